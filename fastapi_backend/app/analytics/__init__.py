@@ -0,0 +1 @@
+"""CPU-side geospatial analytics (coverage, segmentation, scoring)."""
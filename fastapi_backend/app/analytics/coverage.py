@@ -0,0 +1,81 @@
+"""
+Pipeline inspection coverage.
+
+Pure functions over WKB so they can run inside the shared process pool:
+the pipeline is buffered into a corridor, imagery footprints that intersect the
+corridor (STRtree prefilter) are unioned, and the length of line inside that
+union is reported per pipeline and per fixed-length segment.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import numpy as np
+import shapely
+
+from .linear import as_line, local_origin, split_by_length, to_local_km
+
+
+@dataclass(frozen=True)
+class SegmentCoverage:
+    index: int
+    start_km: float
+    end_km: float
+    covered_km: float
+
+    @property
+    def uncovered_km(self) -> float:
+        return max(self.end_km - self.start_km - self.covered_km, 0.0)
+
+
+@dataclass(frozen=True)
+class CoverageResult:
+    length_km: float
+    covered_km: float
+    segments: List[SegmentCoverage] = field(default_factory=list)
+
+    @property
+    def uncovered_km(self) -> float:
+        return max(self.length_km - self.covered_km, 0.0)
+
+    @property
+    def covered_pct(self) -> float:
+        return 100.0 * self.covered_km / self.length_km if self.length_km else 0.0
+
+
+def compute_coverage(
+    line_wkb: bytes,
+    footprint_wkbs: Sequence[bytes],
+    corridor_km: float,
+    segment_km: float,
+) -> CoverageResult:
+    """Coverage of one pipeline by a set of footprints (all EPSG:4326 WKB)."""
+    line_ll = as_line(shapely.from_wkb(line_wkb))
+    origin = local_origin(line_ll)
+    line = to_local_km(line_ll, origin)
+
+    pieces = split_by_length(line, segment_km)
+    segments = np.array([piece for _, _, piece in pieces], dtype=object)
+
+    covered = np.zeros(len(segments))
+    if footprint_wkbs:
+        footprints = to_local_km(
+            shapely.from_wkb(np.asarray(footprint_wkbs, dtype=object)), origin
+        )
+        corridor = shapely.buffer(line, corridor_km)
+        tree = shapely.STRtree(footprints)
+        hits = tree.query(corridor, predicate="intersects")
+        if len(hits):
+            imaged = shapely.intersection(shapely.union_all(footprints[hits]), corridor)
+            covered = shapely.length(shapely.intersection(segments, imaged))
+
+    return CoverageResult(
+        length_km=float(line.length),
+        covered_km=float(covered.sum()),
+        segments=[
+            SegmentCoverage(index=i, start_km=a, end_km=b, covered_km=float(c))
+            for i, ((a, b, _), c) in enumerate(zip(pieces, covered))
+        ],
+    )
@@ -0,0 +1,165 @@
+"""
+Grid-hashed, DBSCAN-style hotspot detection over event locations.
+
+Points are first split into islands that no eps-neighbourhood crosses, and
+each island is projected to its own local km plane (sinusoidal about the
+island's centre, so east-west scale follows each point's latitude); a single
+org-wide projection would distort eps far from the mean latitude. Within an
+island, points are hashed into square cells of side eps/2 (diagonal < eps), so every cell is summarised by its centroid and
+event count. Neighbourhoods are found between cells with one bulk STRtree
+`dwithin` query, core cells are those whose neighbourhood holds at least
+`min_events` events, and clusters are connected components of core cells
+(border cells join an adjacent core). Work and memory scale with the number
+of occupied cells, not with the square of the number of events.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import shapely
+
+from .linear import KM_PER_DEG_LAT, KM_PER_DEG_LON_EQUATOR
+
+# Floor for cos(latitude) so scales stay finite at the poles
+MIN_COS_LAT = 1e-3
+
+
+@dataclass(frozen=True)
+class Hotspot:
+    event_count: int
+    max_severity: int
+    polygon_wkt: str  # EPSG:4326
+
+
+def _connected_components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Label propagation with pointer jumping over undirected edges (a, b)."""
+    labels = np.arange(n)
+    while True:
+        prev = labels.copy()
+        np.minimum.at(labels, a, labels[b])
+        np.minimum.at(labels, b, labels[a])
+        # Pointer jumping: follow labels to their roots
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, prev):
+            return labels
+
+
+def _km_per_deg_lon(lat: np.ndarray) -> np.ndarray:
+    return KM_PER_DEG_LON_EQUATOR * np.maximum(np.cos(np.radians(lat)), MIN_COS_LAT)
+
+
+def _islands(lon: np.ndarray, lat: np.ndarray, eps_km: float) -> np.ndarray:
+    """
+    Label points so that any two within eps_km share a label: occupied cells
+    of a degree grid at least 2*eps_km wide everywhere in the data, joined to
+    their 8 neighbours.
+    """
+    km_per_deg = (float(_km_per_deg_lon(np.max(np.abs(lat)))), KM_PER_DEG_LAT)
+    side = 2 * eps_km / np.array(km_per_deg)
+    keys = np.floor(np.column_stack((lon, lat)) / side).astype(np.int64)
+    cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+    points = shapely.points(cells.astype(np.float64))
+    a, b = shapely.STRtree(points).query(points, predicate="dwithin", distance=1.5)
+    return _connected_components(len(cells), a, b)[inverse.ravel()]
+
+
+def detect_hotspots(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    severity: np.ndarray,
+    eps_km: float,
+    min_events: int,
+) -> List[Hotspot]:
+    """Cluster event points; returns one Hotspot per dense cluster."""
+    if len(lon) == 0:
+        return []
+    labels = _islands(lon, lat, eps_km)
+    order = np.argsort(labels, kind="stable")
+    _, starts, sizes = np.unique(labels[order], return_index=True, return_counts=True)
+    hotspots: List[Hotspot] = []
+    for start, size in zip(starts, sizes):
+        if size < min_events:
+            continue  # too few events for any core cell
+        idx = order[start : start + size]
+        hotspots.extend(
+            _detect_in_island(lon[idx], lat[idx], severity[idx], eps_km, min_events)
+        )
+    return hotspots
+
+
+def _detect_in_island(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    severity: np.ndarray,
+    eps_km: float,
+    min_events: int,
+) -> List[Hotspot]:
+    lon0, lat0 = float(np.mean(lon)), float(np.mean(lat))
+    xy = np.column_stack(
+        ((lon - lon0) * _km_per_deg_lon(lat), (lat - lat0) * KM_PER_DEG_LAT)
+    )
+
+    def to_lonlat(c: np.ndarray) -> np.ndarray:
+        lat_c = c[:, 1] / KM_PER_DEG_LAT + lat0
+        return np.column_stack((c[:, 0] / _km_per_deg_lon(lat_c) + lon0, lat_c))
+
+    # 1) Grid hash: one weighted point per occupied cell
+    cell_side = eps_km / 2
+    keys = np.floor(xy / cell_side).astype(np.int64)
+    _, inverse, counts = np.unique(
+        keys, axis=0, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.ravel()
+    n_cells = len(counts)
+    centers = np.column_stack(
+        (
+            np.bincount(inverse, weights=xy[:, 0], minlength=n_cells) / counts,
+            np.bincount(inverse, weights=xy[:, 1], minlength=n_cells) / counts,
+        )
+    )
+    cell_max_sev = np.zeros(n_cells, dtype=np.int64)
+    np.maximum.at(cell_max_sev, inverse, severity.astype(np.int64))
+
+    # 2) Cell neighbourhoods via the spatial index (includes self-pairs)
+    points = shapely.points(centers)
+    tree = shapely.STRtree(points)
+    a, b = tree.query(points, predicate="dwithin", distance=eps_km)
+
+    # 3) Core cells: enough events within eps
+    density = np.bincount(a, weights=counts[b], minlength=n_cells)
+    core = density >= min_events
+    if not core.any():
+        return []
+
+    # 4) Connect core cells, then attach border cells to a neighbouring core
+    both_core = core[a] & core[b]
+    labels = _connected_components(n_cells, a[both_core], b[both_core])
+    labels = np.where(core, labels, -1)
+    border = ~core[a] & core[b]
+    labels[a[border]] = labels[b[border]]
+
+    # 5) One polygon per cluster around its member cells
+    in_cluster = labels >= 0
+    cluster_ids, member_labels = np.unique(labels[in_cluster], return_inverse=True)
+    member_cells = np.flatnonzero(in_cluster)
+    hulls = shapely.convex_hull(
+        shapely.multipoints(centers[member_cells], indices=member_labels)
+    )
+    polygons = shapely.buffer(hulls, cell_side / 2)
+    polygons_ll = shapely.transform(polygons, to_lonlat)
+
+    event_counts = np.bincount(member_labels, weights=counts[member_cells])
+    max_sev = np.zeros(len(cluster_ids), dtype=np.int64)
+    np.maximum.at(max_sev, member_labels, cell_max_sev[member_cells])
+
+    return [
+        Hotspot(event_count=int(c), max_severity=int(s), polygon_wkt=p)
+        for c, s, p in zip(event_counts, max_sev, shapely.to_wkt(polygons_ll))
+    ]
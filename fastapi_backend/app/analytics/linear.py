@@ -0,0 +1,76 @@
+"""Linear referencing helpers for pipeline geometries (EPSG:4326 in, local km out)."""
+
+from __future__ import annotations
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import substring
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+def as_line(geom: BaseGeometry) -> LineString:
+    """Merge a (multi)line into one continuous LineString or raise ValueError."""
+    if geom.geom_type == "MultiLineString":
+        geom = shapely.line_merge(geom)
+    if geom.geom_type != "LineString" or geom.is_empty:
+        raise ValueError("Pipeline geometry must be a single continuous line")
+    return geom
+
+
+def local_origin(geom: BaseGeometry) -> Tuple[float, float]:
+    """Origin (lon, lat) of the local equirectangular projection for geom."""
+    c = geom.centroid
+    return c.x, c.y
+
+
+def to_local_km(geoms, origin: Tuple[float, float]):
+    """
+    Project lon/lat geometries to a local planar km grid around origin.
+    Accurate to well under 1% over pipeline-sized extents; vectorized over arrays.
+    """
+    lon0, lat0 = origin
+    scale = np.array(
+        [KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat0)), KM_PER_DEG_LAT]
+    )
+    return shapely.transform(geoms, lambda c: (c - (lon0, lat0)) * scale)
+
+
+def from_local_km(geoms, origin: Tuple[float, float]):
+    """Inverse of `to_local_km`."""
+    lon0, lat0 = origin
+    scale = np.array(
+        [KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat0)), KM_PER_DEG_LAT]
+    )
+    return shapely.transform(geoms, lambda c: c / scale + (lon0, lat0))
+
+
+def degrees_for_km(geom: BaseGeometry, km: float) -> float:
+    """Conservative degree distance covering `km` anywhere within geom's bounds."""
+    _, min_lat, _, max_lat = geom.bounds
+    worst_lat = min(max(abs(min_lat), abs(max_lat)), 89.0)
+    return km / (KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(worst_lat)))
+
+
+def split_by_length(
+    line: LineString, segment_len: float
+) -> List[Tuple[float, float, LineString]]:
+    """
+    Cut a line into consecutive pieces of `segment_len` (in the line's units);
+    the last piece holds the remainder. Returns (start, end, piece) tuples.
+    """
+    total = line.length
+    if segment_len <= 0:
+        raise ValueError("segment_len must be positive")
+    bounds = np.append(np.arange(0.0, total, segment_len), total)
+    return [
+        (float(a), float(b), substring(line, a, b))
+        for a, b in zip(bounds[:-1], bounds[1:])
+        if b > a
+    ]
@@ -0,0 +1,167 @@
+"""
+Metrics of a periodic report, as computed in SQL by ReportRepository.metrics
+and laid out by the PDF renderer (app.processing.report_pdf).
+
+Everything here is plain, picklable data: the sections are built in the
+API process and shipped to the render pool as-is.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+SEVERITIES = (1, 2, 3, 4, 5)
+
+
+@dataclass(frozen=True)
+class EventTypeStats:
+    event_type: str
+    count: int
+    by_severity: Tuple[int, ...]  # events at severity 1..5
+    unrated: int
+    max_severity: Optional[int]
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    pipeline_id: Optional[str]  # None: events not linked to a pipeline
+    name: Optional[str]
+    count: int
+    high_severity: int  # severity >= 4
+    max_severity: Optional[int]
+
+
+@dataclass(frozen=True)
+class TimelineBucket:
+    start: dt.date
+    count: int
+    high_severity: int
+
+
+@dataclass(frozen=True)
+class AlertStats:
+    sent: int
+    acknowledged: int
+    # Seconds from sent_at to acknowledged_at, over acknowledged alerts
+    ack_p50_s: Optional[float]
+    ack_p90_s: Optional[float]
+    ack_mean_s: Optional[float]
+    ack_max_s: Optional[float]
+
+
+@dataclass(frozen=True)
+class AssetStats:
+    asset_type: str
+    count: int
+    total_bytes: int
+
+
+@dataclass(frozen=True)
+class ReportMetrics:
+    period_start: dt.date
+    period_end: dt.date  # exclusive
+    timeline_unit: str  # date_trunc unit of `timeline`
+    event_types: List[EventTypeStats] = field(default_factory=list)
+    pipelines: List[PipelineStats] = field(default_factory=list)
+    timeline: List[TimelineBucket] = field(default_factory=list)
+    alerts: Optional[AlertStats] = None
+    assets: List[AssetStats] = field(default_factory=list)
+
+    @property
+    def event_count(self) -> int:
+        return sum(t.count for t in self.event_types)
+
+
+def timeline_unit(period_start: dt.date, period_end: dt.date) -> str:
+    """Daily buckets up to about a month, weekly beyond."""
+    return "day" if (period_end - period_start).days <= 31 else "week"
+
+
+def _duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    minutes = seconds / 60
+    if minutes < 120:
+        return f"{minutes:.0f} min"
+    return f"{minutes / 60:.1f} h"
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TiB"
+
+
+def report_sections(metrics: ReportMetrics) -> List[Dict[str, Any]]:
+    """Renderer sections (headings, tables) for the metrics."""
+    sections: List[Dict[str, Any]] = [
+        {
+            "heading": "Events by type and severity",
+            "text": f"{metrics.event_count} events detected in the period.",
+            "columns": ["Type", "Total", *(f"S{s}" for s in SEVERITIES), "Unrated"],
+            "rows": [
+                [t.event_type, t.count, *t.by_severity, t.unrated]
+                for t in metrics.event_types
+            ],
+        },
+        {
+            "heading": "Events by pipeline",
+            "columns": ["Pipeline", "Events", "Severity >= 4", "Max severity"],
+            "rows": [
+                [
+                    p.name or "(no pipeline)",
+                    p.count,
+                    p.high_severity,
+                    p.max_severity or "-",
+                ]
+                for p in metrics.pipelines
+            ],
+        },
+        {
+            "heading": f"Events per {metrics.timeline_unit}",
+            "columns": ["From", "Events", "Severity >= 4"],
+            "rows": [
+                [b.start.isoformat(), b.count, b.high_severity]
+                for b in metrics.timeline
+            ],
+        },
+    ]
+    alerts = metrics.alerts
+    if alerts is not None:
+        sections.append(
+            {
+                "heading": "Alert response",
+                "columns": [
+                    "Sent",
+                    "Acknowledged",
+                    "Median",
+                    "90th pct",
+                    "Mean",
+                    "Slowest",
+                ],
+                "rows": [
+                    [
+                        alerts.sent,
+                        alerts.acknowledged,
+                        _duration(alerts.ack_p50_s),
+                        _duration(alerts.ack_p90_s),
+                        _duration(alerts.ack_mean_s),
+                        _duration(alerts.ack_max_s),
+                    ]
+                ],
+            }
+        )
+    sections.append(
+        {
+            "heading": "Assets captured",
+            "columns": ["Type", "Count", "Size"],
+            "rows": [
+                [a.asset_type, a.count, _size(a.total_bytes)] for a in metrics.assets
+            ],
+        }
+    )
+    return sections
@@ -0,0 +1,96 @@
+"""
+Time-decayed per-segment risk scores.
+
+score_i(t) = sum_k w_k * exp(-(t - t_k) / tau) over events k on segment i.
+
+Scores are kept relative to a reference time t_ref:
+    acc_i = sum_k w_k * exp((t_k - t_ref) / tau),  score_i(t) = acc_i * exp(-(t - t_ref) / tau)
+so adding an event is a single O(1) array update and decay is only applied
+when scores are read. t_ref is moved forward (one O(n) rescale) when the
+exponent gets large, which keeps the floats bounded.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+# Rebase once exp((t - t_ref) / tau) would exceed e^REBASE_EXPONENT.
+REBASE_EXPONENT = 30.0
+
+
+def severity_weight(severity: Optional[int]) -> float:
+    """Events without a severity count as the mildest level."""
+    return float(severity or 1)
+
+
+@dataclass
+class RiskState:
+    """Scores for one pipeline, indexed by segment sequence number."""
+
+    tau: float  # seconds
+    t_ref: float  # epoch seconds
+    acc: np.ndarray
+    segment_index: Dict[UUID, int]
+    # DB sync bookkeeping: newest event created_at seen, and ids applied at or
+    # after (watermark - lag) so overlapping catch-up queries never double count.
+    watermark: float = 0.0
+    recent: Dict[UUID, float] = field(default_factory=dict)
+    dirty: bool = False
+
+    @classmethod
+    def empty(
+        cls, segment_ids: List[UUID], half_life_s: float, now: float
+    ) -> "RiskState":
+        return cls(
+            tau=half_life_s / math.log(2),
+            t_ref=now,
+            acc=np.zeros(len(segment_ids)),
+            segment_index={sid: i for i, sid in enumerate(segment_ids)},
+        )
+
+    def apply(
+        self,
+        event_id: UUID,
+        segment_id: UUID,
+        weight: float,
+        detected_at: float,
+        created_at: float,
+    ) -> bool:
+        """Add one event in O(1). Returns False if it was already applied or unknown."""
+        idx = self.segment_index.get(segment_id)
+        if idx is None or event_id in self.recent:
+            return False
+        exponent = (detected_at - self.t_ref) / self.tau
+        if exponent > REBASE_EXPONENT:
+            self._rebase(detected_at)
+            exponent = 0.0
+        self.acc[idx] += weight * math.exp(exponent)
+        self.recent[event_id] = created_at
+        self.watermark = max(self.watermark, created_at)
+        self.dirty = True
+        return True
+
+    def apply_many(
+        self,
+        rows: Iterable[Tuple[UUID, UUID, float, float, float]],
+    ) -> int:
+        """Bulk variant of `apply` over (event_id, segment_id, weight, detected_at, created_at)."""
+        return sum(self.apply(*row) for row in rows)
+
+    def prune(self, lag_s: float) -> None:
+        """Forget dedupe ids that can no longer be returned by a catch-up query."""
+        horizon = self.watermark - lag_s
+        self.recent = {eid: ts for eid, ts in self.recent.items() if ts >= horizon}
+
+    def scores(self, now: float) -> np.ndarray:
+        """Decayed scores at `now` (does not mutate state)."""
+        return self.acc * math.exp(-(now - self.t_ref) / self.tau)
+
+    def _rebase(self, t_new: float) -> None:
+        self.acc *= math.exp(-(t_new - self.t_ref) / self.tau)
+        self.t_ref = t_new
@@ -0,0 +1,25 @@
+"""Fixed-length pipeline segmentation (runs in the shared process pool)."""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import shapely
+
+from .linear import as_line, from_local_km, local_origin, split_by_length, to_local_km
+
+
+def segment_line(
+    line_wkb: bytes, segment_km: float
+) -> List[Tuple[int, float, float, str]]:
+    """
+    Split an EPSG:4326 line into `segment_km` pieces.
+    Returns (seq, start_km, end_km, wkt) with chainage measured from the first vertex.
+    """
+    line_ll = as_line(shapely.from_wkb(line_wkb))
+    origin = local_origin(line_ll)
+    pieces = split_by_length(to_local_km(line_ll, origin), segment_km)
+    return [
+        (seq, start, end, from_local_km(piece, origin).wkt)
+        for seq, (start, end, piece) in enumerate(pieces)
+    ]
@@ -19,7 +19,7 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 3600
 
-    #SuperUser
+    # SuperUser
     SUPERUSER_EMAIL: str
     SUPERUSER_PASSWORD: str
     SUPERUSER_FULL_NAME: str = "Super Admin"
@@ -33,6 +33,124 @@ class Settings(BaseSettings):
     CLERK_SECRET_KEY: str
     CLERK_JWKS_URL: str
 
+    # Background / CPU-bound work (0 = one worker per CPU)
+    CPU_WORKERS: int = 0
+    MEDIA_WORKERS: int = 2  # process pool for previews, tiles and metadata extraction
+
+    # Pipeline segmentation (stored segments and coverage/risk bins share it)
+    PIPELINE_SEGMENT_KM: float = 1.0
+
+    # Pipeline inspection coverage
+    COVERAGE_CORRIDOR_M: float = 50.0
+    COVERAGE_CACHE_SIZE: int = 2048
+
+    # Per-segment risk scoring
+    RISK_HALF_LIFE_DAYS: float = 30.0
+    RISK_SYNC_INTERVAL_S: float = 30.0
+    RISK_SYNC_LAG_S: float = 120.0
+    RISK_SNAPSHOT_INTERVAL_S: float = 300.0
+    RISK_STATE_CACHE_SIZE: int = 4096
+
+    # Event hotspot detection
+    HOTSPOT_EPS_M: float = 250.0
+    HOTSPOT_MIN_EVENTS: int = 5
+    HOTSPOT_WINDOW_DAYS: int = 30
+    HOTSPOT_INTERVAL_S: float = 3600.0
+
+    # Asset uploads
+    ASSET_ROOT: str = "/data/assets"
+    ASSET_MAX_UPLOAD_BYTES: int = 50 * 1024**3
+    ASSET_UPLOAD_CHUNK_BYTES: int = 1024**2
+    ASSET_UPLOAD_CONCURRENCY: int = 4
+    # Resumable uploads
+    ASSET_UPLOAD_PART_BYTES: int = 8 * 1024**2
+    ASSET_UPLOAD_TTL_H: float = 24.0
+    ASSET_UPLOAD_JANITOR_INTERVAL_S: float = 900.0
+    # Bulk imports from server-side directories (e.g. a drone station mount).
+    # Only directories below one of these roots may be imported.
+    IMPORT_ROOTS: list[str] = []
+    IMPORT_CONCURRENCY: int = 8  # files hashed/copied at once
+    IMPORT_BATCH: int = 64  # files per transaction (bulk Asset insert)
+    IMPORT_MAX_ERRORS: int = 500  # per-file errors kept on the job
+    IMPORT_STALE_S: float = (
+        900.0  # a running import without progress this long is resumed
+    )
+    # Asset storage backend: "local" (under ASSET_ROOT) or "s3". ASSET_ROOT
+    # also holds local scratch and staging space for either backend.
+    STORAGE_BACKEND: str = "local"
+    STORAGE_PUBLIC_URL: str = "http://localhost:8000"  # base of locally signed URLs
+    STORAGE_SIGNING_KEY: str | None = None  # defaults to ACCESS_SECRET_KEY
+    STORAGE_URL_TTL_S: int = 3600
+    STORAGE_DIRECT_MAX_BYTES: int = 5 * 1024**3  # single presigned PUT limit
+    S3_BUCKET: str = ""
+    S3_PREFIX: str = ""
+    S3_ENDPOINT_URL: str | None = None  # e.g. MinIO
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    # Optional cold tier for old blobs ("", "local" or "s3"); reads fall back
+    # to it transparently. S3 reuses the credentials/endpoint above and needs
+    # an instant-retrieval storage class (not GLACIER / DEEP_ARCHIVE).
+    COLD_STORAGE_BACKEND: str = ""
+    COLD_ASSET_ROOT: str = ""
+    COLD_S3_BUCKET: str = ""  # defaults to S3_BUCKET
+    COLD_S3_PREFIX: str = "cold"
+    COLD_S3_STORAGE_CLASS: str = "STANDARD_IA"
+    # Post-upload asset processing (metadata, previews, tiles)
+    PROCESSING_POLL_S: float = 30.0
+    PROCESSING_BATCH: int = 8
+    PROCESSING_STALE_S: float = 1800.0  # re-queue work from crashed workers
+    METADATA_BATCH: int = 64  # header reads are cheap: claim a mission's worth at once
+    PREVIEW_SIZES: list[int] = [128, 512, 1024]
+    MEDIA_MAX_PIXELS: int = 1_000_000_000
+    PREVIEW_MAX_DECODE_PIXELS: int = (
+        100_000_000  # non-reducible rasters above this get no previews
+    )
+    TILE_SIZE: int = 254  # + 1px overlap on each side = 256px tiles; must be even
+    TILE_OVERLAP: int = 1
+    TILE_MIN_DIMENSION: int = 2048  # smaller images are served whole / as previews
+    # Asset lifecycle (per-org policies: recompress, move to cold tier, delete)
+    LIFECYCLE_INTERVAL_S: float = 3600.0
+    LIFECYCLE_BATCH: int = 32
+    LIFECYCLE_MIN_SAVING: float = 0.1  # keep a recompressed file only if >= 10% smaller
+    LIFECYCLE_RETRY_BASE_S: float = (
+        3600.0  # failed cold-tier moves: doubled per attempt
+    )
+    LIFECYCLE_RETRY_MAX_S: float = 7 * 24 * 3600.0
+    # Byte rate of lifecycle reads/writes (0 = unthrottled), lower during business hours
+    LIFECYCLE_TIMEZONE: str = "UTC"
+    LIFECYCLE_BUSINESS_HOURS: str = "08-18"
+    LIFECYCLE_BUSINESS_DAYS: list[int] = [0, 1, 2, 3, 4]  # Monday = 0
+    LIFECYCLE_BUSINESS_BYTES_PER_S: int = 16 * 1024**2
+    LIFECYCLE_OFF_HOURS_BYTES_PER_S: int = 0
+    # Content-addressed blobs
+    BLOB_GC_INTERVAL_S: float = 6 * 3600.0
+    BLOB_GC_GRACE_H: float = 1.0
+
+    # Report generation (app.jobs.reports)
+    REPORT_POLL_S: float = 30.0
+    REPORT_CONCURRENCY: int = 2  # jobs rendered at once per process
+    REPORT_MAX_ATTEMPTS: int = 3
+    REPORT_RETRY_BASE_S: float = 60.0  # doubled after each failed attempt
+    REPORT_JOB_STALE_S: float = (
+        600.0  # a running job without heartbeat this long is retried
+    )
+    # Rendered PDFs shared between reports of identical content, evicted LRU beyond the cap
+    REPORT_CACHE_MAX_BYTES: int = 2 * 1024**3
+    REPORT_CACHE_EVICT_INTERVAL_S: float = 3600.0
+    # Recurring reports for every active organization (app.jobs.report_schedule)
+    REPORT_SCHEDULE_INTERVAL_S: float = 300.0
+    REPORT_SCHEDULE_FREQUENCIES: list[str] = ["weekly", "monthly", "quarterly"]
+    REPORT_SCHEDULE_CATCHUP_DAYS: int = 35  # periods that ended during downtime
+    REPORT_SCHEDULE_JITTER_S: float = 6 * 3600.0  # spread after each period boundary
+    REPORT_SCHEDULE_MAX_PER_RUN: int = 50
+
+    # Columnar exports of events and alerts (optional pyarrow)
+    EXPORT_BATCH_ROWS: int = (
+        50_000  # rows per cursor fetch, IPC batch and Parquet row group
+    )
+    EXPORT_PARQUET_COMPRESSION: str = "zstd"
+
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
 
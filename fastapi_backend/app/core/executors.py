@@ -0,0 +1,45 @@
+# app/core/executors.py
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_process_pools: Dict[str, ProcessPoolExecutor] = {}
+
+
+def _pool_size(name: str) -> int | None:
+    # "cpu": short geometry/analytics work; "media": long image/video jobs,
+    # kept apart so a batch of uploads cannot starve request-path work.
+    return {"cpu": settings.CPU_WORKERS, "media": settings.MEDIA_WORKERS}[name] or None
+
+
+def get_process_pool(name: str = "cpu") -> ProcessPoolExecutor:
+    """Lazily create the named pool used for CPU-heavy work (geometry, rendering)."""
+    if name not in _process_pools:
+        _process_pools[name] = ProcessPoolExecutor(max_workers=_pool_size(name))
+    return _process_pools[name]
+
+
+async def run_in_pool(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a picklable, module-level function in the named process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_process_pool(name), partial(fn, *args, **kwargs)
+    )
+
+
+async def run_in_process(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a picklable, module-level function in the shared CPU pool."""
+    return await run_in_pool("cpu", fn, *args, **kwargs)
+
+
+def shutdown_process_pool() -> None:
+    for pool in _process_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _process_pools.clear()
@@ -3,10 +3,14 @@ from sqlalchemy import text
 from .database import engine
 from .base import Base
 
+
 async def ensure_extensions():
     # Needed for server_default gen_random_uuid()
     async with engine.begin() as conn:
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto;"))
+        # Needed for geometry columns (events.location, ...)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis;"))
+
 
 # Dev-only helper (avoid in prod; use Alembic instead)
 async def create_db_and_tables():
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Small in-process LRU with an optional per-cache TTL.
+    Not shared between workers; use only for data that is cheap to recompute.
+    Entries `evictable` rejects are skipped by eviction, so the cache can
+    overflow `maxsize` until `trim()` runs after they become evictable.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        evictable: Optional[Callable[[V], bool]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictable = evictable
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        self.trim()
+
+    def trim(self) -> int:
+        """Evict least recently used entries down to `maxsize`; returns the count."""
+        over = len(self._data) - self.maxsize
+        if over <= 0:
+            return 0
+        if self.evictable is None:
+            for _ in range(over):
+                self._data.popitem(last=False)
+            return over
+        victims = []
+        for key, (_, value) in self._data.items():
+            if len(victims) == over:
+                break
+            if self.evictable(value):
+                victims.append(key)
+        for key in victims:
+            del self._data[key]
+        return len(victims)
+
+    def pop(self, key: K) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def items(self) -> List[Tuple[K, V]]:
+        """Live entries, oldest first; does not touch recency or hit stats."""
+        now = time.monotonic()
+        return [
+            (k, v) for k, (expires_at, v) in self._data.items() if expires_at >= now
+        ]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,171 @@
+"""Streaming file helpers: constant-memory copies with hashing, positional writes, locks."""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import os
+import tempfile
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    path: Path
+    sha256: str
+    size: int
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {max_bytes} byte upload limit",
+    )
+
+
+def _write_chunk(out: BinaryIO, digest: Any, chunk: bytes) -> None:
+    # hashlib releases the GIL on large buffers, so both run well in a thread.
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _sync_and_close(out: BinaryIO) -> None:
+    out.flush()
+    os.fsync(out.fileno())
+    out.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    tmp_dir: Path,
+    *,
+    max_bytes: int,
+    chunk_size: int,
+) -> StoredFile:
+    """
+    Copy `file` chunk by chunk into a new temp file under `tmp_dir`, hashing
+    as it goes. The caller moves the returned file into place (an atomic
+    rename on the same filesystem) or deletes it. Raises 413 past `max_bytes`.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+    await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+    fd, tmp = await asyncio.to_thread(
+        tempfile.mkstemp, dir=tmp_dir, prefix="upload-", suffix=".part"
+    )
+    out = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            await asyncio.to_thread(_write_chunk, out, digest, chunk)
+        await asyncio.to_thread(_sync_and_close, out)
+    except BaseException:
+        out.close()
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+    return StoredFile(path=Path(tmp), sha256=digest.hexdigest(), size=size)
+
+
+def _allocate(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as out:
+        out.truncate(size)  # sparse; chunks fill it in any order
+
+
+async def allocate_file(path: Path, size: int) -> None:
+    """Create `path` as a (sparse) file of exactly `size` bytes."""
+    await asyncio.to_thread(_allocate, path, size)
+
+
+async def write_stream_at(
+    stream: AsyncIterator[bytes],
+    path: Path,
+    offset: int,
+    length: int,
+) -> None:
+    """
+    Write exactly `length` bytes from `stream` into `path` starting at
+    `offset`, using positional writes so several chunks can be written to the
+    same file concurrently. Raises 400 if the stream is longer or shorter.
+    """
+    fd = await asyncio.to_thread(os.open, path, os.O_WRONLY)
+    written = 0
+    try:
+        async for data in stream:
+            if written + len(data) > length:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Chunk is larger than the expected {length} bytes",
+                )
+            await asyncio.to_thread(os.pwrite, fd, data, offset + written)
+            written += len(data)
+        if written != length:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk has {written} bytes, expected {length}",
+            )
+        await asyncio.to_thread(os.fsync, fd)
+    finally:
+        os.close(fd)
+
+
+@asynccontextmanager
+async def locked_file(
+    path: Path, *, shared: bool = False, blocking: bool = True
+) -> AsyncIterator[bool]:
+    """
+    Hold an advisory flock on `path` (shared or exclusive) for the block;
+    it excludes other processes on this host too. Yields whether the lock
+    was taken, which is always True when `blocking`. Raises
+    FileNotFoundError if `path` does not exist.
+    """
+    op = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (
+        0 if blocking else fcntl.LOCK_NB
+    )
+    fd = await asyncio.to_thread(os.open, path, os.O_RDONLY)
+    acquiring = asyncio.ensure_future(asyncio.to_thread(fcntl.flock, fd, op))
+    try:
+        await asyncio.shield(acquiring)
+    except BlockingIOError:
+        os.close(fd)
+        yield False
+        return
+    except BaseException:
+        # Cancelled while waiting: close only once the thread stops using the fd.
+        def close(done: asyncio.Future) -> None:
+            if not done.cancelled():
+                done.exception()  # retrieved, so it is not reported as unhandled
+            os.close(fd)
+
+        acquiring.add_done_callback(close)
+        raise
+    try:
+        yield True
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _hash_file(path: Path, chunk_size: int) -> Tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as src:
+        while data := src.read(chunk_size):
+            digest.update(data)
+            size += len(data)
+    return digest.hexdigest(), size
+
+
+async def hash_file(path: Path, chunk_size: int) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of `path`, read in a worker thread."""
+    return await asyncio.to_thread(_hash_file, path, chunk_size)
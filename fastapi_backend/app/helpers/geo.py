@@ -0,0 +1,34 @@
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+BBox = Tuple[float, float, float, float]
+
+# Web-mercator tiles are 256px wide; a cluster cell spans CLUSTER_CELL_PX of them.
+TILE_SIZE_PX = 256
+CLUSTER_CELL_PX = 64
+
+
+def parse_bbox(raw: str) -> BBox:
+    """
+    Parse a "min_lon,min_lat,max_lon,max_lat" query string into a bbox tuple.
+    Raises 422 on malformed or inverted boxes.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(p) for p in raw.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="bbox must be 'min_lon,min_lat,max_lon,max_lat'",
+        )
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="bbox is out of range or inverted",
+        )
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def cell_size_for_zoom(zoom: int, cell_px: int = CLUSTER_CELL_PX) -> float:
+    """Grid cell size in degrees so that one cell covers ~cell_px screen pixels."""
+    return 360.0 / (2**zoom) * cell_px / TILE_SIZE_PX
@@ -0,0 +1,82 @@
+"""HTTP Range / conditional request parsing (RFC 9110 sections 13 and 14)."""
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+ByteRange = Tuple[int, int]  # inclusive start, end
+
+# More ranges than this are served as a plain 200 (RFC 9110 14.2 allows it).
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[List[ByteRange]]:
+    """
+    Resolve a Range header against a representation of `size` bytes.
+    Returns None to serve the whole body (absent, malformed or too many
+    ranges); raises RangeNotSatisfiable if no range overlaps the content.
+    Overlapping and adjacent ranges are coalesced.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    ranges: List[ByteRange] = []
+    for part in spec.split(","):
+        first, sep, last = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and start > end:
+                    return None
+            else:
+                suffix = int(last)
+                start, end = max(size - suffix, 0), size - 1
+                if suffix == 0:
+                    continue
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+    if not ranges:
+        raise RangeNotSatisfiable
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        if start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    if len(merged) > MAX_RANGES:
+        return None
+    return merged
+
+
+def _tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: Optional[str], etag: Optional[str]) -> bool:
+    """True if If-None-Match matches `etag` (weak comparison) -> 304."""
+    if not header or not etag:
+        return False
+    strip = lambda tag: tag.removeprefix("W/")  # noqa: E731
+    return any(tag == "*" or strip(tag) == strip(etag) for tag in _tags(header))
+
+
+def range_applies(if_range: Optional[str], etag: Optional[str]) -> bool:
+    """
+    If-Range: honour Range only if the validator still matches (strong
+    comparison). HTTP dates are not tracked for assets, so they never match.
+    """
+    if not if_range:
+        return True
+    return etag is not None and not etag.startswith("W/") and if_range.strip() == etag
@@ -0,0 +1,87 @@
+"""
+Query-string filters on JSONB columns, translated into GIN-indexable SQL.
+
+Syntax (one predicate per `meta` query parameter, all ANDed; keys may be
+dotted paths into nested objects):
+
+    sensor:thermal          equality / containment  ->  col @> '{"sensor": "thermal"}'
+    tags:["leak","night"]   JSON values contain     ->  col @> '{"tags": ["leak", "night"]}'
+    gps.alt>=50             range (>, >=, <, <=)    ->  col @? '$."gps"."alt" ? (@ >= 50)'
+    mission_id              key present             ->  col @? '$."mission_id"'
+
+Values are parsed as JSON when possible (numbers, booleans, quoted
+strings, arrays, objects), otherwise taken as plain strings.
+"""
+
+from __future__ import annotations
+import json
+import math
+import re
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import cast
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.sql import ColumnElement
+
+PREDICATE = re.compile(
+    r"^(?P<path>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)(?:(?P<op>:|>=|<=|>|<)(?P<value>.+))?$"
+)
+MAX_FILTERS = 20
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+    )
+
+
+def _value(raw: str) -> Any:
+    try:
+        return json.loads(raw, parse_constant=lambda name: name)  # NaN stays a string
+    except ValueError:
+        return raw
+
+
+def _nest(keys: Sequence[str], value: Any) -> Any:
+    for key in reversed(keys):
+        value = {key: value}
+    return value
+
+
+def _jsonpath(keys: Sequence[str]) -> str:
+    return "$" + "".join(f".{json.dumps(key)}" for key in keys)
+
+
+def parse_json_filters(column: Any, raw_filters: Sequence[str]) -> List[ColumnElement]:
+    """
+    SQL conditions on the JSONB `column` for each predicate; every one uses
+    an operator (@>, @?) served by a jsonb_path_ops GIN index. Raises 422
+    on malformed predicates.
+    """
+    if len(raw_filters) > MAX_FILTERS:
+        raise _invalid(f"At most {MAX_FILTERS} metadata filters are allowed")
+    conditions = []
+    for raw in raw_filters:
+        match = PREDICATE.match(raw.strip())
+        if not match:
+            raise _invalid(
+                f"Invalid metadata filter {raw!r}; expected key:value, key>n or key"
+            )
+        keys = match["path"].split(".")
+        op, value = match["op"], match["value"]
+        if op is None:
+            conditions.append(column.op("@?")(cast(_jsonpath(keys), JSONPATH)))
+        elif op == ":":
+            conditions.append(column.op("@>")(cast(_nest(keys, _value(value)), JSONB)))
+        else:
+            bound = _value(value)
+            if (
+                not isinstance(bound, (int, float, str))
+                or isinstance(bound, bool)
+                or (isinstance(bound, float) and not math.isfinite(bound))  # 1e999
+            ):
+                raise _invalid(f"Range filter {raw!r} needs a number or a string")
+            path = f"{_jsonpath(keys)} ? (@ {op} {json.dumps(bound)})"
+            conditions.append(column.op("@?")(cast(path, JSONPATH)))
+    return conditions
@@ -0,0 +1,45 @@
+"""Calendar periods of recurring reports (UTC days, end exclusive)."""
+
+from __future__ import annotations
+import datetime as dt
+import hashlib
+from typing import List, Tuple
+
+from app.schemas.enums import ReportFrequency
+
+Period = Tuple[dt.date, dt.date]
+
+
+def _add_months(day: dt.date, months: int) -> dt.date:
+    index = day.year * 12 + day.month - 1 + months
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def period_containing(frequency: ReportFrequency, day: dt.date) -> Period:
+    """ISO weeks (Monday to Monday), calendar months and calendar quarters."""
+    if frequency == ReportFrequency.WEEKLY:
+        start = day - dt.timedelta(days=day.weekday())
+        return start, start + dt.timedelta(days=7)
+    months = 1 if frequency == ReportFrequency.MONTHLY else 3
+    start = dt.date(day.year, (day.month - 1) // months * months + 1, 1)
+    return start, _add_months(start, months)
+
+
+def completed_periods(
+    frequency: ReportFrequency, since: dt.date, today: dt.date
+) -> List[Period]:
+    """Periods that ended by `today`, from the one containing `since` on."""
+    periods = []
+    start, end = period_containing(frequency, since)
+    while end <= today:
+        periods.append((start, end))
+        start, end = period_containing(frequency, end)
+    return periods
+
+
+def jitter(seed: str, spread_s: float) -> dt.timedelta:
+    """A stable offset in [0, spread_s) for `seed`: the same on every worker and run."""
+    if spread_s <= 0:
+        return dt.timedelta()
+    fraction = int.from_bytes(hashlib.sha256(seed.encode()).digest()[:8], "big") / 2**64
+    return dt.timedelta(seconds=fraction * spread_s)
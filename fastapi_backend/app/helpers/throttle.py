@@ -0,0 +1,63 @@
+"""Byte-rate throttling for background jobs that share disks with the API."""
+
+from __future__ import annotations
+import asyncio
+import datetime as dt
+import time
+from typing import Awaitable, Callable, Collection, Tuple
+
+
+def parse_hours(spec: str) -> Tuple[int, int]:
+    """ "08-18" -> (8, 18): from 08:00 until 18:00. A window may wrap past midnight."""
+    try:
+        start, end = (int(part) for part in spec.split("-"))
+    except ValueError:
+        raise ValueError(f"Invalid hour range {spec!r}; expected e.g. 08-18") from None
+    if not (0 <= start <= 24 and 0 <= end <= 24):
+        raise ValueError(f"Invalid hour range {spec!r}")
+    return start, end
+
+
+def in_window(now: dt.datetime, hours: Tuple[int, int], days: Collection[int]) -> bool:
+    """Whether local time `now` falls in the hours on one of the weekdays (Monday = 0)."""
+    start, end = hours
+    if start <= end:
+        return now.weekday() in days and start <= now.hour < end
+    # Overnight window: the early hours belong to the previous day's window
+    if now.hour >= start:
+        return now.weekday() in days
+    return now.hour < end and (now.weekday() - 1) % 7 in days
+
+
+class Throttle:
+    """
+    Token bucket over bytes. `rate` is asked for the current limit on every
+    call (so it can follow the clock); 0 or less means unlimited. Large
+    requests are let through and paid back by sleeping, so callers can
+    throttle whole files as well as chunks.
+    """
+
+    def __init__(
+        self,
+        rate: Callable[[], float],
+        burst_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst_s = burst_s
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = 0.0
+        self.updated = clock()
+
+    async def consume(self, n: int) -> None:
+        now = self.clock()
+        elapsed, self.updated = now - self.updated, now
+        rate = self.rate()
+        if rate <= 0:
+            self.tokens = 0.0
+            return
+        self.tokens = min(self.tokens + elapsed * rate, rate * self.burst_s) - n
+        if self.tokens < 0:
+            await self.sleep(-self.tokens / rate)
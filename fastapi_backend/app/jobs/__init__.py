@@ -0,0 +1 @@
+"""Background jobs started from the app lifespan."""
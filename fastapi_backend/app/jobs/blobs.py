@@ -0,0 +1,50 @@
+# app/jobs/blobs.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+import os
+import time
+from contextlib import suppress
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.repositories import BlobRepository
+from app.services.blob import remove_blob, tmp_dir
+from .locks import try_advisory_xact_lock
+
+log = logging.getLogger(__name__)
+
+
+def _remove_stale_tmp(older_than: float) -> None:
+    """Spool files left behind by crashed uploads."""
+    with suppress(FileNotFoundError):
+        for entry in os.scandir(tmp_dir()):
+            if entry.stat().st_mtime < older_than:
+                with suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+
+
+async def collect_garbage_blobs() -> int:
+    """
+    Delete blobs no asset references. Ref counts are first reconciled with
+    the assets table; objects are deleted before the row deletes commit, so a
+    concurrent upload of the same content waits and then stores a fresh copy.
+    """
+    grace = dt.timedelta(hours=settings.BLOB_GC_GRACE_H)
+    async with async_session_maker() as db:
+        if not await try_advisory_xact_lock(db, "jobs.blob_gc"):
+            return 0
+        repo = BlobRepository(db)
+        await repo.reconcile_ref_counts()
+        hashes = await repo.delete_unreferenced(
+            dt.datetime.now(dt.timezone.utc) - grace
+        )
+        for sha256 in hashes:
+            await remove_blob(sha256)
+        await db.commit()
+    await asyncio.to_thread(_remove_stale_tmp, time.time() - grace.total_seconds())
+    if hashes:
+        log.info("Removed %d unreferenced blobs", len(hashes))
+    return len(hashes)
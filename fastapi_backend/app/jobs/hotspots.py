@@ -0,0 +1,62 @@
+# app/jobs/hotspots.py
+from __future__ import annotations
+
+import datetime as dt
+import logging
+
+import numpy as np
+
+from app.analytics.hotspots import detect_hotspots
+from app.core.config import settings
+from app.core.executors import run_in_process
+from app.db.database import async_session_maker
+from app.models import Organization
+from app.repositories import EventRepository, HotspotRepository, OrganizationRepository
+from .locks import advisory_lock
+
+log = logging.getLogger(__name__)
+
+
+async def detect_all_hotspots() -> int:
+    """
+    Recompute every active organization's hotspots over the last
+    HOTSPOT_WINDOW_DAYS. One worker runs at a time (advisory lock); each
+    organization is swapped in its own short transaction, so readers and
+    other writers are never held up by the whole run.
+    """
+    window_end = dt.datetime.now(dt.timezone.utc)
+    window_start = window_end - dt.timedelta(days=settings.HOTSPOT_WINDOW_DAYS)
+    total = 0
+    async with advisory_lock("jobs.hotspots") as acquired:
+        if not acquired:
+            log.info("Hotspot job already running elsewhere; skipping")
+            return 0
+        async with async_session_maker() as db:
+            org_ids = [
+                org.id
+                for org in await OrganizationRepository(db).list(
+                    filters=[Organization.is_active.is_(True)]
+                )
+            ]
+            event_repo = EventRepository(db)
+            hotspot_repo = HotspotRepository(db)
+            for org_id in org_ids:
+                rows = await event_repo.located_since(org_id, window_start)
+                await db.rollback()  # don't sit in a transaction while clustering
+                hotspots = []
+                if rows:
+                    points = np.asarray(rows, dtype=np.float64)
+                    hotspots = await run_in_process(
+                        detect_hotspots,
+                        points[:, 0],
+                        points[:, 1],
+                        points[:, 2],
+                        settings.HOTSPOT_EPS_M / 1000,
+                        settings.HOTSPOT_MIN_EVENTS,
+                    )
+                await hotspot_repo.replace_for_org(
+                    org_id, window_start, window_end, hotspots
+                )
+                total += len(hotspots)
+    log.info("Hotspot job stored %d hotspots for %d organizations", total, len(org_ids))
+    return total
@@ -0,0 +1,203 @@
+# app/jobs/imports.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.helpers.files import hash_file
+from app.models import AssetImport
+from app.processing.queue import kick
+from app.repositories import AssetImportRepository, AssetRepository, BlobRepository
+from app.schemas.enums import AssetType, JobStatus
+from app.services.asset import build_asset
+from app.services.asset_import import scan_directory
+from app.services.blob import store_blob_copy
+
+log = logging.getLogger(__name__)
+
+_running: Dict[UUID, asyncio.Task] = {}
+
+
+def _error(rel_path: str, exc: BaseException) -> Dict[str, str]:
+    return {"path": rel_path, "error": f"{type(exc).__name__}: {exc}"}
+
+
+async def _bounded(slots: asyncio.Semaphore, coro: Any) -> Any:
+    async with slots:
+        return await coro
+
+
+async def _import_batch(
+    db: AsyncSession,
+    job: AssetImport,
+    root: Path,
+    batch: List[Tuple[str, AssetType]],
+    slots: asyncio.Semaphore,
+) -> None:
+    """
+    Hash the batch concurrently, drop content the organization already has,
+    store the new blobs concurrently and insert all Asset rows in the same
+    transaction as the job's progress.
+    """
+    asset_repo, blob_repo = AssetRepository(db), BlobRepository(db)
+    errors: List[Dict[str, str]] = []
+
+    hashed = await asyncio.gather(
+        *(
+            _bounded(slots, hash_file(root / rel, settings.ASSET_UPLOAD_CHUNK_BYTES))
+            for rel, _ in batch
+        ),
+        return_exceptions=True,
+    )
+    seen: Set[str] = await asset_repo.existing_hashes(
+        job.organization_id, {r[0] for r in hashed if not isinstance(r, BaseException)}
+    )
+    fresh = []
+    skipped = 0
+    for (rel, kind), result in zip(batch, hashed):
+        if isinstance(result, BaseException):
+            errors.append(_error(rel, result))
+        elif result[0] in seen:
+            skipped += 1  # already imported (or duplicated within this directory)
+        else:
+            seen.add(result[0])
+            fresh.append((rel, kind, *result))
+
+    # Row locks/upserts on the shared session, one at a time; file copies in parallel.
+    acquired = [await blob_repo.acquire(sha256, size) for _, _, sha256, size in fresh]
+    stored = await asyncio.gather(
+        *(
+            _bounded(slots, store_blob_copy(root / rel, sha256, created))
+            for (rel, _, sha256, _), (_, created) in zip(fresh, acquired)
+        ),
+        return_exceptions=True,
+    )
+    assets = []
+    for (rel, kind, sha256, size), (blob_id, _), result in zip(fresh, acquired, stored):
+        if isinstance(result, BaseException):
+            # The blob keeps a reference without an asset; blob GC reconciles counts.
+            errors.append(_error(rel, result))
+            continue
+        assets.append(
+            build_asset(
+                job.organization_id,
+                blob_id,
+                sha256,
+                size,
+                Path(rel).name,
+                kind,
+                None,
+                {**(job.asset_metadata or {}), "source_path": rel},
+                None,
+            )
+        )
+    db.add_all(assets)
+
+    job.processed_files += len(batch)
+    job.imported_files += len(assets)
+    job.skipped_files += skipped
+    job.failed_files += len(errors)
+    if errors:
+        kept = (job.errors or [])[: settings.IMPORT_MAX_ERRORS]
+        job.errors = kept + errors[: settings.IMPORT_MAX_ERRORS - len(kept)]
+    await db.commit()
+    if assets:
+        kick()  # metadata, previews and tiles start while the import goes on
+
+
+async def run_import(import_id: UUID) -> None:
+    """
+    Import every file of the job's directory, IMPORT_BATCH files per
+    transaction with IMPORT_CONCURRENCY files hashed/copied at once. A job
+    interrupted by a restart resumes after its last committed batch.
+    """
+    async with async_session_maker() as db:
+        repo = AssetImportRepository(db)
+        if not await repo.claim(import_id, _stale_before()):
+            return
+        await db.commit()
+        job = await repo.get(import_id)
+        root = Path(job.directory)
+        heartbeat = asyncio.create_task(_heartbeat(import_id))
+        try:
+            files = await asyncio.to_thread(
+                scan_directory, root, job.asset_type, job.recursive
+            )
+            job.total_files = len(files)
+            job.started_at = job.started_at or dt.datetime.now(dt.timezone.utc)
+            await db.commit()
+
+            slots = asyncio.Semaphore(settings.IMPORT_CONCURRENCY)
+            size = settings.IMPORT_BATCH
+            for start in range(job.processed_files, len(files), size):
+                await _import_batch(db, job, root, files[start : start + size], slots)
+            job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            # Shutdown: hand the job back; whichever process resumes it next
+            # continues after the last committed batch.
+            await asyncio.shield(_requeue(import_id))
+            raise
+        except Exception as exc:
+            log.exception("Asset import %s failed", import_id)
+            await db.rollback()
+            job = await repo.get(import_id)
+            job.status = JobStatus.FAILED
+            job.errors = (job.errors or []) + [_error(job.directory, exc)]
+        finally:
+            heartbeat.cancel()
+        job.finished_at = dt.datetime.now(dt.timezone.utc)
+        await db.commit()
+
+
+def _stale_before() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc) - dt.timedelta(
+        seconds=settings.IMPORT_STALE_S
+    )
+
+
+async def _heartbeat(import_id: UUID) -> None:
+    # Batches of large files can outlast IMPORT_STALE_S; keep the claim fresh.
+    while True:
+        await asyncio.sleep(settings.IMPORT_STALE_S / 3)
+        async with async_session_maker() as db:
+            await AssetImportRepository(db).touch(import_id)
+            await db.commit()
+
+
+async def _requeue(import_id: UUID) -> None:
+    async with async_session_maker() as db:
+        await AssetImportRepository(db).requeue(import_id)
+        await db.commit()
+
+
+def start_import(import_id: UUID) -> None:
+    """Run an import in the background of this process."""
+    if import_id in _running:
+        return
+    task = asyncio.create_task(run_import(import_id))
+    _running[import_id] = task
+    task.add_done_callback(lambda _: _running.pop(import_id, None))
+
+
+async def resume_imports() -> None:
+    """
+    Start queued imports and those whose process died mid-way (no progress
+    for IMPORT_STALE_S). Runs at startup and periodically; `run_import`
+    claims each job atomically, so several app processes can call this.
+    """
+    async with async_session_maker() as db:
+        ids = await AssetImportRepository(db).claimable_ids(_stale_before())
+    for import_id in ids:
+        start_import(import_id)
+
+
+def running_imports() -> List[asyncio.Task]:
+    return list(_running.values())
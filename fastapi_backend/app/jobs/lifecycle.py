@@ -0,0 +1,106 @@
+# app/jobs/lifecycle.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.helpers.throttle import Throttle
+from app.repositories import AssetRepository, BlobRepository
+from app.services.lifecycle import (
+    archive_blob,
+    cold_storage,
+    delete_expired_assets,
+    lifecycle_rate,
+    recompress_asset,
+    recompressed_types,
+)
+from .locks import advisory_lock
+
+log = logging.getLogger(__name__)
+
+
+async def _recompress_batch(throttle: Throttle, slots: asyncio.Semaphore) -> int:
+    async with async_session_maker() as db:
+        candidates = await AssetRepository(db).recompress_candidates(
+            settings.LIFECYCLE_BATCH, recompressed_types()
+        )
+        db.expunge_all()
+
+    async def _one(asset, policy) -> None:
+        async with slots:
+            await recompress_asset(asset, policy, throttle)
+
+    results = await asyncio.gather(
+        *(_one(asset, policy) for asset, policy in candidates), return_exceptions=True
+    )
+    for (asset, _), result in zip(candidates, results):
+        if isinstance(result, BaseException):
+            log.error("Asset %s: lifecycle recompression failed: %r", asset.id, result)
+    return sum(not isinstance(r, BaseException) for r in results)
+
+
+def _archive_retry_in(attempts: int) -> dt.timedelta:
+    delay = settings.LIFECYCLE_RETRY_BASE_S * 2 ** min(attempts, 32)
+    return dt.timedelta(seconds=min(delay, settings.LIFECYCLE_RETRY_MAX_S))
+
+
+async def _archive_batch(throttle: Throttle) -> int:
+    storage = cold_storage()
+    if storage is None:
+        return 0  # no cold tier configured
+    async with async_session_maker() as db:
+        blobs = await BlobRepository(db).archive_candidates(
+            settings.LIFECYCLE_BATCH, recompressed_types()
+        )
+        db.expunge_all()
+    for blob in blobs:
+        try:
+            await archive_blob(storage, blob, throttle)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Blob %s: moving to the cold tier failed", blob.sha256)
+            # Back off so the next batches reach newer blobs instead of retrying this one.
+            retry_in = _archive_retry_in(blob.archive_attempts)
+            async with async_session_maker() as db:
+                await BlobRepository(db).defer_archive(blob.id, retry_in)
+    return len(
+        blobs
+    )  # failed blobs were deferred out of the candidates: still progress
+
+
+async def _drain(step: str, batch: Callable[[], Awaitable[int]]) -> int:
+    """Run batches until one makes no progress (done, or only failures left)."""
+    total = 0
+    while done := await batch():
+        total += done
+    if total:
+        log.info("Lifecycle %s: %d items", step, total)
+    return total
+
+
+async def run_lifecycle() -> int:
+    """
+    Apply every organization's lifecycle policy: retention deletes first
+    (no point moving what is about to go), then recompression, then moves
+    to the cold tier. One worker at a time across processes; reads and
+    writes are throttled to LIFECYCLE_BUSINESS_BYTES_PER_S during business
+    hours. Progress is committed per item, so a cancelled run resumes
+    where it stopped on the next interval.
+    """
+    async with advisory_lock("jobs.lifecycle") as acquired:
+        if not acquired:
+            return 0
+        throttle = Throttle(lifecycle_rate)
+        slots = asyncio.Semaphore(settings.MEDIA_WORKERS)
+        return (
+            await _drain(
+                "retention", lambda: delete_expired_assets(settings.LIFECYCLE_BATCH)
+            )
+            + await _drain("recompress", lambda: _recompress_batch(throttle, slots))
+            + await _drain("archive", lambda: _archive_batch(throttle))
+        )
@@ -0,0 +1,38 @@
+# app/jobs/locks.py
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import engine
+
+
+async def try_advisory_xact_lock(db: AsyncSession, name: str) -> bool:
+    """
+    Take a Postgres advisory lock named `name` for the current transaction.
+    Returns False if another worker holds it; released on commit/rollback.
+    """
+    acquired = await db.scalar(
+        select(func.pg_try_advisory_xact_lock(func.hashtext(name)))
+    )
+    return bool(acquired)
+
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """
+    Session-level advisory lock named `name`, held on a dedicated connection
+    for the whole block (for jobs that span many transactions). Yields False
+    if another worker holds it; released on exit or when the connection drops.
+    """
+    key = func.hashtext(name)
+    async with engine.connect() as conn:
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(key))))
+        await conn.commit()  # don't sit idle in a transaction while holding it
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(select(func.pg_advisory_unlock(key)))
+                await conn.commit()
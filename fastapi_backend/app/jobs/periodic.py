@@ -0,0 +1,32 @@
+# app/jobs/periodic.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+log = logging.getLogger(__name__)
+
+
+async def run_every(interval_s: float, fn: Callable[[], Awaitable[object]]) -> None:
+    """Call `fn` every `interval_s` seconds until cancelled; errors are logged, not raised."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await fn()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Periodic job %s failed", getattr(fn, "__name__", fn))
+
+
+def start_periodic(
+    jobs: List[tuple[float, Callable[[], Awaitable[object]]]],
+) -> List[asyncio.Task]:
+    return [asyncio.create_task(run_every(interval, fn)) for interval, fn in jobs]
+
+
+async def stop_periodic(tasks: List[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,122 @@
+# app/jobs/processing.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.models import Asset
+from app.processing.queue import wait_for_work
+from app.repositories import AssetRepository
+from app.schemas.enums import ProcessingStatus
+from app.services.metadata import extract_asset_metadata
+from app.services.preview import generate_previews
+from app.services.tiles import generate_tiles
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One post-upload step; `handler` returns the asset columns to set. A
+    `batched` handler takes the whole claimed batch and returns one dict per
+    asset, for work that is cheaper done together.
+    """
+
+    name: str
+    status: InstrumentedAttribute
+    handler: Callable[..., Awaitable[Any]]
+    batched: bool = False
+    batch_size: int = settings.PROCESSING_BATCH
+
+
+STAGES: List[Stage] = [
+    Stage(
+        "metadata",
+        Asset.metadata_status,
+        extract_asset_metadata,
+        batched=True,
+        batch_size=settings.METADATA_BATCH,
+    ),
+    Stage("previews", Asset.preview_status, generate_previews),
+    Stage("tiles", Asset.tiles_status, generate_tiles),
+]
+
+
+async def _run_one(stage: Stage, asset: Asset) -> Dict[Any, Any]:
+    try:
+        return await stage.handler(asset)
+    except Exception:
+        log.exception("Asset %s: %s stage failed", asset.id, stage.name)
+        return {stage.status: ProcessingStatus.FAILED}
+
+
+async def _run_batch(stage: Stage, assets: List[Asset]) -> List[Dict[Any, Any]]:
+    try:
+        return await stage.handler(assets)
+    except Exception:
+        log.exception(
+            "%s stage failed for a batch of %d assets", stage.name, len(assets)
+        )
+        return [{stage.status: ProcessingStatus.FAILED}] * len(assets)
+
+
+async def process_stage(stage: Stage) -> int:
+    """Claim one batch for `stage`, process it concurrently, store results."""
+    async with async_session_maker() as db:
+        repo = AssetRepository(db)
+        assets = await repo.claim_pending(stage.status, stage.batch_size)
+        db.expunge_all()  # keep attributes readable after the session closes
+        await db.commit()
+    if not assets:
+        return 0
+    if stage.batched:
+        results = await _run_batch(stage, assets)
+    else:
+        results = await asyncio.gather(*(_run_one(stage, asset) for asset in assets))
+    async with async_session_maker() as db:
+        repo = AssetRepository(db)
+        for asset, values in zip(assets, results):
+            await repo.set_values(asset.id, values)
+        await db.commit()
+    return len(assets)
+
+
+async def _requeue_stale() -> None:
+    before = dt.datetime.now(dt.timezone.utc) - dt.timedelta(
+        seconds=settings.PROCESSING_STALE_S
+    )
+    async with async_session_maker() as db:
+        repo = AssetRepository(db)
+        for stage in STAGES:
+            await repo.requeue_stale(stage.status, before)
+        await db.commit()
+
+
+async def run_processing() -> None:
+    """
+    Long-running loop (one per app process): drain every stage, then sleep
+    until kicked by a new upload or PROCESSING_POLL_S elapses. Bounded by
+    the media pool size (MEDIA_WORKERS) and PROCESSING_BATCH.
+    """
+    while True:
+        try:
+            await _requeue_stale()
+            while sum([await process_stage(stage) for stage in STAGES]):
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Asset processing loop failed")
+        await wait_for_work(settings.PROCESSING_POLL_S)
+
+
+def start_processing() -> asyncio.Task:
+    return asyncio.create_task(run_processing())
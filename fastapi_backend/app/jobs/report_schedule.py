@@ -0,0 +1,113 @@
+# app/jobs/report_schedule.py
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from typing import Iterable, List, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.helpers.periods import completed_periods, jitter
+from app.models import Organization, Report, ReportJob
+from app.processing.queue import kick
+from app.repositories import (
+    OrganizationRepository,
+    ReportJobRepository,
+    ReportRepository,
+)
+from app.schemas.enums import ClientType, JobStatus, ReportFrequency
+from .locks import try_advisory_xact_lock
+from .reports import QUEUE
+
+log = logging.getLogger(__name__)
+
+Due = Tuple[dt.datetime, UUID, ReportFrequency, dt.date, dt.date]
+
+
+def due_reports(
+    orgs: Iterable[Tuple[UUID, dt.date]],
+    existing: Set[Tuple[UUID, ReportFrequency, dt.date, dt.date]],
+    now: dt.datetime,
+) -> List[Due]:
+    """
+    Recurring reports owed to `orgs` (id, creation day): every period that
+    ended within REPORT_SCHEDULE_CATCHUP_DAYS and has no report yet, once its
+    per-org jitter after the boundary has passed. Longest overdue first.
+    """
+    today = now.date()
+    since = today - dt.timedelta(days=settings.REPORT_SCHEDULE_CATCHUP_DAYS)
+    frequencies = [ReportFrequency(f) for f in settings.REPORT_SCHEDULE_FREQUENCIES]
+    due: List[Due] = []
+    for org_id, created in orgs:
+        for frequency in frequencies:
+            for start, end in completed_periods(frequency, max(since, created), today):
+                if (org_id, frequency, start, end) in existing:
+                    continue
+                due_at = dt.datetime.combine(
+                    end, dt.time(), tzinfo=dt.timezone.utc
+                ) + jitter(
+                    f"{org_id}:{frequency.value}:{start}",
+                    settings.REPORT_SCHEDULE_JITTER_S,
+                )
+                if due_at <= now:
+                    due.append((due_at, org_id, frequency, start, end))
+    due.sort()
+    return due
+
+
+async def schedule_reports() -> int:
+    """
+    Queue the recurring reports of every active organization. The advisory
+    lock elects one scheduler across processes; at most
+    REPORT_SCHEDULE_MAX_PER_RUN reports are queued per run, so a backlog
+    (first deploy, downtime) drains over several runs instead of at once.
+    """
+    now = dt.datetime.now(dt.timezone.utc)
+    async with async_session_maker() as db:
+        if not await try_advisory_xact_lock(db, "jobs.report_schedule"):
+            return 0
+        orgs = await OrganizationRepository(db).list(
+            filters=[
+                Organization.is_active.is_(True),
+                Organization.client_type != ClientType.SYSTEM,
+            ]
+        )
+        report_repo = ReportRepository(db)
+        job_repo = ReportJobRepository(db)
+        since = now.date() - dt.timedelta(days=settings.REPORT_SCHEDULE_CATCHUP_DAYS)
+        due = due_reports(
+            [(org.id, org.created_at.date()) for org in orgs],
+            await report_repo.periods_since(since),  # due periods all end after `since`
+            now,
+        )
+        queued = due[: settings.REPORT_SCHEDULE_MAX_PER_RUN]
+        for _, org_id, frequency, start, end in queued:
+            report = await report_repo.create(
+                Report(
+                    organization_id=org_id,
+                    frequency=frequency,
+                    period_start=start,
+                    period_end=end,
+                ),
+                commit=False,
+            )
+            await db.flush()
+            await job_repo.create(
+                ReportJob(
+                    report_id=report.id,
+                    organization_id=org_id,
+                    status=JobStatus.QUEUED,
+                    max_attempts=settings.REPORT_MAX_ATTEMPTS,
+                ),
+                commit=False,
+            )
+        await db.commit()
+    if queued:
+        kick(QUEUE)
+        log.info(
+            "Queued %d scheduled reports (%d more due)",
+            len(queued),
+            len(due) - len(queued),
+        )
+    return len(queued)
@@ -0,0 +1,143 @@
+# app/jobs/reports.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from contextlib import suppress
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.models import ReportJob
+from app.processing.queue import wait_for_work
+from app.repositories import (
+    ReportArtifactRepository,
+    ReportJobRepository,
+    ReportRepository,
+)
+from app.services.report import generate_report_file
+from app.storage import get_storage
+from .locks import try_advisory_xact_lock
+
+log = logging.getLogger(__name__)
+
+QUEUE = "reports"
+
+
+async def _set_progress(job: ReportJob, progress: float) -> None:
+    job.progress = progress
+    async with async_session_maker() as db:
+        await ReportJobRepository(db).progress(job.id, progress)
+        await db.commit()
+
+
+async def _heartbeat(job: ReportJob) -> None:
+    """Keep the claim fresh while rendering, so other workers don't take over."""
+    while True:
+        await asyncio.sleep(settings.REPORT_JOB_STALE_S / 3)
+        await _set_progress(job, job.progress)
+
+
+def _retry_in(job: ReportJob) -> dt.timedelta | None:
+    if job.attempts >= job.max_attempts:
+        return None
+    return dt.timedelta(seconds=settings.REPORT_RETRY_BASE_S * 2 ** (job.attempts - 1))
+
+
+async def _fail(job: ReportJob, error: str) -> None:
+    async with async_session_maker() as db:
+        await ReportJobRepository(db).fail(job, error, _retry_in(job))
+        await db.commit()
+
+
+async def run_job(job: ReportJob) -> None:
+    """Generate one claimed job's PDF; failures are retried with backoff."""
+    if job.attempts > job.max_attempts:  # reclaimed after its worker died each time
+        await _fail(job, "Worker stopped responding")
+        return
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        async with async_session_maker() as db:
+            report = await ReportRepository(db).get(job.report_id)
+            db.expunge_all()
+        if report is None:
+            return  # deleted meanwhile (its jobs cascade)
+        await _set_progress(job, 0.1)
+        await generate_report_file(report, lambda p: _set_progress(job, p))
+        async with async_session_maker() as db:
+            await ReportJobRepository(db).finish(job.id)
+            await db.commit()
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back without counting the attempt.
+        with suppress(Exception):
+            async with async_session_maker() as db:
+                await ReportJobRepository(db).requeue(job.id)
+                await db.commit()
+        raise
+    except Exception as exc:
+        log.exception("Report job %s failed (attempt %d)", job.id, job.attempts)
+        await _fail(job, f"{type(exc).__name__}: {exc}")
+    finally:
+        heartbeat.cancel()
+
+
+async def process_report_jobs() -> int:
+    """Claim up to REPORT_CONCURRENCY due jobs and run them concurrently."""
+    stale_before = dt.datetime.now(dt.timezone.utc) - dt.timedelta(
+        seconds=settings.REPORT_JOB_STALE_S
+    )
+    async with async_session_maker() as db:
+        jobs = await ReportJobRepository(db).claim(
+            settings.REPORT_CONCURRENCY, stale_before
+        )
+        db.expunge_all()
+        await db.commit()
+    await asyncio.gather(*(run_job(job) for job in jobs))
+    return len(jobs)
+
+
+async def run_report_worker() -> None:
+    """
+    Long-running loop (one per app process): run due report jobs, then
+    sleep until a new report is queued or REPORT_POLL_S elapses (which
+    also picks up retries whose backoff has passed).
+    """
+    while True:
+        try:
+            while await process_report_jobs():
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Report worker loop failed")
+        await wait_for_work(settings.REPORT_POLL_S, QUEUE)
+
+
+def start_report_worker() -> asyncio.Task:
+    return asyncio.create_task(run_report_worker())
+
+
+async def evict_report_artifacts(batch: int = 100) -> int:
+    """
+    Shrink the report cache back under REPORT_CACHE_MAX_BYTES, least
+    recently used PDFs first. Their reports lose the file and are
+    regenerated when next downloaded. Objects are deleted after the rows
+    commit; every rendering has its own key, so none is ever reused.
+    """
+    evicted = 0
+    while True:
+        async with async_session_maker() as db:
+            if not await try_advisory_xact_lock(db, "jobs.report_cache"):
+                return evicted
+            paths = await ReportArtifactRepository(db).evict(
+                settings.REPORT_CACHE_MAX_BYTES, batch
+            )
+            await db.commit()
+        for path in paths:
+            await get_storage().delete(path)
+        evicted += len(paths)
+        if len(paths) < batch:
+            break
+    if evicted:
+        log.info("Evicted %d cached report PDFs", evicted)
+    return evicted
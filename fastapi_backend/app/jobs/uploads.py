@@ -0,0 +1,59 @@
+# app/jobs/uploads.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.repositories import AssetUploadRepository
+from app.services.asset_upload import discard_upload, staging_dir, staging_lock
+
+log = logging.getLogger(__name__)
+
+
+def _remove_orphans(pending: set[str], older_than: float) -> int:
+    """Delete staging files that no pending upload owns."""
+    removed = 0
+    with suppress(FileNotFoundError):
+        for entry in os.scandir(staging_dir()):
+            stem = entry.name.removesuffix(".part")
+            if stem not in pending and entry.stat().st_mtime < older_than:
+                with suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+                    removed += 1
+    return removed
+
+
+async def reap_abandoned_uploads() -> int:
+    """
+    Abort resumable uploads idle for longer than ASSET_UPLOAD_TTL_H and
+    reclaim their staging files, plus any staging file left without a row.
+    """
+    ttl = dt.timedelta(hours=settings.ASSET_UPLOAD_TTL_H)
+    async with async_session_maker() as db:
+        repo = AssetUploadRepository(db)
+        stale = await repo.list_stale(dt.datetime.now(dt.timezone.utc) - ttl)
+        reaped = 0
+        for upload in stale:
+            staging = None if upload.direct else Path(upload.staging_path)
+            # A chunk still being written (slow client) keeps its upload alive.
+            async with staging_lock(staging, blocking=False) as idle:
+                if idle:
+                    await discard_upload(repo, upload)
+                    reaped += 1
+        await db.commit()
+        pending = {str(upload_id) for upload_id in await repo.pending_ids()}
+    orphans = await asyncio.to_thread(
+        _remove_orphans, pending, time.time() - ttl.total_seconds()
+    )
+    if reaped or orphans:
+        log.info(
+            "Reclaimed %d abandoned uploads, %d orphaned staging files", reaped, orphans
+        )
+    return reaped + orphans
@@ -5,11 +5,28 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.executors import shutdown_process_pool
 from app.core.seeder import seed_core
 from app.db.database import async_session_maker, engine
-from app.db.init import ensure_extensions, create_db_and_tables  # keep create_all for dev only
+from app.db.init import (
+    ensure_extensions,
+    create_db_and_tables,
+)  # keep create_all for dev only
 from app.routes.endpoints import api_router as ap
-from app.helpers.utils import simple_generate_unique_route_id  # adjust import path if needed
+from app.security.clerk import jwks as clerk_jwks
+from app.helpers.utils import (
+    simple_generate_unique_route_id,
+)  # adjust import path if needed
+from app.jobs.blobs import collect_garbage_blobs
+from app.jobs.hotspots import detect_all_hotspots
+from app.jobs.imports import resume_imports, running_imports
+from app.jobs.lifecycle import run_lifecycle
+from app.jobs.periodic import start_periodic, stop_periodic
+from app.jobs.processing import start_processing
+from app.jobs.report_schedule import schedule_reports
+from app.jobs.reports import evict_report_artifacts, start_report_worker
+from app.jobs.uploads import reap_abandoned_uploads
+from app.services.risk import snapshot_risk_states
 
 
 @asynccontextmanager
@@ -26,15 +43,39 @@ async def lifespan(app: FastAPI):
     async with async_session_maker() as db:
         await seed_core(db)
 
+    # Fetch Clerk's signing keys now rather than on the first request (failures are logged)
+    await clerk_jwks.warm()
+
+    jobs = start_periodic(
+        [
+            (settings.RISK_SNAPSHOT_INTERVAL_S, snapshot_risk_states),
+            (settings.HOTSPOT_INTERVAL_S, detect_all_hotspots),
+            (settings.ASSET_UPLOAD_JANITOR_INTERVAL_S, reap_abandoned_uploads),
+            (settings.BLOB_GC_INTERVAL_S, collect_garbage_blobs),
+            (settings.IMPORT_STALE_S, resume_imports),
+            (settings.LIFECYCLE_INTERVAL_S, run_lifecycle),
+            (settings.REPORT_CACHE_EVICT_INTERVAL_S, evict_report_artifacts),
+            (settings.REPORT_SCHEDULE_INTERVAL_S, schedule_reports),
+        ]
+    )
+    jobs.append(start_processing())
+    jobs.append(start_report_worker())
+    await resume_imports()
+
     yield
 
     # ---- SHUTDOWN ----
+    await stop_periodic(jobs + running_imports())
+    await snapshot_risk_states()
+    shutdown_process_pool()
     await engine.dispose()
 
 
 app = FastAPI(
     generate_unique_id_function=simple_generate_unique_route_id,
-    openapi_url=settings.OPENAPI_URL if hasattr(settings, "OPENAPI_URL") else "/openapi.json",
+    openapi_url=settings.OPENAPI_URL
+    if hasattr(settings, "OPENAPI_URL")
+    else "/openapi.json",
     lifespan=lifespan,
 )
 
@@ -2,8 +2,13 @@
 
 from .users.users import User
 from .events import Event
+from .event_rollups import EventRollupDaily, EventRollupHourly
 from .alerts import Alert
 from .assets import Asset
+from .asset_blobs import AssetBlob
+from .asset_uploads import AssetUpload, AssetUploadChunk
+from .asset_imports import AssetImport
+from .asset_lifecycle_policies import AssetLifecyclePolicy
 from .users.organization import Organization
 from .users.user_permission import UserPermission
 from .permissions.permission import Permission
@@ -11,20 +16,37 @@ from .permissions.role_permission import RolePermission
 from .permissions.roles import Role
 from .users.user_roles import UserRole
 from .pipelines import Pipeline
+from .pipeline_segments import PipelineSegment
+from .risk_snapshots import PipelineRiskSnapshot
+from .hotspots import EventHotspot
 from .reports import Report
+from .report_jobs import ReportJob
+from .report_artifacts import ReportArtifact
 
 # …add other models here…
 
 __all__ = [
     "User",
     "Event",
+    "EventRollupHourly",
+    "EventRollupDaily",
     "Alert",
     "Asset",
+    "AssetBlob",
+    "AssetUpload",
+    "AssetUploadChunk",
+    "AssetImport",
+    "AssetLifecyclePolicy",
     "Organization",
     "UserPermission",
     "UserRole",
     "Pipeline",
+    "PipelineSegment",
+    "PipelineRiskSnapshot",
+    "EventHotspot",
     "Report",
+    "ReportJob",
+    "ReportArtifact",
     "RolePermission",
     "Role",
     "Permission",
@@ -2,7 +2,7 @@ from __future__ import annotations
 from sqlalchemy.dialects.postgresql import UUID
 from typing import Optional, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, relationship, mapped_column
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index
 import datetime as dt
 from app.db.base import Base
 
@@ -30,3 +30,8 @@ class Alert(Base):
     )
 
     event: Mapped["Event"] = relationship(back_populates="alerts")  # noqa: F821
+
+    __table_args__ = (
+        # Period scans for reports (alert response times)
+        Index("ix_alerts_org_sent_at", "organization_id", "sent_at"),
+    )
@@ -0,0 +1,29 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, DateTime, Integer, String, Enum as SQLEnum
+from app.db.base import Base
+from app.schemas.enums import StorageTier
+
+
+class AssetBlob(Base):
+    """
+    Content-addressed file bytes, stored once at <root>/<sha256[:2]>/<sha256>
+    and shared by every Asset with identical content. Old blobs may be moved
+    to the cold storage tier under the same key (app.jobs.lifecycle); a
+    failed move is retried with backoff after archive_retry_at.
+    """
+
+    __tablename__ = "asset_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    storage_tier: Mapped[StorageTier] = mapped_column(
+        SQLEnum(StorageTier), nullable=False, default=StorageTier.HOT, index=True
+    )
+    archive_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    archive_retry_at: Mapped[Optional[dt.datetime]] = mapped_column(
+        DateTime(timezone=True)
+    )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Dict, List, Optional
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Enum as SQLEnum
+from app.db.base import Base
+from app.schemas.enums import AssetType, JobStatus
+
+
+class AssetImport(Base):
+    """
+    A bulk import of every file below a server-side directory. Progress
+    counters and per-file errors are updated after each batch.
+    """
+
+    __tablename__ = "asset_imports"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True
+    )
+    directory: Mapped[str] = mapped_column(String(1024), nullable=False)
+    recursive: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # None: inferred per file from its extension
+    asset_type: Mapped[Optional[AssetType]] = mapped_column(SQLEnum(AssetType))
+    asset_metadata: Mapped[Optional[Dict]] = mapped_column(JSONB)
+
+    total_files: Mapped[Optional[int]] = mapped_column(Integer)
+    processed_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    imported_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    errors: Mapped[Optional[List[Dict]]] = mapped_column(JSONB)  # [{"path", "error"}]
+
+    started_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
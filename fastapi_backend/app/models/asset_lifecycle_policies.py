@@ -0,0 +1,25 @@
+from __future__ import annotations
+from typing import Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, ForeignKey, Integer
+from app.db.base import Base
+
+
+class AssetLifecyclePolicy(Base):
+    """
+    How an organization's assets age (app.jobs.lifecycle). Ages count from
+    upload; each step is off while its threshold is None.
+    """
+
+    __tablename__ = "asset_lifecycle_policies"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    recompress_after_days: Mapped[Optional[int]] = mapped_column(Integer)
+    jpeg_quality: Mapped[int] = mapped_column(Integer, nullable=False, default=85)
+    video_crf: Mapped[int] = mapped_column(Integer, nullable=False, default=28)  # x265
+    archive_after_days: Mapped[Optional[int]] = mapped_column(Integer)
+    delete_after_days: Mapped[Optional[int]] = mapped_column(Integer)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Dict, Optional
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    Enum as SQLEnum,
+)
+from app.db.base import Base
+from app.schemas.enums import AssetType, UploadStatus
+
+
+class AssetUpload(Base):
+    """
+    A resumable upload in progress. Chunks are written at fixed offsets into a
+    staging file; the Asset row is only created once every chunk has arrived.
+    """
+
+    __tablename__ = "asset_uploads"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[UploadStatus] = mapped_column(
+        SQLEnum(UploadStatus), nullable=False, default=UploadStatus.PENDING, index=True
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Whole file size for direct uploads and dedup hits, which can exceed int4
+    chunk_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Local staging file, or a storage key for presigned direct uploads
+    staging_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    direct: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    sha256: Mapped[Optional[str]] = mapped_column(
+        String(64)
+    )  # as declared by the client
+
+    # Asset fields, applied on completion
+    asset_type: Mapped[AssetType] = mapped_column(SQLEnum(AssetType), nullable=False)
+    captured_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    footprint_wkt: Mapped[Optional[str]] = mapped_column(Text)
+    asset_metadata: Mapped[Optional[Dict]] = mapped_column(JSONB)
+
+    asset_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("assets.id", ondelete="SET NULL")
+    )
+
+
+class AssetUploadChunk(Base):
+    """One received chunk; the set of rows per upload is its progress."""
+
+    __tablename__ = "asset_upload_chunks"
+
+    upload_id: Mapped[UUID] = mapped_column(
+        ForeignKey("asset_uploads.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    index: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("upload_id", "index", name="uq_asset_upload_chunk_index"),
+    )
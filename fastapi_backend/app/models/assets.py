@@ -1,10 +1,20 @@
 from __future__ import annotations
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from typing import List, Dict, Optional, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, relationship, mapped_column
-from sqlalchemy import String, DateTime, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    String,
+    DateTime,
+    JSON,
+    ForeignKey,
+    BigInteger,
+    Index,
+    Enum as SQLEnum,
+    text,
+)
+from geoalchemy2 import Geometry
 from app.db.base import Base
-from app.schemas.enums import AssetType
+from app.schemas.enums import AssetType, ProcessingStatus
 import datetime as dt
 
 if TYPE_CHECKING:
@@ -20,11 +30,49 @@ class Asset(Base):
     )
     asset_type: Mapped[AssetType] = mapped_column(SQLEnum(AssetType), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    filename: Mapped[Optional[str]] = mapped_column(String(255))
+    blob_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("asset_blobs.id", ondelete="RESTRICT"), index=True
+    )
+    content_sha256: Mapped[Optional[str]] = mapped_column(String(64), index=True)
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger)
     captured_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
-    footprint: Mapped[Optional[str]] = mapped_column(JSON, nullable=True)
-    asset_metadata: Mapped[Optional[Dict]] = mapped_column(JSON)
+    footprint: Mapped[Optional[str]] = mapped_column(
+        Geometry("GEOMETRY", srid=4326, spatial_index=True), nullable=True
+    )
+    asset_metadata: Mapped[Optional[Dict]] = mapped_column(JSONB)
 
-    organization: Mapped["Organization"] = relationship(
-        back_populates="assets"
-    )  # noqa: F821
+    # Post-upload processing (app.jobs.processing)
+    metadata_status: Mapped[Optional[ProcessingStatus]] = mapped_column(
+        SQLEnum(ProcessingStatus), index=True
+    )
+    preview_status: Mapped[Optional[ProcessingStatus]] = mapped_column(
+        SQLEnum(ProcessingStatus), index=True
+    )
+    previews: Mapped[Optional[List[str]]] = mapped_column(JSON)
+    tiles_status: Mapped[Optional[ProcessingStatus]] = mapped_column(
+        SQLEnum(ProcessingStatus), index=True
+    )
+    tiles: Mapped[Optional[Dict]] = mapped_column(JSON)  # Deep Zoom layout
+
+    # Lifecycle recompression was attempted (the result is kept only if smaller)
+    compacted_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+
+    organization: Mapped["Organization"] = relationship(back_populates="assets")  # noqa: F821
     events: Mapped[List["Event"]] = relationship(back_populates="asset")  # noqa: F821
+
+    __table_args__ = (
+        # Metadata filters on GET /assets (app.helpers.json_filter): @> and @?
+        Index(
+            "ix_assets_metadata_gin",
+            "asset_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"asset_metadata": "jsonb_path_ops"},
+        ),
+        # Period scans for reports: capture time, upload time when unknown
+        Index(
+            "ix_assets_org_taken_at",
+            "organization_id",
+            text("coalesce(captured_at, created_at)"),
+        ),
+    )
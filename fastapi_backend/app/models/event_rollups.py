@@ -0,0 +1,64 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    Enum as SQLEnum,
+)
+from app.db.base import Base
+from app.schemas.enums import EventType
+
+
+class EventRollupMixin:
+    """
+    Event counts per (org, pipeline, type, severity, time bucket), kept in
+    step with `events` by app.repositories.EventRollupRepository in the
+    transactions that write events. Rows of deleted organizations cascade
+    away together with their events. A deleted pipeline's events survive
+    (pipeline_id SET NULL), so its counts are moved to the no-pipeline key
+    first (EventRollupRepository.detach_pipeline); the cascade only removes
+    the emptied rows.
+    """
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    pipeline_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("pipelines.id", ondelete="CASCADE")
+    )
+    event_type: Mapped[EventType] = mapped_column(SQLEnum(EventType), nullable=False)
+    severity: Mapped[Optional[int]] = mapped_column(Integer)
+    bucket: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def _rollup_args(table: str) -> tuple:
+    return (
+        # Upsert target; events without pipeline or severity share one row per bucket
+        UniqueConstraint(
+            "organization_id",
+            "pipeline_id",
+            "event_type",
+            "severity",
+            "bucket",
+            name=f"uq_{table}_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index(f"ix_{table}_org_bucket", "organization_id", "bucket"),
+    )
+
+
+class EventRollupHourly(EventRollupMixin, Base):
+    __tablename__ = "event_rollups_hourly"
+    __table_args__ = _rollup_args(__tablename__)
+
+
+class EventRollupDaily(EventRollupMixin, Base):
+    __tablename__ = "event_rollups_daily"
+    __table_args__ = _rollup_args(__tablename__)
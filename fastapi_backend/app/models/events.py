@@ -2,7 +2,8 @@ from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship, mapped_column
-from sqlalchemy import Text, Integer, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Text, Integer, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index
+from geoalchemy2 import Geometry
 from app.db.base import Base
 import datetime as dt
 from app.schemas.enums import EventType
@@ -28,22 +29,29 @@ class Event(Base):
     description: Mapped[Optional[str]] = mapped_column(Text)
 
     location_geojeson: Mapped[Optional[str]] = mapped_column(JSON, nullable=True)
+    # PostGIS point (GiST-indexed) used for bbox filtering and server-side clustering
+    location: Mapped[Optional[str]] = mapped_column(
+        Geometry("POINT", srid=4326, spatial_index=True), nullable=True
+    )
     pipeline_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("pipelines.id", ondelete="SET NULL")
     )
     asset_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("assets.id", ondelete="SET NULL")
     )
+    # Nearest segment of `pipeline_id`, resolved on ingest / re-segmentation
+    segment_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("pipeline_segments.id", ondelete="SET NULL"), index=True
+    )
 
-    organization: Mapped["Organization"] = relationship(
-        back_populates="events"
-    )  # noqa: F821
-    pipeline: Mapped[Optional["Pipeline"]] = relationship(
-        back_populates="events"
-    )  # noqa: F821
-    asset: Mapped[Optional["Asset"]] = relationship(
-        back_populates="events"
-    )  # noqa: F821
+    organization: Mapped["Organization"] = relationship(back_populates="events")  # noqa: F821
+    pipeline: Mapped[Optional["Pipeline"]] = relationship(back_populates="events")  # noqa: F821
+    asset: Mapped[Optional["Asset"]] = relationship(back_populates="events")  # noqa: F821
     alerts: Mapped[List["Alert"]] = relationship(
         back_populates="event", cascade="all, delete-orphan"
     )  # noqa: F821
+
+    __table_args__ = (
+        # Sliding-window scans (hotspots, reports) per organization
+        Index("ix_events_org_detected_at", "organization_id", "detected_at"),
+    )
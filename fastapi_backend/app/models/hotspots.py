@@ -0,0 +1,28 @@
+from __future__ import annotations
+import datetime as dt
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Integer
+from geoalchemy2 import Geometry
+from app.db.base import Base
+
+
+class EventHotspot(Base):
+    """Dense cluster of recent events found by the hotspot job (app.jobs.hotspots)."""
+
+    __tablename__ = "event_hotspots"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    window_start: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    window_end: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_severity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    geom: Mapped[str] = mapped_column(
+        Geometry("POLYGON", srid=4326, spatial_index=True), nullable=False
+    )
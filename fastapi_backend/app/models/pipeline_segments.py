@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, relationship, mapped_column
+from sqlalchemy import Float, ForeignKey, Integer, UniqueConstraint
+from geoalchemy2 import Geometry
+from app.db.base import Base
+
+if TYPE_CHECKING:
+    from app.models.pipelines import Pipeline  # noqa: F401
+
+
+class PipelineSegment(Base):
+    """Fixed-length slice of a pipeline, rebuilt whenever the pipeline geometry changes."""
+
+    __tablename__ = "pipeline_segments"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    pipeline_id: Mapped[UUID] = mapped_column(
+        ForeignKey("pipelines.id", ondelete="CASCADE"), nullable=False
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_km: Mapped[float] = mapped_column(Float, nullable=False)
+    end_km: Mapped[float] = mapped_column(Float, nullable=False)
+    geom: Mapped[str] = mapped_column(
+        Geometry("LINESTRING", srid=4326, spatial_index=True), nullable=False
+    )
+
+    pipeline: Mapped["Pipeline"] = relationship(back_populates="segments")  # noqa: F821
+
+    __table_args__ = (
+        UniqueConstraint("pipeline_id", "seq", name="uq_pipeline_segment_seq"),
+    )
@@ -3,11 +3,13 @@ from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from sqlalchemy import Float, ForeignKey, String, JSON
+from geoalchemy2 import Geometry
 from app.db.base import Base
 from app.models.events import Event  # noqa: F401
 
 if TYPE_CHECKING:
     from app.models.users.organization import Organization  # noqa: F401
+    from app.models.pipeline_segments import PipelineSegment  # noqa: F401
 
 
 class Pipeline(Base):
@@ -21,13 +23,20 @@ class Pipeline(Base):
     )  # store name in JSON or String as needed
     length_km: Mapped[float] = mapped_column(Float, nullable=False)
     geom_geojson: Mapped[Optional[str]] = mapped_column(JSON, nullable=True)
+    geom: Mapped[Optional[str]] = mapped_column(
+        Geometry("GEOMETRY", srid=4326, spatial_index=True), nullable=True
+    )
 
-    organization: Mapped["Organization"] = relationship(
-        back_populates="pipelines"
-    )  # noqa: F821
+    organization: Mapped["Organization"] = relationship(back_populates="pipelines")  # noqa: F821
     events: Mapped[List["Event"]] = relationship(
         back_populates="pipeline", cascade="all, delete-orphan"
     )  # noqa: F821
+    segments: Mapped[List["PipelineSegment"]] = relationship(
+        back_populates="pipeline",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="PipelineSegment.seq",
+    )  # noqa: F821
 
 
 """
@@ -0,0 +1,56 @@
+from __future__ import annotations
+import datetime as dt
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    Enum as SQLEnum,
+)
+from app.db.base import Base
+from app.schemas.enums import ReportFrequency
+
+
+class ReportArtifact(Base):
+    """
+    A rendered report PDF, shared by every report whose content hashes the
+    same (app.services.report). Least recently used artifacts are evicted
+    once the cache outgrows REPORT_CACHE_MAX_BYTES.
+    """
+
+    __tablename__ = "report_artifacts"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    frequency: Mapped[ReportFrequency] = mapped_column(
+        SQLEnum(ReportFrequency), nullable=False
+    )
+    period_start: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    # sha256 of everything the renderer lays out (aggregates, summary, titles)
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    template_version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    file_path: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_used_at: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True), default=dt.datetime.utcnow, nullable=False, index=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id",
+            "frequency",
+            "period_start",
+            "period_end",
+            "content_sha256",
+            "template_version",
+            name="uq_report_artifact_key",
+        ),
+    )
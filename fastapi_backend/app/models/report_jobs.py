@@ -0,0 +1,36 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, Text, Enum as SQLEnum
+from app.db.base import Base
+from app.schemas.enums import JobStatus
+
+
+class ReportJob(Base):
+    """
+    One generation of a report's PDF, claimed by report workers with SKIP
+    LOCKED (app.jobs.reports). Failed attempts are retried with backoff
+    until max_attempts; updated_at is the worker's heartbeat.
+    """
+
+    __tablename__ = "report_jobs"
+
+    report_id: Mapped[UUID] = mapped_column(
+        ForeignKey("reports.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True
+    )
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # 0..1
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    error: Mapped[Optional[str]] = mapped_column(Text)
+
+    started_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship, mapped_column
-from sqlalchemy import String, Text, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Date, String, Text, DateTime, Enum as SQLEnum, ForeignKey
 from app.db.base import Base
 import datetime as dt
 from app.schemas.enums import ReportFrequency
@@ -20,18 +20,11 @@ class Report(Base):
     frequency: Mapped[ReportFrequency] = mapped_column(
         SQLEnum(ReportFrequency), nullable=False
     )
-    period_start: Mapped[dt.date] = mapped_column(
-        DateTime(timezone=False), nullable=False
-    )
-    period_end: Mapped[dt.date] = mapped_column(
-        DateTime(timezone=False), nullable=False
-    )
-    generated_at: Mapped[dt.datetime] = mapped_column(
-        DateTime(timezone=True), default=dt.datetime.utcnow, nullable=False
-    )
-    file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    period_start: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[dt.date] = mapped_column(Date, nullable=False)  # exclusive
+    # Set by the report worker (app.jobs.reports) once the PDF is stored
+    generated_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    file_path: Mapped[Optional[str]] = mapped_column(String(1024))  # storage key
     summary: Mapped[Optional[str]] = mapped_column(Text)
 
-    organization: Mapped["Organization"] = relationship(
-        back_populates="reports"
-    )  # noqa: F821
+    organization: Mapped["Organization"] = relationship(back_populates="reports")  # noqa: F821
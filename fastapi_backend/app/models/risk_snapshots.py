@@ -0,0 +1,24 @@
+from __future__ import annotations
+from typing import Dict, Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Float, ForeignKey, LargeBinary, JSON
+from app.db.base import Base
+
+
+class PipelineRiskSnapshot(Base):
+    """Persisted RiskState of one pipeline (see app.analytics.risk)."""
+
+    __tablename__ = "pipeline_risk_snapshots"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    pipeline_id: Mapped[UUID] = mapped_column(
+        ForeignKey("pipelines.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    t_ref: Mapped[float] = mapped_column(Float, nullable=False)
+    watermark: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    half_life_s: Mapped[float] = mapped_column(Float, nullable=False)
+    scores: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # float64 array
+    recent: Mapped[Optional[Dict[str, float]]] = mapped_column(JSON)
@@ -0,0 +1,4 @@
+"""
+Post-upload asset processing. Modules here hold the pure, picklable worker
+functions run in the "media" process pool; app.jobs.processing drives them.
+"""
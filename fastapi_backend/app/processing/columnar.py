@@ -0,0 +1,125 @@
+"""
+Incremental Arrow IPC / Parquet encoding of query results (data exports).
+
+Rows arrive in batches and each batch is encoded as soon as it comes in:
+one IPC record batch or one Parquet row group. The encoded bytes are handed
+back right away, so memory holds a single batch whatever the export size.
+Requires the optional `pyarrow` dependency.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# format -> (media type, file extension)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _arrow_type(kind: str) -> Any:
+    # Column kinds of export queries (see EventRepository.export_query)
+    return {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }[kind]
+
+
+def _values(kind: str, values: List[Any]) -> List[Any]:
+    # UUIDs and enums become text; numeric (Decimal) from SQL becomes float
+    if kind == "string":
+        return [None if v is None else str(v) for v in values]
+    if kind == "float":
+        return [None if v is None else float(v) for v in values]
+    return values
+
+
+class _Sink:
+    """Write-only file object the pyarrow writers append to; drained per batch."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._written = 0
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._written += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._written
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ColumnarWriter:
+    """
+    Encode batches of row tuples whose columns are `columns` (name, kind).
+    Not thread-safe: feed it from one task (the calls may run in a thread).
+    """
+
+    def __init__(
+        self, fmt: str, columns: Sequence[Tuple[str, str]], compression: str = "zstd"
+    ) -> None:
+        if pa is None:
+            raise RuntimeError(
+                "Columnar export requires the optional 'pyarrow' dependency"
+            )
+        self.kinds = [kind for _, kind in columns]
+        self.schema = pa.schema(
+            [pa.field(name, _arrow_type(kind)) for name, kind in columns]
+        )
+        self._sink = _Sink()
+        if fmt == "arrow":
+            self._ipc = pa.ipc.new_stream(self._sink, self.schema)
+            self._parquet = None
+        elif fmt == "parquet":
+            self._ipc = None
+            self._parquet = pq.ParquetWriter(
+                self._sink, self.schema, compression=compression
+            )
+        else:
+            raise ValueError(f"Unknown export format {fmt!r}")
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode one batch (one row group); returns the bytes produced so far."""
+        if rows:
+            arrays = [
+                pa.array(_values(kind, [row[i] for row in rows]), type=field.type)
+                for i, (kind, field) in enumerate(zip(self.kinds, self.schema))
+            ]
+            batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+            if self._ipc is not None:
+                self._ipc.write_batch(batch)
+            else:
+                self._parquet.write_table(pa.Table.from_batches([batch]))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Finish the stream (end marker / Parquet footer); returns the last bytes."""
+        (self._ipc or self._parquet).close()
+        return self._sink.drain()
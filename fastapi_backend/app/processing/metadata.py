@@ -0,0 +1,433 @@
+"""
+Header-only metadata extraction (runs in the media process pool).
+
+Nothing here decodes pixel data: Pillow parses only the file header on
+open, GeoTIFF georeferencing comes from the TIFF tags (or rasterio when
+installed), and videos are inspected with ffprobe's container probe.
+
+A source is a local path or an http(s) URL (a presigned link to object
+storage). URLs are never downloaded: Pillow reads through ranged GETs of
+the bytes it touches (EXIF segment, TIFF IFDs), while ffprobe and GDAL
+open the URL themselves and issue their own ranged requests.
+
+Each file yields {"captured_at", "footprint_wkt", "metadata"}:
+- captured_at: aware datetime (GPS clock, else EXIF time + offset, else
+  EXIF time taken as UTC)
+- footprint_wkt: WGS84 polygon of a georeferenced raster's bounds, or the
+  camera position as a point for geotagged photos/videos
+- metadata: structured header facts (dimensions, camera, gps, crs, ...)
+"""
+
+from __future__ import annotations
+import datetime as dt
+import io
+import json
+import math
+import re
+import subprocess
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import httpx
+from PIL import ExifTags, Image, UnidentifiedImageError
+from shapely.geometry import Point, box
+
+try:  # optional: georeferencing for every raster format GDAL reads
+    import rasterio
+    from rasterio.warp import transform_bounds
+except ImportError:  # pragma: no cover - depends on the install
+    rasterio = None
+
+# GeoTIFF tags and geokeys (OGC GeoTIFF 1.1)
+MODEL_PIXEL_SCALE = 33550
+MODEL_TIEPOINT = 33922
+GEO_KEY_DIRECTORY = 34735
+GT_RASTER_TYPE = 1025
+GEOGRAPHIC_TYPE = 2048
+PROJECTED_CS_TYPE = 3072
+RASTER_PIXEL_IS_POINT = 2
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+UTM_K0 = 0.9996
+
+# ISO 6709 location as written by phones into video containers: +12.3456-045.6789+010.0/
+ISO6709 = re.compile(r"([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)?/?")
+
+# Bytes fetched per ranged GET; a JPEG's EXIF segment fits in one.
+HEADER_BLOCK = 64 * 1024
+
+
+class _RangeFile(io.RawIOBase):
+    """Read-only, seekable view of a URL; every read is one ranged GET."""
+
+    def __init__(self, url: str, timeout: float = 30.0) -> None:
+        self.url = url
+        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+        self.pos = 0
+        self.size: Optional[int] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            if self.size is None:
+                self._get(0, 0)
+            offset += self.size or 0
+        elif whence == io.SEEK_CUR:
+            offset += self.pos
+        self.pos = max(offset, 0)
+        return self.pos
+
+    def _get(self, start: int, end: int) -> bytes:
+        with self.client.stream(
+            "GET", self.url, headers={"Range": f"bytes={start}-{end}"}
+        ) as res:
+            total = res.headers.get("Content-Range", "").rpartition("/")[2]
+            if total.isdigit():
+                self.size = int(total)
+            if res.status_code == 416:  # at or past the end
+                return b""
+            res.raise_for_status()
+            if res.status_code != 206:  # never stream the whole object
+                raise OSError(f"ranged read refused (HTTP {res.status_code})")
+            return res.read()
+
+    def readinto(self, buffer: Any) -> int:
+        if len(buffer) == 0 or (self.size is not None and self.pos >= self.size):
+            return 0
+        data = self._get(self.pos, self.pos + len(buffer) - 1)
+        buffer[: len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self.client.close()
+        super().close()
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+@contextmanager
+def _header_reader(source: str) -> Iterator[Union[str, io.BufferedReader]]:
+    if not _is_url(source):
+        yield source
+        return
+    with io.BufferedReader(_RangeFile(source), HEADER_BLOCK) as fp:
+        yield fp
+
+
+def _utm_to_lonlat(epsg: int, x: float, y: float) -> Tuple[float, float]:
+    """Inverse transverse Mercator for WGS84 / UTM zones (Snyder 1987, eq. 8-12 ff.)."""
+    zone, south = epsg % 100, epsg // 100 == 327
+    e2 = WGS84_F * (2 - WGS84_F)
+    ep2 = e2 / (1 - e2)
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+    x -= 500_000.0
+    if south:
+        y -= 10_000_000.0
+    mu = (y / UTM_K0) / (WGS84_A * (1 - e2 / 4 - 3 * e2**2 / 64 - 5 * e2**3 / 256))
+    phi1 = (
+        mu
+        + (3 * e1 / 2 - 27 * e1**3 / 32) * math.sin(2 * mu)
+        + (21 * e1**2 / 16 - 55 * e1**4 / 32) * math.sin(4 * mu)
+        + (151 * e1**3 / 96) * math.sin(6 * mu)
+        + (1097 * e1**4 / 512) * math.sin(8 * mu)
+    )
+    sin1, cos1, tan1 = math.sin(phi1), math.cos(phi1), math.tan(phi1)
+    c1, t1 = ep2 * cos1**2, tan1**2
+    n1 = WGS84_A / math.sqrt(1 - e2 * sin1**2)
+    r1 = WGS84_A * (1 - e2) / (1 - e2 * sin1**2) ** 1.5
+    d = x / (n1 * UTM_K0)
+    lat = phi1 - (n1 * tan1 / r1) * (
+        d**2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1**2 - 9 * ep2) * d**4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1**2 - 252 * ep2 - 3 * c1**2) * d**6 / 720
+    )
+    lon = (
+        d
+        - (1 + 2 * t1 + c1) * d**3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1**2 + 8 * ep2 + 24 * t1**2) * d**5 / 120
+    ) / cos1
+    return (zone - 1) * 6 - 180 + 3 + math.degrees(lon), math.degrees(lat)
+
+
+def _to_lonlat(epsg: int, x: float, y: float) -> Optional[Tuple[float, float]]:
+    if epsg in (4326, 4269, 4258):  # WGS84, NAD83, ETRS89: degrees, close enough
+        return x, y
+    if epsg in (3857, 900913):
+        lon = math.degrees(x / WGS84_A)
+        lat = math.degrees(2 * math.atan(math.exp(y / WGS84_A)) - math.pi / 2)
+        return lon, lat
+    if 32601 <= epsg <= 32660 or 32701 <= epsg <= 32760:
+        return _utm_to_lonlat(epsg, x, y)
+    return None
+
+
+def _bounds_footprint(
+    epsg: int, bounds: Tuple[float, float, float, float]
+) -> Optional[str]:
+    minx, miny, maxx, maxy = bounds
+    # Sample the edges, not just corners: projected rectangles bow in lon/lat.
+    steps = [i / 8 for i in range(9)]
+    edge = [(minx + (maxx - minx) * s, miny) for s in steps] + [
+        (minx + (maxx - minx) * s, maxy) for s in steps
+    ]
+    edge += [(minx, miny + (maxy - miny) * s) for s in steps]
+    edge += [(maxx, miny + (maxy - miny) * s) for s in steps]
+    points = [_to_lonlat(epsg, x, y) for x, y in edge]
+    if None in points:
+        return None
+    lons, lats = zip(*points)
+    return box(min(lons), min(lats), max(lons), max(lats)).wkt
+
+
+def _geokeys(raw: Sequence[int]) -> Dict[int, int]:
+    # Header (4 shorts) then entries of (key, location, count, value); only
+    # keys stored inline (location 0) matter here.
+    keys = {}
+    for i in range(4, 4 + 4 * raw[3], 4):
+        key, location, _count, value = raw[i : i + 4]
+        if location == 0:
+            keys[key] = value
+    return keys
+
+
+def _geotiff(img: Image.Image) -> Optional[Dict[str, Any]]:
+    tags = getattr(img, "tag_v2", None)
+    if not tags or MODEL_PIXEL_SCALE not in tags or MODEL_TIEPOINT not in tags:
+        return None
+    sx, sy = tags[MODEL_PIXEL_SCALE][:2]
+    i, j, _k, x, y = tags[MODEL_TIEPOINT][:5]
+    keys = _geokeys(tags.get(GEO_KEY_DIRECTORY) or (0, 0, 0, 0))
+    if keys.get(GT_RASTER_TYPE) == RASTER_PIXEL_IS_POINT:
+        i, j = i - 0.5, j - 0.5  # tiepoint names a pixel centre
+    left, top = x - i * sx, y + j * sy
+    width, height = img.size
+    bounds = (left, top - height * sy, left + width * sx, top)
+    epsg = keys.get(PROJECTED_CS_TYPE) or keys.get(GEOGRAPHIC_TYPE)
+    return {
+        "crs": f"EPSG:{epsg}" if epsg else None,
+        "bounds": list(bounds),
+        "resolution": [sx, sy],
+        "footprint_wkt": _bounds_footprint(epsg, bounds) if epsg else None,
+    }
+
+
+def _rasterio_geo(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        ds = rasterio.open(path)
+    except rasterio.errors.RasterioIOError:
+        return None
+    with ds:
+        if ds.crs is None:
+            return None
+        bounds = tuple(ds.bounds)
+        footprint = box(
+            *transform_bounds(ds.crs, "EPSG:4326", *bounds, densify_pts=21)
+        ).wkt
+        return {
+            "crs": ds.crs.to_string(),
+            "bounds": list(bounds),
+            "resolution": list(ds.res),
+            "bands": ds.count,
+            "dtype": ds.dtypes[0],
+            "footprint_wkt": footprint,
+        }
+
+
+def _ratio(value: Any) -> float:
+    return (
+        float(value[0]) / float(value[1]) if isinstance(value, tuple) else float(value)
+    )
+
+
+def _dms(value: Sequence[Any], ref: Optional[str], negative: str) -> float:
+    degrees = _ratio(value[0]) + _ratio(value[1]) / 60 + _ratio(value[2]) / 3600
+    return -degrees if ref and ref.strip().upper() == negative else degrees
+
+
+def _gps(gps: Dict[int, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        lat = _dms(
+            gps[ExifTags.GPS.GPSLatitude], gps.get(ExifTags.GPS.GPSLatitudeRef), "S"
+        )
+        lon = _dms(
+            gps[ExifTags.GPS.GPSLongitude], gps.get(ExifTags.GPS.GPSLongitudeRef), "W"
+        )
+    except (KeyError, IndexError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or (lat == 0 and lon == 0):
+        return None
+    out: Dict[str, Any] = {"lat": lat, "lon": lon}
+    if ExifTags.GPS.GPSAltitude in gps:
+        alt = _ratio(gps[ExifTags.GPS.GPSAltitude])
+        below = gps.get(ExifTags.GPS.GPSAltitudeRef) in (1, b"\x01")
+        out["alt"] = -alt if below else alt
+    return out
+
+
+def _gps_time(gps: Dict[int, Any]) -> Optional[dt.datetime]:
+    try:
+        day = dt.datetime.strptime(gps[ExifTags.GPS.GPSDateStamp], "%Y:%m:%d")
+        h, m, s = (_ratio(v) for v in gps[ExifTags.GPS.GPSTimeStamp])
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    return day.replace(tzinfo=dt.timezone.utc) + dt.timedelta(
+        hours=h, minutes=m, seconds=s
+    )
+
+
+def _exif_time(exif: Dict[int, Any]) -> Optional[dt.datetime]:
+    raw = exif.get(ExifTags.Base.DateTimeOriginal) or exif.get(ExifTags.Base.DateTime)
+    try:
+        taken = dt.datetime.strptime(str(raw).strip("\x00 "), "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
+    offset = exif.get(ExifTags.Base.OffsetTimeOriginal)
+    if offset:
+        try:
+            return dt.datetime.fromisoformat(
+                f"{taken.isoformat()}{str(offset).strip()}"
+            )
+        except ValueError:
+            pass
+    return taken.replace(tzinfo=dt.timezone.utc)
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", "replace")
+    return value.strip("\x00 ") if isinstance(value, str) else value
+
+
+def _image(source: str) -> Dict[str, Any]:
+    # header only; pixels are never loaded
+    with _header_reader(source) as fp, Image.open(fp) as img:
+        metadata: Dict[str, Any] = {
+            "format": img.format,
+            "width": img.width,
+            "height": img.height,
+        }
+        exif = img.getexif()
+        base = dict(exif)
+        base.update(exif.get_ifd(ExifTags.IFD.Exif))
+        gps_ifd = exif.get_ifd(ExifTags.IFD.GPSInfo)
+        geo = _rasterio_geo(source) if rasterio is not None else _geotiff(img)
+
+    camera = {
+        "make": _clean(base.get(ExifTags.Base.Make)),
+        "model": _clean(base.get(ExifTags.Base.Model)),
+    }
+    if any(camera.values()):
+        metadata["camera"] = camera
+    if ExifTags.Base.FocalLength in base:
+        metadata["focal_length_mm"] = _ratio(base[ExifTags.Base.FocalLength])
+
+    gps = _gps(gps_ifd)
+    footprint = None
+    if gps:
+        metadata["gps"] = gps
+        footprint = Point(gps["lon"], gps["lat"]).wkt
+    if geo:
+        footprint = geo.pop("footprint_wkt") or footprint
+        metadata["geo"] = geo
+    return {
+        "captured_at": _gps_time(gps_ifd) or _exif_time(base),
+        "footprint_wkt": footprint,
+        "metadata": metadata,
+    }
+
+
+def _video(source: str, ffprobe: str) -> Dict[str, Any]:
+    out = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            source,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    probe = json.loads(out.stdout)
+    fmt = probe.get("format", {})
+    tags = {k.lower(): v for k, v in (fmt.get("tags") or {}).items()}
+    metadata: Dict[str, Any] = {"container": fmt.get("format_name")}
+    if fmt.get("duration"):
+        metadata["duration_s"] = float(fmt["duration"])
+    video = next(
+        (s for s in probe.get("streams", []) if s.get("codec_type") == "video"), None
+    )
+    if video:
+        metadata.update(
+            codec=video.get("codec_name"),
+            width=video.get("width"),
+            height=video.get("height"),
+        )
+
+    captured_at = None
+    if tags.get("creation_time"):
+        try:
+            captured_at = dt.datetime.fromisoformat(
+                tags["creation_time"].replace("Z", "+00:00")
+            )
+        except ValueError:
+            pass
+    footprint = None
+    location = tags.get("location") or tags.get("com.apple.quicktime.location.iso6709")
+    match = ISO6709.match(location or "")
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        metadata["gps"] = {"lat": lat, "lon": lon}
+        footprint = Point(lon, lat).wkt
+    return {
+        "captured_at": captured_at,
+        "footprint_wkt": footprint,
+        "metadata": metadata,
+    }
+
+
+def extract_metadata(
+    source: str, is_video: bool, ffprobe: Optional[str] = None
+) -> Dict[str, Any]:
+    if is_video:
+        if not ffprobe:
+            return {"captured_at": None, "footprint_wkt": None, "metadata": {}}
+        return _video(source, ffprobe)
+    return _image(source)
+
+
+def extract_file(
+    source: str, is_video: bool, ffprobe: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    extract_metadata for one pool task: a file that cannot be parsed or
+    fetched yields {"error": ...} instead of raising.
+    """
+    try:
+        return extract_metadata(source, is_video, ffprobe)
+    except (
+        OSError,
+        ValueError,
+        UnidentifiedImageError,
+        httpx.HTTPError,
+        subprocess.SubprocessError,
+        json.JSONDecodeError,
+    ) as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
@@ -0,0 +1,159 @@
+"""
+Preview rendering (runs in the media process pool).
+
+Images: WebP thumbnails at each requested size. JPEGs are decoded at a
+reduced scale (Image.draft) and pyramidal TIFFs from their smallest
+sufficient overview, so even very large photos never decode at full
+resolution. Other rasters that would still decode above the caller's cap
+raise RasterTooLarge instead of being decoded. Videos: a poster frame (plus the same thumbnails rendered from
+it) and a sprite sheet of evenly spaced frames, when ffmpeg is available.
+"""
+
+from __future__ import annotations
+import os
+import subprocess
+from typing import List, Optional, Sequence
+
+from PIL import Image, ImageOps
+
+POSTER = "poster.jpg"
+SPRITE = "sprite.jpg"
+SPRITE_GRID = (5, 5)
+SPRITE_FRAME_WIDTH = 160
+
+
+def thumbnail_name(size: int) -> str:
+    return f"{size}.webp"
+
+
+class RasterTooLarge(ValueError):
+    """The image has no reduced-resolution decode and exceeds the decode cap."""
+
+
+def _seek_overview(img: Image.Image, largest: int) -> None:
+    """On a pyramidal TIFF, select the smallest overview page still >= largest."""
+    if img.format != "TIFF" or getattr(img, "n_frames", 1) < 2:
+        return
+    width, height = img.size
+    best, best_pixels = 0, width * height
+    for page in range(1, img.n_frames):
+        img.seek(page)
+        w, h = img.size
+        # Overviews keep the aspect ratio; other pages are unrelated images.
+        same_shape = abs(w * height - h * width) <= max(width, height)
+        if same_shape and max(w, h) >= largest and w * h < best_pixels:
+            best, best_pixels = page, w * h
+    img.seek(best)
+
+
+def render_image_previews(
+    src: str,
+    out_dir: str,
+    sizes: Sequence[int],
+    max_pixels: int,
+    max_decode_pixels: Optional[int] = None,
+) -> List[str]:
+    """Write one thumbnail per size into out_dir; returns the file names."""
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    largest = max(sizes)
+    with Image.open(src) as img:
+        img.draft("RGB", (largest, largest))  # JPEG: DCT-domain downscale
+        _seek_overview(img, largest)
+        if max_decode_pixels and img.width * img.height > max_decode_pixels:
+            raise RasterTooLarge(
+                f"{img.format} {img.width}x{img.height} would decode at full resolution"
+            )
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGB")
+        names = []
+        # Shrink progressively: each size starts from the previous result.
+        for size in sorted(sizes, reverse=True):
+            img.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            name = thumbnail_name(size)
+            img.save(os.path.join(out_dir, name), "WEBP", quality=80)
+            names.append(name)
+    return names
+
+
+def _duration_s(src: str, ffprobe: Optional[str]) -> Optional[float]:
+    if not ffprobe:
+        return None
+    out = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            src,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    try:
+        return float(out.stdout.strip())
+    except ValueError:
+        return None
+
+
+def render_video_previews(
+    src: str,
+    out_dir: str,
+    sizes: Sequence[int],
+    max_pixels: int,
+    ffmpeg: str,
+    ffprobe: Optional[str] = None,
+) -> List[str]:
+    """Poster frame, thumbnails of it and (if the duration is known) a sprite sheet."""
+    duration = _duration_s(src, ffprobe)
+    poster = os.path.join(out_dir, POSTER)
+    seek = "0" if duration is not None and duration < 2 else "1"
+    subprocess.run(
+        [
+            ffmpeg,
+            "-v",
+            "error",
+            "-y",
+            "-ss",
+            seek,
+            "-i",
+            src,
+            "-frames:v",
+            "1",
+            "-q:v",
+            "3",
+            poster,
+        ],
+        check=True,
+        timeout=300,
+    )
+    names = [POSTER, *render_image_previews(poster, out_dir, sizes, max_pixels)]
+
+    if duration:
+        cols, rows = SPRITE_GRID
+        fps = cols * rows / duration
+        subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-y",
+                "-i",
+                src,
+                "-vf",
+                f"fps={fps:.6f},scale={SPRITE_FRAME_WIDTH}:-2,tile={cols}x{rows}",
+                "-frames:v",
+                "1",
+                "-q:v",
+                "4",
+                os.path.join(out_dir, SPRITE),
+            ],
+            check=True,
+            timeout=1800,
+        )
+        names.append(SPRITE)
+    return names
@@ -0,0 +1,21 @@
+"""Wake-up signals for the in-process work loops (asset processing, reports)."""
+
+from __future__ import annotations
+import asyncio
+from collections import defaultdict
+from typing import DefaultDict
+
+_work: DefaultDict[str, asyncio.Event] = defaultdict(asyncio.Event)
+
+
+def kick(queue: str = "assets") -> None:
+    """New work was committed; process it now instead of at the next poll."""
+    _work[queue].set()
+
+
+async def wait_for_work(timeout: float, queue: str = "assets") -> None:
+    try:
+        await asyncio.wait_for(_work[queue].wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    _work[queue].clear()
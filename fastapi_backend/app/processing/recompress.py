@@ -0,0 +1,67 @@
+"""
+Lifecycle recompression (runs in the media process pool).
+
+JPEGs are re-encoded at the policy quality, PNGs losslessly re-optimized,
+both keeping EXIF and ICC data so captured_at/GPS survive; videos are
+transcoded to H.265 with every other stream (audio, telemetry) copied.
+Callers keep the result only if it is sufficiently smaller.
+"""
+
+from __future__ import annotations
+import subprocess
+from typing import Optional
+
+from PIL import Image
+
+
+def recompress_image(
+    src: str, dest: str, quality: int, max_pixels: int
+) -> Optional[str]:
+    """Write a recompressed copy of `src` to `dest`; returns its format, or None if unsupported."""
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(src) as img:
+        keep = {
+            key: img.info[key]
+            for key in ("exif", "icc_profile", "dpi")
+            if img.info.get(key)
+        }
+        if img.format == "JPEG":
+            img.save(
+                dest, "JPEG", quality=quality, optimize=True, progressive=True, **keep
+            )
+        elif img.format == "PNG":
+            img.save(dest, "PNG", optimize=True, **keep)
+        else:
+            return None
+        return img.format
+
+
+def transcode_video(src: str, dest: str, crf: int, ffmpeg: str) -> None:
+    """H.265 at constant quality `crf` into `dest` (same container as `src`)."""
+    subprocess.run(
+        [
+            ffmpeg,
+            "-v",
+            "error",
+            "-y",
+            "-i",
+            src,
+            "-map",
+            "0",
+            "-map_metadata",
+            "0",
+            "-c",
+            "copy",
+            "-c:v",
+            "libx265",
+            "-crf",
+            str(crf),
+            "-preset",
+            "medium",
+            "-tag:v",
+            "hvc1",
+            dest,
+        ],
+        check=True,
+        timeout=6 * 3600,
+    )
@@ -0,0 +1,118 @@
+"""
+Report PDF rendering (runs in the media process pool).
+
+Pages are laid out on A4 canvases with Pillow and saved as a multi-page
+PDF, so no extra rendering dependency is needed. The input is plain data
+(picklable): a title, subtitle lines, free text and tables.
+
+    {
+        "title": "Weekly report",
+        "subtitle": ["Acme Pipelines", "2024-06-03 - 2024-06-10"],
+        "summary": "optional free text",
+        "sections": [{"heading": "Events by type", "columns": [...], "rows": [[...], ...]}],
+    }
+"""
+
+from __future__ import annotations
+import textwrap
+from typing import Any, Dict, List, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Part of the report cache key (app.services.report): bump on any layout change
+TEMPLATE_VERSION = 1
+
+DPI = 150
+PAGE = (1240, 1754)  # A4 at 150 dpi
+MARGIN = 100
+TITLE, HEADING, BODY = 40, 28, 20
+
+
+class _Pages:
+    def __init__(self) -> None:
+        self.pages: List[Image.Image] = []
+        self.fonts = {
+            size: ImageFont.load_default(size=size) for size in (TITLE, HEADING, BODY)
+        }
+        self._new_page()
+
+    def _new_page(self) -> None:
+        self.page = Image.new("L", PAGE, 255)
+        self.draw = ImageDraw.Draw(self.page)
+        self.pages.append(self.page)
+        self.y = MARGIN
+
+    def _room(self, height: int) -> None:
+        if self.y + height > PAGE[1] - MARGIN:
+            self._new_page()
+
+    def text(
+        self, line: str, size: int = BODY, x: int = MARGIN, gap: float = 1.5
+    ) -> None:
+        self._room(int(size * gap))
+        self.draw.text((x, self.y), line, font=self.fonts[size], fill=0)
+        self.y += int(size * gap)
+
+    def paragraph(self, text: str) -> None:
+        width = int((PAGE[0] - 2 * MARGIN) / (BODY * 0.55))
+        for block in text.splitlines() or [""]:
+            for line in textwrap.wrap(block, width) or [""]:
+                self.text(line)
+
+    def space(self, height: int) -> None:
+        self.y += height
+
+    def table(self, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+        font = self.fonts[BODY]
+        cells = [[str(c) for c in columns]] + [
+            ["" if v is None else str(v) for v in r] for r in rows
+        ]
+        widths = [
+            max(font.getlength(row[i]) for row in cells) + 24
+            for i in range(len(columns))
+        ]
+        scale = min(1.0, (PAGE[0] - 2 * MARGIN) / sum(widths))
+        xs = [MARGIN]
+        for w in widths[:-1]:
+            xs.append(xs[-1] + int(w * scale))
+        header, *body = cells
+        self._room(BODY * 3)
+        self._row(xs, header, bold=True)
+        for row in body:
+            if self.y + BODY * 1.5 > PAGE[1] - MARGIN:
+                self._new_page()
+                self._row(xs, header, bold=True)  # repeat the header on each page
+            self._row(xs, row)
+
+    def _row(self, xs: Sequence[int], row: Sequence[str], bold: bool = False) -> None:
+        for x, value in zip(xs, row):
+            self.draw.text((x, self.y), value, font=self.fonts[BODY], fill=0)
+        self.y += int(BODY * 1.5)
+        if bold:
+            self.draw.line(
+                (MARGIN, self.y - 6, PAGE[0] - MARGIN, self.y - 6), fill=0, width=2
+            )
+
+
+def render_report_pdf(content: Dict[str, Any], out_path: str) -> int:
+    """Write the report to `out_path` as PDF; returns the page count."""
+    doc = _Pages()
+    doc.text(content["title"], TITLE)
+    for line in content.get("subtitle", []):
+        doc.text(line, BODY)
+    if content.get("summary"):
+        doc.space(BODY)
+        doc.paragraph(content["summary"])
+    for section in content.get("sections", []):
+        doc.space(BODY * 2)
+        doc.text(section["heading"], HEADING)
+        if section.get("text"):
+            doc.paragraph(section["text"])
+        if section.get("rows"):
+            doc.table(section["columns"], section["rows"])
+        elif "rows" in section:
+            doc.text("No data for this period.")
+
+    first, *rest = doc.pages
+    first.save(out_path, "PDF", resolution=DPI, save_all=True, append_images=rest)
+    return len(doc.pages)
@@ -0,0 +1,294 @@
+"""
+Deep Zoom tile pyramids (runs in the media process pool).
+
+The pyramid is built one strip of tile rows at a time: each strip of the
+full-resolution raster is cut into tiles and downsampled 2x into a
+disk-backed array (numpy memmap) holding the next level, which is then
+tiled the same way. Only one strip is ever held in memory per level.
+
+Sources are read through rasterio windowed reads (GeoTIFF/COG block by
+block, JPEG/PNG scanline by scanline); the raster is never decoded whole.
+EXIF orientation is applied per strip by reading the matching source
+columns or rows and flipping/transposing them, so tiles match the previews.
+
+Layout (DZI, as consumed by OpenSeadragon and similar viewers):
+    image.dzi
+    image_files/<level>/<col>_<row>.<jpg|png>
+"""
+
+from __future__ import annotations
+import math
+import os
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Protocol
+
+import numpy as np
+from PIL import Image
+
+from .previews import RasterTooLarge
+
+try:  # required for tiling (see pyproject); the rest of the app imports without it
+    import rasterio
+    from rasterio.enums import ColorInterp
+    from rasterio.windows import Window
+except ImportError:  # pragma: no cover - depends on the install
+    rasterio = None
+
+DESCRIPTOR = "image.dzi"
+TILES_DIR = "image_files"
+DZI_NS = "http://schemas.microsoft.com/deepzoom/2008"
+
+ORIENTATION = 0x0112
+_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+
+class Raster(Protocol):
+    width: int
+    height: int
+    bands: int
+
+    def read(self, top: int, bottom: int) -> np.ndarray:
+        """Rows [top, bottom) as a (rows, width, bands) uint8 array."""
+
+
+def _to_uint8(data: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    if data.dtype == np.uint8:
+        return data
+    scale = 255.0 / (hi - lo) if hi > lo else 0.0
+    return np.clip((data.astype(np.float32) - lo) * scale, 0, 255).astype(np.uint8)
+
+
+class _RasterioRaster:
+    def __init__(self, ds: Any) -> None:
+        self.ds = ds
+        self.width, self.height = ds.width, ds.height
+        self.indexes = [1, 2, 3] if ds.count >= 3 else [1]
+        alpha = len(self.indexes)  # gray+alpha or RGB+alpha
+        if ds.count > alpha and ds.colorinterp[alpha] == ColorInterp.alpha:
+            self.indexes.append(alpha + 1)
+        self.bands = len(self.indexes)
+        self.range = None
+        if ds.dtypes[0] != "uint8":
+            # Stretch over the range of a decimated read, identical for every strip.
+            sample = ds.read(
+                self.indexes,
+                out_shape=(self.bands, min(self.height, 1024), min(self.width, 1024)),
+                masked=True,
+            )
+            self.range = (float(sample.min()), float(sample.max()))
+
+    def read_window(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        data = self.ds.read(self.indexes, window=Window(left, top, width, height))
+        data = np.moveaxis(data, 0, -1)
+        if self.range is not None:
+            data = _to_uint8(data, *self.range)
+        return data
+
+    def read(self, top: int, bottom: int) -> np.ndarray:
+        return self.read_window(0, top, self.width, bottom - top)
+
+
+class _ArrayRaster:
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+        self.height, self.width, self.bands = array.shape
+
+    def read_window(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        return np.asarray(self.array[top : top + height, left : left + width])
+
+    def read(self, top: int, bottom: int) -> np.ndarray:
+        return np.asarray(self.array[top:bottom])
+
+
+class _OrientedRaster:
+    """
+    An EXIF-oriented view of a raster: output rows [top, bottom) come from
+    the matching source rows (orientations 2-4) or columns (5-8).
+    """
+
+    def __init__(self, base: Any, orientation: int) -> None:
+        self.base = base
+        self.orientation = orientation
+        self.bands = base.bands
+        if orientation >= 5:
+            self.width, self.height = base.height, base.width
+        else:
+            self.width, self.height = base.width, base.height
+
+    def read(self, top: int, bottom: int) -> np.ndarray:
+        return np.ascontiguousarray(self._read(top, bottom))
+
+    def _read(self, top: int, bottom: int) -> np.ndarray:
+        b, o = self.base, self.orientation
+        if o in (3, 4):
+            data = b.read_window(0, b.height - bottom, b.width, bottom - top)[::-1]
+            return data[:, ::-1] if o == 3 else data
+        if o in (5, 6):
+            data = b.read_window(top, 0, bottom - top, b.height)
+            return data.swapaxes(0, 1) if o == 5 else np.rot90(data, -1)
+        if o in (7, 8):
+            data = b.read_window(b.width - bottom, 0, bottom - top, b.height)
+            return data[::-1, ::-1].swapaxes(0, 1) if o == 7 else np.rot90(data, 1)
+        data = b.read_window(0, top, b.width, bottom - top)
+        return data[:, ::-1] if o == 2 else data
+
+
+def _orientation(src: str) -> int:
+    """EXIF orientation tag of `src` (header only; 1 when absent or not an image Pillow knows)."""
+    try:
+        with Image.open(src) as img:
+            orientation = img.getexif().get(ORIENTATION, 1)
+    except (OSError, Image.DecompressionBombError):
+        return 1
+    return orientation if orientation in range(1, 9) else 1
+
+
+@contextmanager
+def open_raster(src: str, max_pixels: int) -> Iterator[Raster]:
+    """
+    Open `src` for windowed reads. Raises RasterTooLarge above `max_pixels`
+    (the pyramid levels are staged on disk at full size).
+    """
+    if rasterio is None:
+        raise RuntimeError("rasterio is required to build tile pyramids")
+    with rasterio.open(src) as ds:
+        if ds.width * ds.height > max_pixels:
+            raise RasterTooLarge(f"{ds.width}x{ds.height} exceeds {max_pixels} pixels")
+        raster = _RasterioRaster(ds)
+        orientation = _orientation(src)
+        yield raster if orientation == 1 else _OrientedRaster(raster, orientation)
+
+
+def _halve(strip: np.ndarray) -> np.ndarray:
+    """2x box downsample; odd edges are padded by repeating the last row/column."""
+    rows, cols, _ = strip.shape
+    if rows % 2 or cols % 2:
+        strip = np.pad(strip, ((0, rows % 2), (0, cols % 2), (0, 0)), mode="edge")
+    r, c, b = strip.shape
+    total = strip.reshape(r // 2, 2, c // 2, 2, b).sum(axis=(1, 3), dtype=np.uint16)
+    return ((total + 2) // 4).astype(np.uint8)
+
+
+def _save_tile(tile: np.ndarray, path: str, fmt: str) -> None:
+    mode = _MODES[tile.shape[2]]
+    img = Image.fromarray(tile[:, :, 0] if mode == "L" else tile, mode)
+    if fmt == "jpg":
+        img.save(path, "JPEG", quality=85)
+    else:
+        img.save(path, "PNG", compress_level=3)
+
+
+def level_count(width: int, height: int) -> int:
+    return math.ceil(math.log2(max(width, height))) + 1
+
+
+def render_deepzoom(
+    src: str,
+    out_dir: str,
+    tile_size: int,
+    overlap: int,
+    min_dimension: int,
+    max_pixels: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Write a DZI pyramid for `src` into out_dir and return its layout, or
+    None if the raster is smaller than `min_dimension` on both sides
+    (previews already cover it).
+    """
+    with open_raster(src, max_pixels) as raster:
+        return build_deepzoom(raster, out_dir, tile_size, overlap, min_dimension)
+
+
+def build_deepzoom(
+    raster: Raster, out_dir: str, tile_size: int, overlap: int, min_dimension: int
+) -> Optional[Dict[str, Any]]:
+    """render_deepzoom for an opened raster."""
+    if tile_size % 2:
+        raise ValueError("tile_size must be even")
+    width, height, bands = raster.width, raster.height, raster.bands
+    if max(width, height) < min_dimension:
+        return None
+    fmt = "png" if bands in (2, 4) else "jpg"  # keep transparency (nodata edges)
+    top_level = level_count(width, height) - 1
+
+    level, source = top_level, raster
+    level_file: Optional[str] = None
+    while True:
+        level_dir = os.path.join(out_dir, TILES_DIR, str(level))
+        os.makedirs(level_dir, exist_ok=True)
+        lw, lh = source.width, source.height
+        next_file = os.path.join(out_dir, f".level-{level - 1}.npy")
+        half = (
+            np.lib.format.open_memmap(
+                next_file,
+                mode="w+",
+                dtype=np.uint8,
+                shape=((lh + 1) // 2, (lw + 1) // 2, bands),
+            )
+            if level > 0
+            else None
+        )
+        for row, y0 in enumerate(range(0, lh, tile_size)):
+            top, bottom = max(y0 - overlap, 0), min(y0 + tile_size + overlap, lh)
+            strip = source.read(top, bottom)
+            for col, x0 in enumerate(range(0, lw, tile_size)):
+                left, right = max(x0 - overlap, 0), min(x0 + tile_size + overlap, lw)
+                _save_tile(
+                    strip[:, left:right],
+                    os.path.join(level_dir, f"{col}_{row}.{fmt}"),
+                    fmt,
+                )
+            if half is not None:
+                core = _halve(strip[y0 - top : y0 - top + min(tile_size, lh - y0)])
+                half[y0 // 2 : y0 // 2 + core.shape[0]] = core
+        if level_file is not None:
+            del source
+            os.unlink(level_file)
+        if half is None:
+            break
+        half.flush()
+        level, source, level_file = level - 1, _ArrayRaster(half), next_file
+
+    write_descriptor(
+        os.path.join(out_dir, DESCRIPTOR), width, height, tile_size, overlap, fmt
+    )
+    return {
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "overlap": overlap,
+        "format": fmt,
+        "levels": top_level + 1,
+    }
+
+
+def write_descriptor(
+    path: str, width: int, height: int, tile_size: int, overlap: int, fmt: str
+) -> None:
+    image = ET.Element(
+        "Image",
+        {
+            "xmlns": DZI_NS,
+            "Format": fmt,
+            "Overlap": str(overlap),
+            "TileSize": str(tile_size),
+        },
+    )
+    ET.SubElement(image, "Size", {"Width": str(width), "Height": str(height)})
+    ET.ElementTree(image).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def read_descriptor(data: bytes) -> Dict[str, Any]:
+    """Layout (as returned by render_deepzoom) of a stored DZI descriptor."""
+    image = ET.fromstring(data)
+    size = image.find(f"{{{DZI_NS}}}Size")
+    width, height = int(size.get("Width")), int(size.get("Height"))
+    return {
+        "width": width,
+        "height": height,
+        "tile_size": int(image.get("TileSize")),
+        "overlap": int(image.get("Overlap")),
+        "format": image.get("Format"),
+        "levels": level_count(width, height),
+    }
@@ -6,9 +6,18 @@ from .role import RoleRepository
 from .user import UserRepository
 from .pipeline import PipelineRepository
 from .asset import AssetRepository
+from .asset_upload import AssetUploadRepository
+from .asset_import import AssetImportRepository
+from .asset_lifecycle_policy import AssetLifecyclePolicyRepository
+from .blob import BlobRepository
 from .event import EventRepository
+from .event_rollup import EventRollupRepository
 from .alert import AlertRepository
 from .report import ReportRepository
+from .report_job import ReportJobRepository
+from .report_artifact import ReportArtifactRepository
+from .risk import RiskSnapshotRepository
+from .hotspot import HotspotRepository
 
 __all__ = [
     "OrganizationRepository",
@@ -17,7 +26,16 @@ __all__ = [
     "UserRepository",
     "PipelineRepository",
     "AssetRepository",
+    "AssetUploadRepository",
+    "AssetImportRepository",
+    "AssetLifecyclePolicyRepository",
+    "BlobRepository",
     "EventRepository",
+    "EventRollupRepository",
     "AlertRepository",
     "ReportRepository",
+    "ReportJobRepository",
+    "ReportArtifactRepository",
+    "RiskSnapshotRepository",
+    "HotspotRepository",
 ]
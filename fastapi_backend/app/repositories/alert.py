@@ -1,8 +1,63 @@
 from __future__ import annotations
-from app.models import Alert
+import datetime as dt
+from typing import Collection, Dict, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import Select, func, select
+from sqlalchemy.sql import ColumnElement
+from app.models import Alert, Event
+from app.schemas.enums import EventType
 from .base import AsyncRepository
+from .event import EXPORT_COLUMNS as EVENT_EXPORT_COLUMNS, export_joins
 from .mixins import OrgFilterMixin
 
+# Data export columns (see app.repositories.event.EXPORT_COLUMNS); alerts
+# carry their event's attributes, and through it its pipeline and asset.
+EXPORT_COLUMNS: Dict[str, Tuple[ColumnElement, str, Optional[str]]] = {
+    "id": (Alert.id, "string", None),
+    "organization_id": (Alert.organization_id, "string", None),
+    "sent_at": (Alert.sent_at, "timestamp", None),
+    "acknowledged_at": (Alert.acknowledged_at, "timestamp", None),
+    "ack_latency_s": (
+        func.extract("epoch", Alert.acknowledged_at - Alert.sent_at),
+        "float",
+        None,
+    ),
+    "recipient_user_id": (Alert.recipient_user_id, "string", None),
+    "event_id": (Alert.event_id, "string", None),
+    **{
+        name: column
+        for name, column in EVENT_EXPORT_COLUMNS.items()
+        if name not in ("id", "organization_id", "description")
+    },
+}
+
 
 class AlertRepository(OrgFilterMixin, AsyncRepository[Alert]):
     model = Alert
+
+    @staticmethod
+    def export_query(
+        columns: Sequence[str],
+        org_id: Optional[UUID],
+        start: Optional[dt.datetime],
+        end: Optional[dt.datetime],
+        event_types: Optional[Collection[EventType]],
+    ) -> Select:
+        """Alerts sent in [start, end) with the EXPORT_COLUMNS `columns`, oldest first."""
+        selected = [EXPORT_COLUMNS[name] for name in columns]
+        stmt = select(
+            *(expr.label(name) for name, (expr, _, _) in zip(columns, selected))
+        )
+        stmt = export_joins(
+            stmt.select_from(Alert).join(Event, Event.id == Alert.event_id),
+            {join for _, _, join in selected},
+        )
+        if org_id is not None:
+            stmt = stmt.where(Alert.organization_id == org_id)
+        if start is not None:
+            stmt = stmt.where(Alert.sent_at >= start)
+        if end is not None:
+            stmt = stmt.where(Alert.sent_at < end)
+        if event_types:
+            stmt = stmt.where(Event.event_type.in_(event_types))
+        return stmt.order_by(Alert.sent_at)
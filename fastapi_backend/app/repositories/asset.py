@@ -1,8 +1,227 @@
 from __future__ import annotations
-from app.models import Asset
+import datetime as dt
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+from sqlalchemy import Float, and_, column, delete, or_, select, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement, Select
+from app.models import Asset, AssetBlob, AssetLifecyclePolicy, Pipeline
+from app.schemas.enums import AssetType, ProcessingStatus, StorageTier
 from .base import AsyncRepository
 from .mixins import OrgFilterMixin
 
+Policy = AssetLifecyclePolicy
+
+
+def older_than(days: Any) -> ColumnElement:
+    """Asset uploaded more than `days` (a policy column) ago."""
+    return Asset.created_at < func.now() - func.make_interval(0, 0, 0, days)
+
+
+def settled() -> ColumnElement:
+    """No processing stage is waiting on or reading the asset's current blob."""
+    busy = (ProcessingStatus.PENDING, ProcessingStatus.PROCESSING)
+    return and_(
+        *(
+            or_(col.is_(None), col.not_in(busy))
+            for col in (Asset.metadata_status, Asset.preview_status, Asset.tiles_status)
+        )
+    )
+
 
 class AssetRepository(OrgFilterMixin, AsyncRepository[Asset]):
     model = Asset
+
+    def _near_pipelines(
+        self,
+        stmt: Select,
+        within_deg: Dict[UUID, float],
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> Select:
+        """
+        Restrict `stmt` to footprints of each pipeline's organization captured
+        in [start, end) within that pipeline's own distance (degrees).
+        """
+        near = values(
+            column("pipeline_id", PG_UUID(as_uuid=True)),
+            column("within_deg", Float),
+            name="near",
+        ).data(list(within_deg.items()))
+        return (
+            stmt.select_from(Asset)
+            .join(Pipeline, Pipeline.organization_id == Asset.organization_id)
+            .join(near, near.c.pipeline_id == Pipeline.id)
+            .where(
+                Asset.footprint.is_not(None),
+                Asset.captured_at >= start,
+                Asset.captured_at < end,
+                func.ST_DWithin(Asset.footprint, Pipeline.geom, near.c.within_deg),
+            )
+        )
+
+    async def footprint_versions(
+        self,
+        within_deg: Dict[UUID, float],
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> Dict[UUID, Tuple[int, Any]]:
+        """
+        Cheap fingerprint (count, max updated_at) of the footprints near each
+        pipeline, in one grouped query; pipelines with none get (0, None).
+        """
+        if not within_deg:
+            return {}
+        stmt = self._near_pipelines(
+            select(Pipeline.id, func.count(), func.max(Asset.updated_at)),
+            within_deg,
+            start,
+            end,
+        ).group_by(Pipeline.id)
+        versions: Dict[UUID, Tuple[int, Any]] = dict.fromkeys(within_deg, (0, None))
+        for pipeline_id, count, last_updated in await self.db.execute(stmt):
+            versions[pipeline_id] = (count, last_updated)
+        return versions
+
+    async def footprints_near(
+        self,
+        within_deg: Dict[UUID, float],
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> Dict[UUID, List[bytes]]:
+        """WKB footprints near each pipeline (see footprint_versions), in one query."""
+        footprints: Dict[UUID, List[bytes]] = {
+            pipeline_id: [] for pipeline_id in within_deg
+        }
+        if not within_deg:
+            return footprints
+        stmt = self._near_pipelines(
+            select(Pipeline.id, func.ST_AsBinary(Asset.footprint)),
+            within_deg,
+            start,
+            end,
+        )
+        for pipeline_id, wkb in await self.db.execute(stmt):
+            footprints[pipeline_id].append(bytes(wkb))
+        return footprints
+
+    async def claim_pending(
+        self,
+        status_col: InstrumentedAttribute,
+        limit: int,
+    ) -> List[Asset]:
+        """
+        Move up to `limit` assets from PENDING to PROCESSING in `status_col`
+        and return them. SKIP LOCKED lets several workers claim concurrently
+        without ever taking the same asset. The caller commits.
+        """
+        pending = (
+            select(Asset.id)
+            .where(status_col == ProcessingStatus.PENDING)
+            .order_by(Asset.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = await self.db.scalars(
+            update(Asset)
+            .where(Asset.id.in_(pending.scalar_subquery()))
+            .values(
+                {status_col: ProcessingStatus.PROCESSING, Asset.updated_at: func.now()}
+            )
+            .returning(Asset.id)
+        )
+        ids = list(claimed)
+        if not ids:
+            return []
+        return list(await self.db.scalars(select(Asset).where(Asset.id.in_(ids))))
+
+    async def requeue_stale(
+        self, status_col: InstrumentedAttribute, before: dt.datetime
+    ) -> None:
+        """Hand work claimed by a worker that died back to the queue."""
+        await self.db.execute(
+            update(Asset)
+            .where(status_col == ProcessingStatus.PROCESSING, Asset.updated_at < before)
+            .values({status_col: ProcessingStatus.PENDING})
+        )
+
+    async def set_values(self, asset_id: UUID, values: Dict[Any, Any]) -> None:
+        await self.db.execute(
+            update(Asset)
+            .where(Asset.id == asset_id)
+            .values({**values, Asset.updated_at: func.now()})
+        )
+
+    async def existing_hashes(self, org_id: UUID, hashes: Iterable[str]) -> Set[str]:
+        """Which of `hashes` the organization already has an asset for."""
+        hashes = list(hashes)
+        if not hashes:
+            return set()
+        stmt = select(Asset.content_sha256).where(
+            Asset.organization_id == org_id,
+            Asset.content_sha256.in_(hashes),
+        )
+        return set(await self.db.scalars(stmt))
+
+    async def delete_expired(self, limit: int) -> List[Tuple[UUID, Optional[UUID]]]:
+        """
+        Delete up to `limit` assets past their organization's retention;
+        returns (asset id, blob id) pairs so the caller can release the
+        blobs in the same transaction. The caller commits.
+        """
+        expired = (
+            select(Asset.id)
+            .join(Policy, Policy.organization_id == Asset.organization_id)
+            .where(
+                Policy.enabled,
+                Policy.delete_after_days.is_not(None),
+                older_than(Policy.delete_after_days),
+            )
+            .order_by(Asset.created_at)
+            .limit(limit)
+            .with_for_update(of=Asset, skip_locked=True)
+        )
+        rows = await self.db.execute(
+            delete(Asset)
+            .where(Asset.id.in_(expired.scalar_subquery()))
+            .returning(Asset.id, Asset.blob_id)
+        )
+        return [(asset_id, blob_id) for asset_id, blob_id in rows]
+
+    async def recompress_candidates(
+        self,
+        limit: int,
+        types: Sequence[AssetType],
+    ) -> List[Tuple[Asset, Policy]]:
+        """Hot assets of `types` old enough to be recompressed under their organization's policy."""
+        stmt = (
+            select(Asset, Policy)
+            .join(Policy, Policy.organization_id == Asset.organization_id)
+            .join(AssetBlob, AssetBlob.id == Asset.blob_id)
+            .where(
+                Policy.enabled,
+                Policy.recompress_after_days.is_not(None),
+                older_than(Policy.recompress_after_days),
+                Asset.compacted_at.is_(None),
+                Asset.asset_type.in_(types),
+                AssetBlob.storage_tier == StorageTier.HOT,
+                settled(),
+            )
+            .order_by(Asset.created_at)
+            .limit(limit)
+        )
+        return [(asset, policy) for asset, policy in await self.db.execute(stmt)]
+
+    async def lock_blob_ref(self, asset_id: UUID, blob_id: UUID) -> Optional[Asset]:
+        """The asset, row-locked, if it still points at `blob_id` and is not compacted."""
+        stmt = (
+            select(Asset)
+            .where(
+                Asset.id == asset_id,
+                Asset.blob_id == blob_id,
+                Asset.compacted_at.is_(None),
+            )
+            .with_for_update()
+        )
+        return await self.db.scalar(stmt)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List
+from uuid import UUID
+from sqlalchemy import and_, func, or_, select, update
+from app.models import AssetImport
+from app.schemas.enums import JobStatus
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+
+def _claimable(stale_before: dt.datetime):
+    # Queued, or running without progress since stale_before (its process died)
+    return or_(
+        AssetImport.status == JobStatus.QUEUED,
+        and_(
+            AssetImport.status == JobStatus.RUNNING,
+            AssetImport.updated_at < stale_before,
+        ),
+    )
+
+
+class AssetImportRepository(OrgFilterMixin, AsyncRepository[AssetImport]):
+    model = AssetImport
+
+    async def claim(self, import_id: UUID, stale_before: dt.datetime) -> bool:
+        """
+        Atomically mark the import RUNNING for this process; False if another
+        process holds it or it has finished. The caller commits.
+        """
+        claimed = await self.db.scalar(
+            update(AssetImport)
+            .where(AssetImport.id == import_id, _claimable(stale_before))
+            .values(status=JobStatus.RUNNING, updated_at=func.now())
+            .returning(AssetImport.id)
+        )
+        return claimed is not None
+
+    async def touch(self, import_id: UUID) -> None:
+        await self.db.execute(
+            update(AssetImport)
+            .where(AssetImport.id == import_id)
+            .values(updated_at=func.now())
+        )
+
+    async def requeue(self, import_id: UUID) -> None:
+        await self.db.execute(
+            update(AssetImport)
+            .where(AssetImport.id == import_id, AssetImport.status == JobStatus.RUNNING)
+            .values(status=JobStatus.QUEUED)
+        )
+
+    async def claimable_ids(self, stale_before: dt.datetime) -> List[UUID]:
+        """Imports waiting for a process to run them, oldest first."""
+        stmt = (
+            select(AssetImport.id)
+            .where(_claimable(stale_before))
+            .order_by(AssetImport.created_at)
+        )
+        return list(await self.db.scalars(stmt))
@@ -0,0 +1,16 @@
+from __future__ import annotations
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select
+from app.models import AssetLifecyclePolicy
+from .base import AsyncRepository
+
+
+class AssetLifecyclePolicyRepository(AsyncRepository[AssetLifecyclePolicy]):
+    model = AssetLifecyclePolicy
+
+    async def get_for_org(self, org_id: UUID) -> Optional[AssetLifecyclePolicy]:
+        stmt = select(AssetLifecyclePolicy).where(
+            AssetLifecyclePolicy.organization_id == org_id
+        )
+        return await self.db.scalar(stmt)
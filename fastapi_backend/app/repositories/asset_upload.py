@@ -0,0 +1,83 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models import AssetUpload, AssetUploadChunk
+from app.schemas.enums import UploadStatus
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+
+class AssetUploadRepository(OrgFilterMixin, AsyncRepository[AssetUpload]):
+    model = AssetUpload
+
+    async def get_for_update(self, upload_id: UUID) -> Optional[AssetUpload]:
+        """Lock the upload row so concurrent completes/aborts serialize."""
+        stmt = (
+            select(AssetUpload)
+            .where(AssetUpload.id == upload_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return await self.db.scalar(stmt)
+
+    async def get_status(self, upload_id: UUID) -> Optional[UploadStatus]:
+        return await self.db.scalar(
+            select(AssetUpload.status).where(AssetUpload.id == upload_id)
+        )
+
+    async def record_chunk(
+        self,
+        upload_id: UUID,
+        index: int,
+        size: int,
+        *,
+        commit: bool = True,
+    ) -> None:
+        """Mark a chunk received (idempotent) and touch the upload's updated_at."""
+        await self.db.execute(
+            insert(AssetUploadChunk)
+            .values(upload_id=upload_id, index=index, size=size)
+            .on_conflict_do_nothing(constraint="uq_asset_upload_chunk_index")
+        )
+        await self.db.execute(
+            update(AssetUpload)
+            .where(AssetUpload.id == upload_id)
+            .values(updated_at=func.now())
+        )
+        if commit:
+            await self.db.commit()
+
+    async def received_chunks(self, upload_id: UUID) -> List[int]:
+        stmt = (
+            select(AssetUploadChunk.index)
+            .where(AssetUploadChunk.upload_id == upload_id)
+            .order_by(AssetUploadChunk.index)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def delete_chunks(self, upload_id: UUID, *, commit: bool = True) -> None:
+        await self.db.execute(
+            delete(AssetUploadChunk).where(AssetUploadChunk.upload_id == upload_id)
+        )
+        if commit:
+            await self.db.commit()
+
+    async def list_stale(self, idle_before: dt.datetime) -> List[AssetUpload]:
+        """Pending uploads with no chunk activity since `idle_before`, locked."""
+        stmt = (
+            select(AssetUpload)
+            .where(
+                AssetUpload.status == UploadStatus.PENDING,
+                AssetUpload.updated_at < idle_before,
+            )
+            # Locked, so its caller can discard them; skips uploads being completed
+            .with_for_update(skip_locked=True)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def pending_ids(self) -> List[UUID]:
+        stmt = select(AssetUpload.id).where(AssetUpload.status == UploadStatus.PENDING)
+        return list(await self.db.scalars(stmt))
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import and_, delete, exists, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models import Asset, AssetBlob, AssetLifecyclePolicy as Policy
+from app.schemas.enums import AssetType, StorageTier
+from .asset import older_than, settled
+from .base import AsyncRepository
+
+
+class BlobRepository(AsyncRepository[AssetBlob]):
+    """Content-addressed blobs are shared across organizations (no org filter)."""
+
+    model = AssetBlob
+
+    async def acquire(self, sha256: str, size: int) -> Tuple[UUID, bool]:
+        """
+        Take a reference on the blob for `sha256`, creating its row if needed.
+        Returns (blob id, created). Concurrent acquires of the same hash
+        serialize on the row, so exactly one caller sees created=True.
+        """
+        stmt = insert(AssetBlob).values(sha256=sha256, size_bytes=size, ref_count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AssetBlob.sha256],
+            set_={"ref_count": AssetBlob.ref_count + 1, "updated_at": func.now()},
+        ).returning(AssetBlob.id, literal_column("xmax = 0"))
+        blob_id, created = (await self.db.execute(stmt)).one()
+        return blob_id, created
+
+    async def release(self, blob_id: UUID, *, commit: bool = True) -> None:
+        """Drop one reference; the blob is reclaimed by GC once unreferenced."""
+        await self.db.execute(
+            update(AssetBlob)
+            .where(AssetBlob.id == blob_id, AssetBlob.ref_count > 0)
+            .values(ref_count=AssetBlob.ref_count - 1, updated_at=func.now())
+        )
+        if commit:
+            await self.db.commit()
+
+    async def find_in_org(self, org_id: UUID, sha256: str) -> Optional[AssetBlob]:
+        """The blob for `sha256`, only if `org_id` already owns an asset with it."""
+        stmt = (
+            select(AssetBlob)
+            .join(Asset, Asset.blob_id == AssetBlob.id)
+            .where(Asset.organization_id == org_id, AssetBlob.sha256 == sha256)
+            .limit(1)
+        )
+        return await self.db.scalar(stmt)
+
+    async def reconcile_ref_counts(self) -> None:
+        """Recompute ref_count from assets (repairs drift from cascaded deletes)."""
+        refs = (
+            select(func.count())
+            .where(Asset.blob_id == AssetBlob.id)
+            .correlate(AssetBlob)
+            .scalar_subquery()
+        )
+        await self.db.execute(
+            update(AssetBlob)
+            .where(AssetBlob.ref_count != refs)
+            .values(ref_count=refs, updated_at=func.now())
+        )
+
+    async def delete_unreferenced(self, idle_before: dt.datetime) -> List[str]:
+        """Delete blobs unreferenced since `idle_before`; returns their hashes."""
+        stmt = (
+            delete(AssetBlob)
+            .where(AssetBlob.ref_count == 0, AssetBlob.updated_at < idle_before)
+            .returning(AssetBlob.sha256)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def archive_candidates(
+        self,
+        limit: int,
+        recompressed_types: Sequence[AssetType],
+    ) -> List[AssetBlob]:
+        """
+        Hot blobs every referencing asset of which is past its organization's
+        archive age (and recompressed first, for `recompressed_types`). Blobs
+        shared with an organization without such a policy stay hot, and blobs
+        whose last move failed wait out their backoff.
+        """
+        references = select(Asset.id).where(Asset.blob_id == AssetBlob.id)
+        keep_hot = references.outerjoin(
+            Policy, Policy.organization_id == Asset.organization_id
+        ).where(
+            or_(
+                Policy.id.is_(None),
+                Policy.enabled.is_(False),
+                Policy.archive_after_days.is_(None),
+                ~older_than(Policy.archive_after_days),
+                ~settled(),
+                # recompress first, while the blob is still on fast storage
+                and_(
+                    Policy.recompress_after_days.is_not(None),
+                    Asset.compacted_at.is_(None),
+                    Asset.asset_type.in_(recompressed_types),
+                ),
+            )
+        )
+        stmt = (
+            select(AssetBlob)
+            .where(
+                AssetBlob.storage_tier == StorageTier.HOT,
+                or_(
+                    AssetBlob.archive_retry_at.is_(None),
+                    AssetBlob.archive_retry_at <= func.now(),
+                ),
+                exists(references.correlate(AssetBlob)),
+                ~exists(keep_hot.correlate(AssetBlob)),
+            )
+            .order_by(AssetBlob.created_at)
+            .limit(limit)
+        )
+        return list(await self.db.scalars(stmt))
+
+    async def set_tier(self, blob_id: UUID, tier: StorageTier) -> None:
+        await self.db.execute(
+            update(AssetBlob)
+            .where(AssetBlob.id == blob_id)
+            .values(storage_tier=tier, updated_at=func.now())
+        )
+
+    async def defer_archive(self, blob_id: UUID, retry_in: dt.timedelta) -> None:
+        """Count a failed move to the cold tier; the blob is not a candidate again for `retry_in`."""
+        await self.db.execute(
+            update(AssetBlob)
+            .where(AssetBlob.id == blob_id)
+            .values(
+                archive_attempts=AssetBlob.archive_attempts + 1,
+                archive_retry_at=func.now() + retry_in,
+                updated_at=func.now(),
+            )
+        )
+        await self.db.commit()
@@ -10,9 +10,18 @@ from app.repositories import (
     UserRepository,
     PipelineRepository,
     AssetRepository,
+    AssetUploadRepository,
+    AssetImportRepository,
+    AssetLifecyclePolicyRepository,
+    BlobRepository,
     EventRepository,
+    EventRollupRepository,
     AlertRepository,
     ReportRepository,
+    ReportJobRepository,
+    ReportArtifactRepository,
+    RiskSnapshotRepository,
+    HotspotRepository,
 )
 
 # Explicit factories (so IDEs can resolve them, tests can monkeypatch).
@@ -52,12 +61,42 @@ async def get_asset_repo(
     return AssetRepository(session)
 
 
+async def get_asset_upload_repo(
+    session: aSync = Depends(get_async_session),
+) -> AssetUploadRepository:
+    return AssetUploadRepository(session)
+
+
+async def get_asset_import_repo(
+    session: aSync = Depends(get_async_session),
+) -> AssetImportRepository:
+    return AssetImportRepository(session)
+
+
+async def get_asset_lifecycle_policy_repo(
+    session: aSync = Depends(get_async_session),
+) -> AssetLifecyclePolicyRepository:
+    return AssetLifecyclePolicyRepository(session)
+
+
+async def get_blob_repo(
+    session: aSync = Depends(get_async_session),
+) -> BlobRepository:
+    return BlobRepository(session)
+
+
 async def get_event_repo(
     session: aSync = Depends(get_async_session),
 ) -> EventRepository:
     return EventRepository(session)
 
 
+async def get_event_rollup_repo(
+    session: aSync = Depends(get_async_session),
+) -> EventRollupRepository:
+    return EventRollupRepository(session)
+
+
 async def get_alert_repo(
     session: aSync = Depends(get_async_session),
 ) -> AlertRepository:
@@ -70,6 +109,30 @@ async def get_report_repo(
     return ReportRepository(session)
 
 
+async def get_report_job_repo(
+    session: aSync = Depends(get_async_session),
+) -> ReportJobRepository:
+    return ReportJobRepository(session)
+
+
+async def get_report_artifact_repo(
+    session: aSync = Depends(get_async_session),
+) -> ReportArtifactRepository:
+    return ReportArtifactRepository(session)
+
+
+async def get_risk_snapshot_repo(
+    session: aSync = Depends(get_async_session),
+) -> RiskSnapshotRepository:
+    return RiskSnapshotRepository(session)
+
+
+async def get_hotspot_repo(
+    session: aSync = Depends(get_async_session),
+) -> HotspotRepository:
+    return HotspotRepository(session)
+
+
 __all__ = [
     "get_organization_repo",
     "get_permission_repo",
@@ -77,7 +140,14 @@ __all__ = [
     "get_user_repo",
     "get_pipeline_repo",
     "get_asset_repo",
+    "get_asset_upload_repo",
+    "get_blob_repo",
     "get_event_repo",
+    "get_event_rollup_repo",
     "get_alert_repo",
     "get_report_repo",
+    "get_report_job_repo",
+    "get_report_artifact_repo",
+    "get_risk_snapshot_repo",
+    "get_hotspot_repo",
 ]
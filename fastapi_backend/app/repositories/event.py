@@ -1,13 +1,46 @@
 from __future__ import annotations
-from typing import List, Any
+import datetime as dt
+from typing import Collection, Dict, List, Any, Optional, Sequence, Tuple
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import Select, select, func, update
 from sqlalchemy.orm import selectinload
-from app.models import Event
+from sqlalchemy.sql import ColumnElement
+from app.models import Asset, Event, Pipeline, PipelineSegment
+from app.schemas.enums import EventType
 from .base import AsyncRepository
 from .mixins import OrgFilterMixin
 
 
+# Data export columns: name -> (expression, kind, table to outer join);
+# kinds are those of app.processing.columnar
+EXPORT_COLUMNS: Dict[str, Tuple[ColumnElement, str, Optional[str]]] = {
+    "id": (Event.id, "string", None),
+    "organization_id": (Event.organization_id, "string", None),
+    "event_type": (Event.event_type, "string", None),
+    "detected_at": (Event.detected_at, "timestamp", None),
+    "severity": (Event.severity, "int", None),
+    "description": (Event.description, "string", None),
+    "lon": (func.ST_X(Event.location), "float", None),
+    "lat": (func.ST_Y(Event.location), "float", None),
+    "segment_id": (Event.segment_id, "string", None),
+    "pipeline_id": (Event.pipeline_id, "string", None),
+    "pipeline_name": (Pipeline.name, "string", "pipeline"),
+    "asset_id": (Event.asset_id, "string", None),
+    "asset_type": (Asset.asset_type, "string", "asset"),
+    "asset_filename": (Asset.filename, "string", "asset"),
+    "asset_captured_at": (Asset.captured_at, "timestamp", "asset"),
+}
+
+
+def export_joins(stmt: Select, joins: Collection[Optional[str]]) -> Select:
+    """Outer join the pipeline and asset of `Event` when exported columns need them."""
+    if "pipeline" in joins:
+        stmt = stmt.outerjoin(Pipeline, Pipeline.id == Event.pipeline_id)
+    if "asset" in joins:
+        stmt = stmt.outerjoin(Asset, Asset.id == Event.asset_id)
+    return stmt
+
+
 class EventRepository(OrgFilterMixin, AsyncRepository[Event]):
     model = Event
 
@@ -19,3 +52,116 @@ class EventRepository(OrgFilterMixin, AsyncRepository[Event]):
         )
         res = await self.db.scalars(stmt)
         return list(res)
+
+    async def cluster_counts(
+        self,
+        org_id: Optional[UUID],
+        bbox: Tuple[float, float, float, float],
+        cell_size: float,
+    ) -> List[Any]:
+        """
+        Aggregate events inside bbox into square grid cells of `cell_size` degrees.
+        One row per non-empty cell: centroid, count, max severity and a count
+        column per EventType. `org_id=None` aggregates across all organizations.
+        """
+        cell = func.ST_SnapToGrid(Event.location, cell_size)
+        centroid = func.ST_Centroid(func.ST_Collect(Event.location))
+        stmt = (
+            select(
+                func.ST_X(centroid).label("lon"),
+                func.ST_Y(centroid).label("lat"),
+                func.count().label("count"),
+                func.max(Event.severity).label("max_severity"),
+                *(
+                    func.count()
+                    .filter(Event.event_type == event_type)
+                    .label(event_type.value)
+                    for event_type in EventType
+                ),
+            )
+            .where(
+                Event.location.is_not(None),
+                func.ST_Intersects(Event.location, func.ST_MakeEnvelope(*bbox, 4326)),
+            )
+            .group_by(cell)
+        )
+        if org_id is not None:
+            stmt = stmt.where(Event.organization_id == org_id)
+        res = await self.db.execute(stmt)
+        return list(res.mappings())
+
+    @staticmethod
+    def nearest_segment(pipeline_id: Any, location: Any) -> ColumnElement:
+        """Scalar subquery: id of the pipeline's segment closest to `location` (KNN)."""
+        return (
+            select(PipelineSegment.id)
+            .where(PipelineSegment.pipeline_id == pipeline_id)
+            .order_by(PipelineSegment.geom.distance_centroid(location))
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    async def assign_segments(self, pipeline_id: UUID, *, commit: bool = True) -> None:
+        """Re-resolve segment_id for every located event on a pipeline."""
+        stmt = (
+            update(Event)
+            .where(Event.pipeline_id == pipeline_id, Event.location.is_not(None))
+            .values(segment_id=self.nearest_segment(pipeline_id, Event.location))
+        )
+        await self.db.execute(stmt)
+        if commit:
+            await self.db.commit()
+
+    async def risk_rows(self, pipeline_id: UUID, created_after: float) -> List[Any]:
+        """(id, segment_id, severity, detected_at, created_at) of segmented events."""
+        stmt = select(
+            Event.id,
+            Event.segment_id,
+            Event.severity,
+            Event.detected_at,
+            Event.created_at,
+        ).where(
+            Event.pipeline_id == pipeline_id,
+            Event.segment_id.is_not(None),
+            Event.created_at > func.to_timestamp(created_after),
+        )
+        res = await self.db.execute(stmt)
+        return list(res)
+
+    async def located_since(self, org_id: UUID, since: Any) -> List[Any]:
+        """(lon, lat, severity) of an organization's located events since `since`."""
+        stmt = select(
+            func.ST_X(Event.location),
+            func.ST_Y(Event.location),
+            func.coalesce(Event.severity, 0),
+        ).where(
+            Event.organization_id == org_id,
+            Event.location.is_not(None),
+            Event.detected_at >= since,
+        )
+        res = await self.db.execute(stmt)
+        return list(res.tuples())
+
+    @staticmethod
+    def export_query(
+        columns: Sequence[str],
+        org_id: Optional[UUID],
+        start: Optional[dt.datetime],
+        end: Optional[dt.datetime],
+        event_types: Optional[Collection[EventType]],
+    ) -> Select:
+        """Events in [start, end) with the EXPORT_COLUMNS `columns`, oldest first."""
+        selected = [EXPORT_COLUMNS[name] for name in columns]
+        stmt = select(
+            *(expr.label(name) for name, (expr, _, _) in zip(columns, selected))
+        )
+        stmt = export_joins(stmt.select_from(Event), {join for _, _, join in selected})
+        if org_id is not None:
+            stmt = stmt.where(Event.organization_id == org_id)
+        if start is not None:
+            stmt = stmt.where(Event.detected_at >= start)
+        if end is not None:
+            stmt = stmt.where(Event.detected_at < end)
+        if event_types:
+            stmt = stmt.where(Event.event_type.in_(event_types))
+        return stmt.order_by(Event.detected_at)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Any, Collection, List, Optional, Sequence, Type
+from uuid import UUID
+from sqlalchemy import delete, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from app.models import Event, EventRollupDaily, EventRollupHourly, Pipeline
+from app.models.event_rollups import EventRollupMixin
+from app.schemas.enums import EventType
+from .base import AsyncRepository
+
+# date_trunc unit -> rollup table
+ROLLUPS: dict[str, Type[EventRollupMixin]] = {
+    "hour": EventRollupHourly,
+    "day": EventRollupDaily,
+}
+
+
+def _bucket(unit: str) -> Any:
+    # Constants inlined so SELECT and GROUP BY are the same expression to Postgres
+    return func.date_trunc(
+        literal_column(f"'{unit}'"), Event.detected_at, literal_column("'UTC'")
+    )
+
+
+class EventRollupRepository(AsyncRepository[EventRollupDaily]):
+    """
+    Hourly and daily event counts. Writers call `add` / `remove` with the
+    ids of the events they insert or are about to delete, in the same
+    transaction, so the counts commit (or roll back) with the events.
+    """
+
+    model = EventRollupDaily
+
+    async def _merge(self, rollup: Type[EventRollupMixin], rows: Any) -> None:
+        """Add `rows` (organization_id, pipeline_id, event_type, severity, bucket, count) to `rollup`."""
+        rows = rows.add_columns(func.gen_random_uuid(), func.now(), func.now())
+        columns = [
+            "organization_id",
+            "pipeline_id",
+            "event_type",
+            "severity",
+            "bucket",
+            "count",
+        ]
+        stmt = insert(rollup).from_select(
+            [*columns, "id", "created_at", "updated_at"], rows
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint=f"uq_{rollup.__tablename__}_key",
+            set_={
+                "count": rollup.count + stmt.excluded.count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _upsert(self, unit: str, source: Any, sign: int) -> None:
+        """Add sign * (counts of the events matching `source`) to the `unit` rollup."""
+        bucket = _bucket(unit)
+        key = (
+            Event.organization_id,
+            Event.pipeline_id,
+            Event.event_type,
+            Event.severity,
+            bucket,
+        )
+        await self._merge(
+            ROLLUPS[unit],
+            select(*key, func.count() * sign).where(source).group_by(*key),
+        )
+
+    async def _apply(self, event_ids: Collection[UUID], sign: int) -> None:
+        if not event_ids:
+            return
+        source = Event.id.in_(list(event_ids))
+        for unit, rollup in ROLLUPS.items():
+            await self._upsert(unit, source, sign)
+            if sign < 0:
+                orgs = select(Event.organization_id).where(source)
+                await self.db.execute(
+                    delete(rollup).where(
+                        rollup.organization_id.in_(orgs), rollup.count <= 0
+                    )
+                )
+
+    async def add(self, event_ids: Collection[UUID]) -> None:
+        """Count freshly inserted (flushed) events; batched in one upsert per table."""
+        await self._apply(event_ids, 1)
+
+    async def remove(self, event_ids: Collection[UUID]) -> None:
+        """Uncount events that are about to be deleted or changed."""
+        await self._apply(event_ids, -1)
+
+    async def detach_pipeline(self, pipeline_id: UUID) -> None:
+        """
+        Move a pipeline's counts to the no-pipeline key before the pipeline
+        is deleted: its events survive with pipeline_id NULL, while its
+        rollup rows go with the FK cascade. Locks the pipeline row first so
+        no event can be counted against it in between.
+        """
+        await self.db.execute(
+            select(Pipeline.id).where(Pipeline.id == pipeline_id).with_for_update()
+        )
+        for rollup in ROLLUPS.values():
+            moved = select(
+                rollup.organization_id,
+                literal(None, rollup.pipeline_id.type),
+                rollup.event_type,
+                rollup.severity,
+                rollup.bucket,
+                rollup.count,
+            ).where(rollup.pipeline_id == pipeline_id)
+            await self._merge(rollup, moved)
+
+    async def rebuild(self, org_id: UUID) -> None:
+        """Recount an organization's events from scratch (backfill / repair)."""
+        for unit, rollup in ROLLUPS.items():
+            await self.db.execute(
+                delete(rollup).where(rollup.organization_id == org_id)
+            )
+            await self._upsert(unit, Event.organization_id == org_id, 1)
+
+    async def series(
+        self,
+        unit: str,
+        org_id: Optional[UUID],
+        start: dt.datetime,
+        end: dt.datetime,
+        pipeline_id: Optional[UUID] = None,
+        event_types: Optional[Sequence[EventType]] = None,
+    ) -> List[Any]:
+        """(bucket, event_type, count) in [start, end), one row per non-empty pair."""
+        rollup = ROLLUPS[unit]
+        stmt = (
+            select(
+                rollup.bucket, rollup.event_type, func.sum(rollup.count).label("count")
+            )
+            .where(rollup.bucket >= start, rollup.bucket < end)
+            .group_by(rollup.bucket, rollup.event_type)
+            .having(func.sum(rollup.count) > 0)
+            .order_by(rollup.bucket)
+        )
+        if org_id is not None:
+            stmt = stmt.where(rollup.organization_id == org_id)
+        if pipeline_id is not None:
+            stmt = stmt.where(rollup.pipeline_id == pipeline_id)
+        if event_types:
+            stmt = stmt.where(rollup.event_type.in_(event_types))
+        res = await self.db.execute(stmt)
+        return list(res)
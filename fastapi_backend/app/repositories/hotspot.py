@@ -0,0 +1,59 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Any, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import delete, insert, select, func
+from app.models import EventHotspot
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+
+class HotspotRepository(OrgFilterMixin, AsyncRepository[EventHotspot]):
+    model = EventHotspot
+
+    async def list_with_geojson(self, org_id: Optional[UUID]) -> List[Any]:
+        """Current hotspots with their polygon as a GeoJSON string, densest first."""
+        stmt = select(
+            EventHotspot.id,
+            EventHotspot.organization_id,
+            EventHotspot.window_start,
+            EventHotspot.window_end,
+            EventHotspot.event_count,
+            EventHotspot.max_severity,
+            func.ST_AsGeoJSON(EventHotspot.geom).label("geojson"),
+        ).order_by(EventHotspot.event_count.desc())
+        if org_id is not None:
+            stmt = stmt.where(EventHotspot.organization_id == org_id)
+        res = await self.db.execute(stmt)
+        return list(res.mappings())
+
+    async def replace_for_org(
+        self,
+        org_id: UUID,
+        window_start: dt.datetime,
+        window_end: dt.datetime,
+        hotspots: Sequence[Any],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """Swap an organization's hotspots for a freshly computed set."""
+        await self.db.execute(
+            delete(EventHotspot).where(EventHotspot.organization_id == org_id)
+        )
+        if hotspots:
+            await self.db.execute(
+                insert(EventHotspot),
+                [
+                    {
+                        "organization_id": org_id,
+                        "window_start": window_start,
+                        "window_end": window_end,
+                        "event_count": h.event_count,
+                        "max_severity": h.max_severity,
+                        "geom": f"SRID=4326;{h.polygon_wkt}",
+                    }
+                    for h in hotspots
+                ],
+            )
+        if commit:
+            await self.db.commit()
@@ -1,8 +1,89 @@
 from __future__ import annotations
-from app.models import Pipeline
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import delete, insert, select, func
+from app.models import Event, Pipeline, PipelineSegment
 from .base import AsyncRepository
 from .mixins import OrgFilterMixin
 
 
 class PipelineRepository(OrgFilterMixin, AsyncRepository[Pipeline]):
     model = Pipeline
+
+    async def list_geometries(
+        self,
+        org_id: Optional[UUID],
+        pipeline_id: Optional[UUID] = None,
+    ) -> List[Any]:
+        """(id, organization_id, updated_at, wkb) for pipelines that have a geometry."""
+        stmt = select(
+            Pipeline.id,
+            Pipeline.organization_id,
+            Pipeline.updated_at,
+            func.ST_AsBinary(Pipeline.geom).label("wkb"),
+        ).where(Pipeline.geom.is_not(None))
+        if org_id is not None:
+            stmt = stmt.where(Pipeline.organization_id == org_id)
+        if pipeline_id is not None:
+            stmt = stmt.where(Pipeline.id == pipeline_id)
+        res = await self.db.execute(stmt)
+        return list(res.mappings())
+
+    async def replace_segments(
+        self,
+        pipeline: Pipeline,
+        segments: Sequence[Tuple[int, float, float, str]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """
+        Swap the stored segmentation of a pipeline for `segments`
+        ((seq, start_km, end_km, wkt) tuples) in one transaction.
+        """
+        await self.db.execute(
+            delete(PipelineSegment).where(PipelineSegment.pipeline_id == pipeline.id)
+        )
+        if segments:
+            await self.db.execute(
+                insert(PipelineSegment),
+                [
+                    {
+                        "organization_id": pipeline.organization_id,
+                        "pipeline_id": pipeline.id,
+                        "seq": seq,
+                        "start_km": start_km,
+                        "end_km": end_km,
+                        "geom": f"SRID=4326;{wkt}",
+                    }
+                    for seq, start_km, end_km, wkt in segments
+                ],
+            )
+        if commit:
+            await self.db.commit()
+
+    async def segment_event_counts(self, pipeline_id: UUID) -> List[Any]:
+        """Per-segment event counts via the indexed events.segment_id column."""
+        stmt = (
+            select(
+                PipelineSegment.id,
+                PipelineSegment.seq,
+                PipelineSegment.start_km,
+                PipelineSegment.end_km,
+                func.count(Event.id).label("event_count"),
+            )
+            .outerjoin(Event, Event.segment_id == PipelineSegment.id)
+            .where(PipelineSegment.pipeline_id == pipeline_id)
+            .group_by(PipelineSegment.id)
+            .order_by(PipelineSegment.seq)
+        )
+        res = await self.db.execute(stmt)
+        return list(res.mappings())
+
+    async def segment_ids(self, pipeline_id: UUID) -> List[UUID]:
+        """Segment ids of a pipeline ordered by seq."""
+        stmt = (
+            select(PipelineSegment.id)
+            .where(PipelineSegment.pipeline_id == pipeline_id)
+            .order_by(PipelineSegment.seq)
+        )
+        return list(await self.db.scalars(stmt))
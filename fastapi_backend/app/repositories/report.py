@@ -1,8 +1,203 @@
 from __future__ import annotations
-from app.models import Report
+import datetime as dt
+from typing import Set, Tuple
+from uuid import UUID
+from sqlalchemy import and_, func, literal_column, select, update
+from app.analytics.report_metrics import (
+    SEVERITIES,
+    AlertStats,
+    AssetStats,
+    EventTypeStats,
+    PipelineStats,
+    ReportMetrics,
+    TimelineBucket,
+    timeline_unit,
+)
+from app.models import Alert, Asset, Event, Pipeline, Report
+from app.schemas.enums import ReportFrequency
 from .base import AsyncRepository
 from .mixins import OrgFilterMixin
 
+HIGH_SEVERITY = 4
+
+
+def _utc(day: dt.date) -> dt.datetime:
+    return dt.datetime.combine(day, dt.time(), tzinfo=dt.timezone.utc)
+
+
+def _seconds(value) -> float | None:
+    return None if value is None else float(value)
+
 
 class ReportRepository(OrgFilterMixin, AsyncRepository[Report]):
     model = Report
+
+    async def set_generated(self, report_id: UUID, file_path: str) -> None:
+        await self.db.execute(
+            update(Report)
+            .where(Report.id == report_id)
+            .values(file_path=file_path, generated_at=func.now(), updated_at=func.now())
+        )
+
+    async def periods_since(
+        self, since: dt.date
+    ) -> Set[Tuple[UUID, ReportFrequency, dt.date, dt.date]]:
+        """(org, frequency, start, end) of every report for a period ending after `since`."""
+        res = await self.db.execute(
+            select(
+                Report.organization_id,
+                Report.frequency,
+                Report.period_start,
+                Report.period_end,
+            )
+            .where(Report.period_end > since)
+            .distinct()
+        )
+        return {tuple(row) for row in res}
+
+    async def metrics(
+        self,
+        org_id: UUID,
+        period_start: dt.date,
+        period_end: dt.date,
+        top_pipelines: int = 20,
+    ) -> ReportMetrics:
+        """
+        Everything a report shows for [period_start, period_end) (UTC days),
+        aggregated in the database: five grouped queries whatever the
+        number of events, each a range scan of an (organization_id, time)
+        index.
+        """
+        start, end = _utc(period_start), _utc(period_end)
+        unit = timeline_unit(period_start, period_end)
+        in_period = and_(
+            Event.organization_id == org_id,
+            Event.detected_at >= start,
+            Event.detected_at < end,
+        )
+        high = func.count().filter(Event.severity >= HIGH_SEVERITY)
+
+        # Per type, one FILTER count per severity level
+        res = await self.db.execute(
+            select(
+                Event.event_type,
+                func.count(),
+                *(func.count().filter(Event.severity == s) for s in SEVERITIES),
+                func.count().filter(Event.severity.is_(None)),
+                func.max(Event.severity),
+            )
+            .where(in_period)
+            .group_by(Event.event_type)
+            .order_by(func.count().desc())
+        )
+        event_types = [
+            EventTypeStats(
+                event_type=row[0].value,
+                count=row[1],
+                by_severity=tuple(row[2 : 2 + len(SEVERITIES)]),
+                unrated=row[-2],
+                max_severity=row[-1],
+            )
+            for row in res
+        ]
+
+        # Group first, then join the names of the busiest pipelines only
+        per_pipeline = (
+            select(
+                Event.pipeline_id,
+                func.count().label("count"),
+                high.label("high"),
+                func.max(Event.severity).label("max_severity"),
+            )
+            .where(in_period)
+            .group_by(Event.pipeline_id)
+            .order_by(func.count().desc())
+            .limit(top_pipelines)
+            .subquery()
+        )
+        res = await self.db.execute(
+            select(per_pipeline, Pipeline.name)
+            .outerjoin(Pipeline, Pipeline.id == per_pipeline.c.pipeline_id)
+            .order_by(per_pipeline.c.count.desc())
+        )
+        pipelines = [
+            PipelineStats(
+                pipeline_id=str(row.pipeline_id) if row.pipeline_id else None,
+                name=row.name,
+                count=row.count,
+                high_severity=row.high,
+                max_severity=row.max_severity,
+            )
+            for row in res
+        ]
+
+        # Inlined constants, so SELECT and GROUP BY are the same expression to Postgres
+        bucket = func.date_trunc(
+            literal_column(f"'{unit}'"),
+            func.timezone(literal_column("'UTC'"), Event.detected_at),
+        ).label("bucket")
+        res = await self.db.execute(
+            select(bucket, func.count(), high)
+            .where(in_period)
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        timeline = [
+            TimelineBucket(start=row[0].date(), count=row[1], high_severity=row[2])
+            for row in res
+        ]
+
+        # Ack latency percentiles; NULL latencies (unacknowledged) are ignored
+        latency = func.extract("epoch", Alert.acknowledged_at - Alert.sent_at)
+        row = (
+            await self.db.execute(
+                select(
+                    func.count(),
+                    func.count(Alert.acknowledged_at),
+                    func.percentile_cont(0.5).within_group(latency),
+                    func.percentile_cont(0.9).within_group(latency),
+                    func.avg(latency),
+                    func.max(latency),
+                ).where(
+                    Alert.organization_id == org_id,
+                    Alert.sent_at >= start,
+                    Alert.sent_at < end,
+                )
+            )
+        ).one()
+        alerts = AlertStats(
+            sent=row[0],
+            acknowledged=row[1],
+            ack_p50_s=_seconds(row[2]),
+            ack_p90_s=_seconds(row[3]),
+            ack_mean_s=_seconds(row[4]),
+            ack_max_s=_seconds(row[5]),
+        )
+
+        # Capture time when known, upload time otherwise (ix_assets_org_taken_at)
+        taken_at = func.coalesce(Asset.captured_at, Asset.created_at)
+        res = await self.db.execute(
+            select(
+                Asset.asset_type,
+                func.count(),
+                func.coalesce(func.sum(Asset.size_bytes), 0),
+            )
+            .where(Asset.organization_id == org_id, taken_at >= start, taken_at < end)
+            .group_by(Asset.asset_type)
+            .order_by(Asset.asset_type)
+        )
+        assets = [
+            AssetStats(asset_type=row[0].value, count=row[1], total_bytes=int(row[2]))
+            for row in res
+        ]
+
+        return ReportMetrics(
+            period_start=period_start,
+            period_end=period_end,
+            timeline_unit=unit,
+            event_types=event_types,
+            pipelines=pipelines,
+            timeline=timeline,
+            alerts=alerts,
+            assets=assets,
+        )
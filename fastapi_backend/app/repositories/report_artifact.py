@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Any, List, Mapping, Optional
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models import Report, ReportArtifact
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+# Cache key: organization_id, frequency, period_start, period_end,
+# content_sha256, template_version (uq_report_artifact_key)
+ArtifactKey = Mapping[str, Any]
+
+
+def _matches(key: ArtifactKey):
+    return and_(
+        *(getattr(ReportArtifact, column) == value for column, value in key.items())
+    )
+
+
+class ReportArtifactRepository(OrgFilterMixin, AsyncRepository[ReportArtifact]):
+    model = ReportArtifact
+
+    async def acquire(self, key: ArtifactKey) -> Optional[str]:
+        """
+        Storage key of the cached PDF for `key` (marked used), or None. The
+        row stays locked until the caller commits, so eviction (SKIP
+        LOCKED) cannot take it away before the caller records it on a report.
+        """
+        return await self.db.scalar(
+            update(ReportArtifact)
+            .where(_matches(key))
+            .values(last_used_at=func.now(), updated_at=func.now())
+            .returning(ReportArtifact.file_path)
+        )
+
+    async def add(self, key: ArtifactKey, file_path: str, size_bytes: int) -> str:
+        """
+        Register a freshly rendered PDF; returns the storage key to use,
+        which is another worker's when it cached the same content first.
+        """
+        stmt = insert(ReportArtifact).values(
+            **key, file_path=file_path, size_bytes=size_bytes
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_report_artifact_key",
+            set_={"last_used_at": func.now(), "updated_at": func.now()},
+        ).returning(ReportArtifact.file_path)
+        return (await self.db.execute(stmt)).scalar_one()
+
+    async def touch(self, file_path: str) -> None:
+        await self.db.execute(
+            update(ReportArtifact)
+            .where(ReportArtifact.file_path == file_path)
+            .values(last_used_at=func.now())
+        )
+
+    async def evict(self, max_bytes: int, limit: int) -> List[str]:
+        """
+        Delete up to `limit` least recently used artifacts beyond the first
+        `max_bytes` (most recent first) and detach them from their reports;
+        returns their storage keys, to delete once the caller commits.
+        """
+        kept_bytes = (
+            func.sum(ReportArtifact.size_bytes)
+            .over(order_by=(ReportArtifact.last_used_at.desc(), ReportArtifact.id))
+            .label("kept_bytes")
+        )
+        ranked = select(ReportArtifact.id, kept_bytes).subquery()
+        victims = (
+            select(ReportArtifact.id)
+            .where(
+                ReportArtifact.id.in_(
+                    select(ranked.c.id).where(ranked.c.kept_bytes > max_bytes)
+                )
+            )
+            .order_by(ReportArtifact.last_used_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        paths = list(
+            await self.db.scalars(
+                delete(ReportArtifact)
+                .where(ReportArtifact.id.in_(victims.scalar_subquery()))
+                .returning(ReportArtifact.file_path)
+            )
+        )
+        if paths:
+            await self.db.execute(
+                update(Report)
+                .where(Report.file_path.in_(paths))
+                .values(file_path=None, generated_at=None, updated_at=func.now())
+            )
+        return paths
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import and_, func, or_, select, update
+from app.models import ReportJob
+from app.schemas.enums import JobStatus
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+
+class ReportJobRepository(OrgFilterMixin, AsyncRepository[ReportJob]):
+    model = ReportJob
+
+    async def claim(self, limit: int, stale_before: dt.datetime) -> List[ReportJob]:
+        """
+        Mark up to `limit` due jobs RUNNING and return them: queued jobs whose
+        backoff has passed, and running ones whose worker stopped heart-
+        beating (it died). SKIP LOCKED keeps concurrent workers apart. The
+        caller commits.
+        """
+        due = (
+            select(ReportJob.id)
+            .where(
+                or_(
+                    and_(
+                        ReportJob.status == JobStatus.QUEUED,
+                        or_(
+                            ReportJob.run_after.is_(None),
+                            ReportJob.run_after <= func.now(),
+                        ),
+                    ),
+                    and_(
+                        ReportJob.status == JobStatus.RUNNING,
+                        ReportJob.updated_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(ReportJob.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = await self.db.scalars(
+            update(ReportJob)
+            .where(ReportJob.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=ReportJob.attempts + 1,
+                progress=0.0,
+                started_at=func.now(),
+                updated_at=func.now(),
+            )
+            .returning(ReportJob.id)
+        )
+        ids = list(claimed)
+        if not ids:
+            return []
+        return list(
+            await self.db.scalars(select(ReportJob).where(ReportJob.id.in_(ids)))
+        )
+
+    async def progress(self, job_id: UUID, progress: float) -> None:
+        """Record progress; doubles as the heartbeat."""
+        await self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id)
+            .values(progress=progress, updated_at=func.now())
+        )
+
+    async def finish(self, job_id: UUID) -> None:
+        await self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id)
+            .values(
+                status=JobStatus.SUCCEEDED,
+                progress=1.0,
+                error=None,
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+        )
+
+    async def fail(
+        self, job: ReportJob, error: str, retry_in: Optional[dt.timedelta]
+    ) -> None:
+        """Re-queue after `retry_in`, or give up for good if it is None."""
+        values = {"error": error, "updated_at": func.now()}
+        if retry_in is None:
+            values.update(status=JobStatus.FAILED, finished_at=func.now())
+        else:
+            values.update(status=JobStatus.QUEUED, run_after=func.now() + retry_in)
+        await self.db.execute(
+            update(ReportJob).where(ReportJob.id == job.id).values(values)
+        )
+
+    async def requeue(self, job_id: UUID) -> None:
+        """Hand a running job back (its worker is shutting down); the attempt is not counted."""
+        await self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == JobStatus.RUNNING)
+            .values(status=JobStatus.QUEUED, attempts=ReportJob.attempts - 1)
+        )
+
+    async def latest_for_report(self, report_id: UUID) -> Optional[ReportJob]:
+        stmt = (
+            select(ReportJob)
+            .where(ReportJob.report_id == report_id)
+            .order_by(ReportJob.created_at.desc())
+            .limit(1)
+        )
+        return await self.db.scalar(stmt)
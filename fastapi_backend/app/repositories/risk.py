@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from app.models import PipelineRiskSnapshot
+from .base import AsyncRepository
+from .mixins import OrgFilterMixin
+
+
+class RiskSnapshotRepository(OrgFilterMixin, AsyncRepository[PipelineRiskSnapshot]):
+    model = PipelineRiskSnapshot
+
+    async def get_for_pipeline(
+        self, pipeline_id: UUID
+    ) -> Optional[PipelineRiskSnapshot]:
+        stmt = select(PipelineRiskSnapshot).where(
+            PipelineRiskSnapshot.pipeline_id == pipeline_id
+        )
+        return await self.db.scalar(stmt)
+
+    async def upsert(self, values: Dict[str, Any], *, commit: bool = True) -> None:
+        """Insert or overwrite the snapshot row of values["pipeline_id"]."""
+        stmt = insert(PipelineRiskSnapshot).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PipelineRiskSnapshot.pipeline_id],
+            set_={k: stmt.excluded[k] for k in values if k != "pipeline_id"},
+        )
+        await self.db.execute(stmt)
+        if commit:
+            await self.db.commit()
+
+    async def delete_for_pipeline(
+        self, pipeline_id: UUID, *, commit: bool = True
+    ) -> None:
+        await self.db.execute(
+            delete(PipelineRiskSnapshot).where(
+                PipelineRiskSnapshot.pipeline_id == pipeline_id
+            )
+        )
+        if commit:
+            await self.db.commit()
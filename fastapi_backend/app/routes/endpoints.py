@@ -10,6 +10,7 @@ from app.routes.router import (
     reports,
     pipelines,
     alerts,
+    storage,
 )
 
 api_router = APIRouter()
@@ -30,3 +31,4 @@ api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(pipelines.router, prefix="/pipelines", tags=["Pipelines"])
 api_router.include_router(alerts.router, prefix="/alerts", tags=["Alerts"])
+api_router.include_router(storage.router, prefix="/storage", tags=["Storage"])
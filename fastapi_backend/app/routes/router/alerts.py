@@ -1,11 +1,15 @@
-from typing import List
+import datetime as dt
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Path, status
+from fastapi.responses import StreamingResponse
 
 from app.schemas.alert import AlertRead
-from app.services.deps import get_alert_service
+from app.schemas.enums import EventType
+from app.services.deps import get_alert_service, get_export_service
 from app.services.alert import AlertService
+from app.services.export import ExportService
 from app.security.clerk import get_current_user, CurrentUser
 
 router = APIRouter()
@@ -26,6 +30,35 @@ async def list_unacknowledged_alerts(
     return await service.list_unack(current, limit=limit, offset=offset)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export alerts as Arrow IPC or Parquet",
+)
+async def export_alerts(
+    format: Literal["arrow", "parquet"] = Query("parquet"),
+    organization_id: Optional[UUID] = Query(None, description="Superadmins only"),
+    start: Optional[dt.datetime] = Query(None, description="sent_at >= start"),
+    end: Optional[dt.datetime] = Query(None, description="sent_at < end"),
+    event_type: Optional[List[EventType]] = Query(
+        None, description="Repeat for several"
+    ),
+    columns: Optional[str] = Query(None, description="Comma-separated; default all"),
+    current: CurrentUser = Depends(get_current_user),
+    service: ExportService = Depends(get_export_service),
+) -> StreamingResponse:
+    """Stream alerts with their event, pipeline and asset attributes for analytics tools."""
+    return await service.export_alerts(
+        current,
+        format,
+        organization_id=organization_id,
+        start=start,
+        end=end,
+        event_types=event_type,
+        columns=columns.split(",") if columns else None,
+    )
+
+
 @router.post(
     "/{alert_id}/acknowledge",
     status_code=status.HTTP_204_NO_CONTENT,
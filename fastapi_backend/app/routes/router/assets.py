@@ -12,13 +12,32 @@ from fastapi import (
     Form,
     Query,
     Path,
+    Request,
+    Response,
     status,
 )
 
-from app.schemas.asset import AssetCreate, AssetRead
+from app.schemas.asset import (
+    AssetCreate,
+    AssetImportCreate,
+    AssetImportRead,
+    AssetRead,
+    AssetUploadComplete,
+    AssetUploadCreate,
+    AssetUploadRead,
+    DirectUploadRead,
+    PresignedRequestRead,
+)
 from app.schemas.enums import AssetType
 from app.services.asset import AssetService
-from app.services.deps import get_asset_service
+from app.services.asset_upload import AssetUploadService
+from app.services.asset_import import AssetImportService
+from app.services.deps import (
+    get_asset_import_service,
+    get_asset_service,
+    get_asset_upload_service,
+)
+from app.jobs.imports import start_import
 from app.security.clerk import get_current_user, CurrentUser
 
 router = APIRouter()
@@ -48,7 +67,9 @@ async def upload_asset(
         target_org: Optional[UUID] = organization_id
     else:
         # CurrentUser.organization_id is a string UUID (or None); cast for the DTO if present
-        target_org = UUID(current["organization_id"]) if current.get("organization_id") else None
+        target_org = (
+            UUID(current["organization_id"]) if current.get("organization_id") else None
+        )
 
     try:
         meta_obj = json.loads(metadata) if metadata else None
@@ -62,13 +83,144 @@ async def upload_asset(
         organization_id=target_org,
         asset_type=asset_type,
         file_path=file.filename,
-        captured_at=captured_at.isoformat() if captured_at else None,
+        captured_at=captured_at,
         footprint_wkt=footprint_wkt,
         metadata=meta_obj,
     )
     return await service.upload(current, create_dto, file)
 
 
+@router.post(
+    "/uploads",
+    response_model=AssetUploadRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a resumable upload",
+)
+async def create_upload(
+    data: AssetUploadCreate,
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> AssetUploadRead:
+    """Register a large file; send its chunks with PUT, then complete."""
+    return await service.create(current, data)
+
+
+@router.post(
+    "/uploads/direct",
+    response_model=DirectUploadRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a direct-to-storage upload",
+)
+async def create_direct_upload(
+    data: AssetUploadCreate,
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> DirectUploadRead:
+    """Get a presigned PUT for the file (sha256 required), then complete."""
+    return await service.create_direct(current, data)
+
+
+@router.get(
+    "/uploads/{upload_id}",
+    response_model=AssetUploadRead,
+    summary="Get resumable upload progress",
+    responses={404: {"description": "Upload not found"}},
+)
+async def get_upload(
+    upload_id: UUID = Path(..., description="Upload ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> AssetUploadRead:
+    """List received chunks so an interrupted client can resume."""
+    return await service.get_upload(current, upload_id)
+
+
+@router.put(
+    "/uploads/{upload_id}/chunks/{index}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Upload one chunk",
+)
+async def put_upload_chunk(
+    request: Request,
+    upload_id: UUID = Path(..., description="Upload ID"),
+    index: int = Path(..., ge=0, description="Zero-based chunk index"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> None:
+    """Raw request body holds the chunk bytes; chunks may be sent in parallel."""
+    await service.put_chunk(current, upload_id, index, request.stream())
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response_model=AssetRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Finish a resumable upload",
+)
+async def complete_upload(
+    data: AssetUploadComplete,
+    upload_id: UUID = Path(..., description="Upload ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> AssetRead:
+    """Assemble the uploaded chunks into an asset."""
+    return await service.complete(current, upload_id, data)
+
+
+@router.delete(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Abort a resumable upload",
+)
+async def abort_upload(
+    upload_id: UUID = Path(..., description="Upload ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetUploadService = Depends(get_asset_upload_service),
+) -> None:
+    """Discard a pending upload and its staged data."""
+    await service.abort(current, upload_id)
+
+
+@router.post(
+    "/imports",
+    response_model=AssetImportRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Import a server-side directory (superadmin)",
+    responses={
+        403: {"description": "Not a superadmin, or directory outside IMPORT_ROOTS"},
+        404: {"description": "Directory not found"},
+    },
+)
+async def create_import(
+    data: AssetImportCreate,
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetImportService = Depends(get_asset_import_service),
+) -> AssetImportRead:
+    """
+    Ingest every file below a mounted directory (e.g. a drone station's
+    mission folder) in the background. Content the organization already
+    has is skipped; poll GET /assets/imports/{id} for progress.
+    """
+    job = await service.create(current, data)
+    start_import(job.id)
+    return job
+
+
+@router.get(
+    "/imports/{import_id}",
+    response_model=AssetImportRead,
+    summary="Get bulk import progress",
+    responses={404: {"description": "Import not found"}},
+)
+async def get_import(
+    import_id: UUID = Path(..., description="Import ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetImportService = Depends(get_asset_import_service),
+) -> AssetImportRead:
+    """Counters (processed, imported, skipped, failed) and per-file errors."""
+    return await service.get_import(current, import_id)
+
+
 @router.get(
     "/",
     response_model=List[AssetRead],
@@ -77,11 +229,21 @@ async def upload_asset(
 async def list_assets(
     limit: int = Query(100, ge=1, description="Max items to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    meta: List[str] = Query(
+        [],
+        description=(
+            "Metadata predicate, repeatable (ANDed): key:value (equality/containment, "
+            "JSON values allowed), key>n / key>=n / key<n / key<=n (range), or key "
+            "(present). Keys may be dotted paths, e.g. gps.alt>=50 or camera.make:DJI"
+        ),
+    ),
     current: CurrentUser = Depends(get_current_user),
     service: AssetService = Depends(get_asset_service),
 ) -> List[AssetRead]:
     """Retrieve assets scoped to your organization, or all if superadmin."""
-    return await service.list_assets(current, limit=limit, offset=offset)
+    return await service.list_assets(
+        current, limit=limit, offset=offset, metadata_filters=meta
+    )
 
 
 @router.get(
@@ -97,3 +259,87 @@ async def get_asset(
 ) -> AssetRead:
     """Fetch a single asset by ID, respecting org scope (superadmin can access any)."""
     return await service.get_asset(current, asset_id)
+
+
+@router.get(
+    "/{asset_id}/content",
+    summary="Download asset bytes",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/octet-stream": {}}},
+        206: {"description": "Partial content (Range)"},
+        304: {"description": "Not modified (If-None-Match)"},
+        404: {"description": "Asset not found"},
+        416: {"description": "Range not satisfiable"},
+    },
+)
+async def get_asset_content(
+    request: Request,
+    asset_id: UUID = Path(..., description="Asset ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetService = Depends(get_asset_service),
+) -> Response:
+    """Stream the asset, with single/multi byte ranges for video scrubbing."""
+    return await service.content(current, asset_id, request.headers)
+
+
+@router.get(
+    "/{asset_id}/previews/{name}",
+    summary="Download a generated asset preview",
+    response_class=Response,
+    responses={
+        200: {"content": {"image/webp": {}, "image/jpeg": {}}},
+        304: {"description": "Not modified (If-None-Match)"},
+        404: {"description": "Asset or preview not found"},
+    },
+)
+async def get_asset_preview(
+    request: Request,
+    asset_id: UUID = Path(..., description="Asset ID"),
+    name: str = Path(..., description="Preview name as listed in the asset's previews"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetService = Depends(get_asset_service),
+) -> Response:
+    """Thumbnail, poster frame or sprite sheet; immutable, so cached by clients."""
+    return await service.preview(current, asset_id, name, request.headers)
+
+
+@router.get(
+    "/{asset_id}/tiles/{path:path}",
+    summary="Download a Deep Zoom descriptor or tile",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/xml": {}, "image/jpeg": {}, "image/png": {}}},
+        304: {"description": "Not modified (If-None-Match)"},
+        404: {"description": "Asset or tile not found"},
+    },
+)
+async def get_asset_tile(
+    request: Request,
+    asset_id: UUID = Path(..., description="Asset ID"),
+    path: str = Path(
+        ..., description="image.dzi or image_files/{level}/{col}_{row}.{format}"
+    ),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetService = Depends(get_asset_service),
+) -> Response:
+    """
+    Tiles for zoomable viewers (e.g. OpenSeadragon pointed at .../tiles/image.dzi).
+    Content never changes for a given asset, so responses are cached for a year.
+    """
+    return await service.tile(current, asset_id, path, request.headers)
+
+
+@router.get(
+    "/{asset_id}/download-url",
+    response_model=PresignedRequestRead,
+    summary="Get a presigned download URL",
+    responses={404: {"description": "Asset not found"}},
+)
+async def get_asset_download_url(
+    asset_id: UUID = Path(..., description="Asset ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: AssetService = Depends(get_asset_service),
+) -> PresignedRequestRead:
+    """Time-limited link that downloads the asset straight from storage."""
+    return await service.download_url(current, asset_id)
@@ -1,11 +1,25 @@
-from typing import List
+import datetime as dt
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Path, status
+from fastapi.responses import StreamingResponse
 
-from app.schemas.event import EventCreate, EventRead, EventUpdate
-from app.services.deps import get_event_service
+from app.helpers.geo import parse_bbox
+from app.schemas.event import (
+    EventClusterRead,
+    EventCreate,
+    EventHotspotRead,
+    EventRead,
+    EventSeriesRead,
+    EventUpdate,
+    HotspotFeatureCollection,
+)
+from app.schemas.enums import EventType
+from app.services.deps import get_event_service, get_export_service, get_hotspot_service
 from app.services.event import EventService
+from app.services.export import ExportService
+from app.services.hotspot import HotspotService
 from app.security.clerk import get_current_user, CurrentUser
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -43,6 +57,100 @@ async def list_events(
     return events[offset : offset + limit]
 
 
+@router.get(
+    "/clusters",
+    response_model=EventClusterRead,
+    summary="Aggregate events into map clusters",
+)
+async def cluster_events(
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat (EPSG:4326)"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    service: EventService = Depends(get_event_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> EventClusterRead:
+    """Return per-cell counts, max severity and type breakdown for the viewport."""
+    return await service.clusters(current, parse_bbox(bbox), zoom)
+
+
+@router.get(
+    "/timeseries",
+    response_model=EventSeriesRead,
+    summary="Event counts per hour or day, by type",
+)
+async def event_timeseries(
+    interval: Literal["hour", "day"] = Query("day"),
+    start: Optional[dt.datetime] = Query(
+        None, description="Default: 7 / 90 days before end"
+    ),
+    end: Optional[dt.datetime] = Query(None, description="Exclusive; default: now"),
+    pipeline_id: Optional[UUID] = Query(None),
+    event_type: Optional[List[EventType]] = Query(
+        None, description="Repeat for several"
+    ),
+    service: EventService = Depends(get_event_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> EventSeriesRead:
+    """Chart data from the hourly / daily rollups, cheap whatever the event volume."""
+    return await service.timeseries(
+        current, interval, start, end, pipeline_id, event_type
+    )
+
+
+@router.get(
+    "/hotspots",
+    response_model=List[EventHotspotRead],
+    summary="List detected event hotspots",
+)
+async def list_hotspots(
+    service: HotspotService = Depends(get_hotspot_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> List[EventHotspotRead]:
+    """Return the hotspots found by the latest background detection run."""
+    return await service.list_hotspots(current)
+
+
+@router.get(
+    "/hotspots/layer",
+    response_model=HotspotFeatureCollection,
+    summary="Event hotspots as a GeoJSON map layer",
+)
+async def hotspot_layer(
+    service: HotspotService = Depends(get_hotspot_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> HotspotFeatureCollection:
+    """Return hotspot polygons as a GeoJSON FeatureCollection."""
+    return await service.hotspot_layer(current)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export events as Arrow IPC or Parquet",
+)
+async def export_events(
+    format: Literal["arrow", "parquet"] = Query("parquet"),
+    organization_id: Optional[UUID] = Query(None, description="Superadmins only"),
+    start: Optional[dt.datetime] = Query(None, description="detected_at >= start"),
+    end: Optional[dt.datetime] = Query(None, description="detected_at < end"),
+    event_type: Optional[List[EventType]] = Query(
+        None, description="Repeat for several"
+    ),
+    columns: Optional[str] = Query(None, description="Comma-separated; default all"),
+    service: ExportService = Depends(get_export_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream events with their pipeline and asset attributes for analytics tools."""
+    return await service.export_events(
+        current,
+        format,
+        organization_id=organization_id,
+        start=start,
+        end=end,
+        event_types=event_type,
+        columns=columns.split(",") if columns else None,
+    )
+
+
 @router.get(
     "/{event_id}",
     response_model=EventRead,
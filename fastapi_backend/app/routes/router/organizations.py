@@ -8,8 +8,10 @@ from app.schemas.organization import (
     OrganizationRead,
     OrganizationUpdate,
 )
+from app.schemas.asset import AssetLifecyclePolicyRead, AssetLifecyclePolicyUpdate
+from app.services.lifecycle import AssetLifecycleService
 from app.services.organization import OrganizationService
-from app.services.deps import get_organization_service
+from app.services.deps import get_asset_lifecycle_service, get_organization_service
 from app.security.clerk import get_current_user, CurrentUser
 
 router = APIRouter()
@@ -94,3 +96,33 @@ async def delete_organization(
 ) -> None:
     """Remove a tenant organization (superadmin only)."""
     await service.delete_org(current, org_id)
+
+
+@router.get(
+    "/{org_id}/lifecycle-policy",
+    response_model=AssetLifecyclePolicyRead,
+    summary="Get the organization's asset lifecycle policy",
+    responses={404: {"description": "No policy"}},
+)
+async def get_lifecycle_policy(
+    org_id: UUID,
+    current: CurrentUser = Depends(require_superadmin),
+    service: AssetLifecycleService = Depends(get_asset_lifecycle_service),
+) -> AssetLifecyclePolicyRead:
+    """When old assets are recompressed, moved to cold storage and deleted (superadmin only)."""
+    return await service.get_policy(current, org_id)
+
+
+@router.put(
+    "/{org_id}/lifecycle-policy",
+    response_model=AssetLifecyclePolicyRead,
+    summary="Set the organization's asset lifecycle policy",
+)
+async def put_lifecycle_policy(
+    org_id: UUID,
+    data: AssetLifecyclePolicyUpdate,
+    current: CurrentUser = Depends(require_superadmin),
+    service: AssetLifecycleService = Depends(get_asset_lifecycle_service),
+) -> AssetLifecyclePolicyRead:
+    """Create or replace the policy; applied by the hourly lifecycle job (superadmin only)."""
+    return await service.put_policy(current, org_id, data)
@@ -1,10 +1,24 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Path, status
 
-from app.schemas.pipeline import PipelineCreate, PipelineRead, PipelineUpdate
-from app.services.deps import get_pipeline_service
+from app.schemas.pipeline import (
+    PipelineCoverageRead,
+    PipelineCreate,
+    PipelineRead,
+    PipelineRiskRead,
+    PipelineSegmentRead,
+    PipelineUpdate,
+)
+from app.services.coverage import CoverageService
+from app.services.deps import (
+    get_coverage_service,
+    get_pipeline_service,
+    get_risk_service,
+)
+from app.services.risk import RiskService
 from app.services.pipeline import PipelineService
 from app.security.clerk import get_current_user, CurrentUser
 
@@ -41,6 +55,40 @@ async def list_pipelines(
     return await service.list_pipelines(current, limit=limit, offset=offset)
 
 
+@router.get(
+    "/coverage",
+    response_model=List[PipelineCoverageRead],
+    summary="Inspection coverage for all pipelines",
+)
+async def org_coverage(
+    start: datetime = Query(..., description="Period start (inclusive)"),
+    end: datetime = Query(..., description="Period end (exclusive)"),
+    segment_km: Optional[float] = Query(None, gt=0, description="Segment length in km"),
+    service: CoverageService = Depends(get_coverage_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> List[PipelineCoverageRead]:
+    """Covered/uncovered km per pipeline and per segment for your organization."""
+    return await service.org_coverage(current, start, end, segment_km)
+
+
+@router.get(
+    "/{pipeline_id}/coverage",
+    response_model=PipelineCoverageRead,
+    summary="Inspection coverage for a pipeline",
+    responses={404: {"description": "Pipeline not found"}},
+)
+async def pipeline_coverage(
+    pipeline_id: UUID = Path(..., description="ID of the pipeline"),
+    start: datetime = Query(..., description="Period start (inclusive)"),
+    end: datetime = Query(..., description="Period end (exclusive)"),
+    segment_km: Optional[float] = Query(None, gt=0, description="Segment length in km"),
+    service: CoverageService = Depends(get_coverage_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> PipelineCoverageRead:
+    """Share of the pipeline corridor imaged by drone/satellite assets in the period."""
+    return await service.pipeline_coverage(current, pipeline_id, start, end, segment_km)
+
+
 @router.get(
     "/{pipeline_id}",
     response_model=PipelineRead,
@@ -56,6 +104,36 @@ async def get_pipeline(
     return await service.get_pipeline(current, pipeline_id)
 
 
+@router.get(
+    "/{pipeline_id}/segments",
+    response_model=List[PipelineSegmentRead],
+    summary="List pipeline segments with event counts",
+    responses={404: {"description": "Pipeline not found"}},
+)
+async def list_pipeline_segments(
+    pipeline_id: UUID = Path(..., description="ID of the pipeline"),
+    service: PipelineService = Depends(get_pipeline_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> List[PipelineSegmentRead]:
+    """Fixed-length segments (chainage ranges) and the number of events on each."""
+    return await service.list_segments(current, pipeline_id)
+
+
+@router.get(
+    "/{pipeline_id}/risk",
+    response_model=PipelineRiskRead,
+    summary="Per-segment risk scores",
+    responses={404: {"description": "Pipeline not found"}},
+)
+async def pipeline_risk(
+    pipeline_id: UUID = Path(..., description="ID of the pipeline"),
+    service: RiskService = Depends(get_risk_service),
+    current: CurrentUser = Depends(get_current_user),
+) -> PipelineRiskRead:
+    """Severity-weighted, time-decayed score per segment, ready for a heatmap."""
+    return await service.get_risk(current, pipeline_id)
+
+
 @router.patch(
     "/{pipeline_id}",
     response_model=PipelineRead,
@@ -2,20 +2,20 @@
 
 from typing import List
 from uuid import UUID
-from pathlib import Path as FilePath
 
 from fastapi import (
     APIRouter,
     Depends,
-    BackgroundTasks,
     Query,
     Path,
+    Request,
+    Response,
     status,
-    HTTPException,
 )
-from fastapi.responses import FileResponse
 
-from app.schemas.report import ReportCreate, ReportRead, ReportUpdate
+from app.jobs.reports import QUEUE as REPORT_QUEUE
+from app.processing.queue import kick
+from app.schemas.report import ReportCreate, ReportRead, ReportStatusRead, ReportUpdate
 from app.services.report import ReportService
 from app.services.deps import get_report_service
 from app.security.clerk import get_current_user, CurrentUser
@@ -31,11 +31,17 @@ router = APIRouter()
 )
 async def generate_report(
     data: ReportCreate,
-    background: BackgroundTasks,
     current: CurrentUser = Depends(get_current_user),
     service: ReportService = Depends(get_report_service),
 ) -> ReportRead:
-    return await service.generate(current, data, background)
+    """
+    Queue the report; poll GET /reports/{id}/status until it succeeds. A
+    report whose content was rendered before comes back generated at once.
+    """
+    report = await service.generate(current, data)
+    if report.generated_at is None:
+        kick(REPORT_QUEUE)
+    return report
 
 
 @router.get(
@@ -66,23 +72,36 @@ async def get_report(
     return await service.get_report(current, report_id)
 
 
+@router.get(
+    "/{report_id}/status",
+    response_model=ReportStatusRead,
+    summary="Get report generation status",
+    responses={404: {"description": "Report not found"}},
+)
+async def get_report_status(
+    report_id: UUID = Path(..., description="Report ID"),
+    current: CurrentUser = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+) -> ReportStatusRead:
+    return await service.get_status(current, report_id)
+
+
 @router.get(
     "/{report_id}/download",
-    response_class=FileResponse,
+    response_class=Response,
     summary="Download report PDF",
-    responses={404: {"description": "Report not found"}},
+    responses={
+        200: {"content": {"application/pdf": {}}},
+        404: {"description": "Report not found or not generated yet"},
+    },
 )
 async def download_report(
+    request: Request,
     report_id: UUID = Path(..., description="Report ID"),
     current: CurrentUser = Depends(get_current_user),
     service: ReportService = Depends(get_report_service),
-) -> FileResponse:
-    rpt = await service.get_report(current, report_id)
-    if not rpt.file_path:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="PDF not yet generated"
-        )
-    return FileResponse(path=rpt.file_path, filename=FilePath(rpt.file_path).name)
+) -> Response:
+    return await service.download(current, report_id, request.headers)
 
 
 @router.patch(
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+
+from app.helpers.files import allocate_file, write_stream_at
+from app.storage import get_storage
+from app.storage import signing
+
+router = APIRouter()
+
+
+def _local_path(
+    method: str,
+    key: str,
+    exp: int,
+    sig: str,
+    size: Optional[int] = None,
+    filename: Optional[str] = None,
+):
+    if not signing.verify(method, key, exp, sig, size, filename):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired signature",
+        )
+    # Local backends only (either tier of tiered storage); S3 links go to S3.
+    storage = get_storage()
+    path = storage.local_path(key) if method == "GET" else storage.upload_path(key)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return path
+
+
+@router.get(
+    "/{key:path}",
+    summary="Download through a signed URL (local storage backend)",
+    response_class=FileResponse,
+)
+async def signed_download(
+    key: str,
+    exp: int = Query(..., description="Expiry (epoch seconds)"),
+    sig: str = Query(..., description="URL signature"),
+    filename: Optional[str] = Query(None, description="Download file name"),
+) -> FileResponse:
+    """Serve an object by signature alone; links come from /assets/{id}/download-url."""
+    path = _local_path("GET", key, exp, sig, filename=filename)
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return FileResponse(path, filename=filename)
+
+
+@router.put(
+    "/{key:path}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Upload through a signed URL (local storage backend)",
+)
+async def signed_upload(
+    request: Request,
+    key: str,
+    exp: int = Query(..., description="Expiry (epoch seconds)"),
+    sig: str = Query(..., description="URL signature"),
+    size: int = Query(..., ge=0, description="Exact body size in bytes"),
+) -> None:
+    """Receive the body of a direct upload created with /assets/uploads/direct."""
+    path = _local_path("PUT", key, exp, sig, size)
+    await allocate_file(path, size)
+    await write_stream_at(request.stream(), path, 0, size)
@@ -1,16 +1,19 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+import datetime as dt
+from typing import Dict, Any, List, Optional
 from uuid import UUID
-from pydantic import BaseModel
+from geoalchemy2.elements import WKBElement
+from geoalchemy2.shape import to_shape
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 from .base import IDMixin, TimestampMixin
-from .enums import AssetType
+from .enums import AssetType, JobStatus, ProcessingStatus, UploadStatus
 
 
 class AssetBase(BaseModel):
     organization_id: UUID
     asset_type: AssetType
     file_path: str
-    captured_at: Optional[str] = None  # ISO date‑time
+    captured_at: Optional[dt.datetime] = None
 
 
 class AssetCreate(AssetBase):
@@ -24,8 +27,148 @@ class AssetUpdate(BaseModel):
 
 
 class AssetRead(IDMixin, TimestampMixin, AssetBase):
-    footprint_wkt: Optional[str]
-    metadata: Optional[Dict[str, Any]]
+    # Read from the ORM columns (footprint, asset_metadata) as well as by name
+    footprint_wkt: Optional[str] = Field(
+        None, validation_alias=AliasChoices("footprint_wkt", "footprint")
+    )
+    metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("asset_metadata", "metadata")
+    )
+    filename: Optional[str] = None
+    content_sha256: Optional[str] = None
+    size_bytes: Optional[int] = None
+    metadata_status: Optional[ProcessingStatus] = None
+    preview_status: Optional[ProcessingStatus] = None
+    previews: Optional[List[str]] = None
+    tiles_status: Optional[ProcessingStatus] = None
+    tiles: Optional[Dict[str, Any]] = None
+
+    @field_validator("footprint_wkt", mode="before")
+    @classmethod
+    def footprint_as_wkt(cls, v: Any) -> Optional[str]:
+        if isinstance(v, WKBElement):
+            return to_shape(v).wkt
+        if isinstance(v, str) and v.startswith("SRID="):
+            return v.split(";", 1)[1]  # EWKT assigned before a refresh
+        return v
+
+    class Config:
+        from_attributes = True
+
+
+class AssetUploadCreate(BaseModel):
+    organization_id: Optional[UUID] = None
+    asset_type: AssetType
+    filename: str
+    total_size: int = Field(..., gt=0, description="Size of the whole file in bytes")
+    sha256: Optional[str] = Field(
+        None,
+        description="SHA-256 of the file; if this organization already has it, "
+        "the asset is created immediately and no chunks are needed",
+    )
+    captured_at: Optional[dt.datetime] = None
+    footprint_wkt: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class AssetUploadComplete(BaseModel):
+    sha256: Optional[str] = Field(
+        None, description="Expected SHA-256 hex digest; verified if provided"
+    )
+
+
+class AssetUploadRead(IDMixin, TimestampMixin):
+    direct: bool = False
+    organization_id: UUID
+    status: UploadStatus
+    filename: str
+    total_size: int
+    chunk_size: int
+    chunk_count: int
+    received_chunks: List[int]
+    received_bytes: int
+    asset_id: Optional[UUID] = None
+
+
+class PresignedRequestRead(BaseModel):
+    url: str
+    method: str
+    headers: Dict[str, str]
+    expires_at: dt.datetime
+
+
+class DirectUploadRead(BaseModel):
+    """Upload the file with `request`, then POST .../uploads/{id}/complete."""
+
+    upload: AssetUploadRead
+    request: Optional[PresignedRequestRead] = None  # None if deduplicated
+
+
+class AssetImportCreate(BaseModel):
+    organization_id: UUID
+    directory: str = Field(
+        ..., description="Absolute path below one of the configured IMPORT_ROOTS"
+    )
+    recursive: bool = True
+    asset_type: Optional[AssetType] = Field(
+        None,
+        description="Type for every file; inferred from each file's extension if omitted",
+    )
+    metadata: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Merged into every imported asset's metadata (e.g. mission_id)",
+    )
+
+
+class AssetImportError(BaseModel):
+    path: str
+    error: str
+
+
+class AssetImportRead(IDMixin, TimestampMixin):
+    organization_id: UUID
+    status: JobStatus
+    directory: str
+    recursive: bool
+    asset_type: Optional[AssetType] = None
+    total_files: Optional[int] = None
+    processed_files: int
+    imported_files: int
+    skipped_files: int
+    failed_files: int
+    errors: List[AssetImportError] = Field(default_factory=list)
+    started_at: Optional[dt.datetime] = None
+    finished_at: Optional[dt.datetime] = None
+
+    @field_validator("errors", mode="before")
+    @classmethod
+    def no_errors(cls, v: Any) -> Any:
+        return v or []
+
+
+class AssetLifecyclePolicyUpdate(BaseModel):
+    """Ages count from upload; leave a step's threshold empty to turn it off."""
+
+    enabled: bool = True
+    recompress_after_days: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Re-encode JPEG/PNG images and transcode videos to H.265",
+    )
+    jpeg_quality: int = Field(85, ge=30, le=95)
+    video_crf: int = Field(
+        28, ge=18, le=40, description="x265 constant quality (lower is better)"
+    )
+    archive_after_days: Optional[int] = Field(
+        None, ge=1, description="Move the files to the cold storage tier"
+    )
+    delete_after_days: Optional[int] = Field(
+        None, ge=1, description="Delete the assets"
+    )
+
+
+class AssetLifecyclePolicyRead(IDMixin, TimestampMixin, AssetLifecyclePolicyUpdate):
+    organization_id: UUID
 
     class Config:
         from_attributes = True
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Optional
+import datetime as dt
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 from .base import IDMixin, TimestampMixin
@@ -30,3 +31,47 @@ class EventRead(IDMixin, TimestampMixin, EventBase):
 
     class Config:
         from_attributes = True
+
+
+class EventClusterCell(BaseModel):
+    lon: float
+    lat: float
+    count: int
+    max_severity: Optional[int] = None
+    by_type: Dict[EventType, int]
+
+
+class EventClusterRead(BaseModel):
+    zoom: int
+    cell_size: float  # degrees
+    cells: List[EventClusterCell]
+
+
+class EventSeriesPoint(BaseModel):
+    bucket: dt.datetime  # start of the hour / UTC day
+    count: int
+    by_type: Dict[EventType, int]
+
+
+class EventSeriesRead(BaseModel):
+    interval: str  # "hour" or "day"
+    start: dt.datetime
+    end: dt.datetime
+    points: List[EventSeriesPoint]  # non-empty buckets only, oldest first
+
+
+class EventHotspotRead(BaseModel):
+    id: UUID
+    organization_id: UUID
+    window_start: dt.datetime
+    window_end: dt.datetime
+    event_count: int
+    max_severity: int
+    geometry: Dict[str, Any]  # GeoJSON Polygon
+
+
+class HotspotFeatureCollection(BaseModel):
+    """GeoJSON map layer of the current hotspots."""
+
+    type: str = "FeatureCollection"
+    features: List[Dict[str, Any]]
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Optional
+import datetime as dt
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 from .base import IDMixin, TimestampMixin
@@ -26,3 +27,41 @@ class PipelineRead(IDMixin, TimestampMixin, PipelineBase):
 
     class Config:
         from_attributes = True
+
+
+class PipelineSegmentRead(BaseModel):
+    id: UUID
+    seq: int
+    start_km: float
+    end_km: float
+    event_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class SegmentCoverageRead(BaseModel):
+    index: int
+    start_km: float
+    end_km: float
+    covered_km: float
+    uncovered_km: float
+
+
+class PipelineCoverageRead(BaseModel):
+    pipeline_id: UUID
+    period_start: dt.datetime
+    period_end: dt.datetime
+    length_km: float
+    covered_km: float
+    uncovered_km: float
+    covered_pct: float
+    segments: List[SegmentCoverageRead] = []
+
+
+class PipelineRiskRead(BaseModel):
+    pipeline_id: UUID
+    as_of: dt.datetime
+    half_life_days: float
+    max_score: float
+    scores: List[float]  # one per segment, ordered by seq
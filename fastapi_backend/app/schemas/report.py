@@ -1,22 +1,32 @@
 from __future__ import annotations
+import datetime as dt
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from .base import IDMixin, TimestampMixin
-from .enums import ReportFrequency
+from .enums import JobStatus, ReportFrequency
 
 
 class ReportBase(BaseModel):
     organization_id: UUID
     frequency: ReportFrequency
-    period_start: str  # ISO date
-    period_end: str
-    file_path: str
+    period_start: dt.date
+    period_end: dt.date
     summary: Optional[str] = None
 
 
-class ReportCreate(ReportBase):
-    pass
+class ReportCreate(BaseModel):
+    organization_id: Optional[UUID] = None  # superadmins only; others use their org
+    frequency: ReportFrequency
+    period_start: dt.date
+    period_end: dt.date = Field(..., description="Exclusive end of the reported period")
+    summary: Optional[str] = None
+
+    @model_validator(mode="after")
+    def period_not_empty(self) -> "ReportCreate":
+        if self.period_end <= self.period_start:
+            raise ValueError("period_end must be after period_start")
+        return self
 
 
 class ReportUpdate(BaseModel):
@@ -24,7 +34,23 @@ class ReportUpdate(BaseModel):
 
 
 class ReportRead(IDMixin, TimestampMixin, ReportBase):
-    generated_at: str
+    generated_at: Optional[dt.datetime] = None
+    file_path: Optional[str] = None  # set once the PDF is generated
 
     class Config:
         from_attributes = True
+
+
+class ReportStatusRead(BaseModel):
+    """Generation progress of a report (its latest job)."""
+
+    report_id: UUID
+    status: JobStatus
+    progress: float
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    queued_at: dt.datetime
+    started_at: Optional[dt.datetime] = None
+    finished_at: Optional[dt.datetime] = None
+    generated_at: Optional[dt.datetime] = None
@@ -1,27 +1,51 @@
 # app/security/clerk_auth.py
-import os, time
-from functools import lru_cache
-from typing import Any, Dict, List, Optional, TypedDict
+import hashlib, os, time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, TypedDict
+from uuid import UUID
 from jose import jwt
 
-import httpx
 from fastapi import Depends, HTTPException, Request, WebSocket, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.deps import get_db
+from app.helpers.cache import LRUCache
 from app.models.users.users import User
 from app.models.users.organization import Organization
+from app.security.jwks import JWKSCache
 
 # ---- Settings (env) ----
-CLERK_ISSUER = os.getenv("CLERK_ISSUER", "")  # e.g. https://your-domain.clerk.accounts.dev
+CLERK_ISSUER = os.getenv(
+    "CLERK_ISSUER", ""
+)  # e.g. https://your-domain.clerk.accounts.dev
 CLERK_JWKS_URL = os.getenv("CLERK_JWKS_URL", f"{CLERK_ISSUER}/.well-known/jwks.json")
-CLERK_PERMITTED_AZP = {s.strip() for s in os.getenv("CLERK_PERMITTED_AZP", "").split(",") if s.strip()}
-SUPERADMINS = {s.strip() for s in os.getenv("SUPERADMINS", "").split(",") if s.strip()}  # clerk user ids
+CLERK_PERMITTED_AZP = {
+    s.strip() for s in os.getenv("CLERK_PERMITTED_AZP", "").split(",") if s.strip()
+}
+SUPERADMINS = {
+    s.strip() for s in os.getenv("SUPERADMINS", "").split(",") if s.strip()
+}  # clerk user ids
+CLERK_JWKS_TTL_S = float(
+    os.getenv("CLERK_JWKS_TTL_S", "3600")
+)  # background refresh after this age
+CLERK_JWKS_MIN_REFRESH_S = float(
+    os.getenv("CLERK_JWKS_MIN_REFRESH_S", "30")
+)  # unknown-kid refetch limit
+CLERK_CLAIMS_CACHE_SIZE = int(
+    os.getenv("CLERK_CLAIMS_CACHE_SIZE", "10000")
+)  # 0 disables
+CLERK_IDENTITY_CACHE_TTL_S = float(
+    os.getenv("CLERK_IDENTITY_CACHE_TTL_S", "60")
+)  # clerk id -> local row
+CLERK_IDENTITY_CACHE_SIZE = int(
+    os.getenv("CLERK_IDENTITY_CACHE_SIZE", "10000")
+)  # users; 0 disables
 
 ALGORITHMS = ["RS256"]
 bearer = HTTPBearer(auto_error=True)
 
+
 class AuthContext(TypedDict, total=False):
     # raw claims (Clerk v2)
     sub: str
@@ -31,34 +55,43 @@ class AuthContext(TypedDict, total=False):
     org_permissions: List[str]
     azp: Optional[str]
 
-@lru_cache(maxsize=1)
-def _jwks() -> Dict[str, Any]:
-    try:
-        res = httpx.get(CLERK_JWKS_URL, timeout=5.0)
-        res.raise_for_status()
-        return res.json()
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to load Clerk JWKS")
 
-def _public_key_for(token: str):
+# Signing keys, parsed and indexed by kid; pre-warmed in the app lifespan
+jwks = JWKSCache(
+    CLERK_JWKS_URL,
+    ttl_s=CLERK_JWKS_TTL_S,
+    min_refresh_interval_s=CLERK_JWKS_MIN_REFRESH_S,
+    algorithm=ALGORITHMS[0],
+)
+
+
+async def _public_key_for(token: str):
     headers = jwt.get_unverified_header(token)
-    kid = headers.get("kid")
-    for key in _jwks()["keys"]:
-        if key.get("kid") == kid:
-            # jose accepts PEM key via from_jwk
-            return jwt.algorithms.RSAAlgorithm.from_jwk(key)
-    raise HTTPException(status_code=401, detail="Unknown key id (kid)")
-
-def _decode_clerk(token: str) -> Dict[str, Any]:
-    key = _public_key_for(token)
+    return await jwks.get(headers.get("kid"))
+
+
+# Verified claims by sha256(token), each expiring at the token's exp, so a token
+# the client keeps sending is only verified (RS256) once per worker.
+_claims_cache: LRUCache[bytes, Dict[str, Any]] = LRUCache(
+    maxsize=CLERK_CLAIMS_CACHE_SIZE
+)
+
+
+async def _verify_clerk(token: str) -> Dict[str, Any]:
+    key = await _public_key_for(token)
     # Validate signature + issuer; Clerk tokens typically omit `aud`, so don't enforce it.
-    claims = jwt.decode(
+    # exp / nbf are checked by _check_claims, so they fail as a 401 rather than a JWTError.
+    return jwt.decode(
         token,
         key=key,
         algorithms=ALGORITHMS,
         issuer=CLERK_ISSUER,
-        options={"verify_aud": False},
+        options={"verify_aud": False, "verify_exp": False, "verify_nbf": False},
     )
+
+
+def _check_claims(claims: Dict[str, Any]) -> None:
+    # Time- and config-dependent checks: run on every request, cached or not.
     now = int(time.time())
     if int(claims.get("exp", 0)) < now or int(claims.get("nbf", 0)) > now:
         raise HTTPException(status_code=401, detail="Token expired or not yet valid")
@@ -67,8 +100,19 @@ def _decode_clerk(token: str) -> Dict[str, Any]:
     if CLERK_PERMITTED_AZP and azp not in CLERK_PERMITTED_AZP:
         raise HTTPException(status_code=401, detail="Invalid 'azp' (origin)")
 
+
+async def _decode_clerk(token: str) -> Dict[str, Any]:
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _claims_cache.get(digest)
+    if claims is None:
+        claims = await _verify_clerk(token)
+        ttl = int(claims.get("exp", 0)) - time.time()
+        if ttl > 0:
+            _claims_cache.set(digest, claims, ttl=ttl)
+    _check_claims(claims)
     return claims
 
+
 def _claims_to_ctx(claims: Dict[str, Any]) -> AuthContext:
     # Support v2 claims directly
     ctx: AuthContext = {
@@ -77,23 +121,28 @@ def _claims_to_ctx(claims: Dict[str, Any]) -> AuthContext:
         "org_id": claims.get("org_id") or (claims.get("o") or {}).get("id"),
         "org_role": claims.get("org_role") or (claims.get("o") or {}).get("rol"),
         "org_slug": claims.get("org_slug") or (claims.get("o") or {}).get("slg"),
-        "org_permissions": claims.get("org_permissions") or (claims.get("o") or {}).get("per") or [],
+        "org_permissions": claims.get("org_permissions")
+        or (claims.get("o") or {}).get("per")
+        or [],
     }
     if not ctx["sub"]:
         raise HTTPException(status_code=401, detail="Missing subject in token")
     return ctx
 
+
 async def require_clerk_claims(
     credentials: HTTPAuthorizationCredentials = Depends(bearer),
 ) -> AuthContext:
     token = credentials.credentials
-    claims = _decode_clerk(token)
+    claims = await _decode_clerk(token)
     return _claims_to_ctx(claims)
 
+
 # ---- Map Clerk -> your DB user + org ----
 
+
 class CurrentUser(TypedDict):
-    id: str                 # your local UUID (as str)
+    id: str  # your local UUID (as str)
     clerk_user_id: str
     email: Optional[str]
     full_name: Optional[str]
@@ -103,49 +152,128 @@ class CurrentUser(TypedDict):
     is_superadmin: bool
     permissions: List[str]
 
+
+class _LocalUser(NamedTuple):
+    id: UUID
+    email: Optional[str]
+    full_name: Optional[str]
+    organization_id: Optional[UUID]
+
+
+# Clerk id -> local row, per worker. Entries are dropped by forget_user /
+# forget_orgs when this worker changes them and expire after
+# CLERK_IDENTITY_CACHE_TTL_S for changes made elsewhere.
+_user_cache: LRUCache[str, _LocalUser] = LRUCache(
+    maxsize=CLERK_IDENTITY_CACHE_SIZE, ttl=CLERK_IDENTITY_CACHE_TTL_S
+)
+# Wrapped in a tuple so "no such organization" is cached too (None is a miss)
+_org_cache: LRUCache[str, Tuple[Optional[UUID]]] = LRUCache(
+    maxsize=1024, ttl=CLERK_IDENTITY_CACHE_TTL_S
+)
+
+
+def forget_user(clerk_user_id: Optional[str] = None) -> None:
+    """Drop the cached local user for `clerk_user_id` (all users if None)."""
+    if clerk_user_id is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(clerk_user_id)
+
+
+def forget_orgs() -> None:
+    """Drop the cached Clerk org -> organization mappings (after any org change)."""
+    _org_cache.clear()
+
+
+def auth_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Size and hit/miss counters of this worker's auth caches."""
+    return {
+        "claims": _claims_cache.stats(),
+        "users": _user_cache.stats(),
+        "orgs": _org_cache.stats(),
+    }
+
+
+async def _local_user(db: AsyncSession, clerk_id: str) -> _LocalUser:
+    columns = (User.id, User.email, User.full_name, User.organization_id)
+    row = (
+        await db.execute(select(*columns).where(User.clerk_user_id == clerk_id))
+    ).first()
+    if row is None:
+        # First-time “auto-provision”: create a minimal local user row. Concurrent
+        # first requests race here; ON CONFLICT makes the losers no-ops.
+        # If you want richer data, fetch from Clerk Backend API using CLERK_SECRET_KEY.
+        await db.execute(
+            insert(User)
+            .values(
+                clerk_user_id=clerk_id, email=f"{clerk_id}@example.com", full_name=""
+            )
+            .on_conflict_do_nothing()
+        )
+        await db.commit()
+        row = (
+            await db.execute(select(*columns).where(User.clerk_user_id == clerk_id))
+        ).one()
+    return _LocalUser(*row)
+
+
+async def _org_for(db: AsyncSession, clerk_org_id: str) -> Optional[UUID]:
+    cached = _org_cache.get(clerk_org_id)
+    if cached is None:
+        cached = (
+            await db.scalar(
+                select(Organization.id).where(Organization.clerk_org_id == clerk_org_id)
+            ),
+        )
+        _org_cache.set(clerk_org_id, cached)
+    return cached[0]
+
+
 async def get_current_user(
     ctx: AuthContext = Depends(require_clerk_claims),
     db: AsyncSession = Depends(get_db),
 ) -> CurrentUser:
     clerk_id = ctx["sub"]
 
-    # Try to find local user by clerk_user_id
-    user = await db.scalar(select(User).where(User.clerk_user_id == clerk_id))
-    if not user:
-        # First-time “auto-provision”: create a minimal local user row.
-        # If you want richer data, fetch from Clerk Backend API using CLERK_SECRET_KEY.
-        user = User(clerk_user_id=clerk_id, full_name="", email=None)  # adapt fields to your model
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+    # Find (or provision) the local user by clerk_user_id
+    user = _user_cache.get(clerk_id)
+    if user is None:
+        user = await _local_user(db, clerk_id)
+        _user_cache.set(clerk_id, user)
 
     # If token has an active org, try to map to a local organization via organizations.clerk_org_id
     org_id = None
     if ctx.get("org_id"):
-        org = await db.scalar(select(Organization).where(Organization.clerk_org_id == ctx["org_id"]))
-        if org:
-            org_id = str(org.id)
-            # Optional: keep user.organization_id synced to active org
-            user.organization_id = org.id
+        org_id = await _org_for(db, ctx["org_id"])
+        if org_id is not None and org_id != user.organization_id:
+            # Keep user.organization_id synced to the active org; only written when it changes
+            await db.execute(
+                update(User).where(User.id == user.id).values(organization_id=org_id)
+            )
             await db.commit()
+            user = user._replace(organization_id=org_id)
+            _user_cache.set(clerk_id, user)
 
     return {
         "id": str(user.id),
         "clerk_user_id": clerk_id,
-        "email": getattr(user, "email", None),
-        "full_name": getattr(user, "full_name", None),
-        "organization_id": org_id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "organization_id": str(org_id) if org_id is not None else None,
         "org_role": ctx.get("org_role"),
         "org_slug": ctx.get("org_slug"),
         "is_superadmin": clerk_id in SUPERADMINS,
         "permissions": list(ctx.get("org_permissions") or []),
     }
 
+
 # ---- Role/permission guard compatible with your existing style ----
 from fastapi import HTTPException
 
+
 def role_required(*allowed_roles: str):
     allowed = set(allowed_roles)
+
     async def _dep(current: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         if current["is_superadmin"]:
             return current
@@ -154,10 +282,14 @@ def role_required(*allowed_roles: str):
         # Fallback: also allow via DB role assignments if you want:
         #   - check current user's Role names in your join tables here
         raise HTTPException(status_code=403, detail="Forbidden")
+
     return _dep
 
+
 # ---- WebSocket variant (Authorization header or ?token=...) ----
-async def get_current_user_ws(websocket: WebSocket, db: AsyncSession = Depends(get_db)) -> CurrentUser:
+async def get_current_user_ws(
+    websocket: WebSocket, db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
     auth = websocket.headers.get("authorization", "")
     token = ""
     if auth.startswith("Bearer "):
@@ -168,7 +300,7 @@ async def get_current_user_ws(websocket: WebSocket, db: AsyncSession = Depends(g
         await websocket.close(code=4401)
         raise HTTPException(status_code=401, detail="Missing token")
 
-    claims = _decode_clerk(token)
+    claims = await _decode_clerk(token)
     ctx = _claims_to_ctx(claims)
     # Reuse mapping to DB:
     return await get_current_user(ctx, db)
@@ -0,0 +1,135 @@
+# app/security/jwks.py
+"""
+In-process cache of a JSON Web Key Set (the signing keys of an identity provider).
+
+Keys are parsed once into jose key objects and indexed by `kid`, so a
+request only does a dict lookup. The set is refreshed:
+
+- in the background when it is older than `ttl_s` (requests keep using the
+  cached keys meanwhile);
+- right away when a token names an unknown `kid` (key rotation), at most
+  once per `min_refresh_interval_s` so tokens with made-up kids cannot make
+  us hammer the provider.
+
+Concurrent refreshes are single-flight: every caller awaits the same fetch.
+A failed fetch keeps the previous keys.
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from fastapi import HTTPException, status
+from jose import jwk
+from jose.backends.base import Key
+
+log = logging.getLogger(__name__)
+
+Fetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class JWKSCache:
+    def __init__(
+        self,
+        url: str,
+        *,
+        ttl_s: float = 3600.0,
+        min_refresh_interval_s: float = 30.0,
+        timeout_s: float = 5.0,
+        algorithm: str = "RS256",
+        fetch: Optional[Fetcher] = None,
+    ) -> None:
+        self.url = url
+        self.ttl_s = ttl_s
+        self.min_refresh_interval_s = min_refresh_interval_s
+        self.timeout_s = timeout_s
+        self.algorithm = algorithm
+        self._fetch = fetch or self._http_fetch
+        self.keys: Dict[str, Key] = {}
+        self.loaded_at: Optional[
+            float
+        ] = None  # monotonic time of the last successful fetch
+        self._attempted_at: Optional[
+            float
+        ] = None  # ... of the last attempt, successful or not
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def _http_fetch(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=self.timeout_s) as client:
+            res = await client.get(self.url)
+            res.raise_for_status()
+            return res.json()
+
+    def _parse(self, jwks: Dict[str, Any]) -> Dict[str, Key]:
+        keys: Dict[str, Key] = {}
+        for data in jwks.get("keys", []):
+            kid = data.get("kid")
+            if not kid or data.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = jwk.construct(
+                    data, algorithm=data.get("alg", self.algorithm)
+                )
+            except Exception:
+                log.warning("Skipping unusable JWK %s from %s", kid, self.url)
+        return keys
+
+    async def _load(self) -> None:
+        self._attempted_at = time.monotonic()
+        try:
+            keys = self._parse(await self._fetch())
+        except Exception:
+            log.exception("Failed to fetch JWKS from %s", self.url)
+            return
+        if not keys:
+            log.error("JWKS from %s has no usable signing keys", self.url)
+            return
+        self.keys = keys
+        self.loaded_at = time.monotonic()
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._load())
+        return self._inflight
+
+    async def refresh(self) -> None:
+        """Fetch the key set now, joining a fetch already in flight."""
+        # shield: a cancelled request must not cancel the fetch other callers await
+        await asyncio.shield(self._start_refresh())
+
+    async def warm(self) -> None:
+        """Load the keys ahead of the first request (startup); failures are only logged."""
+        await self.refresh()
+
+    def _stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.ttl_s
+
+    def _may_refresh(self) -> bool:
+        return (
+            self._attempted_at is None
+            or time.monotonic() - self._attempted_at >= self.min_refresh_interval_s
+        )
+
+    async def get(self, kid: Optional[str]) -> Key:
+        """The key for `kid`; 401 if the provider does not have it, 500 if no keys could be loaded."""
+        refreshing = self._inflight is not None and not self._inflight.done()
+        if not self.keys or (kid and kid not in self.keys):
+            if refreshing or self._may_refresh():
+                await self.refresh()
+        elif self._stale() and self._may_refresh():
+            self._start_refresh()
+
+        key = self.keys.get(kid) if kid else None
+        if key is not None:
+            return key
+        if not self.keys:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to load JWKS",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown key id (kid)"
+        )
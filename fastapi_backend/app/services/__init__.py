@@ -6,6 +6,10 @@ from .alert import AlertService
 from .report import ReportService
 from .pipeline import PipelineService
 from .asset import AssetService
+from .asset_upload import AssetUploadService
+from .coverage import CoverageService
+from .risk import RiskService
+from .hotspot import HotspotService
 
 __all__ = [
     "OrganizationService",
@@ -16,4 +20,8 @@ __all__ = [
     "ReportService",
     "PipelineService",
     "AssetService",
+    "AssetUploadService",
+    "CoverageService",
+    "RiskService",
+    "HotspotService",
 ]
@@ -1,13 +1,93 @@
 from __future__ import annotations
+import asyncio
+import datetime as dt
+import mimetypes
+import os
+from contextlib import suppress
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 from uuid import UUID
-from fastapi import UploadFile, HTTPException, status
+from fastapi import UploadFile, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.asset import AssetCreate, AssetRead
-from app.repositories import AssetRepository
+from app.core.config import settings
+from app.helpers.files import spool_upload
+from app.helpers.json_filter import parse_json_filters
+from app.models import Asset
+from app.processing.queue import kick
+from app.schemas.asset import AssetCreate, AssetRead, PresignedRequestRead
+from app.schemas.enums import AssetType, ProcessingStatus
+from app.repositories import AssetRepository, BlobRepository
 from app.security.clerk import CurrentUser
+from app.storage import get_storage
+from app.storage.responses import content_response
 from .base import BaseService
+from .blob import adopt_blob, blob_key, tmp_dir
+from .preview import PREVIEW_TYPES, preview_key
+from .tiles import TILED_TYPES, TILE_PATH, tile_key
+
+# Caps simultaneous upload writes per process; extra requests wait their turn.
+upload_slots = asyncio.Semaphore(settings.ASSET_UPLOAD_CONCURRENCY)
+
+
+def upload_org(current_user: CurrentUser, requested: Optional[UUID]) -> UUID:
+    """
+    Organization an upload lands in.
+    - Superusers may upload into any organization by specifying it.
+    - Regular users only upload into their own organization.
+    """
+    if current_user["is_superadmin"]:
+        return requested
+    org_id = current_user["organization_id"]
+    # CurrentUser carries the id as a string; compare as UUIDs
+    if org_id is None or requested != UUID(str(org_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not permitted to upload to this organization",
+        )
+    return requested
+
+
+def clean_filename(filename: Optional[str]) -> str:
+    """Client file names are kept as metadata only, reduced to their base name."""
+    name = Path(filename or "").name
+    if not name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file has no name",
+        )
+    return name
+
+
+def build_asset(
+    org_id: UUID,
+    blob_id: UUID,
+    sha256: str,
+    size: int,
+    filename: str,
+    asset_type: AssetType,
+    captured_at: Any,
+    metadata: Optional[Dict[str, Any]],
+    footprint_wkt: Optional[str],
+) -> Asset:
+    """Per-asset row pointing at a shared content-addressed blob."""
+    return Asset(
+        organization_id=org_id,
+        asset_type=asset_type,
+        file_path=blob_key(sha256),
+        filename=filename,
+        blob_id=blob_id,
+        content_sha256=sha256,
+        size_bytes=size,
+        captured_at=captured_at,
+        asset_metadata=metadata,
+        footprint=f"SRID=4326;{footprint_wkt}" if footprint_wkt else None,
+        metadata_status=ProcessingStatus.PENDING,
+        preview_status=ProcessingStatus.PENDING
+        if asset_type in PREVIEW_TYPES
+        else None,
+        tiles_status=ProcessingStatus.PENDING if asset_type in TILED_TYPES else None,
+    )
 
 
 class AssetService(BaseService[AssetRepository]):
@@ -16,6 +96,15 @@ class AssetService(BaseService[AssetRepository]):
     supporting both global superusers and org-scoped users.
     """
 
+    def __init__(
+        self,
+        repo: AssetRepository,
+        blob_repo: BlobRepository,
+        db: AsyncSession,
+    ) -> None:
+        super().__init__(repo, db)
+        self.blob_repo = blob_repo
+
     async def upload(
         self,
         current_user: CurrentUser,
@@ -27,36 +116,39 @@ class AssetService(BaseService[AssetRepository]):
         - Superusers may upload into any organization by specifying data.organization_id.
         - Regular users only upload into their own organization.
         """
-        # Determine target org
-        if current_user["is_superadmin"]:
-            org_id = data.organization_id
-        else:
-            org_id = current_user["organization_id"]
-            if data.organization_id != org_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not permitted to upload to this organization",
-                )
-
-        # Prepare storage path
-        dest_dir = Path("/data/assets") / str(org_id)
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        dest = dest_dir / file.filename
-        content = await file.read()
-        dest.write_bytes(content)
-
-        # Create DB record
-        asset_db = self.repo.model(
-            organization_id=org_id,
-            asset_type=data.asset_type,
-            file_path=str(dest),
-            captured_at=data.captured_at,
-            asset_metadata=data.metadata,
-            footprint=(
-                f"SRID=4326;{data.footprint_wkt}" if data.footprint_wkt else None
-            ),
+        org_id = upload_org(current_user, data.organization_id)
+        filename = clean_filename(file.filename)
+
+        # Stream to scratch space (constant memory, writes off the event loop),
+        # then hand the bytes to the content-addressed store.
+        async with upload_slots:
+            stored = await spool_upload(
+                file,
+                tmp_dir(),
+                max_bytes=settings.ASSET_MAX_UPLOAD_BYTES,
+                chunk_size=settings.ASSET_UPLOAD_CHUNK_BYTES,
+            )
+        try:
+            blob_id = await adopt_blob(
+                self.blob_repo, stored.path, stored.sha256, stored.size
+            )
+        finally:
+            with suppress(FileNotFoundError):
+                os.unlink(stored.path)
+
+        asset_db = build_asset(
+            org_id,
+            blob_id,
+            stored.sha256,
+            stored.size,
+            filename,
+            data.asset_type,
+            data.captured_at,
+            data.metadata,
+            data.footprint_wkt,
         )
         await self.repo.create(asset_db)
+        kick()
         validated: AssetRead = AssetRead.model_validate(asset_db)
         return validated
 
@@ -65,15 +157,19 @@ class AssetService(BaseService[AssetRepository]):
         current_user: CurrentUser,
         limit: int | None = None,
         offset: int | None = None,
+        metadata_filters: Sequence[str] = (),
     ) -> List[AssetRead]:
         """
         List assets. Superusers see all; others see org-scoped.
+        `metadata_filters` use the app.helpers.json_filter syntax.
         """
+        filters = parse_json_filters(Asset.asset_metadata, metadata_filters)
         if current_user["is_superadmin"]:
-            rows = await self.repo.list(limit=limit, offset=offset)
+            rows = await self.repo.list(filters=filters, limit=limit, offset=offset)
         else:
             rows = await self.repo.list_by_org(
                 current_user["organization_id"],
+                filters=filters,
                 limit=limit,
                 offset=offset,
             )
@@ -90,7 +186,9 @@ class AssetService(BaseService[AssetRepository]):
         if current_user["is_superadmin"]:
             asset = await self.repo.get(asset_id)
         else:
-            asset = await self.repo.get_in_org(current_user["organization_id"], asset_id)
+            asset = await self.repo.get_in_org(
+                current_user["organization_id"], asset_id
+            )
         if not asset:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -98,3 +196,122 @@ class AssetService(BaseService[AssetRepository]):
             )
         validated: AssetRead = AssetRead.model_validate(asset)
         return validated
+
+    async def download_url(
+        self,
+        current_user: CurrentUser,
+        asset_id: UUID,
+    ) -> PresignedRequestRead:
+        """Time-limited link that serves the asset's bytes straight from storage."""
+        asset = await self.get_asset(current_user, asset_id)
+        expires_s = settings.STORAGE_URL_TTL_S
+        storage = await get_storage().locate(asset.file_path)  # hot or cold tier
+        presigned = storage.presign_get(asset.file_path, expires_s, asset.filename)
+        return PresignedRequestRead(
+            url=presigned.url,
+            method=presigned.method,
+            headers=presigned.headers,
+            expires_at=dt.datetime.now(dt.timezone.utc)
+            + dt.timedelta(seconds=expires_s),
+        )
+
+    async def content(
+        self,
+        current_user: CurrentUser,
+        asset_id: UUID,
+        request_headers: Mapping[str, str],
+    ) -> Response:
+        """
+        The asset's bytes, honouring Range, If-None-Match and If-Range. The
+        content hash doubles as a strong ETag since blobs never change.
+        """
+        asset = await self.get_asset(current_user, asset_id)
+        # Nothing else to read: don't hold a transaction open while streaming.
+        await self.db.rollback()
+        storage = get_storage()
+        size = asset.size_bytes
+        if size is None:
+            size = await storage.size(asset.file_path)
+        if size is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Asset content not found",
+            )
+        filename = asset.filename or asset.file_path.rsplit("/", 1)[-1]
+        return content_response(
+            storage,
+            asset.file_path,
+            size,
+            request_headers,
+            etag=f'"{asset.content_sha256}"' if asset.content_sha256 else None,
+            media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            filename=filename,
+        )
+
+    async def preview(
+        self,
+        current_user: CurrentUser,
+        asset_id: UUID,
+        name: str,
+        request_headers: Mapping[str, str],
+    ) -> Response:
+        """A generated preview (thumbnail, poster or sprite sheet) of the asset."""
+        asset = await self.get_asset(current_user, asset_id)
+        await self.db.rollback()
+        if name not in (asset.previews or []) or asset.content_sha256 is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preview not found",
+            )
+        storage = get_storage()
+        key = preview_key(asset.content_sha256, name)
+        size = await storage.size(key)
+        if size is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preview not found",
+            )
+        return content_response(
+            storage,
+            key,
+            size,
+            request_headers,
+            etag=f'"{asset.content_sha256}-{name}"',
+            media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        )
+
+    async def tile(
+        self,
+        current_user: CurrentUser,
+        asset_id: UUID,
+        path: str,
+        request_headers: Mapping[str, str],
+    ) -> Response:
+        """A Deep Zoom descriptor or tile of the asset's pyramid."""
+        asset = await self.get_asset(current_user, asset_id)
+        await self.db.rollback()
+        if (
+            asset.tiles_status != ProcessingStatus.READY
+            or asset.content_sha256 is None
+            or not TILE_PATH.match(path)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tile not found",
+            )
+        storage = get_storage()
+        key = tile_key(asset.content_sha256, path)
+        size = await storage.size(key)
+        if size is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tile not found",
+            )
+        return content_response(
+            storage,
+            key,
+            size,
+            request_headers,
+            etag=f'"{asset.content_sha256}-{path}"',
+            media_type=mimetypes.guess_type(path)[0] or "application/xml",
+        )
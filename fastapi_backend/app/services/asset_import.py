@@ -0,0 +1,124 @@
+from __future__ import annotations
+import asyncio
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models import AssetImport
+from app.repositories import AssetImportRepository
+from app.schemas.asset import AssetImportCreate, AssetImportRead
+from app.schemas.enums import AssetType, JobStatus
+from app.security.clerk import CurrentUser
+from .base import BaseService
+
+# Extensions picked up when the import does not force an asset type;
+# everything else (flight logs, sidecars, ...) is left alone.
+IMPORT_EXTENSIONS = {
+    **dict.fromkeys(
+        (".jpg", ".jpeg", ".png", ".webp", ".heic", ".dng"), AssetType.IMAGE
+    ),
+    **dict.fromkeys(
+        (".tif", ".tiff", ".jp2", ".geojson", ".kml", ".kmz"), AssetType.GIS
+    ),
+    **dict.fromkeys((".mp4", ".mov", ".mkv", ".avi", ".ts"), AssetType.VIDEO),
+}
+
+
+def resolve_import_dir(directory: str) -> Path:
+    """
+    The real path of `directory`, which must lie below one of IMPORT_ROOTS
+    (symlinks resolved first, so they cannot escape).
+    """
+    roots = [Path(root).resolve() for root in settings.IMPORT_ROOTS]
+    if not roots:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk import is not configured on this server",
+        )
+    path = Path(directory).resolve()
+    if not any(path == root or root in path.parents for root in roots):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Directory is outside the allowed import roots",
+        )
+    if not path.is_dir():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Directory not found",
+        )
+    return path
+
+
+def scan_directory(
+    root: Path,
+    asset_type: Optional[AssetType],
+    recursive: bool,
+) -> List[Tuple[str, AssetType]]:
+    """
+    (relative path, asset type) of every importable file, sorted so a
+    resumed import sees the same order. Hidden entries and symlinks are
+    skipped.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = (
+            sorted(d for d in dirnames if not d.startswith(".")) if recursive else []
+        )
+        for name in filenames:
+            path = Path(dirpath) / name
+            if name.startswith(".") or path.is_symlink() or not path.is_file():
+                continue
+            kind = asset_type or IMPORT_EXTENSIONS.get(path.suffix.lower())
+            if kind is not None:
+                found.append((path.relative_to(root).as_posix(), kind))
+    return sorted(found)
+
+
+class AssetImportService(BaseService[AssetImportRepository]):
+    """Bulk imports of server-side directories (superadmin only)."""
+
+    async def create(
+        self,
+        current_user: CurrentUser,
+        data: AssetImportCreate,
+    ) -> AssetImportRead:
+        """Queue an import; the caller starts it with app.jobs.imports.start_import."""
+        self._ensure_superadmin(current_user)
+        directory = await asyncio.to_thread(resolve_import_dir, data.directory)
+        job = AssetImport(
+            organization_id=data.organization_id,
+            status=JobStatus.QUEUED,
+            directory=str(directory),
+            recursive=data.recursive,
+            asset_type=data.asset_type,
+            asset_metadata=data.metadata,
+        )
+        await self.repo.create(job)
+        return AssetImportRead.model_validate(job)
+
+    async def get_import(
+        self,
+        current_user: CurrentUser,
+        import_id: UUID,
+    ) -> AssetImportRead:
+        """Progress and per-file errors of an import."""
+        self._ensure_superadmin(current_user)
+        job = await self.repo.get(import_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import not found",
+            )
+        return AssetImportRead.model_validate(job)
+
+    @staticmethod
+    def _ensure_superadmin(current_user: CurrentUser) -> None:
+        # Server paths are shared by every tenant, so only superadmins import.
+        if not current_user["is_superadmin"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only superadmins can run bulk imports",
+            )
@@ -0,0 +1,420 @@
+from __future__ import annotations
+import asyncio
+import datetime as dt
+import math
+import os
+import uuid
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.helpers.files import allocate_file, hash_file, locked_file, write_stream_at
+from app.models import AssetUpload
+from app.processing.queue import kick
+from app.repositories import AssetRepository, AssetUploadRepository, BlobRepository
+from app.schemas.asset import (
+    AssetRead,
+    AssetUploadComplete,
+    AssetUploadCreate,
+    AssetUploadRead,
+    DirectUploadRead,
+    PresignedRequestRead,
+)
+from app.schemas.enums import UploadStatus
+from app.security.clerk import CurrentUser
+from app.storage import get_storage
+from .asset import build_asset, clean_filename, upload_org, upload_slots
+from .blob import adopt_blob, adopt_stored_blob
+from .base import BaseService
+
+
+def staging_dir() -> Path:
+    return Path(settings.ASSET_ROOT) / ".staging"
+
+
+@asynccontextmanager
+async def staging_lock(
+    path: Optional[Path], *, shared: bool = False, blocking: bool = True
+) -> AsyncIterator[bool]:
+    """
+    Lock a chunked upload's staging file: chunk writes share it; complete,
+    abort and the janitor take it exclusively, before any row lock. Direct
+    uploads (path None) and staging files already gone need no lock.
+    """
+    if path is None or not await asyncio.to_thread(path.exists):
+        yield True
+        return
+    async with locked_file(path, shared=shared, blocking=blocking) as acquired:
+        yield acquired
+
+
+class AssetUploadService(BaseService[AssetUploadRepository]):
+    """
+    Resumable, chunked uploads: create, PUT chunks (any order, in parallel),
+    complete. Chunk i covers bytes [i * chunk_size, (i + 1) * chunk_size) of a
+    preallocated staging file; the Asset row is created on completion.
+    """
+
+    def __init__(
+        self,
+        repo: AssetUploadRepository,
+        asset_repo: AssetRepository,
+        blob_repo: BlobRepository,
+        db: AsyncSession,
+    ) -> None:
+        super().__init__(repo, db)
+        self.asset_repo = asset_repo
+        self.blob_repo = blob_repo
+
+    async def create(
+        self,
+        current_user: CurrentUser,
+        data: AssetUploadCreate,
+    ) -> AssetUploadRead:
+        """
+        Register an upload and allocate its staging file. If the caller sends
+        the file's SHA-256 and their organization already stores that content,
+        the asset is created straight away and the upload is born completed.
+        """
+        org_id = upload_org(current_user, data.organization_id)
+        filename = clean_filename(data.filename)
+        if data.sha256:
+            duplicate = await self._create_duplicate(org_id, filename, data)
+            if duplicate is not None:
+                return duplicate
+        self._check_size(data.total_size, settings.ASSET_MAX_UPLOAD_BYTES)
+        upload_id = uuid.uuid4()
+        staging_path = staging_dir() / f"{upload_id}.part"
+        await allocate_file(staging_path, data.total_size)
+        upload = self._new_upload(
+            upload_id,
+            org_id,
+            filename,
+            data,
+            str(staging_path),
+            settings.ASSET_UPLOAD_PART_BYTES,
+        )
+        upload.sha256 = data.sha256.lower() if data.sha256 else None
+        await self.repo.create(upload)
+        return await self._to_read(upload)
+
+    async def create_direct(
+        self,
+        current_user: CurrentUser,
+        data: AssetUploadCreate,
+    ) -> DirectUploadRead:
+        """
+        Register an upload that goes straight to storage through a presigned
+        PUT, bypassing the API. The declared SHA-256 is verified on complete.
+        """
+        org_id = upload_org(current_user, data.organization_id)
+        filename = clean_filename(data.filename)
+        if not data.sha256:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="sha256 is required for direct uploads",
+            )
+        duplicate = await self._create_duplicate(org_id, filename, data)
+        if duplicate is not None:
+            return DirectUploadRead(upload=duplicate)
+        self._check_size(
+            data.total_size,
+            min(settings.ASSET_MAX_UPLOAD_BYTES, settings.STORAGE_DIRECT_MAX_BYTES),
+        )
+        upload_id = uuid.uuid4()
+        upload = self._new_upload(
+            upload_id, org_id, filename, data, f"incoming/{upload_id}", data.total_size
+        )
+        upload.direct = True
+        upload.sha256 = data.sha256.lower()
+        await self.repo.create(upload)
+
+        expires_s = settings.STORAGE_URL_TTL_S
+        presigned = get_storage().presign_put(
+            upload.staging_path, expires_s, upload.total_size, upload.sha256
+        )
+        return DirectUploadRead(
+            upload=await self._to_read(upload),
+            request=PresignedRequestRead(
+                url=presigned.url,
+                method=presigned.method,
+                headers=presigned.headers,
+                expires_at=dt.datetime.now(dt.timezone.utc)
+                + dt.timedelta(seconds=expires_s),
+            ),
+        )
+
+    async def get_upload(
+        self,
+        current_user: CurrentUser,
+        upload_id: UUID,
+    ) -> AssetUploadRead:
+        """Progress of an upload; clients resume by sending the missing chunks."""
+        return await self._to_read(await self._get(current_user, upload_id))
+
+    async def put_chunk(
+        self,
+        current_user: CurrentUser,
+        upload_id: UUID,
+        index: int,
+        body: AsyncIterator[bytes],
+    ) -> None:
+        """
+        Write one chunk at its offset. Re-sending a chunk simply overwrites it.
+        The staging file stays share-locked from the status check until the
+        chunk is recorded, so complete() and abort() wait for it; no
+        transaction (or pooled connection) is held while the body streams.
+        """
+        upload = await self._get(current_user, upload_id)
+        self._ensure_pending(upload)
+        if upload.direct:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Direct uploads go to their presigned URL, not in chunks",
+            )
+        chunk_count = math.ceil(upload.total_size / upload.chunk_size)
+        if not 0 <= index < chunk_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk index must be between 0 and {chunk_count - 1}",
+            )
+        offset = index * upload.chunk_size
+        length = min(upload.chunk_size, upload.total_size - offset)
+        path = Path(upload.staging_path)
+        await self.db.rollback()
+
+        async with upload_slots, staging_lock(path, shared=True):
+            # complete() may have finished since the check above; the lock
+            # keeps it (and abort) from starting until this chunk is recorded.
+            current = await self.repo.get_status(upload_id)
+            await self.db.rollback()
+            if current != UploadStatus.PENDING:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload is {current.value if current else 'gone'}",
+                )
+            await write_stream_at(body, path, offset, length)
+            await self.repo.record_chunk(upload_id, index, length)
+
+    async def complete(
+        self,
+        current_user: CurrentUser,
+        upload_id: UUID,
+        data: AssetUploadComplete,
+    ) -> AssetRead:
+        """Verify the bytes arrived intact, store them as a blob and create the Asset."""
+        staging = self._staging(await self._get(current_user, upload_id))
+        await self.db.rollback()  # no connection held while chunk writes drain
+        async with staging_lock(staging):
+            upload = await self.repo.get_for_update(upload_id)
+            self._ensure_pending(upload)
+            expected = (data.sha256 or upload.sha256 or "").lower() or None
+            if upload.direct:
+                blob_id, sha256, size = await self._adopt_direct(upload, expected)
+            else:
+                blob_id, sha256, size = await self._adopt_staged(upload, expected)
+            asset_db = build_asset(
+                upload.organization_id,
+                blob_id,
+                sha256,
+                size,
+                upload.filename,
+                upload.asset_type,
+                upload.captured_at,
+                upload.asset_metadata,
+                upload.footprint_wkt,
+            )
+            await self.asset_repo.create(asset_db, commit=False)
+            await self.db.flush()
+            upload.status = UploadStatus.COMPLETED
+            upload.asset_id = asset_db.id
+            await self.repo.delete_chunks(upload_id, commit=False)
+            await self._commit()
+        kick()
+        await self.db.refresh(asset_db)
+        return AssetRead.model_validate(asset_db)
+
+    async def abort(self, current_user: CurrentUser, upload_id: UUID) -> None:
+        """Cancel a pending upload and free its staging file."""
+        staging = self._staging(await self._get(current_user, upload_id))
+        await self.db.rollback()
+        async with staging_lock(staging):
+            upload = await self.repo.get_for_update(upload_id)
+            self._ensure_pending(upload)
+            await discard_upload(self.repo, upload)
+            await self._commit()
+
+    @staticmethod
+    def _staging(upload: AssetUpload) -> Optional[Path]:
+        return None if upload.direct else Path(upload.staging_path)
+
+    async def _create_duplicate(
+        self,
+        org_id: UUID,
+        filename: str,
+        data: AssetUploadCreate,
+    ) -> Optional[AssetUploadRead]:
+        # Only content the organization already holds: a hash alone must not
+        # grant access to another organization's bytes.
+        blob = await self.blob_repo.find_in_org(org_id, data.sha256.lower())
+        if blob is None or blob.size_bytes != data.total_size:
+            return None
+        blob_id, _ = await self.blob_repo.acquire(blob.sha256, blob.size_bytes)
+        asset_db = build_asset(
+            org_id,
+            blob_id,
+            blob.sha256,
+            blob.size_bytes,
+            filename,
+            data.asset_type,
+            data.captured_at,
+            data.metadata,
+            data.footprint_wkt,
+        )
+        await self.asset_repo.create(asset_db, commit=False)
+        await self.db.flush()
+        upload = self._new_upload(
+            uuid.uuid4(), org_id, filename, data, "", blob.size_bytes
+        )
+        upload.status = UploadStatus.COMPLETED
+        upload.sha256 = blob.sha256
+        upload.asset_id = asset_db.id
+        await self.repo.create(upload)
+        kick()
+        return await self._to_read(upload)
+
+    async def _adopt_staged(
+        self,
+        upload: AssetUpload,
+        expected: Optional[str],
+    ) -> Tuple[UUID, str, int]:
+        received = await self.repo.received_chunks(upload.id)
+        chunk_count = math.ceil(upload.total_size / upload.chunk_size)
+        if len(received) != chunk_count:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{chunk_count - len(received)} of {chunk_count} chunks missing",
+            )
+        staging_path = Path(upload.staging_path)
+        sha256, size = await hash_file(staging_path, settings.ASSET_UPLOAD_CHUNK_BYTES)
+        self._check_digest(expected, sha256, "re-send the affected chunks")
+        blob_id = await adopt_blob(self.blob_repo, staging_path, sha256, size)
+        return blob_id, sha256, size
+
+    async def _adopt_direct(
+        self,
+        upload: AssetUpload,
+        expected: Optional[str],
+    ) -> Tuple[UUID, str, int]:
+        storage = get_storage()
+        size = await storage.size(upload.staging_path)
+        if size != upload.total_size:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="File has not been uploaded to storage yet",
+            )
+        sha256 = await storage.sha256(upload.staging_path)
+        self._check_digest(expected, sha256, "upload the file again")
+        blob_id = await adopt_stored_blob(
+            self.blob_repo, upload.staging_path, sha256, size
+        )
+        return blob_id, sha256, size
+
+    @staticmethod
+    def _check_digest(expected: Optional[str], actual: str, remedy: str) -> None:
+        if expected and expected != actual:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"SHA-256 mismatch; {remedy}",
+            )
+
+    @staticmethod
+    def _check_size(size: int, limit: int) -> None:
+        if size > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {limit} byte limit for this upload method",
+            )
+
+    def _new_upload(
+        self,
+        upload_id: UUID,
+        org_id: UUID,
+        filename: str,
+        data: AssetUploadCreate,
+        staging_path: str,
+        chunk_size: int,
+    ) -> AssetUpload:
+        return self.repo.model(
+            id=upload_id,
+            organization_id=org_id,
+            status=UploadStatus.PENDING,
+            filename=filename,
+            total_size=data.total_size,
+            chunk_size=chunk_size,
+            staging_path=staging_path,
+            asset_type=data.asset_type,
+            captured_at=data.captured_at,
+            footprint_wkt=data.footprint_wkt,
+            asset_metadata=data.metadata,
+        )
+
+    async def _get(self, current_user: CurrentUser, upload_id: UUID) -> AssetUpload:
+        if current_user["is_superadmin"]:
+            upload = await self.repo.get(upload_id)
+        else:
+            upload = await self.repo.get_in_org(
+                current_user["organization_id"], upload_id
+            )
+        if not upload:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found",
+            )
+        return upload
+
+    @staticmethod
+    def _ensure_pending(upload: AssetUpload) -> None:
+        if upload.status != UploadStatus.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is {upload.status.value}",
+            )
+
+    async def _to_read(self, upload: AssetUpload) -> AssetUploadRead:
+        received = await self.repo.received_chunks(upload.id)
+        last = math.ceil(upload.total_size / upload.chunk_size) - 1
+        received_bytes = len(received) * upload.chunk_size
+        if received and received[-1] == last:
+            # The final chunk is usually short
+            received_bytes -= upload.chunk_size * (last + 1) - upload.total_size
+        return AssetUploadRead(
+            id=upload.id,
+            direct=upload.direct,
+            created_at=upload.created_at,
+            updated_at=upload.updated_at,
+            organization_id=upload.organization_id,
+            status=upload.status,
+            filename=upload.filename,
+            total_size=upload.total_size,
+            chunk_size=upload.chunk_size,
+            chunk_count=last + 1,
+            received_chunks=received,
+            received_bytes=received_bytes,
+            asset_id=upload.asset_id,
+        )
+
+
+async def discard_upload(repo: AssetUploadRepository, upload: AssetUpload) -> None:
+    """Mark an upload aborted and delete its staging data (caller commits)."""
+    if upload.direct:
+        await get_storage().delete(upload.staging_path)
+    else:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, upload.staging_path)
+    upload.status = UploadStatus.ABORTED
+    await repo.delete_chunks(upload.id, commit=False)
@@ -0,0 +1,88 @@
+"""Content-addressed blob store: object key <sha256[:2]>/<sha256> in the storage backend."""
+
+from __future__ import annotations
+import asyncio
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from uuid import UUID
+
+from app.core.config import settings
+from app.repositories import BlobRepository
+from app.storage import get_storage
+
+
+def blob_key(sha256: str) -> str:
+    return f"{sha256[:2]}/{sha256}"
+
+
+def derived_key(sha256: str, name: str) -> str:
+    """Files generated from a blob (previews, tiles) live next to it."""
+    return f"{sha256[:2]}/{sha256}.d/{name}"
+
+
+def tmp_dir() -> Path:
+    """Local scratch space; on the local backend it shares the blobs' filesystem."""
+    return Path(settings.ASSET_ROOT) / ".tmp"
+
+
+async def adopt_blob(repo: BlobRepository, src: Path, sha256: str, size: int) -> UUID:
+    """
+    Reference the blob for `sha256` and make sure its bytes are stored. New
+    content is moved into storage; a duplicate's local file is simply deleted,
+    so identical uploads cost no extra space. The caller commits.
+    """
+    storage = get_storage()
+    blob_id, created = await repo.acquire(sha256, size)
+    key = blob_key(sha256)
+    if created or not await storage.exists(key):
+        await storage.put_file(key, src)
+    else:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, src)
+    return blob_id
+
+
+async def store_blob_copy(src: Path, sha256: str, created: bool) -> None:
+    """
+    Storage half of `adopt_blob` for a file that must stay where it is
+    (bulk imports): the bytes are copied, and only if the blob is new or
+    its object went missing.
+    """
+    storage = get_storage()
+    key = blob_key(sha256)
+    if not created and await storage.exists(key):
+        return
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    fd, tmp = await asyncio.to_thread(tempfile.mkstemp, dir=scratch, prefix="import-")
+    os.close(fd)
+    try:
+        # copyfile uses copy_file_range/sendfile where available
+        await asyncio.to_thread(shutil.copyfile, src, tmp)
+        await storage.put_file(key, Path(tmp))
+    finally:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, tmp)
+
+
+async def adopt_stored_blob(
+    repo: BlobRepository, src_key: str, sha256: str, size: int
+) -> UUID:
+    """`adopt_blob` for bytes already in storage (e.g. a presigned direct upload)."""
+    storage = get_storage()
+    blob_id, created = await repo.acquire(sha256, size)
+    key = blob_key(sha256)
+    if created or not await storage.exists(key):
+        await storage.move(src_key, key)
+    else:
+        await storage.delete(src_key)
+    return blob_id
+
+
+async def remove_blob(sha256: str) -> None:
+    storage = get_storage()
+    await storage.delete(blob_key(sha256))
+    await storage.delete_prefix(derived_key(sha256, ""))
@@ -2,12 +2,15 @@ from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 
+from fastapi import HTTPException, status
+
 from app.security.clerk import CurrentUser
 
 
 @dataclass(frozen=True)
 class UserContext:
     """Lightweight, service-friendly view of the current user."""
+
     user_id: UUID
     organization_id: Optional[UUID]
     is_superadmin: bool
@@ -25,3 +28,19 @@ def ctx_from_current_user(cu: CurrentUser) -> UserContext:
         organization_id=org_id,
         is_superadmin=bool(cu.get("is_superadmin", False)),
     )
+
+
+def org_scope(cu: CurrentUser) -> Optional[UUID]:
+    """
+    Organization to filter a read by: None (every organization) for
+    superadmins, the active organization for everyone else. Users without
+    one get a 400, never an unscoped query.
+    """
+    if cu.get("is_superadmin"):
+        return None
+    if not cu.get("organization_id"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No active organization",
+        )
+    return UUID(str(cu["organization_id"]))
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import asyncio
+import datetime as dt
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+from shapely import from_wkb
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.coverage import CoverageResult, compute_coverage
+from app.analytics.linear import degrees_for_km
+from app.core.config import settings
+from app.core.executors import run_in_process
+from app.helpers.cache import LRUCache
+from app.repositories import AssetRepository, PipelineRepository
+from app.schemas.pipeline import PipelineCoverageRead, SegmentCoverageRead
+from app.security.clerk import CurrentUser
+from .base import BaseService
+from .context import org_scope
+
+# Keyed on (pipeline, pipeline version, period, params, footprint-set version),
+# so any edit to the pipeline or to a matching asset produces a new key.
+_coverage_cache: LRUCache[tuple, CoverageResult] = LRUCache(
+    maxsize=settings.COVERAGE_CACHE_SIZE
+)
+
+
+class CoverageService(BaseService[PipelineRepository]):
+    """
+    Computes how much of each pipeline was imaged (asset footprints) in a period.
+    Geometry work runs in the shared process pool; results are cached.
+    """
+
+    def __init__(
+        self,
+        repo: PipelineRepository,
+        asset_repo: AssetRepository,
+        db: AsyncSession,
+    ) -> None:
+        super().__init__(repo, db)
+        self.asset_repo = asset_repo
+
+    async def pipeline_coverage(
+        self,
+        current_user: CurrentUser,
+        pipeline_id: UUID,
+        start: dt.datetime,
+        end: dt.datetime,
+        segment_km: Optional[float] = None,
+    ) -> PipelineCoverageRead:
+        """Coverage for a single pipeline, scoped to the caller's organization."""
+        org_id = org_scope(current_user)
+        rows = await self.repo.list_geometries(org_id, pipeline_id)
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pipeline not found or has no geometry",
+            )
+        [result] = await self._compute(rows, start, end, segment_km)
+        return result
+
+    async def org_coverage(
+        self,
+        current_user: CurrentUser,
+        start: dt.datetime,
+        end: dt.datetime,
+        segment_km: Optional[float] = None,
+    ) -> List[PipelineCoverageRead]:
+        """Coverage for every pipeline with a geometry in the caller's organization."""
+        org_id = org_scope(current_user)
+        rows = await self.repo.list_geometries(org_id)
+        return await self._compute(rows, start, end, segment_km)
+
+    async def _compute(
+        self,
+        rows: List[Any],
+        start: dt.datetime,
+        end: dt.datetime,
+        segment_km: Optional[float],
+    ) -> List[PipelineCoverageRead]:
+        if end <= start:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Period end must be after start",
+            )
+        segment_km = segment_km or settings.PIPELINE_SEGMENT_KM
+        corridor_km = settings.COVERAGE_CORRIDOR_M / 1000
+
+        # Two grouped queries for all pipelines: footprint versions (cache
+        # keys), then footprints for the misses; geometry work fans out to the pool.
+        within_deg = {
+            row["id"]: degrees_for_km(from_wkb(bytes(row["wkb"])), corridor_km)
+            for row in rows
+        }
+        versions = await self.asset_repo.footprint_versions(within_deg, start, end)
+        keys: dict[int, tuple] = {}
+        results: dict[int, CoverageResult] = {}
+        for i, row in enumerate(rows):
+            key = (
+                row["id"],
+                row["updated_at"],
+                start,
+                end,
+                segment_km,
+                corridor_km,
+                versions[row["id"]],
+            )
+            cached = _coverage_cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                keys[i] = key
+        footprints = await self.asset_repo.footprints_near(
+            {rows[i]["id"]: within_deg[rows[i]["id"]] for i in keys}, start, end
+        )
+        pending: dict[int, "asyncio.Future[CoverageResult]"] = {
+            i: asyncio.ensure_future(
+                self._run(
+                    key,
+                    bytes(rows[i]["wkb"]),
+                    footprints[rows[i]["id"]],
+                    corridor_km,
+                    segment_km,
+                )
+            )
+            for i, key in keys.items()
+        }
+
+        if pending:
+            done = await asyncio.gather(*pending.values())
+            results.update(zip(pending.keys(), done))
+
+        return [
+            self._to_read(row["id"], start, end, results[i])
+            for i, row in enumerate(rows)
+        ]
+
+    @staticmethod
+    async def _run(
+        key: tuple,
+        line_wkb: bytes,
+        footprints: List[bytes],
+        corridor_km: float,
+        segment_km: float,
+    ) -> CoverageResult:
+        try:
+            result = await run_in_process(
+                compute_coverage, line_wkb, footprints, corridor_km, segment_km
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            )
+        _coverage_cache.set(key, result)
+        return result
+
+    @staticmethod
+    def _to_read(
+        pipeline_id: UUID,
+        start: dt.datetime,
+        end: dt.datetime,
+        result: CoverageResult,
+    ) -> PipelineCoverageRead:
+        return PipelineCoverageRead(
+            pipeline_id=pipeline_id,
+            period_start=start,
+            period_end=end,
+            length_km=result.length_km,
+            covered_km=result.covered_km,
+            uncovered_km=result.uncovered_km,
+            covered_pct=result.covered_pct,
+            segments=[
+                SegmentCoverageRead(
+                    index=s.index,
+                    start_km=s.start_km,
+                    end_km=s.end_km,
+                    covered_km=s.covered_km,
+                    uncovered_km=s.uncovered_km,
+                )
+                for s in result.segments
+            ],
+        )
@@ -11,9 +11,18 @@ from app.repositories.deps import (
     get_user_repo,
     get_pipeline_repo,
     get_asset_repo,
+    get_asset_upload_repo,
+    get_asset_import_repo,
+    get_asset_lifecycle_policy_repo,
+    get_blob_repo,
     get_event_repo,
+    get_event_rollup_repo,
     get_alert_repo,
     get_report_repo,
+    get_report_job_repo,
+    get_report_artifact_repo,
+    get_risk_snapshot_repo,
+    get_hotspot_repo,
 )
 from app.repositories import (
     OrganizationRepository,
@@ -22,9 +31,18 @@ from app.repositories import (
     UserRepository,
     PipelineRepository,
     AssetRepository,
+    AssetUploadRepository,
+    AssetImportRepository,
+    AssetLifecyclePolicyRepository,
+    BlobRepository,
     EventRepository,
+    EventRollupRepository,
     AlertRepository,
     ReportRepository,
+    ReportJobRepository,
+    ReportArtifactRepository,
+    RiskSnapshotRepository,
+    HotspotRepository,
 )
 from app.security.clerk import get_current_user
 from app.services.organization import OrganizationService
@@ -32,9 +50,16 @@ from app.services.role import RoleService
 from app.services.users import UserService
 from app.services.pipeline import PipelineService
 from app.services.asset import AssetService
+from app.services.asset_upload import AssetUploadService
+from app.services.asset_import import AssetImportService
+from app.services.lifecycle import AssetLifecycleService
 from app.services.event import EventService
 from app.services.alert import AlertService
 from app.services.report import ReportService
+from app.services.export import ExportService
+from app.services.coverage import CoverageService
+from app.services.risk import RiskService
+from app.services.hotspot import HotspotService
 
 
 async def get_organization_service(
@@ -66,27 +91,59 @@ async def get_user_service(
 
 async def get_pipeline_service(
     pipeline_repo: PipelineRepository = Depends(get_pipeline_repo),
+    event_repo: EventRepository = Depends(get_event_repo),
+    rollup_repo: EventRollupRepository = Depends(get_event_rollup_repo),
     db: AsyncSession = Depends(get_async_session),
 ) -> PipelineService:
     """Injectable PipelineService"""
-    return PipelineService(pipeline_repo, db)
+    return PipelineService(pipeline_repo, event_repo, rollup_repo, db)
 
 
 async def get_asset_service(
     asset_repo: AssetRepository = Depends(get_asset_repo),
+    blob_repo: BlobRepository = Depends(get_blob_repo),
     db: AsyncSession = Depends(get_async_session),
 ) -> AssetService:
     """Injectable AssetService"""
-    return AssetService(asset_repo, db)
+    return AssetService(asset_repo, blob_repo, db)
+
+
+async def get_asset_upload_service(
+    upload_repo: AssetUploadRepository = Depends(get_asset_upload_repo),
+    asset_repo: AssetRepository = Depends(get_asset_repo),
+    blob_repo: BlobRepository = Depends(get_blob_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> AssetUploadService:
+    """Injectable AssetUploadService"""
+    return AssetUploadService(upload_repo, asset_repo, blob_repo, db)
+
+
+async def get_asset_import_service(
+    import_repo: AssetImportRepository = Depends(get_asset_import_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> AssetImportService:
+    """Injectable AssetImportService"""
+    return AssetImportService(import_repo, db)
+
+
+async def get_asset_lifecycle_service(
+    policy_repo: AssetLifecyclePolicyRepository = Depends(
+        get_asset_lifecycle_policy_repo
+    ),
+    db: AsyncSession = Depends(get_async_session),
+) -> AssetLifecycleService:
+    """Injectable AssetLifecycleService"""
+    return AssetLifecycleService(policy_repo, db)
 
 
 async def get_event_service(
     event_repo: EventRepository = Depends(get_event_repo),
     alert_repo: AlertRepository = Depends(get_alert_repo),
+    rollup_repo: EventRollupRepository = Depends(get_event_rollup_repo),
     db: AsyncSession = Depends(get_async_session),
 ) -> EventService:
     """Injectable EventService"""
-    return EventService(event_repo, alert_repo, db)
+    return EventService(event_repo, alert_repo, rollup_repo, db)
 
 
 async def get_alert_service(
@@ -97,12 +154,50 @@ async def get_alert_service(
     return AlertService(alert_repo, db)
 
 
+async def get_export_service(
+    event_repo: EventRepository = Depends(get_event_repo),
+    alert_repo: AlertRepository = Depends(get_alert_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> ExportService:
+    """Injectable ExportService"""
+    return ExportService(event_repo, alert_repo, db)
+
+
 async def get_report_service(
     report_repo: ReportRepository = Depends(get_report_repo),
+    job_repo: ReportJobRepository = Depends(get_report_job_repo),
+    artifact_repo: ReportArtifactRepository = Depends(get_report_artifact_repo),
     db: AsyncSession = Depends(get_async_session),
 ) -> ReportService:
     """Injectable ReportService"""
-    return ReportService(report_repo, db)
+    return ReportService(report_repo, job_repo, artifact_repo, db)
+
+
+async def get_coverage_service(
+    pipeline_repo: PipelineRepository = Depends(get_pipeline_repo),
+    asset_repo: AssetRepository = Depends(get_asset_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> CoverageService:
+    """Injectable CoverageService"""
+    return CoverageService(pipeline_repo, asset_repo, db)
+
+
+async def get_risk_service(
+    pipeline_repo: PipelineRepository = Depends(get_pipeline_repo),
+    event_repo: EventRepository = Depends(get_event_repo),
+    snapshot_repo: RiskSnapshotRepository = Depends(get_risk_snapshot_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> RiskService:
+    """Injectable RiskService"""
+    return RiskService(pipeline_repo, event_repo, snapshot_repo, db)
+
+
+async def get_hotspot_service(
+    hotspot_repo: HotspotRepository = Depends(get_hotspot_repo),
+    db: AsyncSession = Depends(get_async_session),
+) -> HotspotService:
+    """Injectable HotspotService"""
+    return HotspotService(hotspot_repo, db)
 
 
 __all__ = [
@@ -111,7 +206,12 @@ __all__ = [
     "get_user_service",
     "get_pipeline_service",
     "get_asset_service",
+    "get_asset_upload_service",
     "get_event_service",
     "get_alert_service",
+    "get_export_service",
     "get_report_service",
+    "get_coverage_service",
+    "get_risk_service",
+    "get_hotspot_service",
 ]
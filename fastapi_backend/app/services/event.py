@@ -1,14 +1,37 @@
 from __future__ import annotations
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID
 from fastapi import HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.event import EventCreate, EventRead, EventUpdate
+from app.helpers.geo import BBox, cell_size_for_zoom
+from app.schemas.enums import EventType
+from app.schemas.event import (
+    EventClusterCell,
+    EventClusterRead,
+    EventCreate,
+    EventRead,
+    EventSeriesPoint,
+    EventSeriesRead,
+    EventUpdate,
+)
 from app.security.clerk import CurrentUser
-from app.repositories import EventRepository, AlertRepository
+from app.repositories import EventRepository, AlertRepository, EventRollupRepository
+from . import risk
 from .base import BaseService
+from .context import org_scope
+
+
+# Time-series windows per bucket size
+SERIES_DEFAULT_DAYS = {"hour": 7, "day": 90}
+SERIES_MAX_DAYS = {"hour": 92, "day": 3660}
+
+
+def _aware(value: datetime) -> datetime:
+    """Naive query datetimes are taken as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 class EventService(BaseService[EventRepository]):
@@ -21,10 +44,12 @@ class EventService(BaseService[EventRepository]):
         self,
         repo: EventRepository,
         alert_repo: AlertRepository,
+        rollup_repo: EventRollupRepository,
         db: AsyncSession,
     ) -> None:
         super().__init__(repo, db)
         self.alert_repo = alert_repo
+        self.rollup_repo = rollup_repo
 
     async def ingest(
         self,
@@ -53,14 +78,23 @@ class EventService(BaseService[EventRepository]):
         )
         if data.location_wkt:
             event.location = f"SRID=4326;{data.location_wkt}"
-        await self.repo.create(event)
-
-        # Trigger initial alert
+            if data.pipeline_id:
+                # Resolved by a KNN lookup on the segments' spatial index at insert time
+                event.segment_id = self.repo.nearest_segment(
+                    data.pipeline_id, func.ST_GeomFromEWKT(event.location)
+                )
+        # The event, its rollup counts and its initial alert commit together
+        await self.repo.create(event, commit=False)
+        await self.db.flush()
+        await self.rollup_repo.add([event.id])
         alert = self.alert_repo.model(
             organization_id=org_id,
             event_id=event.id,
         )
-        await self.alert_repo.create(alert)
+        await self.alert_repo.create(alert, commit=False)
+        await self._commit()
+        await self.db.refresh(event)
+        risk.apply_ingested_event(event)
 
         validated: EventRead = EventRead.model_validate(event)
         return validated
@@ -76,7 +110,8 @@ class EventService(BaseService[EventRepository]):
         """
         if current_user["is_superadmin"]:
             events = await self.repo.list_with_related(
-                limit=limit, offset=offset  # type: ignore
+                limit=limit,
+                offset=offset,  # type: ignore
             )
         else:
             events = await self.repo.list_with_related(
@@ -86,6 +121,68 @@ class EventService(BaseService[EventRepository]):
             )
         return [EventRead.model_validate(e) for e in events]
 
+    async def clusters(
+        self,
+        current_user: CurrentUser,
+        bbox: BBox,
+        zoom: int,
+    ) -> EventClusterRead:
+        """
+        Grid-aggregate events inside bbox for map display at the given zoom.
+        Response size is bounded by the number of non-empty cells.
+        """
+        org_id = org_scope(current_user)
+        cell_size = cell_size_for_zoom(zoom)
+        rows = await self.repo.cluster_counts(org_id, bbox, cell_size)
+        cells = [
+            EventClusterCell(
+                lon=r["lon"],
+                lat=r["lat"],
+                count=r["count"],
+                max_severity=r["max_severity"],
+                by_type={t: r[t.value] for t in EventType if r[t.value]},
+            )
+            for r in rows
+        ]
+        return EventClusterRead(zoom=zoom, cell_size=cell_size, cells=cells)
+
+    async def timeseries(
+        self,
+        current_user: CurrentUser,
+        interval: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        pipeline_id: Optional[UUID] = None,
+        event_types: Optional[List[EventType]] = None,
+    ) -> EventSeriesRead:
+        """
+        Event counts per hour or UTC day by type, read from the rollup tables
+        (no scan of raw events). Defaults to the last SERIES_DEFAULT_DAYS.
+        """
+        end = _aware(end) if end else datetime.now(timezone.utc)
+        start = (
+            _aware(start)
+            if start
+            else end - timedelta(days=SERIES_DEFAULT_DAYS[interval])
+        )
+        if not start < end <= start + timedelta(days=SERIES_MAX_DAYS[interval]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{interval} series need 0 < end - start <= "
+                f"{SERIES_MAX_DAYS[interval]} days",
+            )
+        org_id = org_scope(current_user)
+        rows = await self.rollup_repo.series(
+            interval, org_id, start, end, pipeline_id, event_types
+        )
+        points: List[EventSeriesPoint] = []
+        for bucket, event_type, count in rows:
+            if not points or points[-1].bucket != bucket:
+                points.append(EventSeriesPoint(bucket=bucket, count=0, by_type={}))
+            points[-1].count += count
+            points[-1].by_type[event_type] = count
+        return EventSeriesRead(interval=interval, start=start, end=end, points=points)
+
     async def get_event(
         self,
         current_user: CurrentUser,
@@ -127,7 +224,17 @@ class EventService(BaseService[EventRepository]):
                 detail="Event not found",
             )
         update_data = data.model_dump(exclude_none=True)
-        updated = await self.repo.update(event, update_data)
+        recount = (
+            "severity" in update_data and update_data["severity"] != event.severity
+        )
+        if recount:  # severity is part of the rollup key: move the event's count
+            await self.rollup_repo.remove([event.id])
+        updated = await self.repo.update(event, update_data, commit=not recount)
+        if recount:
+            await self.db.flush()
+            await self.rollup_repo.add([event.id])
+            await self._commit()
+            await self.db.refresh(updated)
         validated: EventRead = EventRead.model_validate(updated)
         return validated
 
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import json
+from typing import List
+
+from app.repositories import HotspotRepository
+from app.schemas.event import EventHotspotRead, HotspotFeatureCollection
+from app.security.clerk import CurrentUser
+from .base import BaseService
+from .context import org_scope
+
+
+class HotspotService(BaseService[HotspotRepository]):
+    """
+    Read side of the event hotspot job (app.jobs.hotspots). Hotspots are
+    precomputed, so requests only read stored polygons.
+    """
+
+    async def list_hotspots(self, current_user: CurrentUser) -> List[EventHotspotRead]:
+        """Hotspots for the caller's organization (all organizations for superadmins)."""
+        org_id = org_scope(current_user)
+        rows = await self.repo.list_with_geojson(org_id)
+        return [
+            EventHotspotRead(
+                id=row["id"],
+                organization_id=row["organization_id"],
+                window_start=row["window_start"],
+                window_end=row["window_end"],
+                event_count=row["event_count"],
+                max_severity=row["max_severity"],
+                geometry=json.loads(row["geojson"]),
+            )
+            for row in rows
+        ]
+
+    async def hotspot_layer(
+        self, current_user: CurrentUser
+    ) -> HotspotFeatureCollection:
+        """Same hotspots as a GeoJSON FeatureCollection for the map."""
+        hotspots = await self.list_hotspots(current_user)
+        return HotspotFeatureCollection(
+            features=[
+                {
+                    "type": "Feature",
+                    "id": str(h.id),
+                    "geometry": h.geometry,
+                    "properties": h.model_dump(mode="json", exclude={"geometry"}),
+                }
+                for h in hotspots
+            ]
+        )
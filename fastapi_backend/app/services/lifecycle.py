@@ -0,0 +1,276 @@
+"""
+Asset lifecycle: per-organization policies, and the per-item steps the
+lifecycle job (app.jobs.lifecycle) runs on old assets:
+
+- recompress: re-encode an asset into a new, smaller blob
+- archive: move a blob to the cold storage tier (same key, reads fall back)
+- retention: delete assets (their blobs are reclaimed by blob GC)
+
+Every step commits per item and is selected from database state alone, so
+an interrupted run simply continues with the next one.
+"""
+
+from __future__ import annotations
+import asyncio
+import datetime as dt
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.db.database import async_session_maker
+from app.helpers.files import hash_file
+from app.helpers.throttle import Throttle, in_window, parse_hours
+from app.models import Asset, AssetBlob, AssetLifecyclePolicy, Organization
+from app.processing.queue import kick
+from app.processing.recompress import recompress_image, transcode_video
+from app.repositories import (
+    AssetLifecyclePolicyRepository,
+    AssetRepository,
+    BlobRepository,
+)
+from app.schemas.asset import AssetLifecyclePolicyRead, AssetLifecyclePolicyUpdate
+from app.schemas.enums import AssetType, ProcessingStatus, StorageTier
+from app.security.clerk import CurrentUser
+from app.storage import get_storage
+from app.storage.tiered import TieredStorage
+from .base import BaseService
+from .blob import adopt_blob, blob_key, tmp_dir
+from .preview import PREVIEW_TYPES
+from .tiles import TILED_TYPES
+
+log = logging.getLogger(__name__)
+
+
+def lifecycle_rate(now: Optional[dt.datetime] = None) -> float:
+    """Current byte-rate limit of lifecycle I/O (0 = unlimited)."""
+    tz = ZoneInfo(settings.LIFECYCLE_TIMEZONE)
+    now = now.astimezone(tz) if now else dt.datetime.now(tz)
+    hours = parse_hours(settings.LIFECYCLE_BUSINESS_HOURS)
+    if in_window(now, hours, settings.LIFECYCLE_BUSINESS_DAYS):
+        return settings.LIFECYCLE_BUSINESS_BYTES_PER_S
+    return settings.LIFECYCLE_OFF_HOURS_BYTES_PER_S
+
+
+def recompressed_types() -> Tuple[AssetType, ...]:
+    """Videos are only transcoded where ffmpeg is installed."""
+    if shutil.which("ffmpeg"):
+        return (AssetType.IMAGE, AssetType.VIDEO)
+    return (AssetType.IMAGE,)
+
+
+def cold_storage() -> Optional[TieredStorage]:
+    storage = get_storage()
+    return storage if isinstance(storage, TieredStorage) else None
+
+
+async def _recompress_file(
+    asset: Asset,
+    policy: AssetLifecyclePolicy,
+    out: Path,
+    throttle: Throttle,
+) -> bool:
+    """Write the recompressed bytes to `out`; False if the format is unsupported."""
+    storage = get_storage()
+    await throttle.consume(asset.size_bytes or 0)
+    async with storage.local_copy(asset.file_path, tmp_dir()) as src:
+        if asset.asset_type == AssetType.VIDEO:
+            await run_in_pool(
+                "media",
+                transcode_video,
+                str(src),
+                str(out),
+                policy.video_crf,
+                shutil.which("ffmpeg"),
+            )
+            return True
+        fmt = await run_in_pool(
+            "media",
+            recompress_image,
+            str(src),
+            str(out),
+            policy.jpeg_quality,
+            settings.MEDIA_MAX_PIXELS,
+        )
+        return fmt is not None
+
+
+async def recompress_asset(
+    asset: Asset,
+    policy: AssetLifecyclePolicy,
+    throttle: Throttle,
+) -> bool:
+    """
+    Recompress one asset. If the result is at least LIFECYCLE_MIN_SAVING
+    smaller it becomes a new blob, and one transaction repoints the asset,
+    releases the old blob and re-queues previews/tiles. Either way the asset
+    is marked compacted so it is not tried again. Returns True if replaced.
+    """
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    # The extension picks ffmpeg's output container
+    suffix = Path(asset.filename or asset.file_path).suffix or ".mkv"
+    fd, tmp = await asyncio.to_thread(
+        tempfile.mkstemp, dir=scratch, prefix="recompress-", suffix=suffix
+    )
+    os.close(fd)
+    out = Path(tmp)
+    try:
+        try:
+            produced = await _recompress_file(asset, policy, out, throttle)
+        except Exception:
+            log.exception(
+                "Asset %s: recompression failed; keeping the original", asset.id
+            )
+            produced = False
+        sha256, size = await hash_file(out, settings.ASSET_UPLOAD_CHUNK_BYTES)
+        replace = produced and 0 < size <= (asset.size_bytes or 0) * (
+            1 - settings.LIFECYCLE_MIN_SAVING
+        )
+        if replace:
+            await throttle.consume(size)  # before taking the row lock
+
+        async with async_session_maker() as db:
+            repo, blob_repo = AssetRepository(db), BlobRepository(db)
+            if await repo.lock_blob_ref(asset.id, asset.blob_id) is None:
+                return False  # deleted or changed meanwhile
+            values = {Asset.compacted_at: func.now()}
+            if replace:
+                blob_id = await adopt_blob(blob_repo, out, sha256, size)
+                await blob_repo.release(asset.blob_id, commit=False)
+                values.update(
+                    {
+                        Asset.blob_id: blob_id,
+                        Asset.content_sha256: sha256,
+                        Asset.size_bytes: size,
+                        Asset.file_path: blob_key(sha256),
+                        # Derived files belong to the old blob; render them anew.
+                        Asset.preview_status: (
+                            ProcessingStatus.PENDING
+                            if asset.asset_type in PREVIEW_TYPES
+                            else None
+                        ),
+                        Asset.previews: None,
+                        Asset.tiles_status: (
+                            ProcessingStatus.PENDING
+                            if asset.asset_type in TILED_TYPES
+                            else None
+                        ),
+                        Asset.tiles: None,
+                    }
+                )
+            await repo.set_values(asset.id, values)
+            await db.commit()
+    finally:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, out)
+    if replace:
+        kick()
+    return replace
+
+
+async def _copy_to_cold(storage: TieredStorage, key: str, throttle: Throttle) -> None:
+    """Throttled chunked copy from the hot to the cold tier."""
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    fd, tmp = await asyncio.to_thread(tempfile.mkstemp, dir=scratch, prefix="archive-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for data in storage.hot.iter_range(key):
+                await throttle.consume(len(data))
+                await asyncio.to_thread(out.write, data)
+        await storage.cold.put_file(key, Path(tmp))
+    finally:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, tmp)
+
+
+async def archive_blob(
+    storage: TieredStorage, blob: AssetBlob, throttle: Throttle
+) -> None:
+    """
+    Move a blob to the cold tier. The copy is verified before the hot one
+    is deleted, and the delete happens inside the transaction that flips the
+    tier, so a crash at any point leaves a readable object that the next run
+    finishes moving (an existing complete cold copy is not copied again).
+    """
+    key = blob_key(blob.sha256)
+    if await storage.cold.size(key) != blob.size_bytes:
+        await _copy_to_cold(storage, key, throttle)
+        if await storage.cold.size(key) != blob.size_bytes:
+            raise RuntimeError(f"Cold copy of blob {blob.sha256} is incomplete")
+    async with async_session_maker() as db:
+        await BlobRepository(db).set_tier(blob.id, StorageTier.COLD)
+        await storage.hot.delete(key)
+        await db.commit()
+
+
+async def delete_expired_assets(limit: int) -> int:
+    """Delete one batch of assets past retention, releasing their blobs in the same transaction."""
+    async with async_session_maker() as db:
+        blob_repo = BlobRepository(db)
+        deleted: List[Tuple[UUID, Optional[UUID]]] = await AssetRepository(
+            db
+        ).delete_expired(limit)
+        for _, blob_id in deleted:
+            if blob_id is not None:
+                await blob_repo.release(blob_id, commit=False)
+        await db.commit()
+    return len(deleted)
+
+
+class AssetLifecycleService(BaseService[AssetLifecyclePolicyRepository]):
+    """Per-organization lifecycle policies (superadmin only)."""
+
+    async def get_policy(
+        self,
+        current_user: CurrentUser,
+        org_id: UUID,
+    ) -> AssetLifecyclePolicyRead:
+        self._ensure_superadmin(current_user)
+        policy = await self.repo.get_for_org(org_id)
+        if policy is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No lifecycle policy for this organization",
+            )
+        return AssetLifecyclePolicyRead.model_validate(policy)
+
+    async def put_policy(
+        self,
+        current_user: CurrentUser,
+        org_id: UUID,
+        data: AssetLifecyclePolicyUpdate,
+    ) -> AssetLifecyclePolicyRead:
+        """Create or replace the organization's policy."""
+        self._ensure_superadmin(current_user)
+        if await self.db.get(Organization, org_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found",
+            )
+        policy = await self.repo.get_for_org(org_id)
+        if policy is None:
+            policy = AssetLifecyclePolicy(organization_id=org_id, **data.model_dump())
+            await self.repo.create(policy)
+        else:
+            policy = await self.repo.update(policy, data.model_dump())
+        return AssetLifecyclePolicyRead.model_validate(policy)
+
+    @staticmethod
+    def _ensure_superadmin(current_user: CurrentUser) -> None:
+        if not current_user["is_superadmin"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient privileges to manage lifecycle policies",
+            )
@@ -0,0 +1,80 @@
+"""Metadata stage of asset processing: captured_at, footprint and header facts."""
+
+from __future__ import annotations
+import asyncio
+import logging
+import shutil
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.models import Asset
+from app.processing.metadata import extract_file
+from app.schemas.enums import AssetType, ProcessingStatus
+from app.storage import get_storage
+
+log = logging.getLogger(__name__)
+
+# GIS rasters carry their bounds in the header; vector files (GeoJSON,
+# KML, KMZ) have nothing to extract.
+RASTER_GIS_SUFFIXES = (".tif", ".tiff", ".jp2")
+
+
+def _has_header(asset: Asset) -> bool:
+    if asset.asset_type in (AssetType.IMAGE, AssetType.VIDEO):
+        return True
+    return asset.asset_type == AssetType.GIS and (
+        asset.filename or ""
+    ).lower().endswith(RASTER_GIS_SUFFIXES)
+
+
+async def _source(key: str) -> str:
+    """A local path for objects on disk, else a presigned URL read with ranged requests."""
+    backend = await get_storage().locate(key)
+    path = backend.local_path(key)
+    if path is not None:
+        return str(path)
+    return backend.presign_get(key, settings.STORAGE_URL_TTL_S).url
+
+
+def _values(asset: Asset, result: Dict[str, Any]) -> Dict[Any, Any]:
+    if "error" in result:
+        log.warning(
+            "Asset %s: metadata extraction failed: %s", asset.id, result["error"]
+        )
+        return {Asset.metadata_status: ProcessingStatus.FAILED}
+    values: Dict[Any, Any] = {Asset.metadata_status: ProcessingStatus.READY}
+    # What the operator entered wins over what the file says.
+    if asset.captured_at is None and result["captured_at"] is not None:
+        values[Asset.captured_at] = result["captured_at"]
+    if asset.footprint is None and result["footprint_wkt"]:
+        values[Asset.footprint] = f"SRID=4326;{result['footprint_wkt']}"
+    if result["metadata"]:
+        values[Asset.asset_metadata] = {
+            **result["metadata"],
+            **(asset.asset_metadata or {}),
+        }
+    return values
+
+
+async def extract_asset_metadata(assets: List[Asset]) -> List[Dict[Any, Any]]:
+    """
+    Read the headers of a claimed batch (typically one mission's uploads),
+    one pool task per asset. Nothing is downloaded: remote objects are read
+    through ranged requests, so only header bytes leave storage.
+    """
+    ffprobe = shutil.which("ffprobe")
+
+    async def extract(asset: Asset) -> Dict[Any, Any]:
+        if not _has_header(asset):
+            return {Asset.metadata_status: ProcessingStatus.SKIPPED}
+        result = await run_in_pool(
+            "media",
+            extract_file,
+            await _source(asset.file_path),
+            asset.asset_type == AssetType.VIDEO,
+            ffprobe,
+        )
+        return _values(asset, result)
+
+    return list(await asyncio.gather(*(extract(asset) for asset in assets)))
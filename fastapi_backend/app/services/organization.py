@@ -12,7 +12,7 @@ from app.schemas.organization import (
     OrganizationUpdate,
 )
 from .base import BaseService
-from app.security.clerk import CurrentUser
+from app.security.clerk import CurrentUser, forget_orgs, forget_user
 
 
 class OrganizationService(BaseService[OrganizationRepository]):
@@ -43,6 +43,7 @@ class OrganizationService(BaseService[OrganizationRepository]):
 
         org = self.repo.model(**data.model_dump(exclude_none=True))
         await self.repo.create(org)
+        forget_orgs()
         return OrganizationRead.model_validate(org)
 
     async def get_org(
@@ -100,6 +101,7 @@ class OrganizationService(BaseService[OrganizationRepository]):
             )
 
         updated = await self.repo.update(org, update_data)
+        forget_orgs()
         return OrganizationRead.model_validate(updated)
 
     async def delete_org(
@@ -124,6 +126,9 @@ class OrganizationService(BaseService[OrganizationRepository]):
             )
 
         await self.repo.delete(org)
+        # Members' organization_id was nulled by the FK
+        forget_orgs()
+        forget_user()
 
     async def list_orgs(
         self,
@@ -1,13 +1,28 @@
 from __future__ import annotations
 from shapely import wkt
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.pipeline import PipelineCreate, PipelineRead, PipelineUpdate
+from app.analytics.segmentation import segment_line
+from app.core.config import settings
+from app.core.executors import run_in_process
+from app.models import Pipeline
+from app.schemas.pipeline import (
+    PipelineCreate,
+    PipelineRead,
+    PipelineSegmentRead,
+    PipelineUpdate,
+)
 from app.security.clerk import CurrentUser
-from app.repositories import PipelineRepository
+from app.repositories import (
+    EventRepository,
+    EventRollupRepository,
+    PipelineRepository,
+    RiskSnapshotRepository,
+)
+from . import risk
 from .base import BaseService
 
 
@@ -20,9 +35,13 @@ class PipelineService(BaseService[PipelineRepository]):
     def __init__(
         self,
         repo: PipelineRepository,
+        event_repo: EventRepository,
+        rollup_repo: EventRollupRepository,
         db: AsyncSession,
     ) -> None:
         super().__init__(repo, db)
+        self.event_repo = event_repo
+        self.rollup_repo = rollup_repo
 
     async def create_pipeline(
         self,
@@ -43,6 +62,7 @@ class PipelineService(BaseService[PipelineRepository]):
 
         # Validate geometry
         geom: str | None = None
+        geom_obj = None
         if data.geom_wkt:
             try:
                 geom_obj = wkt.loads(data.geom_wkt)
@@ -61,7 +81,14 @@ class PipelineService(BaseService[PipelineRepository]):
             length_km=data.length_km,
             geom=geom,
         )
-        await self.repo.create(pipeline)
+        # One transaction with its segments: a failed segmentation leaves no pipeline.
+        await self.repo.create(pipeline, commit=False)
+        await self.db.flush()
+        if geom_obj is not None:
+            await self._resegment(pipeline, geom_obj.wkb)
+        else:
+            await self._commit()
+        await self.db.refresh(pipeline)
         validated: PipelineRead = PipelineRead.model_validate(pipeline)
         return validated
 
@@ -127,6 +154,7 @@ class PipelineService(BaseService[PipelineRepository]):
                 detail="Pipeline not found",
             )
         update_data = data.model_dump(exclude_none=True)
+        geom_obj = None
         if "geom_wkt" in update_data:
             try:
                 geom_obj = wkt.loads(update_data.pop("geom_wkt"))
@@ -138,7 +166,12 @@ class PipelineService(BaseService[PipelineRepository]):
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                     detail="Invalid WKT geometry",
                 )
-        updated = await self.repo.update(pipeline, update_data)
+        updated = await self.repo.update(pipeline, update_data, commit=False)
+        if geom_obj is not None:
+            await self._resegment(updated, geom_obj.wkb)
+        else:
+            await self._commit()
+        await self.db.refresh(updated)
         validated: PipelineRead = PipelineRead.model_validate(updated)
         return validated
 
@@ -161,4 +194,53 @@ class PipelineService(BaseService[PipelineRepository]):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Pipeline not found",
             )
+        # Its events outlive it (pipeline_id SET NULL); keep them in the rollups
+        await self.rollup_repo.detach_pipeline(pipeline.id)
         await self.repo.delete(pipeline)
+
+    async def list_segments(
+        self,
+        current_user: CurrentUser,
+        pipeline_id: UUID,
+    ) -> List[PipelineSegmentRead]:
+        """
+        Stored segments of a pipeline with their event counts.
+        """
+        if current_user["is_superadmin"]:
+            pipeline = await self.repo.get(pipeline_id)
+        else:
+            pipeline = await self.repo.get_in_org(
+                current_user["organization_id"], pipeline_id
+            )
+        if not pipeline:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pipeline not found",
+            )
+        rows = await self.repo.segment_event_counts(pipeline_id)
+        return [PipelineSegmentRead.model_validate(r) for r in rows]
+
+    async def _resegment(
+        self,
+        pipeline: Pipeline,
+        line_wkb: bytes,
+        segment_km: Optional[float] = None,
+    ) -> None:
+        """
+        Rebuild fixed-length segments for a pipeline and re-attach its events,
+        committing them together with the caller's pending pipeline changes.
+        Non-line geometries simply leave the pipeline unsegmented.
+        """
+        try:
+            segments = await run_in_process(
+                segment_line, line_wkb, segment_km or settings.PIPELINE_SEGMENT_KM
+            )
+        except ValueError:
+            segments = []
+        await self.repo.replace_segments(pipeline, segments, commit=False)
+        await self.event_repo.assign_segments(pipeline.id, commit=False)
+        await RiskSnapshotRepository(self.db).delete_for_pipeline(
+            pipeline.id, commit=False
+        )
+        await self._commit()
+        risk.invalidate(pipeline.id)
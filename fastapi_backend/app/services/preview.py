@@ -0,0 +1,101 @@
+"""Preview stage of asset processing: thumbnails, poster frames, sprite sheets."""
+
+from __future__ import annotations
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+import logging
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.models import Asset
+from app.processing.previews import (
+    POSTER,
+    SPRITE,
+    RasterTooLarge,
+    render_image_previews,
+    render_video_previews,
+    thumbnail_name,
+)
+from app.schemas.enums import AssetType, ProcessingStatus
+from app.storage import get_storage
+from .blob import derived_key, tmp_dir
+
+log = logging.getLogger(__name__)
+
+# Asset types with previews; GIS files (GeoJSON, KML, ...) have none.
+PREVIEW_TYPES = (AssetType.IMAGE, AssetType.VIDEO)
+
+
+def preview_key(sha256: str, name: str) -> str:
+    return derived_key(sha256, f"previews/{name}")
+
+
+def _candidates(asset_type: AssetType) -> List[str]:
+    names = [thumbnail_name(size) for size in settings.PREVIEW_SIZES]
+    if asset_type == AssetType.VIDEO:
+        names += [POSTER, SPRITE]
+    return names
+
+
+async def generate_previews(asset: Asset) -> Dict[Any, Any]:
+    """Render and store previews for one asset; returns the asset columns to set."""
+    if asset.asset_type not in PREVIEW_TYPES:
+        return {Asset.preview_status: None}
+    storage = get_storage()
+    sha256 = asset.content_sha256
+    if sha256 is None:
+        return {Asset.preview_status: ProcessingStatus.SKIPPED}
+
+    # Previews belong to the blob: a duplicate upload reuses them as they are.
+    existing = [
+        name
+        for name in _candidates(asset.asset_type)
+        if await storage.exists(preview_key(sha256, name))
+    ]
+    if existing:
+        return {Asset.preview_status: ProcessingStatus.READY, Asset.previews: existing}
+
+    ffmpeg = shutil.which("ffmpeg")
+    if asset.asset_type == AssetType.VIDEO and ffmpeg is None:
+        return {Asset.preview_status: ProcessingStatus.SKIPPED}
+
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    out_dir = Path(
+        await asyncio.to_thread(tempfile.mkdtemp, dir=scratch, prefix="previews-")
+    )
+    try:
+        async with storage.local_copy(asset.file_path, scratch) as src:
+            if asset.asset_type == AssetType.VIDEO:
+                names = await run_in_pool(
+                    "media",
+                    render_video_previews,
+                    str(src),
+                    str(out_dir),
+                    settings.PREVIEW_SIZES,
+                    settings.MEDIA_MAX_PIXELS,
+                    ffmpeg,
+                    shutil.which("ffprobe"),
+                )
+            else:
+                try:
+                    names = await run_in_pool(
+                        "media",
+                        render_image_previews,
+                        str(src),
+                        str(out_dir),
+                        settings.PREVIEW_SIZES,
+                        settings.MEDIA_MAX_PIXELS,
+                        settings.PREVIEW_MAX_DECODE_PIXELS,
+                    )
+                except RasterTooLarge as exc:
+                    log.info("No previews for asset %s: %s", asset.id, exc)
+                    return {Asset.preview_status: ProcessingStatus.SKIPPED}
+        for name in names:
+            await storage.put_file(preview_key(sha256, name), out_dir / name)
+    finally:
+        await asyncio.to_thread(shutil.rmtree, out_dir, ignore_errors=True)
+    return {Asset.preview_status: ProcessingStatus.READY, Asset.previews: names}
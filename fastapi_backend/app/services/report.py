@@ -1,16 +1,114 @@
 # app/services/report.py
 
 from __future__ import annotations
+import asyncio
+import datetime as dt
+import hashlib
+import json
+import os
 import tempfile
+import uuid
+from contextlib import suppress
 from pathlib import Path
-from typing import List
+from typing import Any, Awaitable, Callable, Dict, List, Mapping
 from uuid import UUID
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.db.database import async_session_maker
+from app.analytics.report_metrics import report_sections
+from app.models import Organization, Report, ReportJob
+from app.processing.report_pdf import TEMPLATE_VERSION, render_report_pdf
 from app.security.clerk import CurrentUser
-from app.repositories import ReportRepository
-from app.schemas.report import ReportCreate, ReportRead, ReportUpdate
+from app.repositories import (
+    ReportArtifactRepository,
+    ReportJobRepository,
+    ReportRepository,
+)
+from app.schemas.enums import JobStatus
+from app.schemas.report import ReportCreate, ReportRead, ReportStatusRead, ReportUpdate
+from app.storage import get_storage
+from app.storage.responses import content_response
 from .base import BaseService
+from .blob import tmp_dir
+
+Progress = Callable[[float], Awaitable[None]]
+
+
+def artifact_key(report: Report, content: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Report cache key: reports of the same org, frequency and period whose
+    rendered content is identical share one PDF until the template changes.
+    """
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return {
+        "organization_id": report.organization_id,
+        "frequency": report.frequency,
+        "period_start": report.period_start,
+        "period_end": report.period_end,
+        "content_sha256": hashlib.sha256(canonical.encode()).hexdigest(),
+        "template_version": TEMPLATE_VERSION,
+    }
+
+
+async def report_content(db: AsyncSession, report: Report) -> Dict[str, Any]:
+    """The data the PDF renderer lays out (see app.processing.report_pdf)."""
+    org = await db.get(Organization, report.organization_id)
+    metrics = await ReportRepository(db).metrics(
+        report.organization_id, report.period_start, report.period_end
+    )
+    return {
+        "title": f"{report.frequency.value.capitalize()} report",
+        "subtitle": [
+            org.name if org else str(report.organization_id),
+            f"{report.period_start.isoformat()} - {report.period_end.isoformat()}",
+        ],
+        "summary": report.summary,
+        "sections": report_sections(metrics),
+    }
+
+
+async def generate_report_file(report: Report, progress: Progress) -> str:
+    """
+    Gather the report's data and reuse the cached PDF for identical content,
+    or render it in the media process pool and cache it. The PDF is recorded
+    on the report; returns its storage key.
+    """
+    async with async_session_maker() as db:
+        content = await report_content(db, report)
+        key = artifact_key(report, content)
+        cached = await ReportArtifactRepository(db).acquire(key)
+        if cached:
+            await ReportRepository(db).set_generated(report.id, cached)
+            await db.commit()
+            return cached
+    await progress(0.5)
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    fd, tmp = await asyncio.to_thread(
+        tempfile.mkstemp, dir=scratch, prefix="report-", suffix=".pdf"
+    )
+    os.close(fd)
+    storage = get_storage()
+    # Unique per rendering: an evicted artifact's key is never reused
+    rendered = f"reports/{report.organization_id}/{uuid.uuid4()}.pdf"
+    try:
+        await run_in_pool("media", render_report_pdf, content, tmp)
+        await progress(0.9)
+        size = await asyncio.to_thread(os.path.getsize, tmp)
+        await storage.put_file(rendered, Path(tmp))
+    finally:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, tmp)
+    async with async_session_maker() as db:
+        file_path = await ReportArtifactRepository(db).add(key, rendered, size)
+        await ReportRepository(db).set_generated(report.id, file_path)
+        await db.commit()
+    if file_path != rendered:  # another worker cached the same content first
+        await storage.delete(rendered)
+    return file_path
 
 
 class ReportService(BaseService[ReportRepository]):
@@ -19,16 +117,29 @@ class ReportService(BaseService[ReportRepository]):
     supporting both global superuser access and organization-scoped operations.
     """
 
+    def __init__(
+        self,
+        repo: ReportRepository,
+        job_repo: ReportJobRepository,
+        artifact_repo: ReportArtifactRepository,
+        db: AsyncSession,
+    ) -> None:
+        super().__init__(repo, db)
+        self.job_repo = job_repo
+        self.artifact_repo = artifact_repo
+
     async def generate(
         self,
         current_user: CurrentUser,
         data: ReportCreate,
-        background: BackgroundTasks,
     ) -> ReportRead:
         """
         Initiate report generation:
         - Superusers may specify data.organization_id; others use their org.
-        - PDF rendering happens in background.
+        - When a report with identical content was rendered before, its
+          cached PDF is reused and the report is returned generated.
+        - Otherwise the report and its generation job are committed
+          together; a report worker (app.jobs.reports) renders the PDF.
         """
         org_id = (
             data.organization_id
@@ -42,11 +153,25 @@ class ReportService(BaseService[ReportRepository]):
             frequency=data.frequency,
             period_start=data.period_start,
             period_end=data.period_end,
-            file_path=data.file_path,
             summary=data.summary,
         )
         await self.repo.create(report_db, commit=False)
-        background.add_task(self._render_pdf, report_db)
+        await self.db.flush()
+        job = ReportJob(
+            report_id=report_db.id,
+            organization_id=org_id,
+            status=JobStatus.QUEUED,
+            max_attempts=settings.REPORT_MAX_ATTEMPTS,
+        )
+        content = await report_content(self.db, report_db)
+        cached = await self.artifact_repo.acquire(artifact_key(report_db, content))
+        if cached:
+            now = dt.datetime.now(dt.timezone.utc)
+            report_db.file_path, report_db.generated_at = cached, now
+            job.status, job.progress, job.finished_at = JobStatus.SUCCEEDED, 1.0, now
+        await self.job_repo.create(job, commit=False)
+        await self._commit()
+        await self.db.refresh(report_db)
         validated: ReportRead = ReportRead.model_validate(report_db)
         return validated
 
@@ -68,6 +193,17 @@ class ReportService(BaseService[ReportRepository]):
             )
         return [ReportRead.model_validate(r) for r in rows]
 
+    async def _get(self, current_user: CurrentUser, report_id: UUID) -> Report:
+        if current_user["is_superadmin"]:
+            rpt = await self.repo.get(report_id)
+        else:
+            rpt = await self.repo.get_in_org(current_user["organization_id"], report_id)
+        if not rpt:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Report not found"
+            )
+        return rpt
+
     async def get_report(
         self,
         current_user: CurrentUser,
@@ -76,16 +212,86 @@ class ReportService(BaseService[ReportRepository]):
         """
         Fetch a single report by ID, respecting superuser scope.
         """
-        if current_user["is_superadmin"]:
-            rpt = await self.repo.get(report_id)
+        rpt = await self._get(current_user, report_id)
+        validated: ReportRead = ReportRead.model_validate(rpt)
+        return validated
+
+    async def get_status(
+        self,
+        current_user: CurrentUser,
+        report_id: UUID,
+    ) -> ReportStatusRead:
+        """Progress of the report's latest generation job (cheap to poll)."""
+        rpt = await self._get(current_user, report_id)
+        job = await self.job_repo.latest_for_report(report_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report has no generation job",
+            )
+        return ReportStatusRead(
+            report_id=report_id,
+            status=job.status,
+            progress=job.progress,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            error=job.error,
+            queued_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            generated_at=rpt.generated_at,
+        )
+
+    async def download(
+        self,
+        current_user: CurrentUser,
+        report_id: UUID,
+        request_headers: Mapping[str, str],
+    ) -> Response:
+        """
+        The generated PDF, with Range and conditional request support. A
+        PDF evicted from the report cache is queued for regeneration.
+        """
+        # A detached snapshot: the session is finished with before streaming
+        rpt = ReportRead.model_validate(await self._get(current_user, report_id))
+        if rpt.file_path is None:
+            await self._requeue_evicted(rpt)
         else:
-            rpt = await self.repo.get_in_org(current_user["organization_id"], report_id)
-        if not rpt:
+            await self.artifact_repo.touch(rpt.file_path)
+            await self._commit()
+        storage = get_storage()
+        size = await storage.size(rpt.file_path) if rpt.file_path else None
+        if size is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Report not found"
+                status_code=status.HTTP_404_NOT_FOUND, detail="PDF not yet generated"
             )
-        validated: ReportRead = ReportRead.model_validate(rpt)
-        return validated
+        return content_response(
+            storage,
+            rpt.file_path,
+            size,
+            request_headers,
+            # regenerating rewrites the file: revalidate instead of caching forever
+            etag=f'"{rpt.id}-{int(rpt.generated_at.timestamp())}"',
+            media_type="application/pdf",
+            filename=f"{rpt.frequency.value}-report-{rpt.period_start.isoformat()}.pdf",
+            cache_control="private, no-cache",
+        )
+
+    async def _requeue_evicted(self, rpt: ReportRead) -> None:
+        job = await self.job_repo.latest_for_report(rpt.id)
+        if job is None or job.status != JobStatus.SUCCEEDED:
+            await self.db.rollback()
+            return  # still queued or running, or failed for good
+        await self.job_repo.create(
+            ReportJob(
+                report_id=rpt.id,
+                organization_id=rpt.organization_id,
+                status=JobStatus.QUEUED,
+                max_attempts=settings.REPORT_MAX_ATTEMPTS,
+            ),
+            commit=False,
+        )
+        await self._commit()
 
     async def update_summary(
         self,
@@ -96,24 +302,8 @@ class ReportService(BaseService[ReportRepository]):
         """
         Update the summary text of a report.
         """
-        if current_user["is_superadmin"]:
-            rpt = await self.repo.get(report_id)
-        else:
-            rpt = await self.repo.get_in_org(current_user["organization_id"], report_id)
-        if not rpt:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Report not found"
-            )
+        rpt = await self._get(current_user, report_id)
         rpt.summary = data.summary
         await self._commit()
         validated: ReportRead = ReportRead.model_validate(rpt)
         return validated
-
-    async def _render_pdf(self, report_db) -> None:
-        """
-        Background task to render PDF; stores the file path and commits.
-        """
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        Path(temp.name).write_text("Report placeholder PDF")
-        report_db.file_path = temp.name
-        await self._commit()
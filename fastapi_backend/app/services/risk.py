@@ -0,0 +1,202 @@
+from __future__ import annotations
+import datetime as dt
+import logging
+import time
+from typing import List, Tuple
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.risk import RiskState, severity_weight
+from app.core.config import settings
+from app.db.database import async_session_maker
+from app.helpers.cache import LRUCache
+from app.models import Event, Pipeline
+from app.repositories import (
+    EventRepository,
+    PipelineRepository,
+    RiskSnapshotRepository,
+)
+from app.schemas.pipeline import PipelineRiskRead
+from app.security.clerk import CurrentUser
+from .base import BaseService
+
+log = logging.getLogger(__name__)
+
+# pipeline_id -> (state, organization_id, monotonic time of last DB sync).
+# Per-process; workers converge through DB catch-up and shared snapshots.
+# Dirty states are only evicted once snapshot_risk_states has persisted them.
+_states: LRUCache[UUID, Tuple[RiskState, UUID, float]] = LRUCache(
+    maxsize=settings.RISK_STATE_CACHE_SIZE,
+    evictable=lambda entry: not entry[0].dirty,
+)
+
+
+def _half_life_s() -> float:
+    return settings.RISK_HALF_LIFE_DAYS * 86400
+
+
+def apply_ingested_event(event: Event) -> None:
+    """O(1) score update for a freshly ingested event, if its pipeline is loaded."""
+    if event.pipeline_id is None or event.segment_id is None:
+        return
+    entry = _states.get(event.pipeline_id)
+    if entry is None:
+        return  # built from the DB on first read
+    entry[0].apply(
+        event.id,
+        event.segment_id,
+        severity_weight(event.severity),
+        event.detected_at.timestamp(),
+        event.created_at.timestamp(),
+    )
+
+
+def invalidate(pipeline_id: UUID) -> None:
+    """Drop in-memory scores (e.g. after re-segmentation changed segment ids)."""
+    _states.pop(pipeline_id)
+
+
+class RiskService(BaseService[PipelineRepository]):
+    """
+    Serves time-decayed per-segment risk scores (see app.analytics.risk).
+    State is loaded from the latest snapshot, or rebuilt from events, then kept
+    current by O(1) ingest updates and periodic incremental catch-up.
+    """
+
+    def __init__(
+        self,
+        repo: PipelineRepository,
+        event_repo: EventRepository,
+        snapshot_repo: RiskSnapshotRepository,
+        db: AsyncSession,
+    ) -> None:
+        super().__init__(repo, db)
+        self.event_repo = event_repo
+        self.snapshot_repo = snapshot_repo
+
+    async def get_risk(
+        self,
+        current_user: CurrentUser,
+        pipeline_id: UUID,
+    ) -> PipelineRiskRead:
+        """Current decayed score per segment, ordered by segment seq."""
+        if current_user["is_superadmin"]:
+            pipeline = await self.repo.get(pipeline_id)
+        else:
+            pipeline = await self.repo.get_in_org(
+                current_user["organization_id"], pipeline_id
+            )
+        if not pipeline:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pipeline not found",
+            )
+        state = await self._state_for(pipeline)
+        now = time.time()
+        scores = state.scores(now)
+        return PipelineRiskRead(
+            pipeline_id=pipeline_id,
+            as_of=dt.datetime.fromtimestamp(now, tz=dt.timezone.utc),
+            half_life_days=settings.RISK_HALF_LIFE_DAYS,
+            max_score=float(scores.max()) if len(scores) else 0.0,
+            scores=np.round(scores, 4).tolist(),
+        )
+
+    async def _state_for(self, pipeline: Pipeline) -> RiskState:
+        entry = _states.get(pipeline.id)
+        if entry is None:
+            state = await self._load(pipeline)
+        else:
+            state, _, synced_at = entry
+            if time.monotonic() - synced_at < settings.RISK_SYNC_INTERVAL_S:
+                return state
+        if not await self._sync(pipeline.id, state):
+            # Pipeline was re-segmented under us (by another worker): start over.
+            state = await self._load(pipeline)
+            await self._sync(pipeline.id, state)
+        _states.set(pipeline.id, (state, pipeline.organization_id, time.monotonic()))
+        return state
+
+    async def _load(self, pipeline: Pipeline) -> RiskState:
+        segment_ids = await self.repo.segment_ids(pipeline.id)
+        state = RiskState.empty(segment_ids, _half_life_s(), time.time())
+        snap = await self.snapshot_repo.get_for_pipeline(pipeline.id)
+        if (
+            snap is not None
+            and snap.half_life_s == _half_life_s()
+            and len(snap.scores) == 8 * len(segment_ids)
+        ):
+            state.acc = np.frombuffer(snap.scores, dtype=np.float64).copy()
+            state.t_ref = snap.t_ref
+            state.watermark = snap.watermark
+            state.recent = {UUID(k): v for k, v in (snap.recent or {}).items()}
+        return state
+
+    async def _sync(self, pipeline_id: UUID, state: RiskState) -> bool:
+        """
+        Apply events committed since the watermark (minus a clock-skew lag).
+        Returns False if an event references a segment unknown to `state`.
+        """
+        rows = await self.event_repo.risk_rows(
+            pipeline_id, state.watermark - settings.RISK_SYNC_LAG_S
+        )
+        if any(r.segment_id not in state.segment_index for r in rows):
+            return False
+        state.apply_many(
+            (
+                r.id,
+                r.segment_id,
+                severity_weight(r.severity),
+                r.detected_at.timestamp(),
+                r.created_at.timestamp(),
+            )
+            for r in rows
+        )
+        state.prune(settings.RISK_SYNC_LAG_S)
+        return True
+
+
+async def snapshot_risk_states() -> int:
+    """
+    Persist every dirty in-memory RiskState, then evict clean states beyond
+    RISK_STATE_CACHE_SIZE; run periodically from lifespan.
+    """
+    dirty: List[Tuple[UUID, RiskState, UUID]] = [
+        (pid, state, org_id)
+        for pid, (state, org_id, _) in _states.items()
+        if state.dirty
+    ]
+    if not dirty:
+        _states.trim()
+        return 0
+    try:
+        async with async_session_maker() as db:
+            repo = RiskSnapshotRepository(db)
+            for pipeline_id, state, org_id in dirty:
+                # Cleared as the row is captured, so updates applied while we
+                # await the writes mark the state dirty again.
+                state.dirty = False
+                await repo.upsert(
+                    {
+                        "organization_id": org_id,
+                        "pipeline_id": pipeline_id,
+                        "t_ref": state.t_ref,
+                        "watermark": state.watermark,
+                        "half_life_s": _half_life_s(),
+                        "scores": state.acc.astype(np.float64).tobytes(),
+                        "recent": {str(k): v for k, v in state.recent.items()},
+                        "updated_at": dt.datetime.now(dt.timezone.utc),
+                    },
+                    commit=False,
+                )
+            await db.commit()
+    except BaseException:
+        for _, state, _ in dirty:
+            state.dirty = True  # nothing was persisted; retry on the next run
+        raise
+    _states.trim()
+    log.info("Persisted %d risk snapshots", len(dirty))
+    return len(dirty)
@@ -0,0 +1,98 @@
+"""Tile stage of asset processing: Deep Zoom pyramids for large rasters."""
+
+from __future__ import annotations
+import asyncio
+import logging
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.core.executors import run_in_pool
+from app.models import Asset
+from app.processing.previews import RasterTooLarge
+from app.processing.tiles import DESCRIPTOR, read_descriptor, render_deepzoom
+from app.schemas.enums import AssetType, ProcessingStatus
+from app.storage import get_storage
+from .blob import derived_key, tmp_dir
+
+log = logging.getLogger(__name__)
+
+TILED_TYPES = (AssetType.IMAGE, AssetType.GIS)
+
+# Paths a client may request below /assets/{id}/tiles/
+TILE_PATH = re.compile(
+    rf"^(?:{re.escape(DESCRIPTOR)}|image_files/\d+/\d+_\d+\.(?:jpg|png))$"
+)
+
+# Tiles are small and numerous; store several at a time.
+_UPLOAD_CONCURRENCY = 16
+
+
+def tile_key(sha256: str, path: str) -> str:
+    return derived_key(sha256, f"tiles/{path}")
+
+
+async def _read_object(key: str) -> bytes:
+    return b"".join([chunk async for chunk in get_storage().iter_range(key)])
+
+
+async def _store_tree(sha256: str, out_dir: Path) -> None:
+    storage = get_storage()
+    slots = asyncio.Semaphore(_UPLOAD_CONCURRENCY)
+    files = await asyncio.to_thread(
+        lambda: [p for p in out_dir.rglob("*") if p.is_file() and p.name != DESCRIPTOR]
+    )
+
+    async def put(path: Path) -> None:
+        async with slots:
+            await storage.put_file(
+                tile_key(sha256, path.relative_to(out_dir).as_posix()), path
+            )
+
+    await asyncio.gather(*(put(path) for path in files))
+    # The descriptor goes last: its presence marks a complete pyramid.
+    await storage.put_file(tile_key(sha256, DESCRIPTOR), out_dir / DESCRIPTOR)
+
+
+async def generate_tiles(asset: Asset) -> Dict[Any, Any]:
+    """Build and store the tile pyramid for one asset; returns the asset columns to set."""
+    storage = get_storage()
+    sha256 = asset.content_sha256
+    if sha256 is None or asset.asset_type not in TILED_TYPES:
+        return {Asset.tiles_status: ProcessingStatus.SKIPPED}
+
+    descriptor = tile_key(sha256, DESCRIPTOR)
+    if await storage.exists(descriptor):
+        layout = read_descriptor(await _read_object(descriptor))
+        return {Asset.tiles_status: ProcessingStatus.READY, Asset.tiles: layout}
+
+    scratch = tmp_dir()
+    await asyncio.to_thread(scratch.mkdir, parents=True, exist_ok=True)
+    out_dir = Path(
+        await asyncio.to_thread(tempfile.mkdtemp, dir=scratch, prefix="tiles-")
+    )
+    try:
+        async with storage.local_copy(asset.file_path, scratch) as src:
+            try:
+                layout = await run_in_pool(
+                    "media",
+                    render_deepzoom,
+                    str(src),
+                    str(out_dir),
+                    settings.TILE_SIZE,
+                    settings.TILE_OVERLAP,
+                    settings.TILE_MIN_DIMENSION,
+                    settings.MEDIA_MAX_PIXELS,
+                )
+            except RasterTooLarge as exc:
+                log.info("No tiles for asset %s: %s", asset.id, exc)
+                return {Asset.tiles_status: ProcessingStatus.SKIPPED}
+        if layout is None:
+            return {Asset.tiles_status: ProcessingStatus.SKIPPED}
+        await _store_tree(sha256, out_dir)
+    finally:
+        await asyncio.to_thread(shutil.rmtree, out_dir, ignore_errors=True)
+    return {Asset.tiles_status: ProcessingStatus.READY, Asset.tiles: layout}
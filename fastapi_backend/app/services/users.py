@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories import UserRepository, RoleRepository
 from app.schemas.users import UserUpdate, UserRead
 from .base import BaseService
-from app.security.clerk import CurrentUser
+from app.security.clerk import CurrentUser, forget_user
 from app.services.context import ctx_from_current_user
 
 
@@ -77,6 +77,7 @@ class UserService(BaseService[UserRepository]):
         # Apply other updates
         if updates:
             await self.repo.update(user, updates)
+            forget_user(user.clerk_user_id)
 
         ur = UserRead.model_validate(user)
         ur.role_ids = [r.id for r in user.roles]
@@ -111,7 +112,9 @@ class UserService(BaseService[UserRepository]):
         # Build filters to fetch roles by ids (and org if not superadmin)
         filters = [self.role_repo.model.id.in_(role_ids)]
         if not ctx.is_superadmin:
-            filters.insert(0, self.role_repo.model.organization_id == ctx.organization_id)
+            filters.insert(
+                0, self.role_repo.model.organization_id == ctx.organization_id
+            )
 
         roles = await self.role_repo.list(filters=filters)
         if len(roles) != len(role_ids):
@@ -143,7 +146,9 @@ class UserService(BaseService[UserRepository]):
         if ctx.is_superadmin:
             users = await self.repo.list(limit=limit, offset=offset)  # type: ignore
         else:
-            users = await self.repo.list_by_org(ctx.organization_id, limit=limit, offset=offset)
+            users = await self.repo.list_by_org(
+                ctx.organization_id, limit=limit, offset=offset
+            )
 
         result: list[UserRead] = []
         for u in users:
@@ -0,0 +1,34 @@
+"""Asset storage backends; use `get_storage()` rather than touching paths directly."""
+
+from functools import lru_cache
+
+from app.core.config import settings
+from .base import PresignedRequest, StorageBackend
+
+
+def _backend(name: str, cold: bool = False) -> StorageBackend:
+    if name == "s3":
+        from .s3 import from_settings
+    elif name == "local":
+        from .local import from_settings
+    else:
+        setting = "COLD_STORAGE_BACKEND" if cold else "STORAGE_BACKEND"
+        raise RuntimeError(f"Unknown {setting} {name!r}")
+    return from_settings(cold=cold)
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """
+    Backend selected by STORAGE_BACKEND (built once per process), layered
+    over the cold tier of COLD_STORAGE_BACKEND when one is configured.
+    """
+    hot = _backend(settings.STORAGE_BACKEND)
+    if not settings.COLD_STORAGE_BACKEND:
+        return hot
+    from .tiered import TieredStorage
+
+    return TieredStorage(hot, _backend(settings.COLD_STORAGE_BACKEND, cold=True))
+
+
+__all__ = ["PresignedRequest", "StorageBackend", "get_storage"]
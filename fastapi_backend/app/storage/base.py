@@ -0,0 +1,120 @@
+from __future__ import annotations
+import asyncio
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+READ_CHUNK = 1024**2
+
+
+@dataclass(frozen=True)
+class PresignedRequest:
+    """A request the client makes directly against storage."""
+
+    url: str
+    method: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class StorageBackend(ABC):
+    """
+    Where asset bytes live, addressed by relative keys such as "ab/ab12...".
+    Every method is safe to await from the event loop: blocking work runs in
+    threads. Presigned URLs let clients move large files without the API.
+    """
+
+    @abstractmethod
+    async def put_file(self, key: str, src: Path) -> None:
+        """Store a finished local file under `key`; `src` is consumed."""
+
+    @abstractmethod
+    async def move(self, src_key: str, dest_key: str) -> None:
+        """Rename an object inside the backend."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove `key`; missing keys are ignored."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Remove every object whose key starts with `prefix` (a "directory/")."""
+
+    @abstractmethod
+    async def size(self, key: str) -> Optional[int]:
+        """Object size in bytes, or None if it does not exist."""
+
+    async def exists(self, key: str) -> bool:
+        return await self.size(key) is not None
+
+    async def locate(self, key: str) -> "StorageBackend":
+        """The backend actually holding `key`; differs only for tiered storage."""
+        return self
+
+    @abstractmethod
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = READ_CHUNK,
+    ) -> AsyncIterator[bytes]:
+        """Stream bytes [start, end] (inclusive; end=None reads to EOF)."""
+
+    @abstractmethod
+    async def sha256(self, key: str) -> str:
+        """Hex SHA-256 of the stored object."""
+
+    @abstractmethod
+    def presign_get(
+        self,
+        key: str,
+        expires_s: int,
+        filename: Optional[str] = None,
+    ) -> PresignedRequest:
+        """Time-limited download link."""
+
+    @abstractmethod
+    def presign_put(
+        self,
+        key: str,
+        expires_s: int,
+        size: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        """Time-limited upload link accepting exactly `size` bytes."""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path if the object is on local disk (enables sendfile)."""
+        return None
+
+    def upload_path(self, key: str) -> Optional[Path]:
+        """Filesystem path a signed upload of `key` is written to (local backends only)."""
+        return None
+
+    @asynccontextmanager
+    async def local_copy(self, key: str, tmp_dir: Path) -> AsyncIterator[Path]:
+        """
+        A filesystem path holding the object, for tools that need one (image
+        decoders, ffmpeg). Local objects are used in place; others are
+        downloaded into `tmp_dir` and removed afterwards.
+        """
+        path = self.local_path(key)
+        if path is not None:
+            yield path
+            return
+        await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+        fd, tmp = await asyncio.to_thread(
+            tempfile.mkstemp, dir=tmp_dir, prefix="fetch-"
+        )
+        try:
+            with os.fdopen(fd, "wb") as out:
+                async for data in self.iter_range(key):
+                    await asyncio.to_thread(out.write, data)
+            yield Path(tmp)
+        finally:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import asyncio
+import os
+import shutil
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from urllib.parse import quote, urlencode
+
+from app.core.config import settings
+from app.helpers.files import hash_file
+from . import signing
+from .base import READ_CHUNK, PresignedRequest, StorageBackend
+
+
+def _move(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(src, dest)  # a rename when on the same filesystem
+
+
+def _size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
+
+
+class LocalStorage(StorageBackend):
+    """Objects are files under `root`. Presigned URLs point at /storage on the API."""
+
+    def __init__(self, root: Path, public_url: str) -> None:
+        self.root = root.resolve()
+        self.public_url = public_url.rstrip("/")
+
+    def local_path(self, key: str) -> Path:
+        # Rows written before the storage layer hold absolute paths.
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    def upload_path(self, key: str) -> Path:
+        return self.local_path(key)
+
+    async def put_file(self, key: str, src: Path) -> None:
+        await asyncio.to_thread(_move, src, self.local_path(key))
+
+    async def move(self, src_key: str, dest_key: str) -> None:
+        await asyncio.to_thread(
+            _move, self.local_path(src_key), self.local_path(dest_key)
+        )
+
+    async def delete(self, key: str) -> None:
+        with suppress(FileNotFoundError):
+            await asyncio.to_thread(os.unlink, self.local_path(key))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        path = self.local_path(prefix)
+        if path == self.root:
+            raise ValueError("Refusing to delete the storage root")
+        await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+
+    async def size(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(_size, self.local_path(key))
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = READ_CHUNK,
+    ) -> AsyncIterator[bytes]:
+        src = await asyncio.to_thread(open, self.local_path(key), "rb")
+        try:
+            await asyncio.to_thread(src.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                n = chunk_size if remaining is None else min(chunk_size, remaining)
+                data = await asyncio.to_thread(src.read, n)
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+        finally:
+            src.close()
+
+    async def sha256(self, key: str) -> str:
+        digest, _ = await hash_file(self.local_path(key), READ_CHUNK)
+        return digest
+
+    def _signed_url(
+        self,
+        method: str,
+        key: str,
+        expires_s: int,
+        size: Optional[int] = None,
+        filename: Optional[str] = None,
+    ) -> str:
+        expires_at = int(time.time()) + expires_s
+        sig = signing.sign(method, key, expires_at, size, filename)
+        params = {"exp": expires_at, "sig": sig}
+        if filename:
+            params["filename"] = filename
+        if size is not None:
+            params["size"] = size
+        return f"{self.public_url}/storage/{quote(key)}?{urlencode(params)}"
+
+    def presign_get(
+        self,
+        key: str,
+        expires_s: int,
+        filename: Optional[str] = None,
+    ) -> PresignedRequest:
+        return PresignedRequest(
+            url=self._signed_url("GET", key, expires_s, filename=filename),
+            method="GET",
+        )
+
+    def presign_put(
+        self,
+        key: str,
+        expires_s: int,
+        size: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        return PresignedRequest(
+            url=self._signed_url("PUT", key, expires_s, size=size),
+            method="PUT",
+            headers={"Content-Length": str(size)},
+        )
+
+
+def from_settings(cold: bool = False) -> LocalStorage:
+    root = settings.COLD_ASSET_ROOT if cold else settings.ASSET_ROOT
+    if not root:
+        raise RuntimeError("COLD_STORAGE_BACKEND=local requires COLD_ASSET_ROOT")
+    return LocalStorage(Path(root), settings.STORAGE_PUBLIC_URL)
@@ -0,0 +1,195 @@
+"""Serve stored objects over HTTP with Range, multipart/byteranges and ETags."""
+
+from __future__ import annotations
+import asyncio
+import os
+import secrets
+from pathlib import Path
+from typing import List, Mapping, Optional, Union
+from urllib.parse import quote
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.helpers.http_range import (
+    ByteRange,
+    RangeNotSatisfiable,
+    none_match,
+    parse_range,
+    range_applies,
+)
+from .base import READ_CHUNK, StorageBackend
+
+# Bytes literal (multipart framing) or an inclusive byte range of the object
+Segment = Union[bytes, ByteRange]
+
+ZEROCOPY = "http.response.zerocopysend"
+PATHSEND = "http.response.pathsend"
+
+
+class StorageResponse(Response):
+    """
+    Streams `segments` of an object. Local files use the server's zero-copy
+    extensions when offered (sendfile), otherwise positional reads in a
+    thread; other backends stream through StorageBackend.iter_range.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        key: str,
+        segments: List[Segment],
+        status_code: int,
+        headers: Mapping[str, str],
+        media_type: Optional[str] = None,
+        whole_file: bool = False,
+    ) -> None:
+        super().__init__(
+            status_code=status_code, headers=headers, media_type=media_type
+        )
+        self.storage = storage
+        self.key = key
+        self.segments = segments
+        self.whole_file = whole_file
+        self.headers["content-length"] = str(
+            sum(len(s) if isinstance(s, bytes) else s[1] - s[0] + 1 for s in segments)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = self.storage.local_path(self.key)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        extensions = scope.get("extensions") or {}
+        if path is not None and self.whole_file and PATHSEND in extensions:
+            await send({"type": PATHSEND, "path": str(path)})
+            return
+        if path is not None:
+            await self._send_local(send, path, ZEROCOPY in extensions)
+        else:
+            await self._send_streamed(send)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_local(self, send: Send, path: Path, zerocopy: bool) -> None:
+        with open(path, "rb") as src:
+            fd = src.fileno()
+            for segment in self.segments:
+                if isinstance(segment, bytes):
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": segment,
+                            "more_body": True,
+                        }
+                    )
+                    continue
+                start, end = segment
+                if zerocopy:
+                    await send(
+                        {
+                            "type": ZEROCOPY,
+                            "file": src,
+                            "offset": start,
+                            "count": end - start + 1,
+                            "more_body": True,
+                        }
+                    )
+                    continue
+                pos = start
+                while pos <= end:
+                    data = await asyncio.to_thread(
+                        os.pread, fd, min(READ_CHUNK, end - pos + 1), pos
+                    )
+                    if not data:
+                        break
+                    pos += len(data)
+                    await send(
+                        {"type": "http.response.body", "body": data, "more_body": True}
+                    )
+
+    async def _send_streamed(self, send: Send) -> None:
+        for segment in self.segments:
+            if isinstance(segment, bytes):
+                await send(
+                    {"type": "http.response.body", "body": segment, "more_body": True}
+                )
+                continue
+            async for data in self.storage.iter_range(self.key, *segment):
+                await send(
+                    {"type": "http.response.body", "body": data, "more_body": True}
+                )
+
+
+def content_response(
+    storage: StorageBackend,
+    key: str,
+    size: int,
+    request_headers: Mapping[str, str],
+    *,
+    etag: Optional[str] = None,
+    media_type: str = "application/octet-stream",
+    filename: Optional[str] = None,
+    cache_control: str = "private, max-age=31536000, immutable",
+) -> Response:
+    """
+    Build the response for a GET of an object: 304 on If-None-Match, 206 for
+    one range, 206 multipart/byteranges for several, 416 when unsatisfiable,
+    otherwise 200 with the whole body.
+    """
+    headers = {"accept-ranges": "bytes", "cache-control": cache_control}
+    if etag:
+        headers["etag"] = etag
+    if filename:
+        headers["content-disposition"] = f"inline; filename*=utf-8''{quote(filename)}"
+
+    if none_match(request_headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    ranges = None
+    if range_applies(request_headers.get("if-range"), etag):
+        try:
+            ranges = parse_range(request_headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**headers, "content-range": f"bytes */{size}"},
+            )
+
+    if ranges is None:
+        segments: List[Segment] = [(0, size - 1)] if size else []
+        return StorageResponse(
+            storage, key, segments, 200, headers, media_type, whole_file=True
+        )
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+        return StorageResponse(storage, key, ranges, 206, headers, media_type)
+
+    boundary = secrets.token_hex(16)
+    segments = []
+    for start, end in ranges:
+        segments.append(
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {media_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode()
+        )
+        segments.append((start, end))
+        segments.append(b"\r\n")
+    segments.append(f"--{boundary}--\r\n".encode())
+    return StorageResponse(
+        storage,
+        key,
+        segments,
+        206,
+        headers,
+        f"multipart/byteranges; boundary={boundary}",
+    )
@@ -0,0 +1,205 @@
+"""S3-compatible backend (AWS, MinIO, ...). Requires the optional `boto3` dependency."""
+
+from __future__ import annotations
+import asyncio
+import base64
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from app.core.config import settings
+from .base import READ_CHUNK, PresignedRequest, StorageBackend
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.exceptions import ClientError
+except ImportError:  # pragma: no cover - optional dependency
+    boto3 = None
+
+
+def _b64_to_hex(value: str) -> str:
+    return base64.b64decode(value).hex()
+
+
+def _hex_to_b64(value: str) -> str:
+    return base64.b64encode(bytes.fromhex(value)).decode()
+
+
+class S3Storage(StorageBackend):
+    """
+    Objects live in `bucket` under `prefix`. boto3 is blocking, so every call
+    runs in a worker thread; large transfers use boto3's managed multipart.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        prefix: str = "",
+        storage_class: Optional[str] = None,
+    ) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.extra_args = {"ChecksumAlgorithm": "SHA256"}
+        if storage_class:
+            self.extra_args["StorageClass"] = storage_class
+        self.transfer = TransferConfig(multipart_chunksize=64 * 1024**2)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def put_file(self, key: str, src: Path) -> None:
+        await asyncio.to_thread(
+            self.client.upload_file,
+            str(src),
+            self.bucket,
+            self._key(key),
+            ExtraArgs=self.extra_args,
+            Config=self.transfer,
+        )
+        await asyncio.to_thread(os.unlink, src)
+
+    async def move(self, src_key: str, dest_key: str) -> None:
+        await asyncio.to_thread(
+            self.client.copy,
+            {"Bucket": self.bucket, "Key": self._key(src_key)},
+            self.bucket,
+            self._key(dest_key),
+            Config=self.transfer,
+        )
+        await self.delete(src_key)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=self._key(key)
+        )
+
+    async def delete_prefix(self, prefix: str) -> None:
+        def _delete_all() -> None:
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(
+                Bucket=self.bucket, Prefix=self._key(prefix)
+            ):
+                keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+                if keys:
+                    self.client.delete_objects(
+                        Bucket=self.bucket, Delete={"Objects": keys, "Quiet": True}
+                    )
+
+        await asyncio.to_thread(_delete_all)
+
+    async def _head(self, key: str) -> Optional[dict]:
+        try:
+            return await asyncio.to_thread(
+                self.client.head_object,
+                Bucket=self.bucket,
+                Key=self._key(key),
+                ChecksumMode="ENABLED",
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                return None
+            raise
+
+    async def size(self, key: str) -> Optional[int]:
+        head = await self._head(key)
+        return None if head is None else head["ContentLength"]
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = READ_CHUNK,
+    ) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        obj = await asyncio.to_thread(
+            self.client.get_object,
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Range=byte_range,
+        )
+        body = obj["Body"]
+        try:
+            while data := await asyncio.to_thread(body.read, chunk_size):
+                yield data
+        finally:
+            body.close()
+
+    async def sha256(self, key: str) -> str:
+        head = await self._head(key)
+        # Single-part uploads made with a SHA-256 checksum carry it for free;
+        # anything else is hashed by streaming the object.
+        if head and head.get("ChecksumSHA256") and "-" not in head["ChecksumSHA256"]:
+            return _b64_to_hex(head["ChecksumSHA256"])
+        digest = hashlib.sha256()
+        async for data in self.iter_range(key):
+            digest.update(data)
+        return digest.hexdigest()
+
+    def presign_get(
+        self,
+        key: str,
+        expires_s: int,
+        filename: Optional[str] = None,
+    ) -> PresignedRequest:
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        url = self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_s
+        )
+        return PresignedRequest(url=url, method="GET")
+
+    def presign_put(
+        self,
+        key: str,
+        expires_s: int,
+        size: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        checksum = _hex_to_b64(sha256)
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(key),
+                "ContentLength": size,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=expires_s,
+        )
+        # S3 rejects the PUT unless the body matches this checksum.
+        return PresignedRequest(
+            url=url,
+            method="PUT",
+            headers={"Content-Length": str(size), "x-amz-checksum-sha256": checksum},
+        )
+
+
+def from_settings(cold: bool = False) -> S3Storage:
+    if boto3 is None:
+        raise RuntimeError("STORAGE_BACKEND=s3 requires the boto3 package")
+    client = boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        region_name=settings.S3_REGION,
+        aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+    )
+    if cold:
+        # Same account/endpoint; a different bucket or prefix and storage class
+        return S3Storage(
+            client,
+            settings.COLD_S3_BUCKET or settings.S3_BUCKET,
+            settings.COLD_S3_PREFIX,
+            settings.COLD_S3_STORAGE_CLASS,
+        )
+    return S3Storage(client, settings.S3_BUCKET, settings.S3_PREFIX)
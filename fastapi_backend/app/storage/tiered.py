@@ -0,0 +1,88 @@
+"""Hot/cold tiering: one backend for new and recent objects, a cheaper one for old blobs."""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from .base import READ_CHUNK, PresignedRequest, StorageBackend
+
+
+class TieredStorage(StorageBackend):
+    """
+    Writes go to `hot`; reads look in `hot` first and fall back to `cold`,
+    so callers never need to know where an object lives. Only the asset
+    lifecycle job (app.jobs.lifecycle) moves blobs to `cold`, under the
+    same key. Deletes apply to both tiers.
+    """
+
+    def __init__(self, hot: StorageBackend, cold: StorageBackend) -> None:
+        self.hot = hot
+        self.cold = cold
+
+    async def locate(self, key: str) -> StorageBackend:
+        if await self.hot.exists(key) or not await self.cold.exists(key):
+            return self.hot
+        return self.cold
+
+    async def put_file(self, key: str, src: Path) -> None:
+        await self.hot.put_file(key, src)
+
+    async def move(self, src_key: str, dest_key: str) -> None:
+        await self.hot.move(src_key, dest_key)  # staging keys only exist in hot
+
+    async def delete(self, key: str) -> None:
+        await self.hot.delete(key)
+        await self.cold.delete(key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await self.hot.delete_prefix(prefix)
+        await self.cold.delete_prefix(prefix)
+
+    async def size(self, key: str) -> Optional[int]:
+        size = await self.hot.size(key)
+        if size is None:
+            size = await self.cold.size(key)
+        return size
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = READ_CHUNK,
+    ) -> AsyncIterator[bytes]:
+        backend = await self.locate(key)
+        async for data in backend.iter_range(key, start, end, chunk_size):
+            yield data
+
+    async def sha256(self, key: str) -> str:
+        return await (await self.locate(key)).sha256(key)
+
+    def presign_get(
+        self,
+        key: str,
+        expires_s: int,
+        filename: Optional[str] = None,
+    ) -> PresignedRequest:
+        """Links the hot copy; call `locate` first for objects that may be cold."""
+        return self.hot.presign_get(key, expires_s, filename)
+
+    def presign_put(
+        self,
+        key: str,
+        expires_s: int,
+        size: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        return self.hot.presign_put(key, expires_s, size, sha256)
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """The copy on local disk, if any; None sends callers to iter_range (e.g. cold S3)."""
+        for backend in (self.hot, self.cold):
+            path = backend.local_path(key)
+            if path is not None and path.exists():
+                return path
+        return None
+
+    def upload_path(self, key: str) -> Optional[Path]:
+        return self.hot.upload_path(key)  # new objects land in hot
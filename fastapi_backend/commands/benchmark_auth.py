@@ -0,0 +1,75 @@
+"""
+Time per-request token verification with and without the verified-claims cache.
+
+    python -m commands.benchmark_auth [n_requests]
+
+Signs a Clerk-shaped RS256 token with a throwaway key and decodes it
+n_requests times, the way a dashboard re-sending one session token does.
+No network: the JWKS is served from memory.
+"""
+
+import asyncio
+import sys
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.security import clerk
+from app.security.jwks import JWKSCache
+
+ISSUER = "https://benchmark.clerk.accounts.dev"
+
+
+def signed_token() -> tuple[str, dict]:
+    pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = {**jwk.construct(pem, "RS256").public_key().to_dict(), "kid": "bench"}
+    now = int(time.time())
+    claims = {
+        "sub": "user_bench",
+        "iss": ISSUER,
+        "azp": "https://app.example.com",
+        "exp": now + 3600,
+        "nbf": now - 5,
+        "o": {"id": "org_bench", "rol": "admin", "slg": "bench", "per": ["read"]},
+    }
+    token = jwt.encode(claims, pem, algorithm="RS256", headers={"kid": "bench"})
+    return token, {"keys": [public]}
+
+
+async def run(token: str, n: int, cached: bool) -> float:
+    clerk._claims_cache.clear()
+    start = time.perf_counter()
+    for _ in range(n):
+        if not cached:
+            clerk._claims_cache.clear()
+        clerk._claims_to_ctx(await clerk._decode_clerk(token))
+    return (time.perf_counter() - start) / n
+
+
+async def main(n: int) -> None:
+    token, keys = signed_token()
+
+    async def fetch():
+        return keys
+
+    clerk.jwks = JWKSCache(f"{ISSUER}/.well-known/jwks.json", fetch=fetch)
+    clerk.CLERK_ISSUER = ISSUER
+    clerk.CLERK_PERMITTED_AZP = {"https://app.example.com"}
+    await clerk.jwks.warm()
+
+    uncached = await run(token, n, cached=False)
+    cached = await run(token, n, cached=True)
+    print(f"{n} requests, one token")
+    print(f"  without cache: {uncached * 1e6:8.1f} us/request")
+    print(f"  with cache:    {cached * 1e6:8.1f} us/request ({uncached / cached:.0f}x)")
+    print(f"  {clerk._claims_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
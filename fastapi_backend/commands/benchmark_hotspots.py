@@ -0,0 +1,45 @@
+"""
+Time hotspot detection on synthetic data.
+
+    python -m commands.benchmark_hotspots [n_events]
+
+Scatters events uniformly over a ~200 km box and plants a few dense clusters.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from app.analytics.hotspots import detect_hotspots
+
+
+def synthetic_events(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_planted = n // 20
+    centers = np.array([[-97.5, 31.0], [-96.8, 30.4], [-97.1, 30.9]])
+    which = rng.integers(0, len(centers), n_planted)
+    planted = centers[which] + rng.normal(scale=0.002, size=(n_planted, 2))
+    noise = np.column_stack(
+        (
+            rng.uniform(-98.0, -96.0, n - n_planted),
+            rng.uniform(30.0, 32.0, n - n_planted),
+        )
+    )
+    points = np.vstack((planted, noise))
+    severity = rng.integers(1, 6, n)
+    return points[:, 0], points[:, 1], severity
+
+
+def main(n: int) -> None:
+    lon, lat, severity = synthetic_events(n)
+    start = time.perf_counter()
+    hotspots = detect_hotspots(lon, lat, severity, eps_km=0.25, min_events=50)
+    elapsed = time.perf_counter() - start
+    print(f"{n} events -> {len(hotspots)} hotspots in {elapsed:.2f}s")
+    for h in sorted(hotspots, key=lambda h: -h.event_count)[:5]:
+        print(f"  {h.event_count} events, max severity {h.max_severity}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,111 @@
+"""
+Time report aggregation (ReportRepository.metrics) against a synthetic org.
+
+    python -m commands.benchmark_report_metrics [n_events]
+
+Needs DATABASE_URL. Seeds one organization with 50 pipelines, n events
+spread over a quarter, an alert for every tenth event and n/100 assets, all
+with generate_series inside one transaction that is rolled back at the end,
+so nothing is left behind.
+"""
+
+import asyncio
+import datetime as dt
+import sys
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.database import async_session_maker
+from app.repositories import ReportRepository
+from app.schemas.enums import AssetType, EventType
+
+PERIOD_START = dt.date(2024, 1, 1)
+PERIOD_END = dt.date(2024, 4, 1)
+# Enum columns store member names
+EVENT_TYPES = "ARRAY[" + ",".join(f"'{e.name}'" for e in EventType) + "]::eventtype[]"
+ASSET_TYPES = "ARRAY[" + ",".join(f"'{a.name}'" for a in AssetType) + "]::assettype[]"
+
+SEED = [
+    """
+    INSERT INTO organizations (id, name, slug, client_type, is_active, created_at, updated_at)
+    VALUES (:org, :name, :name, 'OTHER', true, now(), now())
+    """,
+    """
+    INSERT INTO pipelines (id, organization_id, name, length_km, created_at, updated_at)
+    SELECT gen_random_uuid(), :org, 'Pipeline ' || i, 10 + i, now(), now()
+    FROM generate_series(1, 50) AS i
+    """,
+    f"""
+    INSERT INTO events (id, organization_id, event_type, detected_at, severity, pipeline_id,
+                        created_at, updated_at)
+    SELECT gen_random_uuid(), :org,
+           ({EVENT_TYPES})[1 + (i % {len(EventType)})],
+           CAST(:start AS timestamptz) + random() * CAST(:period AS interval),
+           CASE WHEN i % 17 = 0 THEN NULL ELSE 1 + (i % 5) END,
+           p.ids[1 + (i % 51)],  -- one in 51 events has no pipeline
+           now(), now()
+    FROM generate_series(1, CAST(:n AS integer)) AS i,
+         (SELECT array_agg(id) AS ids FROM pipelines WHERE organization_id = :org) AS p
+    """,
+    """
+    INSERT INTO alerts (id, organization_id, event_id, sent_at, acknowledged_at,
+                        created_at, updated_at)
+    SELECT gen_random_uuid(), :org, e.id, e.detected_at,
+           CASE WHEN random() < 0.8
+                THEN e.detected_at + random() * interval '6 hours' END,
+           now(), now()
+    FROM (SELECT id, detected_at, row_number() OVER () AS i
+          FROM events WHERE organization_id = :org) AS e
+    WHERE e.i % 10 = 0
+    """,
+    f"""
+    INSERT INTO assets (id, organization_id, asset_type, file_path, size_bytes, captured_at,
+                        created_at, updated_at)
+    SELECT gen_random_uuid(), :org,
+           ({ASSET_TYPES})[1 + (i % {len(AssetType)})],
+           'bench/' || i, (random() * 50000000)::bigint,
+           CASE WHEN i % 3 <> 0
+                THEN CAST(:start AS timestamptz) + random() * CAST(:period AS interval) END,
+           CAST(:start AS timestamptz) + random() * CAST(:period AS interval), now()
+    FROM generate_series(1, CAST(:n AS integer) / 100) AS i
+    """,
+]
+
+
+async def main(n: int) -> None:
+    org_id = uuid.uuid4()
+    params = {
+        "org": org_id,
+        "name": f"bench-{org_id.hex[:12]}",
+        "n": n,
+        "start": dt.datetime.combine(PERIOD_START, dt.time(), tzinfo=dt.timezone.utc),
+        "period": PERIOD_END - PERIOD_START,
+    }
+    async with async_session_maker() as db:
+        try:
+            start = time.perf_counter()
+            for statement in SEED:
+                await db.execute(text(statement), params)
+            await db.execute(text("ANALYZE events, alerts, assets"))
+            print(f"Seeded {n} events in {time.perf_counter() - start:.1f}s")
+
+            repo = ReportRepository(db)
+            for period_end in (dt.date(2024, 1, 8), dt.date(2024, 2, 1), PERIOD_END):
+                timings = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    metrics = await repo.metrics(org_id, PERIOD_START, period_end)
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"{PERIOD_START} - {period_end}: {metrics.event_count} events, "
+                    f"{len(metrics.timeline)} {metrics.timeline_unit} buckets, "
+                    f"{metrics.alerts.sent} alerts in {min(timings) * 1000:.0f} ms (best of 3)"
+                )
+        finally:
+            await db.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000))
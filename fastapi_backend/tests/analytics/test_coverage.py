@@ -0,0 +1,41 @@
+import pytest
+import shapely
+from shapely.geometry import LineString, box
+
+from app.analytics.coverage import compute_coverage
+
+
+@pytest.fixture
+def line_wkb():
+    # ~14.3 km east-west line at 50°N
+    return shapely.to_wkb(LineString([(10.0, 50.0), (10.2, 50.0)]))
+
+
+def test_overlapping_footprints_are_unioned(line_wkb):
+    footprints = [
+        shapely.to_wkb(box(10.05, 49.99, 10.10, 50.01)),
+        shapely.to_wkb(box(10.08, 49.99, 10.12, 50.01)),
+        shapely.to_wkb(box(20.0, 20.0, 21.0, 21.0)),  # far away, prefiltered out
+    ]
+    result = compute_coverage(line_wkb, footprints, corridor_km=0.05, segment_km=1.0)
+
+    assert result.length_km == pytest.approx(14.31, abs=0.01)
+    assert result.covered_pct == pytest.approx(35.0, abs=0.1)
+    assert result.covered_km + result.uncovered_km == pytest.approx(result.length_km)
+    assert len(result.segments) == 15
+    assert sum(s.covered_km for s in result.segments) == pytest.approx(
+        result.covered_km
+    )
+    assert result.segments[0].covered_km == 0
+    assert result.segments[5].uncovered_km == pytest.approx(0)
+
+
+def test_no_footprints(line_wkb):
+    result = compute_coverage(line_wkb, [], corridor_km=0.05, segment_km=5.0)
+    assert result.covered_km == 0
+    assert [s.end_km for s in result.segments][-1] == pytest.approx(result.length_km)
+
+
+def test_rejects_non_line_geometry():
+    with pytest.raises(ValueError):
+        compute_coverage(shapely.to_wkb(box(0, 0, 1, 1)), [], 0.05, 1.0)
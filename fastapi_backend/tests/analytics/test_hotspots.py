@@ -0,0 +1,59 @@
+import numpy as np
+import shapely
+
+from app.analytics.hotspots import detect_hotspots
+
+
+def _cluster(rng, lon, lat, n, spread_deg=0.0005):
+    return rng.normal((lon, lat), spread_deg, size=(n, 2))
+
+
+def test_finds_planted_clusters_and_ignores_noise():
+    rng = np.random.default_rng(1)
+    a = _cluster(rng, -97.0, 31.0, 200)
+    b = _cluster(rng, -96.5, 31.3, 150)
+    noise = np.column_stack((rng.uniform(-98, -96, 300), rng.uniform(30, 32, 300)))
+    points = np.vstack((a, b, noise))
+    severity = np.ones(len(points), dtype=int)
+    severity[0] = 5
+
+    hotspots = detect_hotspots(
+        points[:, 0], points[:, 1], severity, eps_km=0.25, min_events=20
+    )
+
+    assert len(hotspots) == 2
+    by_size = sorted(hotspots, key=lambda h: -h.event_count)
+    assert 200 <= by_size[0].event_count <= 205
+    assert 150 <= by_size[1].event_count <= 155
+    assert by_size[0].max_severity == 5
+    polygon = shapely.from_wkt(by_size[0].polygon_wkt)
+    assert polygon.contains(shapely.Point(-97.0, 31.0))
+
+
+def test_sparse_points_yield_no_hotspots():
+    rng = np.random.default_rng(2)
+    lon, lat = rng.uniform(-98, -96, 100), rng.uniform(30, 32, 100)
+    assert detect_hotspots(lon, lat, np.ones(100), eps_km=0.25, min_events=5) == []
+
+
+def test_empty_input():
+    empty = np.array([])
+    assert detect_hotspots(empty, empty, empty, eps_km=0.25, min_events=5) == []
+
+
+def test_eps_holds_at_every_latitude_of_an_organization():
+    # Events spaced 0.2 km east-west at 70N; the org also has a cluster at the
+    # equator, so one mean-latitude projection would stretch them past eps.
+    rng = np.random.default_rng(3)
+    step_deg = 0.2 / (111.320 * np.cos(np.radians(70.0)))
+    north = np.column_stack((20.0 + step_deg * np.arange(30), np.full(30, 70.0)))
+    south = _cluster(rng, 10.0, 0.0, 50)
+    points = np.vstack((north, south))
+
+    hotspots = detect_hotspots(
+        points[:, 0], points[:, 1], np.ones(len(points)), eps_km=0.25, min_events=3
+    )
+
+    assert sorted(h.event_count for h in hotspots) == [30, 50]
+    line = next(h for h in hotspots if h.event_count == 30)
+    assert shapely.from_wkt(line.polygon_wkt).contains(shapely.MultiPoint(north))
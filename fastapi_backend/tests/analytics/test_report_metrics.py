@@ -0,0 +1,64 @@
+import datetime as dt
+import pickle
+
+from app.analytics.report_metrics import (
+    AlertStats,
+    AssetStats,
+    EventTypeStats,
+    PipelineStats,
+    ReportMetrics,
+    TimelineBucket,
+    report_sections,
+    timeline_unit,
+)
+from app.processing.report_pdf import render_report_pdf
+
+
+def _metrics() -> ReportMetrics:
+    return ReportMetrics(
+        period_start=dt.date(2024, 6, 3),
+        period_end=dt.date(2024, 6, 10),
+        timeline_unit="day",
+        event_types=[
+            EventTypeStats("leak", 12, (1, 2, 3, 4, 1), 1, 5),
+            EventTypeStats("fire", 3, (0, 0, 3, 0, 0), 0, 3),
+        ],
+        pipelines=[
+            PipelineStats("p1", "North line", 10, 5, 5),
+            PipelineStats(None, None, 5, 0, 3),
+        ],
+        timeline=[TimelineBucket(dt.date(2024, 6, 3), 15, 5)],
+        alerts=AlertStats(4, 3, 600.0, 9000.0, 3300.0, 9000.0),
+        assets=[AssetStats("image", 2, 3 * 1024 * 1024)],
+    )
+
+
+def test_timeline_unit_follows_period_length():
+    assert timeline_unit(dt.date(2024, 6, 3), dt.date(2024, 6, 10)) == "day"
+    assert timeline_unit(dt.date(2024, 1, 1), dt.date(2024, 2, 1)) == "day"
+    assert timeline_unit(dt.date(2024, 1, 1), dt.date(2024, 4, 1)) == "week"
+
+
+def test_sections_lay_out_every_metric():
+    metrics = _metrics()
+    sections = {s["heading"]: s for s in report_sections(metrics)}
+
+    assert metrics.event_count == 15
+    by_type = sections["Events by type and severity"]
+    assert by_type["rows"][0] == ["leak", 12, 1, 2, 3, 4, 1, 1]
+    assert len(by_type["columns"]) == len(by_type["rows"][0])
+    assert sections["Events by pipeline"]["rows"][1][0] == "(no pipeline)"
+    assert sections["Events per day"]["rows"] == [["2024-06-03", 15, 5]]
+    assert sections["Alert response"]["rows"] == [
+        [4, 3, "10 min", "2.5 h", "55 min", "2.5 h"]
+    ]
+    assert sections["Assets captured"]["rows"] == [["image", 2, "3.0 MiB"]]
+
+
+def test_sections_render_and_pickle(tmp_path):
+    sections = report_sections(
+        ReportMetrics(dt.date(2024, 6, 3), dt.date(2024, 6, 10), "day")
+    )
+    content = {"title": "Weekly report", "sections": sections}
+    assert pickle.loads(pickle.dumps(content)) == content  # shipped to the media pool
+    assert render_report_pdf(content, str(tmp_path / "r.pdf")) == 1
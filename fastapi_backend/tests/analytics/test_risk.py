@@ -0,0 +1,62 @@
+import math
+import uuid
+
+import numpy as np
+import pytest
+
+from app.analytics.risk import REBASE_EXPONENT, RiskState, severity_weight
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def segments():
+    return [uuid.uuid4() for _ in range(4)]
+
+
+def test_score_halves_after_one_half_life(segments):
+    state = RiskState.empty(segments, half_life_s=10 * DAY, now=0.0)
+    state.apply(uuid.uuid4(), segments[1], 4.0, detected_at=0.0, created_at=0.0)
+
+    assert state.scores(0.0).tolist() == [0.0, 4.0, 0.0, 0.0]
+    assert state.scores(10 * DAY)[1] == pytest.approx(2.0)
+
+
+def test_matches_direct_sum_across_rebase(segments):
+    tau_days = 2.0
+    state = RiskState.empty(segments, half_life_s=tau_days * DAY * math.log(2), now=0.0)
+    events = [(segments[i % 4], float(i % 5 + 1), i * 7 * DAY) for i in range(40)]
+    for seg, w, t in events:
+        state.apply(uuid.uuid4(), seg, w, detected_at=t, created_at=t)
+    assert state.t_ref > 0  # 270 days at tau=2d forces at least one rebase
+
+    now = events[-1][2] + DAY
+    expected = np.zeros(4)
+    for seg, w, t in events:
+        expected[segments.index(seg)] += w * math.exp(-(now - t) / (tau_days * DAY))
+    assert np.allclose(state.scores(now), expected)
+    assert np.all(np.isfinite(state.acc))
+    assert np.max(state.acc) < math.exp(REBASE_EXPONENT) * 5
+
+
+def test_duplicate_and_unknown_events_are_ignored(segments):
+    state = RiskState.empty(segments, half_life_s=DAY, now=0.0)
+    event_id = uuid.uuid4()
+    assert state.apply(event_id, segments[0], 1.0, 0.0, 0.0)
+    assert not state.apply(event_id, segments[0], 1.0, 0.0, 0.0)
+    assert not state.apply(uuid.uuid4(), uuid.uuid4(), 1.0, 0.0, 0.0)
+    assert state.scores(0.0).sum() == 1.0
+
+
+def test_prune_keeps_ids_inside_lag(segments):
+    state = RiskState.empty(segments, half_life_s=DAY, now=0.0)
+    old, new = uuid.uuid4(), uuid.uuid4()
+    state.apply(old, segments[0], 1.0, 0.0, created_at=0.0)
+    state.apply(new, segments[0], 1.0, 0.0, created_at=1000.0)
+    state.prune(lag_s=100.0)
+    assert set(state.recent) == {new}
+
+
+def test_severity_weight_defaults_to_one():
+    assert severity_weight(None) == 1.0
+    assert severity_weight(5) == 5.0
@@ -0,0 +1,35 @@
+import pytest
+import shapely
+from shapely import wkt
+from shapely.geometry import LineString, MultiLineString
+
+from app.analytics.segmentation import segment_line
+
+
+def test_segments_cover_line_with_contiguous_chainage():
+    line = LineString([(10.0, 50.0), (10.1, 50.0), (10.1, 50.05)])
+    segments = segment_line(shapely.to_wkb(line), 2.0)
+
+    assert [s[0] for s in segments] == list(range(len(segments)))
+    assert segments[0][1] == 0.0
+    for (_, _, end, _), (_, start, _, _) in zip(segments, segments[1:]):
+        assert start == end
+    assert all(s[2] - s[1] == pytest.approx(2.0) for s in segments[:-1])
+    assert 0 < segments[-1][2] - segments[-1][1] <= 2.0
+
+    first = wkt.loads(segments[0][3])
+    assert first.coords[0] == pytest.approx((10.0, 50.0))
+    last = wkt.loads(segments[-1][3])
+    assert last.coords[-1] == pytest.approx((10.1, 50.05))
+
+
+def test_contiguous_multilinestring_is_merged():
+    multi = MultiLineString([[(0, 0), (0.01, 0)], [(0.01, 0), (0.02, 0)]])
+    segments = segment_line(shapely.to_wkb(multi), 1.0)
+    assert segments[-1][2] == pytest.approx(2.226, abs=0.01)
+
+
+def test_disjoint_multilinestring_is_rejected():
+    multi = MultiLineString([[(0, 0), (0.01, 0)], [(1, 1), (1.01, 1)]])
+    with pytest.raises(ValueError):
+        segment_line(shapely.to_wkb(multi), 1.0)
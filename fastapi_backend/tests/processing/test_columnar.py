@@ -0,0 +1,62 @@
+import datetime as dt
+import decimal
+import io
+import uuid
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from app.processing.columnar import ColumnarWriter  # noqa: E402
+from app.schemas.enums import EventType  # noqa: E402
+
+COLUMNS = [
+    ("id", "string"),
+    ("event_type", "string"),
+    ("severity", "int"),
+    ("lat", "float"),
+    ("detected_at", "timestamp"),
+]
+T0 = dt.datetime(2024, 6, 3, tzinfo=dt.timezone.utc)
+
+
+def _batch(offset, n):
+    when = [T0 + dt.timedelta(minutes=offset + i) for i in range(n)]
+    return [
+        (uuid.uuid4(), EventType.LEAK, i % 5 or None, decimal.Decimal("31.5"), when[i])
+        for i in range(n)
+    ]
+
+
+def _export(fmt, batches):
+    writer = ColumnarWriter(fmt, COLUMNS)
+    chunks = [writer.write(rows) for rows in batches]
+    chunks.append(writer.close())
+    return chunks
+
+
+def test_arrow_stream_is_written_batch_by_batch():
+    chunks = _export("arrow", [_batch(0, 100), _batch(100, 50)])
+
+    assert all(chunks[:2])  # each batch is flushed as soon as it is encoded
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+    assert table.num_rows == 150
+    assert table.schema.field("detected_at").type == pa.timestamp("us", tz="UTC")
+    assert table.column("event_type")[0].as_py() == "leak"
+    assert table.column("severity").null_count == 30
+    assert table.column("lat")[0].as_py() == 31.5
+
+
+def test_parquet_gets_one_row_group_per_batch():
+    chunks = _export("parquet", [_batch(0, 100), [], _batch(100, 50)])
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_rows == 150
+    assert parquet.num_row_groups == 2
+    assert parquet.schema_arrow.names == [name for name, _ in COLUMNS]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        ColumnarWriter("csv", COLUMNS)
@@ -0,0 +1,200 @@
+import datetime as dt
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+from PIL import ExifTags, Image, TiffImagePlugin, TiffTags
+from shapely import wkt
+
+from app.processing.metadata import (
+    HEADER_BLOCK,
+    _utm_to_lonlat,
+    extract_file,
+    extract_metadata,
+)
+
+
+def _photo(path, exif):
+    Image.new("RGB", (64, 48)).save(path, "JPEG", exif=exif)
+    return str(path)
+
+
+def test_exif_photo(tmp_path):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "DJI"
+    exif[ExifTags.Base.Model] = "FC6310"
+    exif.get_ifd(ExifTags.IFD.Exif).update(
+        {
+            ExifTags.Base.DateTimeOriginal: "2024:05:01 10:30:00",
+            ExifTags.Base.OffsetTimeOriginal: "+02:00",
+        }
+    )
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update(
+        {
+            ExifTags.GPS.GPSLatitudeRef: "N",
+            ExifTags.GPS.GPSLatitude: (52.0, 30.0, 0.0),
+            ExifTags.GPS.GPSLongitudeRef: "W",
+            ExifTags.GPS.GPSLongitude: (1.0, 15.0, 36.0),
+            ExifTags.GPS.GPSAltitude: 120.5,
+        }
+    )
+
+    result = extract_metadata(_photo(tmp_path / "a.jpg", exif), is_video=False)
+
+    assert result["captured_at"] == dt.datetime(
+        2024, 5, 1, 10, 30, tzinfo=dt.timezone(dt.timedelta(hours=2))
+    )
+    point = wkt.loads(result["footprint_wkt"])
+    assert point.x == pytest.approx(-1.26)
+    assert point.y == pytest.approx(52.5)
+    meta = result["metadata"]
+    assert meta["camera"] == {"make": "DJI", "model": "FC6310"}
+    assert meta["gps"]["alt"] == pytest.approx(120.5)
+    assert (meta["width"], meta["height"]) == (64, 48)
+    json.dumps(meta)  # stored in a JSON column
+
+
+def test_gps_clock_wins_over_camera_clock(tmp_path):
+    exif = Image.Exif()
+    exif.get_ifd(ExifTags.IFD.Exif)[
+        ExifTags.Base.DateTimeOriginal
+    ] = "2024:05:01 10:30:00"
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update(
+        {
+            ExifTags.GPS.GPSDateStamp: "2024:05:01",
+            ExifTags.GPS.GPSTimeStamp: (8.0, 29.0, 58.0),
+        }
+    )
+
+    result = extract_metadata(_photo(tmp_path / "a.jpg", exif), is_video=False)
+
+    assert result["captured_at"] == dt.datetime(
+        2024, 5, 1, 8, 29, 58, tzinfo=dt.timezone.utc
+    )
+    assert result["footprint_wkt"] is None
+
+
+def _geotiff(path, epsg, tiepoint, scale):
+    info = TiffImagePlugin.ImageFileDirectory_v2()
+    info[33550] = scale + (0.0,)
+    info.tagtype[33550] = TiffTags.DOUBLE
+    info[33922] = (0.0, 0.0, 0.0) + tiepoint + (0.0,)
+    info.tagtype[33922] = TiffTags.DOUBLE
+    # GeoKeyDirectory: header + ModelType, RasterType=PixelIsArea, ProjectedCSType
+    info[34735] = (1, 1, 0, 3, 1024, 0, 1, 1, 1025, 0, 1, 1, 3072, 0, 1, epsg)
+    info.tagtype[34735] = TiffTags.SHORT
+    Image.new("RGB", (1000, 500)).save(path, "TIFF", tiffinfo=info)
+    return str(path)
+
+
+def test_geotiff_footprint_from_utm(tmp_path):
+    src = _geotiff(tmp_path / "ortho.tif", 32631, (448000.0, 5412000.0), (0.05, 0.05))
+
+    result = extract_metadata(src, is_video=False)
+
+    footprint = wkt.loads(result["footprint_wkt"])
+    minx, miny, maxx, maxy = footprint.bounds
+    assert footprint.geom_type == "Polygon"
+    assert minx == pytest.approx(2.2910, abs=1e-3)
+    assert maxy == pytest.approx(48.8588, abs=1e-3)
+    assert (maxx - minx) * 73_000 == pytest.approx(50, rel=0.05)  # 1000px * 5cm
+    geo = result["metadata"]["geo"]
+    assert geo["crs"] == "EPSG:32631"
+    assert geo["bounds"] == pytest.approx([448000.0, 5411975.0, 448050.0, 5412000.0])
+
+
+def test_utm_inverse_matches_reference_point():
+    # Eiffel Tower, UTM 31N
+    lon, lat = _utm_to_lonlat(32631, 448251.8, 5411943.8)
+    assert lon == pytest.approx(2.2945, abs=1e-4)
+    assert lat == pytest.approx(48.8583, abs=1e-4)
+
+
+def test_unreadable_files_yield_errors(tmp_path):
+    bad = tmp_path / "bad.jpg"
+    bad.write_bytes(b"not an image")
+    good = _photo(tmp_path / "good.jpg", Image.Exif())
+
+    results = [
+        extract_file(str(bad), False),
+        extract_file(good, False),
+        extract_file(good, True),
+    ]
+
+    assert "error" in results[0]
+    assert results[1]["metadata"]["format"] == "JPEG"
+    assert results[2] == {"captured_at": None, "footprint_wkt": None, "metadata": {}}
+
+
+@pytest.fixture
+def range_server():
+    """Serves files from a dict over HTTP, honouring single Range headers."""
+    state = {"files": {}, "sent": 0, "ranges": True}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = state["files"][self.path]
+            match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+            if not (state["ranges"] and match):
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            start, end = int(match.group(1)), min(int(match.group(2)), len(body) - 1)
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.end_headers()
+                return
+            part = body[start : end + 1]
+            state["sent"] += len(part)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            self.send_header("Content-Length", str(len(part)))
+            self.end_headers()
+            self.wfile.write(part)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _noise_photo(path, exif):
+    pixels = np.random.default_rng(0).integers(0, 256, (1500, 2000, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path, "JPEG", exif=exif, quality=95)
+    return path
+
+
+def test_urls_are_read_header_only(tmp_path, range_server):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "DJI"
+    photo = _noise_photo(tmp_path / "a.jpg", exif).read_bytes()
+    _geotiff(tmp_path / "ortho.tif", 32631, (448000.0, 5412000.0), (0.05, 0.05))
+    ortho = (tmp_path / "ortho.tif").read_bytes()
+    range_server["files"] = {"/a.jpg": photo, "/ortho.tif": ortho}
+
+    result = extract_file(f"{range_server['url']}/a.jpg", is_video=False)
+    assert result["metadata"]["camera"]["make"] == "DJI"
+    assert range_server["sent"] <= 2 * HEADER_BLOCK < len(photo) // 10
+
+    range_server["sent"] = 0
+    result = extract_file(f"{range_server['url']}/ortho.tif", is_video=False)
+    assert result["metadata"]["geo"]["crs"] == "EPSG:32631"
+    assert range_server["sent"] < len(ortho) // 4
+
+
+def test_urls_without_range_support_are_not_downloaded(tmp_path, range_server):
+    _photo(tmp_path / "a.jpg", Image.Exif())
+    range_server["files"] = {"/a.jpg": (tmp_path / "a.jpg").read_bytes()}
+    range_server["ranges"] = False
+
+    assert "error" in extract_file(f"{range_server['url']}/a.jpg", is_video=False)
@@ -0,0 +1,87 @@
+import pytest
+from PIL import Image
+
+from app.processing.previews import (
+    RasterTooLarge,
+    render_image_previews,
+    thumbnail_name,
+)
+
+
+def test_render_image_previews_fits_each_size(tmp_path):
+    src = tmp_path / "photo.jpg"
+    Image.new("RGB", (3000, 2000), (200, 40, 40)).save(src, "JPEG")
+
+    names = render_image_previews(str(src), str(tmp_path), [128, 512], 10**9)
+
+    assert sorted(names) == sorted([thumbnail_name(128), thumbnail_name(512)])
+    with Image.open(tmp_path / thumbnail_name(512)) as img:
+        assert img.format == "WEBP"
+        assert img.size == (512, 341)
+    with Image.open(tmp_path / thumbnail_name(128)) as img:
+        assert max(img.size) == 128
+
+
+def test_render_image_previews_applies_exif_orientation(tmp_path):
+    src = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees on display
+    Image.new("RGB", (400, 200)).save(src, "JPEG", exif=exif)
+
+    render_image_previews(str(src), str(tmp_path), [128], 10**9)
+
+    with Image.open(tmp_path / thumbnail_name(128)) as img:
+        assert img.size == (64, 128)
+
+
+def test_render_image_previews_never_upscales(tmp_path):
+    src = tmp_path / "small.png"
+    Image.new("RGBA", (50, 40)).save(src, "PNG")
+
+    render_image_previews(str(src), str(tmp_path), [128], 10**9)
+
+    with Image.open(tmp_path / thumbnail_name(128)) as img:
+        assert img.size == (50, 40)
+
+
+def test_render_image_previews_caps_full_resolution_decodes(tmp_path):
+    src = tmp_path / "scan.png"
+    Image.new("RGB", (2000, 1000)).save(src, "PNG")
+
+    with pytest.raises(RasterTooLarge):
+        render_image_previews(
+            str(src), str(tmp_path), [128], 10**9, max_decode_pixels=10**6
+        )
+
+
+def test_render_image_previews_decodes_jpeg_below_the_cap(tmp_path):
+    src = tmp_path / "photo.jpg"
+    Image.new("RGB", (4000, 3000)).save(src, "JPEG")
+
+    # Full size is 12 MP, but draft() decodes at 1/8 scale (500x375)
+    render_image_previews(
+        str(src), str(tmp_path), [128], 10**9, max_decode_pixels=10**6
+    )
+
+    with Image.open(tmp_path / thumbnail_name(128)) as img:
+        assert img.size == (128, 96)
+
+
+def test_render_image_previews_uses_tiff_overviews(tmp_path):
+    src = tmp_path / "pyramid.tif"
+    full = Image.new("RGB", (4000, 2000), (10, 200, 10))
+    overviews = [
+        full.resize((1000, 500)),
+        full.resize((250, 125)),
+        Image.new("RGB", (64, 64)),
+    ]
+    full.save(src, "TIFF", save_all=True, append_images=overviews)
+
+    # Only the 1000x500 overview fits under the cap and covers 512px
+    render_image_previews(
+        str(src), str(tmp_path), [512], 10**9, max_decode_pixels=10**6
+    )
+
+    with Image.open(tmp_path / thumbnail_name(512)) as img:
+        assert img.size == (512, 256)
+        assert img.getpixel((10, 10))[1] > 150
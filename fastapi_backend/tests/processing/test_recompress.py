@@ -0,0 +1,42 @@
+import os
+
+from PIL import Image
+
+from app.processing.recompress import recompress_image
+
+
+def _noise(size):
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+def test_recompress_jpeg_keeps_exif_and_shrinks(tmp_path):
+    src, dest = tmp_path / "photo.jpg", tmp_path / "out.jpg"
+    exif = Image.Exif()
+    exif[0x0110] = "Drone X"  # Model
+    _noise((400, 300)).save(src, "JPEG", quality=100, exif=exif)
+
+    assert recompress_image(str(src), str(dest), 70, 10**9) == "JPEG"
+
+    assert dest.stat().st_size < src.stat().st_size
+    with Image.open(dest) as img:
+        assert img.size == (400, 300)
+        assert img.getexif()[0x0110] == "Drone X"
+
+
+def test_recompress_png_is_lossless(tmp_path):
+    src, dest = tmp_path / "map.png", tmp_path / "out.png"
+    original = Image.new("RGB", (64, 64), (10, 200, 30))
+    original.save(src, "PNG", compress_level=0)
+
+    assert recompress_image(str(src), str(dest), 70, 10**9) == "PNG"
+
+    assert dest.stat().st_size < src.stat().st_size
+    with Image.open(dest) as img:
+        assert img.tobytes() == original.tobytes()
+
+
+def test_recompress_skips_other_formats(tmp_path):
+    src = tmp_path / "scan.tif"
+    Image.new("L", (8, 8)).save(src, "TIFF")
+
+    assert recompress_image(str(src), str(tmp_path / "out.tif"), 70, 10**9) is None
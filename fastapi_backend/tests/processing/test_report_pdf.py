@@ -0,0 +1,31 @@
+from app.processing.report_pdf import render_report_pdf
+
+
+def _content(rows):
+    return {
+        "title": "Weekly report",
+        "subtitle": ["Acme Pipelines", "2024-06-03 - 2024-06-10"],
+        "summary": "Two leaks found near the river crossing. " * 20,
+        "sections": [
+            {"heading": "Events by type", "columns": ["Type", "Count"], "rows": rows},
+        ],
+    }
+
+
+def test_render_report_pdf_writes_a_pdf(tmp_path):
+    out = tmp_path / "report.pdf"
+
+    pages = render_report_pdf(_content([["leak", 2], ["fire", 0]]), str(out))
+
+    assert pages == 1
+    assert out.read_bytes().startswith(b"%PDF")
+
+
+def test_long_tables_continue_on_new_pages(tmp_path):
+    out = tmp_path / "report.pdf"
+
+    pages = render_report_pdf(
+        _content([[f"type-{i}", i] for i in range(200)]), str(out)
+    )
+
+    assert pages > 1
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+from app.processing.previews import RasterTooLarge
+from app.processing.tiles import (
+    DESCRIPTOR,
+    ORIENTATION,
+    _ArrayRaster,
+    _OrientedRaster,
+    build_deepzoom,
+    read_descriptor,
+    render_deepzoom,
+)
+
+
+def _raster(img):
+    data = np.asarray(img)
+    return _ArrayRaster(data.reshape(data.shape[0], data.shape[1], -1))
+
+
+def _render(tmp_path, img, **kwargs):
+    out = tmp_path / "out"
+    out.mkdir()
+    params = {"tile_size": 254, "overlap": 1, "min_dimension": 256}
+    params.update(kwargs)
+    return out, build_deepzoom(_raster(img), str(out), **params)
+
+
+def test_render_deepzoom_layout(tmp_path):
+    out, layout = _render(tmp_path, Image.new("RGB", (1000, 600), (10, 120, 30)))
+
+    assert layout == {
+        "width": 1000,
+        "height": 600,
+        "tile_size": 254,
+        "overlap": 1,
+        "format": "jpg",
+        "levels": 11,
+    }
+    assert read_descriptor((out / DESCRIPTOR).read_bytes()) == layout
+    top = out / "image_files" / "10"
+    assert sorted(p.name for p in top.iterdir()) == sorted(
+        f"{col}_{row}.jpg" for col in range(4) for row in range(3)
+    )
+    # Interior tiles carry the overlap on both sides; edge tiles are clipped.
+    assert Image.open(top / "0_0.jpg").size == (255, 255)
+    assert Image.open(top / "1_1.jpg").size == (256, 256)
+    assert Image.open(top / "3_2.jpg").size == (1000 - 762 + 1, 600 - 508 + 1)
+    assert Image.open(out / "image_files" / "9" / "1_1.jpg").size == (
+        500 - 254 + 1,
+        300 - 254 + 1,
+    )
+    assert [p.name for p in (out / "image_files" / "0").iterdir()] == ["0_0.jpg"]
+    assert not list(out.glob(".level-*"))
+
+
+def test_render_deepzoom_downsamples_by_averaging(tmp_path):
+    stripes = np.zeros((512, 512), dtype=np.uint8)
+    stripes[:, 1::2] = 200  # alternating columns average to 100 one level down
+    out, layout = _render(tmp_path, Image.fromarray(stripes, "L"))
+
+    assert layout["format"] == "jpg"
+    with Image.open(out / "image_files" / "8" / "0_0.jpg") as tile:
+        assert abs(np.asarray(tile).astype(int).mean() - 100) < 3
+
+
+def test_render_deepzoom_keeps_alpha(tmp_path):
+    _, layout = _render(tmp_path, Image.new("RGBA", (300, 300), (0, 0, 0, 0)))
+    assert layout["format"] == "png"
+
+
+def test_render_deepzoom_skips_small_images(tmp_path):
+    out, layout = _render(tmp_path, Image.new("RGB", (200, 100)))
+    assert layout is None
+    assert not (out / DESCRIPTOR).exists()
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_oriented_strips_match_exif_transpose(orientation):
+    img = Image.fromarray(np.arange(7 * 5 * 3, dtype=np.uint8).reshape(7, 5, 3), "RGB")
+    exif = img.getexif()
+    exif[ORIENTATION] = orientation
+    img.info["exif"] = exif.tobytes()
+    expected = np.asarray(ImageOps.exif_transpose(img))
+
+    raster = _OrientedRaster(_raster(img), orientation)
+    assert (raster.height, raster.width) == expected.shape[:2]
+    strips = [
+        raster.read(top, min(top + 2, raster.height))
+        for top in range(0, raster.height, 2)
+    ]
+    assert np.array_equal(np.concatenate(strips), expected)
+
+
+def _save_tiff(tmp_path, img, **kwargs):
+    src = tmp_path / "ortho.tif"
+    img.save(src, **kwargs)
+    out = tmp_path / "out"
+    out.mkdir()
+    return str(src), str(out)
+
+
+def test_render_deepzoom_applies_exif_orientation(tmp_path):
+    pytest.importorskip("rasterio")
+    img = Image.new("RGB", (600, 300), (10, 120, 30))
+    exif = img.getexif()
+    exif[ORIENTATION] = 6  # rotated 90 degrees clockwise on display
+    src, out = _save_tiff(tmp_path, img, exif=exif)
+
+    layout = render_deepzoom(src, out, 254, 1, 256, 10**9)
+    assert (layout["width"], layout["height"]) == (300, 600)
+
+
+def test_render_deepzoom_keeps_gray_alpha(tmp_path):
+    pytest.importorskip("rasterio")
+    src, out = _save_tiff(tmp_path, Image.new("LA", (300, 300), (0, 0)))
+
+    assert render_deepzoom(src, out, 254, 1, 256, 10**9)["format"] == "png"
+
+
+def test_render_deepzoom_rejects_oversized_rasters(tmp_path):
+    pytest.importorskip("rasterio")
+    src, out = _save_tiff(tmp_path, Image.new("RGB", (300, 300)))
+
+    with pytest.raises(RasterTooLarge):
+        render_deepzoom(src, out, 254, 1, 256, 300 * 300 - 1)
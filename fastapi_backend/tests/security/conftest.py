@@ -0,0 +1,17 @@
+import pytest
+
+from app.security import clerk
+
+
+def _clear():
+    clerk._claims_cache.clear()
+    clerk.forget_user()
+    clerk.forget_orgs()
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_caches():
+    # Tests reuse token strings / clerk ids with different (mocked) claims and rows
+    _clear()
+    yield
+    _clear()
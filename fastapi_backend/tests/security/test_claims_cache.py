@@ -0,0 +1,89 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.security import clerk
+from app.security.jwks import JWKSCache
+
+ISSUER = "https://test-clerk-issuer.clerk.accounts.dev"
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def clerk_env(signing_key):
+    public = {
+        **jwk.construct(signing_key, "RS256").public_key().to_dict(),
+        "kid": "test-kid",
+    }
+    cache = JWKSCache(
+        f"{ISSUER}/.well-known/jwks.json",
+        fetch=AsyncMock(return_value={"keys": [public]}),
+    )
+    with patch.object(clerk, "jwks", cache), patch.object(
+        clerk, "CLERK_ISSUER", ISSUER
+    ), patch.object(clerk, "CLERK_PERMITTED_AZP", {"https://app.test"}):
+        yield
+
+
+@pytest.fixture
+def token(signing_key):
+    now = int(time.time())
+    claims = {
+        "sub": "user_1",
+        "azp": "https://app.test",
+        "iss": ISSUER,
+        "exp": now + 60,
+        "nbf": now - 5,
+    }
+    return jwt.encode(
+        claims, signing_key, algorithm="RS256", headers={"kid": "test-kid"}
+    )
+
+
+async def test_repeat_token_skips_verification(token):
+    with patch("app.security.clerk.jwt.decode", wraps=jwt.decode) as decode:
+        first = await clerk._decode_clerk(token)
+        second = await clerk._decode_clerk(token)
+
+    assert first == second
+    assert decode.call_count == 1
+    stats = clerk.auth_cache_stats()["claims"]
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+async def test_expiry_is_checked_on_hits(token):
+    claims = await clerk._decode_clerk(token)
+    with patch("app.security.clerk.time.time", return_value=claims["exp"] + 1):
+        with pytest.raises(HTTPException) as excinfo:
+            await clerk._decode_clerk(token)
+    assert excinfo.value.detail == "Token expired or not yet valid"
+
+
+async def test_azp_is_checked_on_hits(token):
+    await clerk._decode_clerk(token)
+    with patch.object(clerk, "CLERK_PERMITTED_AZP", {"https://other.test"}):
+        with pytest.raises(HTTPException) as excinfo:
+            await clerk._decode_clerk(token)
+    assert excinfo.value.detail == "Invalid 'azp' (origin)"
+
+
+async def test_rejected_tokens_are_not_cached(token):
+    header, payload, signature = token.split(".")
+    tampered = ".".join((header, payload, signature[:-4] + "AAAA"))
+    with pytest.raises(jwt.JWTError):
+        await clerk._decode_clerk(tampered)
+    assert len(clerk._claims_cache) == 0
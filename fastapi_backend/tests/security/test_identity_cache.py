@@ -0,0 +1,96 @@
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.security import clerk
+
+CTX = {
+    "sub": "user_1",
+    "org_id": "org_1",
+    "org_role": "org:admin",
+    "org_permissions": [],
+}
+USER_ID, ORG_ID = uuid.uuid4(), uuid.uuid4()
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+    def one(self):
+        assert self.row is not None
+        return self.row
+
+
+class FakeSession:
+    """Records statements; answers the user SELECT with `user_row`, the org lookup with `org_id`."""
+
+    def __init__(self, user_row, org_id):
+        self.user_row = user_row
+        self.org_id = org_id
+        self.statements = []
+        self.inserts = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        kind = stmt.__visit_name__
+        self.statements.append(kind)
+        if kind == "insert":
+            self.inserts.append(str(stmt.compile(dialect=postgresql.dialect())))
+            self.user_row = (USER_ID, stmt.compile().params["email"], "", None)
+        return FakeResult(self.user_row if kind == "select" else None)
+
+    async def scalar(self, stmt):
+        self.statements.append("org")
+        return self.org_id
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_repeat_requests_are_read_and_write_free():
+    db = FakeSession((USER_ID, "u@example.com", "U", ORG_ID), ORG_ID)
+
+    first = await clerk.get_current_user(CTX, db)
+    assert db.statements == ["select", "org"]
+
+    second = await clerk.get_current_user(CTX, db)
+    assert second == first
+    assert first["organization_id"] == str(ORG_ID)
+    assert db.statements == ["select", "org"] and db.commits == 0
+
+
+async def test_active_org_change_is_written_once():
+    db = FakeSession((USER_ID, "u@example.com", "U", None), ORG_ID)
+
+    await clerk.get_current_user(CTX, db)
+    await clerk.get_current_user(CTX, db)
+
+    assert db.statements == ["select", "org", "update"]
+    assert db.commits == 1
+
+
+async def test_unknown_org_is_cached_until_orgs_change():
+    db = FakeSession((USER_ID, "u@example.com", "U", None), None)
+
+    assert (await clerk.get_current_user(CTX, db))["organization_id"] is None
+    await clerk.get_current_user(CTX, db)
+    assert db.statements.count("org") == 1
+
+    clerk.forget_orgs()
+    db.org_id = ORG_ID
+    assert (await clerk.get_current_user(CTX, db))["organization_id"] == str(ORG_ID)
+
+
+async def test_missing_user_is_provisioned_with_upsert():
+    db = FakeSession(None, None)
+
+    user = await clerk.get_current_user({"sub": "user_2"}, db)
+
+    assert db.statements == ["select", "insert", "select"]
+    assert "ON CONFLICT DO NOTHING" in db.inserts[0]
+    assert db.commits == 1
+    assert (user["id"], user["email"]) == (str(USER_ID), "user_2@example.com")
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.security.jwks import JWKSCache
+
+
+def _rsa_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return {kid: _rsa_key(kid) for kid in ("k1", "k2")}
+
+
+@pytest.fixture
+def jwks_server(keys):
+    """A local stand-in for the provider's /.well-known/jwks.json."""
+    state = {"keys": [keys["k1"][1]], "status": 200, "delay": 0.0, "hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            time.sleep(state["delay"])
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(state["status"])
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _cache(server, **kwargs):
+    return JWKSCache(server["url"], **kwargs)
+
+
+async def test_keys_are_parsed_once_and_verify_tokens(jwks_server, keys):
+    cache = _cache(jwks_server)
+    await cache.warm()
+
+    key = await cache.get("k1")
+    assert await cache.get("k1") is key
+    assert jwks_server["hits"] == 1
+
+    token = jwt.encode(
+        {"sub": "u"}, keys["k1"][0], algorithm="RS256", headers={"kid": "k1"}
+    )
+    assert jwt.decode(token, key, algorithms=["RS256"])["sub"] == "u"
+
+
+async def test_unknown_kid_refreshes_once_for_concurrent_requests(jwks_server, keys):
+    cache = _cache(jwks_server, min_refresh_interval_s=0)
+    await cache.warm()
+    # Key rotation: the provider now signs with k2
+    jwks_server["keys"] = [keys["k1"][1], keys["k2"][1]]
+    jwks_server["delay"] = 0.1
+
+    found = await asyncio.gather(*(cache.get("k2") for _ in range(20)))
+
+    assert all(key is found[0] for key in found)
+    assert jwks_server["hits"] == 2
+
+
+async def test_unknown_kid_refreshes_are_rate_limited(jwks_server):
+    cache = _cache(jwks_server, min_refresh_interval_s=60)
+    await cache.warm()
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as excinfo:
+            await cache.get("made-up")
+        assert excinfo.value.status_code == 401
+    assert jwks_server["hits"] == 1
+
+
+async def test_stale_keys_are_served_while_refreshing(jwks_server, keys):
+    cache = _cache(jwks_server, ttl_s=0, min_refresh_interval_s=0)
+    await cache.warm()
+    jwks_server["keys"] = [keys["k2"][1]]
+
+    assert await cache.get("k1") is not None  # answered from cache
+    await cache._inflight
+    assert jwks_server["hits"] == 2
+    assert set(cache.keys) == {"k2"}
+
+
+async def test_failed_refresh_keeps_previous_keys(jwks_server):
+    cache = _cache(jwks_server, ttl_s=0, min_refresh_interval_s=0)
+    await cache.warm()
+    jwks_server["status"] = 503
+
+    await cache.refresh()
+
+    assert set(cache.keys) == {"k1"}
+    assert await cache.get("k1") is not None
+
+
+async def test_unreachable_provider(jwks_server):
+    jwks_server["status"] = 503
+    cache = _cache(jwks_server)
+    await cache.warm()  # logged, not raised
+
+    with pytest.raises(HTTPException) as excinfo:
+        await cache.get("k1")
+    assert excinfo.value.status_code == 500
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.schemas.enums import AssetType
+from app.services.asset_import import resolve_import_dir, scan_directory
+
+
+@pytest.fixture
+def mount(tmp_path, monkeypatch):
+    root = tmp_path / "station"
+    root.mkdir()
+    monkeypatch.setattr(settings, "IMPORT_ROOTS", [str(root)])
+    return root
+
+
+def test_resolve_import_dir_inside_root(mount):
+    (mount / "mission-1").mkdir()
+    assert (
+        resolve_import_dir(str(mount / "mission-1")) == (mount / "mission-1").resolve()
+    )
+
+
+@pytest.mark.parametrize(
+    "relative, code",
+    [("../elsewhere", 403), ("mission-1/../../x", 403), ("missing", 404)],
+)
+def test_resolve_import_dir_rejects(mount, relative, code):
+    (mount.parent / "elsewhere").mkdir()
+    with pytest.raises(HTTPException) as excinfo:
+        resolve_import_dir(str(mount / relative))
+    assert excinfo.value.status_code == code
+
+
+def test_resolve_import_dir_rejects_symlink_escape(mount):
+    (mount.parent / "secret").mkdir()
+    (mount / "link").symlink_to(mount.parent / "secret")
+    with pytest.raises(HTTPException) as excinfo:
+        resolve_import_dir(str(mount / "link"))
+    assert excinfo.value.status_code == 403
+
+
+def test_import_disabled_without_roots(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "IMPORT_ROOTS", [])
+    with pytest.raises(HTTPException) as excinfo:
+        resolve_import_dir(str(tmp_path))
+    assert excinfo.value.status_code == 400
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+
+
+def test_scan_directory_infers_types(mount):
+    names = [
+        "b/DJI_0002.JPG",
+        "DJI_0001.jpg",
+        "ortho.tif",
+        "flight.MP4",
+        "log.srt",
+        ".x.jpg",
+    ]
+    for name in names:
+        _touch(mount / name)
+    (mount / "alias.jpg").symlink_to(mount / "DJI_0001.jpg")
+
+    assert scan_directory(mount, None, recursive=True) == [
+        ("DJI_0001.jpg", AssetType.IMAGE),
+        ("b/DJI_0002.JPG", AssetType.IMAGE),
+        ("flight.MP4", AssetType.VIDEO),
+        ("ortho.tif", AssetType.GIS),
+    ]
+
+
+def test_scan_directory_forced_type_and_flat(mount):
+    _touch(mount / "a.bin")
+    _touch(mount / "sub" / "b.bin")
+
+    assert scan_directory(mount, AssetType.GIS, recursive=False) == [
+        ("a.bin", AssetType.GIS)
+    ]
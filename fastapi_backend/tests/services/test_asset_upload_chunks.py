@@ -0,0 +1,98 @@
+import fcntl
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.enums import UploadStatus
+from app.services.asset_upload import AssetUploadService, staging_lock
+
+SUPERADMIN = {"is_superadmin": True, "organization_id": None}
+
+
+class FakeRepo:
+    def __init__(self, log, status_at_lock, staging_path):
+        self.log = log
+        self.status_at_lock = status_at_lock
+        self.upload = SimpleNamespace(
+            id=uuid.uuid4(),
+            status=UploadStatus.PENDING,
+            direct=False,
+            total_size=10,
+            chunk_size=4,
+            staging_path=str(staging_path),
+        )
+
+    async def get(self, upload_id):
+        return self.upload
+
+    async def get_status(self, upload_id):
+        self.log.append("status")
+        return self.status_at_lock
+
+    async def record_chunk(self, upload_id, index, size):
+        self.log.append(("record", index, size))
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+def _exclusive_lock_is_free(path):
+    with open(path, "rb") as other:
+        try:
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+
+async def _put(tmp_path, status_at_lock):
+    log = []
+    staging = tmp_path / "staging"
+    staging.write_bytes(bytes(10))
+
+    async def write(body, path, offset, length):
+        # complete()/abort() could not take the staging file now
+        log.append(("write", offset, length, _exclusive_lock_is_free(path)))
+
+    repo = FakeRepo(log, status_at_lock, staging)
+    service = AssetUploadService(repo, None, None, FakeSession(log))
+    with patch("app.services.asset_upload.write_stream_at", write):
+        await service.put_chunk(SUPERADMIN, repo.upload.id, 2, None)
+    return log
+
+
+async def test_chunk_is_written_under_the_lock_outside_a_transaction(tmp_path):
+    log = await _put(tmp_path, UploadStatus.PENDING)
+    assert log == [
+        "rollback",
+        "status",
+        "rollback",
+        ("write", 8, 2, False),
+        ("record", 2, 2),
+    ]
+    assert _exclusive_lock_is_free(tmp_path / "staging")
+
+
+async def test_chunk_after_completion_is_rejected_unwritten(tmp_path):
+    with pytest.raises(HTTPException) as exc:
+        await _put(tmp_path, UploadStatus.COMPLETED)
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Upload is completed"
+
+
+async def test_janitor_lock_skips_files_being_written(tmp_path):
+    staging = tmp_path / "staging"
+    staging.write_bytes(b"")
+    async with staging_lock(staging, shared=True):
+        async with staging_lock(staging, blocking=False) as idle:
+            assert not idle
+    async with staging_lock(staging, blocking=False) as idle:
+        assert idle
@@ -0,0 +1,76 @@
+import hashlib
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services.blob import adopt_blob, blob_key, store_blob_copy
+from app.storage import get_storage
+
+
+class FakeBlobRepo:
+    def __init__(self):
+        self.rows = {}
+
+    async def acquire(self, sha256, size):
+        created = sha256 not in self.rows
+        self.rows.setdefault(sha256, uuid.uuid4())
+        return self.rows[sha256], created
+
+
+@pytest.fixture(autouse=True)
+def asset_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ASSET_ROOT", str(tmp_path))
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    get_storage.cache_clear()
+    yield
+    get_storage.cache_clear()
+
+
+def blob_path(sha):
+    return get_storage().local_path(blob_key(sha))
+
+
+def _spooled(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+async def test_duplicate_content_is_stored_once(tmp_path):
+    repo = FakeBlobRepo()
+    sha = "ab" + "0" * 62
+    first = _spooled(tmp_path, "a.part", b"same")
+    second = _spooled(tmp_path, "b.part", b"same")
+
+    id1 = await adopt_blob(repo, first, sha, 4)
+    id2 = await adopt_blob(repo, second, sha, 4)
+
+    assert id1 == id2
+    assert blob_path(sha) == tmp_path / "ab" / sha
+    assert blob_path(sha).read_bytes() == b"same"
+    assert not first.exists() and not second.exists()
+
+
+async def test_missing_blob_file_is_restored_from_duplicate(tmp_path):
+    repo = FakeBlobRepo()
+    sha = "cd" + "0" * 62
+    await adopt_blob(repo, _spooled(tmp_path, "a.part", b"data"), sha, 4)
+    blob_path(sha).unlink()
+
+    await adopt_blob(repo, _spooled(tmp_path, "b.part", b"data"), sha, 4)
+
+    assert blob_path(sha).read_bytes() == b"data"
+
+
+async def test_store_blob_copy_leaves_source_in_place(tmp_path):
+    mission = tmp_path / "mission"
+    mission.mkdir()
+    src = _spooled(mission, "DJI_0001.JPG", b"photo")
+    sha = hashlib.sha256(b"photo").hexdigest()
+
+    await store_blob_copy(src, sha, created=True)
+    await store_blob_copy(src, sha, created=False)  # already stored: no copy
+
+    assert src.read_bytes() == b"photo"
+    assert blob_path(sha).read_bytes() == b"photo"
@@ -0,0 +1,65 @@
+import datetime as dt
+import uuid
+from unittest.mock import patch
+
+from shapely.geometry import LineString, box
+
+from app.services.coverage import CoverageService
+
+START, END = dt.datetime(2024, 1, 1), dt.datetime(2024, 2, 1)
+ORG = uuid.uuid4()
+
+
+class FakePipelines:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def list_geometries(self, org_id, pipeline_id=None):
+        return self.rows
+
+
+class FakeAssets:
+    def __init__(self, footprints):
+        self.footprints = footprints
+        self.calls = []
+
+    async def footprint_versions(self, within_deg, start, end):
+        self.calls.append(("versions", set(within_deg)))
+        return {pid: (len(self.footprints[pid]), None) for pid in within_deg}
+
+    async def footprints_near(self, within_deg, start, end):
+        self.calls.append(("footprints", set(within_deg)))
+        return {pid: self.footprints[pid] for pid in within_deg}
+
+
+async def _in_process(fn, *args):
+    return fn(*args)
+
+
+async def test_org_coverage_queries_once_for_all_pipelines():
+    rows, footprints = [], {}
+    for i in range(3):
+        pid = uuid.uuid4()
+        line = LineString([(10.0 + i, 50.0), (10.1 + i, 50.0)])
+        rows.append(
+            {"id": pid, "organization_id": ORG, "updated_at": START, "wkb": line.wkb}
+        )
+        footprints[pid] = [box(10.0 + i, 49.99, 10.05 + i, 50.01).wkb]
+    assets = FakeAssets(footprints)
+    service = CoverageService(FakePipelines(rows), assets, None)
+    member = {"is_superadmin": False, "organization_id": str(ORG)}
+
+    with patch("app.services.coverage.run_in_process", _in_process):
+        first = await service.org_coverage(member, START, END)
+        again = await service.org_coverage(member, START, END)
+
+    ids = {row["id"] for row in rows}
+    assert assets.calls == [
+        ("versions", ids),
+        ("footprints", ids),
+        ("versions", ids),
+        ("footprints", set()),  # all cached
+    ]
+    assert [r.pipeline_id for r in first] == [row["id"] for row in rows]
+    assert all(40 < r.covered_pct < 60 for r in first)
+    assert again == first
@@ -0,0 +1,66 @@
+import datetime as dt
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.enums import EventType
+from app.services.event import EventService
+
+UTC = dt.timezone.utc
+DAY1 = dt.datetime(2024, 6, 3, tzinfo=UTC)
+DAY2 = dt.datetime(2024, 6, 4, tzinfo=UTC)
+
+
+class FakeRollups:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def series(self, unit, org_id, start, end, pipeline_id, event_types):
+        self.calls.append((unit, org_id, start, end, pipeline_id, event_types))
+        return self.rows
+
+
+def _service(rows):
+    return EventService(None, None, FakeRollups(rows), None)
+
+
+USER = {"is_superadmin": False, "organization_id": uuid.uuid4()}
+
+
+async def test_series_groups_types_per_bucket():
+    service = _service(
+        [
+            (DAY1, EventType.LEAK, 3),
+            (DAY1, EventType.FIRE, 1),
+            (DAY2, EventType.LEAK, 2),
+        ]
+    )
+    series = await service.timeseries(USER, "day", DAY1, DAY1 + dt.timedelta(days=7))
+
+    assert [(p.bucket, p.count) for p in series.points] == [(DAY1, 4), (DAY2, 2)]
+    assert series.points[0].by_type == {EventType.LEAK: 3, EventType.FIRE: 1}
+    unit, org_id, *_ = service.rollup_repo.calls[0]
+    assert (unit, org_id) == ("day", USER["organization_id"])
+
+
+async def test_series_defaults_and_bounds():
+    service = _service([])
+    series = await service.timeseries(USER, "hour", end=dt.datetime(2024, 6, 10))
+    assert series.end == dt.datetime(2024, 6, 10, tzinfo=UTC)  # naive taken as UTC
+    assert series.start == series.end - dt.timedelta(days=7)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.timeseries(USER, "hour", DAY1, DAY1 + dt.timedelta(days=365))
+    assert exc.value.status_code == 400
+
+
+async def test_series_needs_an_organization():
+    service = _service([])
+    with pytest.raises(HTTPException) as exc:
+        await service.timeseries(
+            {"is_superadmin": False, "organization_id": None}, "day"
+        )
+    assert exc.value.status_code == 400
+    assert service.rollup_repo.calls == []
@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.repositories.alert import EXPORT_COLUMNS as ALERT_COLUMNS
+from app.repositories.event import EXPORT_COLUMNS as EVENT_COLUMNS
+from app.services.export import ExportService
+
+
+def test_columns_default_to_all_and_keep_order():
+    assert [n for n, _ in ExportService._columns(None, EVENT_COLUMNS)] == list(
+        EVENT_COLUMNS
+    )
+    selected = ExportService._columns(["severity", "id", "severity"], EVENT_COLUMNS)
+    assert selected == [("severity", "int"), ("id", "string")]
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(HTTPException) as exc:
+        ExportService._columns(["id", "password"], ALERT_COLUMNS)
+    assert exc.value.status_code == 400
+    assert "password" in exc.value.detail
+
+
+def test_alert_columns_carry_event_attributes():
+    assert {
+        "event_type",
+        "severity",
+        "pipeline_name",
+        "asset_type",
+        "ack_latency_s",
+    } <= set(ALERT_COLUMNS)
+    assert "description" not in ALERT_COLUMNS
+
+
+def test_scope_never_unscoped_for_regular_users():
+    org = uuid.uuid4()
+    superadmin = {"is_superadmin": True, "organization_id": None}
+    assert ExportService._scope(superadmin, None) is None
+    assert ExportService._scope(superadmin, org) == org
+
+    member = {"is_superadmin": False, "organization_id": str(org)}
+    assert ExportService._scope(member, uuid.uuid4()) == org
+
+    with pytest.raises(HTTPException) as exc:
+        ExportService._scope({"is_superadmin": False, "organization_id": None}, None)
+    assert exc.value.status_code == 400
@@ -0,0 +1,61 @@
+import datetime as dt
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.context import org_scope
+from app.services.coverage import CoverageService
+from app.services.event import EventService
+from app.services.hotspot import HotspotService
+
+ORG = uuid.uuid4()
+SUPERADMIN = {"is_superadmin": True, "organization_id": None}
+MEMBER = {"is_superadmin": False, "organization_id": str(ORG)}
+ORGLESS = {"is_superadmin": False, "organization_id": None}
+
+
+class Unreachable:
+    """Repository stand-in: any query means the guard let the request through."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"{name} queried for a user without an organization")
+
+
+def test_org_scope():
+    assert org_scope(SUPERADMIN) is None
+    assert org_scope(MEMBER) == ORG
+    with pytest.raises(HTTPException) as exc:
+        org_scope(ORGLESS)
+    assert (exc.value.status_code, exc.value.detail) == (400, "No active organization")
+
+
+async def test_clusters_need_an_organization():
+    service = EventService(Unreachable(), None, None, None)
+    with pytest.raises(HTTPException) as exc:
+        await service.clusters(ORGLESS, (-98.0, 30.0, -96.0, 32.0), 10)
+    assert exc.value.status_code == 400
+
+
+async def test_pipeline_coverage_needs_an_organization():
+    service = CoverageService(Unreachable(), None, None)
+    with pytest.raises(HTTPException) as exc:
+        await service.pipeline_coverage(
+            ORGLESS, uuid.uuid4(), dt.datetime(2024, 1, 1), dt.datetime(2024, 2, 1)
+        )
+    assert exc.value.status_code == 400
+
+
+async def test_org_coverage_needs_an_organization():
+    service = CoverageService(Unreachable(), None, None)
+    with pytest.raises(HTTPException) as exc:
+        await service.org_coverage(
+            ORGLESS, dt.datetime(2024, 1, 1), dt.datetime(2024, 2, 1)
+        )
+    assert exc.value.status_code == 400
+
+
+async def test_hotspots_need_an_organization():
+    with pytest.raises(HTTPException) as exc:
+        await HotspotService(Unreachable(), None).list_hotspots(ORGLESS)
+    assert exc.value.status_code == 400
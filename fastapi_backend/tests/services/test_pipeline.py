@@ -0,0 +1,69 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.schemas.pipeline import PipelineCreate
+from app.services.pipeline import PipelineService
+
+ORG = uuid.uuid4()
+
+
+class Recorder:
+    def __init__(self, log, name, returns=None):
+        self.log, self.name, self.returns = log, name, returns
+
+    def __getattr__(self, method):
+        async def call(*args, **kwargs):
+            self.log.append(f"{self.name}.{method}")
+            return self.returns
+
+        return call
+
+
+async def test_delete_moves_rollup_counts_before_the_cascade():
+    log = []
+    pipeline = type("P", (), {"id": uuid.uuid4()})()
+    service = PipelineService(
+        Recorder(log, "pipelines", pipeline), None, Recorder(log, "rollups"), None
+    )
+
+    await service.delete_pipeline(
+        {"is_superadmin": True, "organization_id": None}, pipeline.id
+    )
+
+    assert log == ["pipelines.get", "rollups.detach_pipeline", "pipelines.delete"]
+
+
+class Session:
+    def __init__(self, log):
+        self.log = log
+
+    def __getattr__(self, method):
+        async def call(*args, **kwargs):
+            self.log.append(f"db.{method}")
+
+        return call
+
+
+async def test_create_commits_once_after_segmenting():
+    log = []
+    repo = Recorder(log, "pipelines")
+    repo.model = lambda **fields: type("P", (), {"id": uuid.uuid4(), **fields})()
+    service = PipelineService(repo, Recorder(log, "events"), None, Session(log))
+    data = PipelineCreate(
+        organization_id=ORG,
+        name="Line",
+        length_km=35.0,
+        geom_wkt="LINESTRING (10 50, 10.5 50)",
+    )
+
+    with patch(
+        "app.services.pipeline.run_in_process", side_effect=RuntimeError("pool died")
+    ):
+        with pytest.raises(RuntimeError):
+            await service.create_pipeline(
+                {"is_superadmin": True, "organization_id": ORG}, data
+            )
+
+    assert log == ["pipelines.create", "db.flush"]  # nothing committed
@@ -0,0 +1,60 @@
+import datetime as dt
+import uuid
+
+from app.models import Report
+from app.processing.report_pdf import TEMPLATE_VERSION
+from app.schemas.enums import ReportFrequency
+from app.services.report import artifact_key
+
+
+def _report(**overrides):
+    fields = dict(
+        organization_id=uuid.uuid4(),
+        frequency=ReportFrequency.WEEKLY,
+        period_start=dt.date(2024, 6, 3),
+        period_end=dt.date(2024, 6, 10),
+    )
+    fields.update(overrides)
+    return Report(**fields)
+
+
+CONTENT = {
+    "title": "Weekly report",
+    "subtitle": ["Acme", "2024-06-03 - 2024-06-10"],
+    "summary": None,
+    "sections": [
+        {
+            "heading": "Events by type",
+            "columns": ["Type", "Total"],
+            "rows": [["leak", 3]],
+        }
+    ],
+}
+
+
+def test_identical_content_shares_a_key():
+    report = _report()
+    again = _report(organization_id=report.organization_id)
+    reordered = dict(reversed(list(CONTENT.items())))
+
+    key = artifact_key(report, CONTENT)
+    assert key == artifact_key(again, reordered)
+    assert key["template_version"] == TEMPLATE_VERSION
+    assert len(key["content_sha256"]) == 64
+
+
+def test_key_changes_with_data_period_and_org():
+    report = _report()
+    key = artifact_key(report, CONTENT)
+    changed = {
+        **CONTENT,
+        "sections": [{**CONTENT["sections"][0], "rows": [["leak", 4]]}],
+    }
+
+    assert artifact_key(report, changed) != key
+    assert artifact_key(report, {**CONTENT, "summary": "Quiet week"}) != key
+    longer = _report(
+        organization_id=report.organization_id, period_end=dt.date(2024, 6, 11)
+    )
+    assert artifact_key(longer, CONTENT) != key
+    assert artifact_key(_report(), CONTENT) != key
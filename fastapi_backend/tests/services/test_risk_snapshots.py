@@ -0,0 +1,84 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.analytics.risk import RiskState
+from app.helpers.cache import LRUCache
+from app.services import risk
+
+
+class FailingSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        raise ConnectionError("database went away")
+
+
+class Session(FailingSession):
+    async def commit(self):
+        pass
+
+
+class FakeRepo:
+    def __init__(self, db):
+        self.rows = []
+
+    async def upsert(self, values, commit=True):
+        self.rows.append(values)
+
+
+def dirty_state():
+    segment = uuid.uuid4()
+    state = RiskState.empty([segment], half_life_s=86400.0, now=0.0)
+    state.apply(uuid.uuid4(), segment, 1.0, detected_at=0.0, created_at=0.0)
+    return state
+
+
+def states_cache(maxsize):
+    return LRUCache(maxsize=maxsize, evictable=lambda entry: not entry[0].dirty)
+
+
+async def test_failed_snapshot_keeps_states_dirty():
+    state = dirty_state()
+    states = states_cache(8)
+    states.set(uuid.uuid4(), (state, uuid.uuid4(), 0.0))
+
+    with patch.object(risk, "_states", states), patch.object(
+        risk, "async_session_maker", FailingSession
+    ), patch.object(risk, "RiskSnapshotRepository", FakeRepo):
+        with pytest.raises(ConnectionError):
+            await risk.snapshot_risk_states()
+
+    assert state.dirty
+
+
+def test_dirty_states_outlive_the_size_bound():
+    states = states_cache(1)
+    first, second = dirty_state(), dirty_state()
+    states.set("a", (first, None, 0.0))
+    states.set("b", (second, None, 0.0))
+
+    assert len(states) == 2  # neither is persisted yet
+
+    second.dirty = False
+    states.set("c", (dirty_state(), None, 0.0))
+
+    assert [k for k, _ in states.items()] == ["a", "c"]
+
+
+async def test_snapshot_evicts_clean_states_beyond_the_bound():
+    states = states_cache(1)
+    for key in ("a", "b", "c"):
+        states.set(key, (dirty_state(), uuid.uuid4(), 0.0))
+
+    with patch.object(risk, "_states", states), patch.object(
+        risk, "async_session_maker", Session
+    ), patch.object(risk, "RiskSnapshotRepository", FakeRepo):
+        assert await risk.snapshot_risk_states() == 3
+
+    assert [k for k, _ in states.items()] == ["c"]
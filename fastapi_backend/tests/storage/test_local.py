@@ -0,0 +1,77 @@
+import hashlib
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.storage import signing
+from app.storage.local import LocalStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path / "root", "http://api.test/")
+
+
+async def _read(storage, key, start=0, end=None, chunk_size=4):
+    return b"".join([c async for c in storage.iter_range(key, start, end, chunk_size)])
+
+
+async def test_put_move_read_delete(storage, tmp_path):
+    src = tmp_path / "upload.part"
+    src.write_bytes(b"0123456789")
+
+    await storage.put_file("incoming/x", src)
+    await storage.move("incoming/x", "ab/abc")
+
+    assert not src.exists()
+    assert await storage.size("incoming/x") is None
+    assert await storage.size("ab/abc") == 10
+    assert await _read(storage, "ab/abc") == b"0123456789"
+    assert await _read(storage, "ab/abc", 3, 7) == b"34567"
+    assert await storage.sha256("ab/abc") == hashlib.sha256(b"0123456789").hexdigest()
+
+    await storage.delete("ab/abc")
+    await storage.delete("ab/abc")  # missing keys are ignored
+    assert not await storage.exists("ab/abc")
+
+
+def test_keys_cannot_escape_root(storage):
+    with pytest.raises(ValueError):
+        storage.local_path("../outside")
+
+
+def test_presigned_urls_are_signed_and_scoped(storage):
+    put = storage.presign_put("incoming/u1", 60, size=10, sha256="00" * 32)
+    url = urlparse(put.url)
+    query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+    assert url.path == "/storage/incoming/u1"
+    assert signing.verify("PUT", "incoming/u1", int(query["exp"]), query["sig"], 10)
+    assert not signing.verify("PUT", "incoming/u1", int(query["exp"]), query["sig"], 11)
+    assert not signing.verify("GET", "incoming/u1", int(query["exp"]), query["sig"])
+    assert not signing.verify("PUT", "incoming/u1", 1, query["sig"], 10)
+
+
+async def test_delete_prefix_removes_derived_objects(storage, tmp_path):
+    for name in ("a.d/previews/128.webp", "a.d/tiles/0/0_0.webp", "b"):
+        src = tmp_path / "part"
+        src.write_bytes(b"x")
+        await storage.put_file(name, src)
+
+    await storage.delete_prefix("a.d/")
+    await storage.delete_prefix("missing.d/")
+
+    assert not await storage.exists("a.d/previews/128.webp")
+    assert not await storage.exists("a.d/tiles/0/0_0.webp")
+    assert await storage.exists("b")
+
+
+def test_download_filename_is_signed(storage):
+    get = storage.presign_get("ab/abc", 60, filename="report.pdf")
+    query = {k: v[0] for k, v in parse_qs(urlparse(get.url).query).items()}
+    exp, sig = int(query["exp"]), query["sig"]
+
+    assert query["filename"] == "report.pdf"
+    assert signing.verify("GET", "ab/abc", exp, sig, filename="report.pdf")
+    assert not signing.verify("GET", "ab/abc", exp, sig, filename="payload.html")
+    assert not signing.verify("GET", "ab/abc", exp, sig)
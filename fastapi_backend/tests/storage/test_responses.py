@@ -0,0 +1,67 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.storage.local import LocalStorage
+from app.storage.responses import content_response
+
+DATA = bytes(range(256)) * 4
+ETAG = '"deadbeef"'
+
+
+@pytest.fixture
+def client(tmp_path):
+    storage = LocalStorage(tmp_path, "http://test")
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / "blob").write_bytes(DATA)
+
+    async def endpoint(request: Request):
+        return content_response(
+            storage,
+            "ab/blob",
+            len(DATA),
+            request.headers,
+            etag=ETAG,
+            media_type="video/mp4",
+        )
+
+    return TestClient(Starlette(routes=[Route("/content", endpoint)]))
+
+
+def test_full_body(client):
+    res = client.get("/content")
+    assert res.status_code == 200
+    assert res.content == DATA
+    assert res.headers["etag"] == ETAG
+    assert res.headers["accept-ranges"] == "bytes"
+
+
+def test_single_range(client):
+    res = client.get("/content", headers={"Range": "bytes=10-19"})
+    assert res.status_code == 206
+    assert res.content == DATA[10:20]
+    assert res.headers["content-range"] == f"bytes 10-19/{len(DATA)}"
+
+
+def test_multi_range(client):
+    res = client.get("/content", headers={"Range": "bytes=0-3,100-103"})
+    assert res.status_code == 206
+    content_type = res.headers["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("boundary=")[1].encode()
+    parts = res.content.split(b"--" + boundary)
+    assert parts[-1] == b"--\r\n"
+    assert parts[1].endswith(b"\r\n\r\n" + DATA[0:4] + b"\r\n")
+    assert parts[2].endswith(b"\r\n\r\n" + DATA[100:104] + b"\r\n")
+    assert int(res.headers["content-length"]) == len(res.content)
+
+
+def test_conditional_requests(client):
+    assert client.get("/content", headers={"If-None-Match": ETAG}).status_code == 304
+    stale = client.get("/content", headers={"Range": "bytes=0-3", "If-Range": '"old"'})
+    assert stale.status_code == 200 and stale.content == DATA
+    res = client.get("/content", headers={"Range": f"bytes={len(DATA)}-"})
+    assert res.status_code == 416
+    assert res.headers["content-range"] == f"bytes */{len(DATA)}"
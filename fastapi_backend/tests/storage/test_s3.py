@@ -0,0 +1,40 @@
+import hashlib
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from app.storage.s3 import S3Storage  # noqa: E402
+
+
+@pytest.fixture
+def storage():
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="assets")
+        yield S3Storage(client, "assets", prefix="test")
+
+
+async def test_roundtrip(storage, tmp_path):
+    src = tmp_path / "upload.part"
+    src.write_bytes(b"0123456789")
+
+    await storage.put_file("incoming/x", src)
+    await storage.move("incoming/x", "ab/abc")
+
+    assert not src.exists()
+    assert await storage.size("incoming/x") is None
+    assert await storage.size("ab/abc") == 10
+    chunks = [c async for c in storage.iter_range("ab/abc", 3, 7)]
+    assert b"".join(chunks) == b"34567"
+    assert await storage.sha256("ab/abc") == hashlib.sha256(b"0123456789").hexdigest()
+
+
+def test_presigned_put_pins_checksum(storage):
+    sha = hashlib.sha256(b"data").hexdigest()
+    request = storage.presign_put("incoming/u1", 60, size=4, sha256=sha)
+
+    assert request.method == "PUT"
+    assert "x-amz-checksum-sha256" in request.headers
+    assert "test/incoming/u1" in request.url
@@ -0,0 +1,129 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.storage.base import PresignedRequest, StorageBackend
+from app.storage.local import LocalStorage
+from app.storage.responses import content_response
+from app.storage.tiered import TieredStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return TieredStorage(
+        LocalStorage(tmp_path / "hot", "http://api.test/"),
+        LocalStorage(tmp_path / "cold", "http://api.test/"),
+    )
+
+
+async def _put(backend, key, data, tmp_path):
+    src = tmp_path / "src"
+    src.write_bytes(data)
+    await backend.put_file(key, src)
+
+
+async def _read(storage, key, start=0, end=None):
+    return b"".join([c async for c in storage.iter_range(key, start, end)])
+
+
+async def test_writes_go_to_hot(storage, tmp_path):
+    await _put(storage, "ab/new", b"fresh", tmp_path)
+
+    assert await storage.hot.size("ab/new") == 5
+    assert await storage.cold.size("ab/new") is None
+    assert await storage.locate("ab/new") is storage.hot
+
+
+async def test_reads_fall_back_to_cold(storage, tmp_path):
+    await _put(storage.cold, "ab/old", b"0123456789", tmp_path)
+
+    assert await storage.size("ab/old") == 10
+    assert await _read(storage, "ab/old", 2, 4) == b"234"
+    assert await storage.locate("ab/old") is storage.cold
+    assert storage.local_path("ab/old") == storage.cold.local_path("ab/old")
+
+
+async def test_missing_objects_upload_to_hot(storage):
+    assert await storage.size("ab/none") is None
+    assert storage.local_path("ab/none") is None
+    assert storage.upload_path("ab/none") == storage.hot.local_path("ab/none")
+
+
+async def test_delete_removes_both_tiers(storage, tmp_path):
+    await _put(storage.hot, "ab/x", b"1", tmp_path)
+    await _put(storage.cold, "ab/x", b"1", tmp_path)
+    await _put(storage.hot, "ab/x.d/previews/128.webp", b"p", tmp_path)
+
+    await storage.delete("ab/x")
+    await storage.delete_prefix("ab/x.d/")
+
+    assert not await storage.exists("ab/x")
+    assert not await storage.exists("ab/x.d/previews/128.webp")
+
+
+class MemoryStorage(StorageBackend):
+    """A non-local backend (stands in for S3)."""
+
+    def __init__(self):
+        self.objects = {}
+
+    async def put_file(self, key, src):
+        self.objects[key] = src.read_bytes()
+
+    async def move(self, src_key, dest_key):
+        self.objects[dest_key] = self.objects.pop(src_key)
+
+    async def delete(self, key):
+        self.objects.pop(key, None)
+
+    async def delete_prefix(self, prefix):
+        for key in [k for k in self.objects if k.startswith(prefix)]:
+            del self.objects[key]
+
+    async def size(self, key):
+        data = self.objects.get(key)
+        return None if data is None else len(data)
+
+    async def iter_range(self, key, start=0, end=None, chunk_size=4):
+        data = self.objects[key][start : None if end is None else end + 1]
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+
+    async def sha256(self, key):
+        raise NotImplementedError
+
+    def presign_get(self, key, expires_s, filename=None):
+        return PresignedRequest(url=f"https://cold.test/{key}", method="GET")
+
+    def presign_put(self, key, expires_s, size, sha256):
+        return PresignedRequest(url=f"https://cold.test/{key}", method="PUT")
+
+
+@pytest.fixture
+def remote_cold(tmp_path):
+    return TieredStorage(
+        LocalStorage(tmp_path / "hot", "http://api.test/"), MemoryStorage()
+    )
+
+
+async def test_archived_objects_are_copied_from_a_remote_cold_tier(
+    remote_cold, tmp_path
+):
+    await _put(remote_cold.cold, "ab/old", b"0123456789", tmp_path)
+
+    assert remote_cold.local_path("ab/old") is None
+    async with remote_cold.local_copy("ab/old", tmp_path / "tmp") as path:
+        assert path.read_bytes() == b"0123456789"
+
+
+def test_archived_objects_are_streamed_from_a_remote_cold_tier(remote_cold):
+    remote_cold.cold.objects["ab/old"] = b"0123456789"
+
+    async def endpoint(request: Request):
+        return content_response(remote_cold, "ab/old", 10, request.headers)
+
+    client = TestClient(Starlette(routes=[Route("/content", endpoint)]))
+    assert client.get("/content").content == b"0123456789"
+    assert client.get("/content", headers={"Range": "bytes=2-4"}).content == b"234"
@@ -0,0 +1,62 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.helpers.files import allocate_file, hash_file, spool_upload, write_stream_at
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="video.mp4")
+
+
+async def test_spool_upload_streams_and_hashes(tmp_path):
+    data = b"x" * 10_000 + b"y" * 5
+    tmp_dir = tmp_path / "tmp"
+
+    stored = await spool_upload(
+        _upload(data), tmp_dir, max_bytes=1 << 20, chunk_size=1024
+    )
+
+    assert stored.path.parent == tmp_dir
+    assert stored.path.read_bytes() == data
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+
+
+async def test_spool_upload_rejects_oversize_and_cleans_up(tmp_path):
+    with pytest.raises(HTTPException) as exc:
+        await spool_upload(
+            _upload(b"z" * 5000), tmp_path, max_bytes=4096, chunk_size=1024
+        )
+
+    assert exc.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_chunks_written_out_of_order_assemble_the_file(tmp_path):
+    path = tmp_path / "staging.part"
+    await allocate_file(path, 10)
+
+    await write_stream_at(_chunks(b"fgh", b"ij"), path, 5, 5)
+    await write_stream_at(_chunks(b"abcde"), path, 0, 5)
+
+    assert path.read_bytes() == b"abcdefghij"
+    assert await hash_file(path, 4) == (hashlib.sha256(b"abcdefghij").hexdigest(), 10)
+
+
+async def test_write_stream_at_rejects_wrong_length(tmp_path):
+    path = tmp_path / "staging.part"
+    await allocate_file(path, 10)
+
+    with pytest.raises(HTTPException) as exc:
+        await write_stream_at(_chunks(b"abc"), path, 0, 5)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        await write_stream_at(_chunks(b"abcdef"), path, 0, 5)
@@ -0,0 +1,20 @@
+import pytest
+from fastapi import HTTPException
+
+from app.helpers.geo import cell_size_for_zoom, parse_bbox
+
+
+def test_parse_bbox():
+    assert parse_bbox("10,20,30,40") == (10.0, 20.0, 30.0, 40.0)
+
+
+@pytest.mark.parametrize("raw", ["1,2,3", "a,b,c,d", "30,20,10,40", "0,0,200,10"])
+def test_parse_bbox_invalid(raw):
+    with pytest.raises(HTTPException) as excinfo:
+        parse_bbox(raw)
+    assert excinfo.value.status_code == 422
+
+
+def test_cell_size_halves_per_zoom_level():
+    assert cell_size_for_zoom(0) == 90.0
+    assert cell_size_for_zoom(5) == pytest.approx(cell_size_for_zoom(4) / 2)
@@ -0,0 +1,50 @@
+import pytest
+
+from app.helpers.http_range import (
+    MAX_RANGES,
+    RangeNotSatisfiable,
+    none_match,
+    parse_range,
+    range_applies,
+)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", [(0, 99)]),
+        ("bytes=900-", [(900, 999)]),
+        ("bytes=-100", [(900, 999)]),
+        ("bytes=990-2000", [(990, 999)]),
+        ("bytes=0-9,5-19,20-29,100-109", [(0, 29), (100, 109)]),
+        ("bytes=5000-6000,0-0", [(0, 0)]),
+        (None, None),
+        ("items=0-1", None),
+        ("bytes=9-1", None),
+        ("bytes=abc", None),
+        (
+            "bytes="
+            + ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(MAX_RANGES + 1)),
+            None,
+        ),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+def test_unsatisfiable_range():
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=1000-", 1000)
+
+
+def test_conditionals():
+    etag = '"abc"'
+    assert none_match('"x", "abc"', etag)
+    assert none_match('W/"abc"', etag)
+    assert none_match("*", etag)
+    assert not none_match('"x"', etag)
+    assert range_applies(None, etag)
+    assert range_applies('"abc"', etag)
+    assert not range_applies('"old"', etag)
+    assert not range_applies("Wed, 21 Oct 2015 07:28:00 GMT", etag)
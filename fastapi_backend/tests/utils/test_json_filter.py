@@ -0,0 +1,53 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.helpers.json_filter import parse_json_filters
+from app.models import Asset
+
+
+def _sql(raw):
+    (condition,) = parse_json_filters(Asset.asset_metadata, [raw])
+    compiled = condition.compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+
+def test_equality_becomes_containment():
+    sql, params = _sql("camera.make:DJI")
+    assert "@>" in sql
+    assert params == [{"camera": {"make": "DJI"}}]
+
+
+def test_json_values_are_typed():
+    assert _sql("gps.alt:120")[1] == [{"gps": {"alt": 120}}]
+    assert _sql('tags:["leak"]')[1] == [{"tags": ["leak"]}]
+    assert _sql('mission_id:"42"')[1] == [{"mission_id": "42"}]
+
+
+def test_range_becomes_jsonpath():
+    sql, params = _sql("gps.alt>=50.5")
+    assert "@?" in sql and "JSONPATH" in sql
+    assert params == ['$."gps"."alt" ? (@ >= 50.5)']
+
+
+def test_string_range_is_quoted():
+    assert _sql("flown_on<2024-06-01")[1] == ['$."flown_on" ? (@ < "2024-06-01")']
+
+
+def test_bare_key_checks_presence():
+    assert _sql("mission_id")[1] == ['$."mission_id"']
+
+
+@pytest.mark.parametrize(
+    "raw",
+    ["", "a..b:1", "$.x:1", "a b:1", "gps.alt>true", "alt>[1]", "alt>1e999", "x:"],
+)
+def test_invalid_filters(raw):
+    with pytest.raises(HTTPException) as excinfo:
+        parse_json_filters(Asset.asset_metadata, [raw])
+    assert excinfo.value.status_code == 422
+
+
+def test_filter_count_is_capped():
+    with pytest.raises(HTTPException):
+        parse_json_filters(Asset.asset_metadata, ["a"] * 21)
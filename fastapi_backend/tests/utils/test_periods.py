@@ -0,0 +1,90 @@
+import datetime as dt
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.helpers.periods import completed_periods, jitter, period_containing
+from app.jobs.report_schedule import due_reports
+from app.schemas.enums import ReportFrequency as F
+
+UTC = dt.timezone.utc
+
+
+@pytest.mark.parametrize(
+    "frequency, day, expected",
+    [
+        (F.WEEKLY, dt.date(2024, 6, 5), (dt.date(2024, 6, 3), dt.date(2024, 6, 10))),
+        (F.WEEKLY, dt.date(2024, 6, 3), (dt.date(2024, 6, 3), dt.date(2024, 6, 10))),
+        (F.MONTHLY, dt.date(2024, 12, 31), (dt.date(2024, 12, 1), dt.date(2025, 1, 1))),
+        (F.QUARTERLY, dt.date(2024, 5, 17), (dt.date(2024, 4, 1), dt.date(2024, 7, 1))),
+        (
+            F.QUARTERLY,
+            dt.date(2024, 12, 1),
+            (dt.date(2024, 10, 1), dt.date(2025, 1, 1)),
+        ),
+    ],
+)
+def test_period_containing(frequency, day, expected):
+    assert period_containing(frequency, day) == expected
+
+
+def test_completed_periods_stop_before_the_current_one():
+    months = completed_periods(F.MONTHLY, dt.date(2024, 1, 15), dt.date(2024, 4, 1))
+    assert months == [
+        (dt.date(2024, 1, 1), dt.date(2024, 2, 1)),
+        (dt.date(2024, 2, 1), dt.date(2024, 3, 1)),
+        (dt.date(2024, 3, 1), dt.date(2024, 4, 1)),
+    ]
+    assert (
+        completed_periods(F.QUARTERLY, dt.date(2024, 4, 2), dt.date(2024, 6, 30)) == []
+    )
+
+
+def test_jitter_is_stable_and_bounded():
+    offsets = [jitter(f"org-{i}", 3600) for i in range(200)]
+    assert offsets == [jitter(f"org-{i}", 3600) for i in range(200)]
+    assert all(dt.timedelta() <= o < dt.timedelta(hours=1) for o in offsets)
+    assert max(offsets) - min(offsets) > dt.timedelta(minutes=30)  # actually spread
+    assert jitter("org", 0) == dt.timedelta()
+
+
+@pytest.fixture
+def schedule(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_SCHEDULE_FREQUENCIES", ["weekly", "monthly"])
+    monkeypatch.setattr(settings, "REPORT_SCHEDULE_CATCHUP_DAYS", 35)
+    monkeypatch.setattr(settings, "REPORT_SCHEDULE_JITTER_S", 0)
+
+
+def test_due_reports_catch_up_and_skip_existing(schedule):
+    org = uuid.uuid4()
+    now = dt.datetime(2024, 6, 12, 9, tzinfo=UTC)
+    existing = {(org, F.WEEKLY, dt.date(2024, 6, 3), dt.date(2024, 6, 10))}
+
+    due = due_reports([(org, dt.date(2023, 1, 1))], existing, now)
+
+    periods = [(f, start) for _, _, f, start, _ in due]
+    # weeks back to the one containing May 8th and May, longest overdue first
+    assert periods == [
+        (F.WEEKLY, dt.date(2024, 5, 6)),
+        (F.WEEKLY, dt.date(2024, 5, 13)),
+        (F.WEEKLY, dt.date(2024, 5, 20)),
+        (F.MONTHLY, dt.date(2024, 5, 1)),
+        (F.WEEKLY, dt.date(2024, 5, 27)),
+    ]
+
+
+def test_due_reports_respect_jitter_and_org_creation(schedule, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_SCHEDULE_JITTER_S", 6 * 3600)
+    orgs = [(uuid.uuid4(), dt.date(2024, 1, 1)) for _ in range(50)]
+    boundary = dt.datetime(2024, 6, 10, tzinfo=UTC)
+
+    just_after = due_reports(orgs, set(), boundary + dt.timedelta(hours=1))
+    later = due_reports(orgs, set(), boundary + dt.timedelta(hours=6))
+    new_org = due_reports([(uuid.uuid4(), dt.date(2024, 6, 5))], set(), later[-1][0])
+
+    fresh = [d for d in just_after if d[4] == boundary.date()]
+    assert 0 < len(fresh) < len(orgs)  # spread over the jitter window
+    assert len([d for d in later if d[4] == boundary.date()]) == len(orgs)
+    assert all(a[0] <= b[0] for a, b in zip(later, later[1:]))
+    assert [(d[2], d[3]) for d in new_org] == [(F.WEEKLY, dt.date(2024, 6, 3))]
@@ -0,0 +1,74 @@
+import datetime as dt
+
+import pytest
+
+from app.helpers.throttle import Throttle, in_window, parse_hours
+
+WEEKDAYS = [0, 1, 2, 3, 4]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_parse_hours():
+    assert parse_hours("08-18") == (8, 18)
+    with pytest.raises(ValueError):
+        parse_hours("8am-6pm")
+    with pytest.raises(ValueError):
+        parse_hours("08-25")
+
+
+def test_in_window_business_hours():
+    monday = dt.datetime(2024, 6, 3)
+    assert in_window(monday.replace(hour=9), (8, 18), WEEKDAYS)
+    assert not in_window(monday.replace(hour=18), (8, 18), WEEKDAYS)
+    assert not in_window(monday.replace(hour=7, minute=59), (8, 18), WEEKDAYS)
+    assert not in_window(dt.datetime(2024, 6, 8, 10), (8, 18), WEEKDAYS)  # Saturday
+
+
+def test_in_window_overnight_belongs_to_the_starting_day():
+    friday_night = dt.datetime(2024, 6, 7, 23)
+    saturday_early = dt.datetime(2024, 6, 8, 3)
+    monday_early = dt.datetime(2024, 6, 3, 3)
+    assert in_window(friday_night, (22, 6), WEEKDAYS)
+    assert in_window(saturday_early, (22, 6), WEEKDAYS)  # Friday's window
+    assert not in_window(monday_early, (22, 6), WEEKDAYS)  # Sunday's window
+
+
+async def test_throttle_paces_to_the_rate():
+    clock = FakeClock()
+    throttle = Throttle(lambda: 100, burst_s=1.0, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        await throttle.consume(100)
+
+    assert clock.now == pytest.approx(5.0)
+
+
+async def test_throttle_allows_a_burst_after_idling():
+    clock = FakeClock()
+    throttle = Throttle(lambda: 100, burst_s=1.0, clock=clock, sleep=clock.sleep)
+    clock.now = 60.0
+
+    await throttle.consume(100)
+
+    assert clock.slept == []
+
+
+async def test_unlimited_rate_never_sleeps():
+    clock = FakeClock()
+    throttle = Throttle(lambda: 0, clock=clock, sleep=clock.sleep)
+
+    await throttle.consume(10**12)
+
+    assert clock.slept == []